@@ -15,9 +15,12 @@ from aiohttp import ClientSession, TraceConfig
 
 # local imports
 from src import blink_config
+from src import clock
 from src import environment as env
+from src import request_governor
 from src import thermostat_api as api
 from src import thermostat_common as tc
+from src import token_manager
 from src import utilities as util
 
 # Blink library
@@ -31,7 +34,9 @@ if BLINK_DEBUG and not env.is_azure_environment():
         mod_path = "..\\" + mod_path
     blinkpy = env.dynamic_module_import(BLINKPY_BLINKPY_MODULE, mod_path, pkg)
     auth = env.dynamic_module_import("blinkpy.auth", mod_path, pkg)
+    blinkpy_api = env.dynamic_module_import("blinkpy.api", mod_path, pkg)
 else:
+    from blinkpy import api as blinkpy_api  # noqa E402, from site packages
     from blinkpy import auth  # noqa E402, from path / site packages
     from blinkpy import blinkpy  # noqa E402, from path / site packages
 
@@ -78,26 +83,22 @@ except ImportError:
 # Storing the refresh token allows blinkpy to skip the PKCE web flow on
 # subsequent authentication attempts (auth.startup() tries refresh first).
 TOKEN_CACHE_FILE = "./data/blink_auth_cache.json"
+# blinkpy Auth attributes handed to the other zones of an account on refresh
+TOKEN_ATTRIBUTES = ("token", "refresh_token", "expires_in", "expiration_date")
 
 
 def _write_cache_file_sync(cache_data: dict) -> None:
     """Write cache data to TOKEN_CACHE_FILE with restricted permissions.
 
     This sync helper is called via asyncio.to_thread() to avoid blocking the
-    event loop.  Using os.open() with mode 0o600 ensures the cache file
-    (which may contain a refresh token) is owner-readable only on POSIX.
+    event loop.  The file is written with mode 0o600, so the cache (which may
+    contain a refresh token) is owner-readable only on POSIX, and replaced
+    atomically so a concurrent login never reads a half-written cache.
 
     Args:
         cache_data (dict): Token data to serialise as JSON.
     """
-    fd = os.open(TOKEN_CACHE_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
-    try:
-        f = os.fdopen(fd, "w", encoding="utf-8")
-    except Exception:
-        os.close(fd)
-        raise
-    with f:
-        json.dump(cache_data, f, indent=2)
+    util.write_json_atomic(TOKEN_CACHE_FILE, cache_data, indent=2)
 
 
 class ThermostatClass(blinkpy.Blink, tc.ThermostatCommon):  # type: ignore[misc]
@@ -162,6 +163,17 @@ class ThermostatClass(blinkpy.Blink, tc.ThermostatCommon):  # type: ignore[misc]
         self.camera_metadata = {}
         self.get_cameras()
 
+        # refresh the auth token in the background before it expires, once
+        # per account, blinkpy sets the expiry from time.time()
+        self.token_key = f"{blink_config.ALIAS}:{self.bl_uname}"
+        expires_at = self._get_token_expiry()
+        if expires_at is not None:
+            manager = token_manager.get_token_manager()
+            manager.add_peer(self.token_key, self)
+            manager.register(
+                self.token_key, self._background_token_refresh, expires_at, time.time
+            )
+
         # configure zone info
         self.zone_name = self.get_zone_name()
         self.device_id = None  # initialize
@@ -287,7 +299,7 @@ class ThermostatClass(blinkpy.Blink, tc.ThermostatCommon):  # type: ignore[misc]
                     f"Retrying in {retry_delay} seconds..."
                 )
                 print(traceback.format_exc())
-            time.sleep(retry_delay)
+            clock.sleep(retry_delay)
             return retry_delay * 2  # exponential backoff
         else:
             # Final attempt failed
@@ -307,7 +319,7 @@ class ThermostatClass(blinkpy.Blink, tc.ThermostatCommon):  # type: ignore[misc]
                     f"{retry_delay} seconds... "
                     f"(attempt {attempt + 1})"
                 )
-            time.sleep(retry_delay)
+            clock.sleep(retry_delay)
             return True  # Continue retry loop
         else:
             raise RuntimeError(
@@ -315,8 +327,22 @@ class ThermostatClass(blinkpy.Blink, tc.ThermostatCommon):  # type: ignore[misc]
                 "Camera list may not be available."
             )
 
+    def _acquire_request_budget(self, priority):
+        """
+        Wait for the request budget shared by zones of this Blink account.
+
+        inputs:
+            priority(str): request_governor.READ or request_governor.WRITE.
+        returns:
+            None
+        """
+        request_governor.get_governor(
+            blink_config.ALIAS, self.bl_uname, blink_config.REQUEST_BUDGET
+        ).acquire(priority)
+
     def _attempt_authentication(self):
         """Attempt single authentication process."""
+        self._acquire_request_budget(request_governor.WRITE)
         self.blink = blinkpy.Blink()  # type: ignore[misc]
         if self.blink is None:
             raise RuntimeError(
@@ -606,6 +632,9 @@ class ThermostatClass(blinkpy.Blink, tc.ThermostatCommon):  # type: ignore[misc]
         After any successful authentication the tokens are saved to the
         cache file so the next run can use the refresh token path.
         """
+        # wait for the account login budget without blocking the event loop
+        await asyncio.to_thread(self._acquire_request_budget, request_governor.WRITE)
+
         # Merge cached tokens into the auth-init dict so that
         # auth.startup() will attempt token refresh before PKCE.
         cached = self._load_token_cache()
@@ -1303,6 +1332,69 @@ class ThermostatClass(blinkpy.Blink, tc.ThermostatCommon):  # type: ignore[misc]
             print("Attempting to refresh authentication token...")
         self.blink.auth.refresh_token()  # type: ignore[attr-defined, operator]
 
+    def _get_token_expiry(self):
+        """
+        Return the expiry time of the current auth token.
+
+        Returns:
+            (float or None): expiry epoch time, None if unknown.
+        """
+        blink_auth = getattr(self.blink, "auth", None)
+        expires_at = getattr(blink_auth, "expiration_date", None)
+        if not isinstance(expires_at, (int, float)):
+            return None
+        return float(expires_at)
+
+    def _background_token_refresh(self):
+        """
+        Refresh the auth token from the token manager thread.
+
+        The aiohttp session used at login is closed once the constructor
+        returns, so blinkpy 0.22.0+ refreshes on a short-lived session and
+        persists the new tokens to TOKEN_CACHE_FILE.
+
+        The new tokens are handed to every zone logged into the account.
+
+        Returns:
+            (float): new auth token expiry epoch time.
+        """
+        if env.get_package_version(blinkpy) >= (0, 22, 0):  # type: ignore[operator]
+            asyncio.run(self._async_background_token_refresh())
+        else:
+            self._perform_token_refresh()
+        expires_at = self._get_token_expiry()
+        if expires_at is None:
+            raise ValueError("blink auth token refresh returned no expiry time")
+        blink_auth = self.blink.auth  # type: ignore[attr-defined]
+        for peer in token_manager.get_token_manager().get_peers(self.token_key):
+            peer_auth = getattr(getattr(peer, "blink", None), "auth", None)
+            if peer is self or peer_auth is None:
+                continue
+            for attribute in TOKEN_ATTRIBUTES:
+                setattr(peer_auth, attribute, getattr(blink_auth, attribute, None))
+        return expires_at
+
+    async def _async_background_token_refresh(self):
+        """Refresh the auth token on a new session and save the token cache."""
+        blink_auth = self.blink.auth  # type: ignore[attr-defined]
+        await asyncio.to_thread(self._acquire_request_budget, request_governor.WRITE)
+        async with ClientSession() as session:
+            blink_auth.session = session
+            refresh_func = getattr(blinkpy_api, "oauth_refresh_token", None)
+            if refresh_func is not None and blink_auth.hardware_id:
+                # OAuth v2 refresh, same path auth.startup() tries first
+                token_data = await refresh_func(
+                    blink_auth, blink_auth.refresh_token, blink_auth.hardware_id
+                )
+                if not token_data:
+                    raise ValueError("blink OAuth v2 token refresh failed")
+                await blink_auth._process_token_data(  # pylint: disable=W0212
+                    token_data
+                )
+            else:
+                await blink_auth.refresh_tokens(refresh=True)
+            await self._save_token_cache()
+
     def _refresh_camera_data(self):
         """Refresh camera data after token refresh."""
         if hasattr(self.blink, "refresh"):
@@ -1465,7 +1557,7 @@ class ThermostatZone(tc.ThermostatCommonZone):
 
         # server data cache expiration parameters to mitigate spam detection
         self.fetch_interval_sec = 60  # age of server data before refresh (seconds)
-        self.last_fetch_time = time.time() - 2 * self.fetch_interval_sec
+        self.last_fetch_time = clock.time() - 2 * self.fetch_interval_sec
         self.last_printed_refresh_time = None  # track last printed cache message time
 
         # switch config for this thermostat
@@ -1678,7 +1770,7 @@ class ThermostatZone(tc.ThermostatCommonZone):
         returns:
             None, updates self.zone_metadata with fresh data from server
         """
-        now_time = time.time()
+        now_time = clock.time()
         # refresh if past expiration date or force_refresh option
         if force_refresh or (
             now_time >= (self.last_fetch_time + self.fetch_interval_sec)
@@ -10,6 +10,17 @@ MIN_COOL_SETPOINT = 70
 
 MEASUREMENTS = 1  # number of MEASUREMENTS to average
 
+# request budget per account shared by all zones, see request_governor.py
+# logins are rate limited hard (2FA lockout), keep the burst small
+REQUEST_BUDGET = {
+    "rate_per_min": 6.0,
+    "burst": 3,
+    "write_reserve": 1,
+}
+
+# logins in progress at once in site supervision
+MAX_CONCURRENT_AUTH = 1
+
 # API field names
 API_TEMPF_MEAN = "temperature_calibrated"
 API_WIFI_STRENGTH = "wifi_strength"
@@ -0,0 +1,384 @@
+"""
+Hard deadlines for vendor calls.
+
+A vendor library call without a socket timeout (a radiotherm socket, a
+pykumo probe, a pyhtcc request) can block forever and freeze its zone.
+execute_with_extended_retries() therefore runs every call on a worker of
+the process-wide DeadlineExecutor and waits at most the call deadline:
+
+  * a call that overruns is abandoned: the caller gets
+    utilities.CallDeadlineError, a TimeoutError.  The abandoned call is
+    still running on the zone's thermostat object, so the retry loop does
+    not retry it (a write would be repeated), it marks the zone degraded
+    and supervision reconnects with a new object while the siblings keep
+    polling,
+  * the abandoned call keeps its worker until the library returns, the
+    executor counts it and starts another worker for new calls, up to
+    CALL_MAX_WORKERS,
+  * calls are grouped, e.g. by vendor and zone.  A group holding
+    CALL_MAX_HUNG_PER_GROUP abandoned calls gets CallDeadlineError for
+    new calls without taking a worker, so one dead device cannot drain
+    the pool shared with healthy zones,
+  * a watchdog thread logs every call that runs past its deadline once,
+    with the stack of the worker it is stuck in.
+
+The deadline is CALL_DEADLINE_SEC, override per vendor with
+<vendor>_config.CALL_DEADLINE_SEC.  Workers are daemon threads, so a hung
+call cannot block exit.
+"""
+
+# built-in imports
+import collections
+import contextvars
+import itertools
+import queue
+import sys
+import threading
+import time
+import traceback
+
+# local imports
+from src import clock
+from src import utilities as util
+
+CALL_DEADLINE_SEC = 60  # default deadline of one vendor call
+CALL_MAX_WORKERS = 32  # worker threads, including ones held by hung calls
+CALL_MAX_HUNG_PER_GROUP = 2  # hung calls of one group before it fails fast
+WORKER_IDLE_SEC = 60  # idle workers exit after this long
+WATCHDOG_INTERVAL_SEC = 5  # period of the stuck call scan
+
+
+class _Call:
+    """One vendor call handed to a worker."""
+
+    def __init__(self, func, deadline_sec, name, group):
+        self.func = func
+        self.deadline_sec = deadline_sec
+        self.name = name
+        self.group = group
+        # run in the caller's context, e.g. its supervision context
+        self.context = contextvars.copy_context()
+        self.done = threading.Event()
+        self.result = None
+        self.exception = None
+        self.thread_id = None
+        self.start_time = None
+        self.abandoned = False
+        self.hung = False  # abandoned while running, holds its worker
+        self.reported = False
+
+    def run(self):
+        """Run the call and store its result or exception."""
+        try:
+            self.result = clock.run_task(self.context.run, self.func)
+        except BaseException as ex:  # re-raised in the caller
+            self.exception = ex
+        finally:
+            self.done.set()
+
+
+class DeadlineExecutor:
+    """Daemon worker pool that abandons calls overrunning their deadline."""
+
+    def __init__(
+        self,
+        max_workers=CALL_MAX_WORKERS,
+        idle_sec=WORKER_IDLE_SEC,
+        max_hung_per_group=CALL_MAX_HUNG_PER_GROUP,
+    ):
+        """
+        Constructor.
+
+        inputs:
+            max_workers(int): most worker threads at once.
+            idle_sec(float): idle workers exit after this long.
+            max_hung_per_group(int): hung calls of one group before its
+                                     new calls fail fast.
+        """
+        self.max_workers = max_workers
+        self.idle_sec = idle_sec
+        self.max_hung_per_group = max_hung_per_group
+        self.stats = collections.Counter()
+        self._hung = collections.Counter()  # group -> hung calls
+        self._tasks = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._workers = 0
+        self._idle = 0
+        self._pending = 0
+        self._running = {}  # id(call) -> call
+        self._worker_ids = itertools.count(1)
+        self._watchdog = None
+
+    def call(self, func, deadline_sec, name=None, group=None):
+        """
+        Run func with a deadline.
+
+        inputs:
+            func(callable): vendor call without arguments.
+            deadline_sec(float): longest wait, None runs func in the
+                                 calling thread without a deadline.
+            name(str): call name for logs, default is func's name.
+            group(str): worker budget group, e.g. vendor and zone,
+                        default is the call name.
+        returns:
+            result of func().
+        raises:
+            util.CallDeadlineError: func did not return in time, or the
+                                    group holds max_hung_per_group hung
+                                    calls.
+            any exception raised by func.
+        """
+        if deadline_sec is None:
+            return func()
+        name = name or getattr(func, "__qualname__", "call")
+        group = group or name
+        with self._lock:
+            hung = self._hung[group]
+            if hung >= self.max_hung_per_group:
+                self.stats["refused"] += 1
+        if hung >= self.max_hung_per_group:
+            raise util.CallDeadlineError(
+                f"{name} not started, {hung} abandoned call(s) of {group} "
+                "are still running"
+            )
+        call = _Call(func, deadline_sec, name, group)
+        # the worker is a clock task while the caller waits on it, so
+        # clock.sleep() inside func works on a virtual clock
+        clock.add_task()
+        self._submit(call)
+        with clock.idle():
+            finished = call.done.wait(deadline_sec)
+        if not finished:
+            with self._lock:
+                call.abandoned = True
+                self.stats["overruns"] += 1
+                if call.start_time is not None and not call.done.is_set():
+                    call.hung = True
+                    self._hung[call.group] += 1
+            util.log_msg(
+                f"WARNING: {call.name} did not return within {deadline_sec} "
+                "sec, abandoning the call",
+                mode=util.BOTH_LOG,
+                func_name=1,
+            )
+            raise util.CallDeadlineError(
+                f"{call.name} did not return within {deadline_sec} sec"
+            )
+        with self._lock:
+            self.stats["calls"] += 1
+        if call.exception is not None:
+            raise call.exception
+        return call.result
+
+    def get_stuck_calls(self):
+        """
+        Return the calls running past their deadline.
+
+        inputs:
+            None
+        returns:
+            (list): dicts with the call "name", "elapsed_sec",
+                    "deadline_sec", "thread_id" and worker "stack".
+        """
+        return [
+            {
+                "name": call.name,
+                "elapsed_sec": round(elapsed_sec, 1),
+                "deadline_sec": call.deadline_sec,
+                "thread_id": call.thread_id,
+                "stack": format_thread_stack(call.thread_id),
+            }
+            for call, elapsed_sec in self._get_overdue_calls()
+        ]
+
+    def get_metrics(self):
+        """
+        Return executor counters.
+
+        inputs:
+            None
+        returns:
+            (dict): calls, overruns, abandoned calls that returned later,
+                    calls refused for their group's hung calls, hung
+                    calls, workers and calls running now.
+        """
+        with self._lock:
+            return {
+                "calls": self.stats["calls"],
+                "overruns": self.stats["overruns"],
+                "late_returns": self.stats["late_returns"],
+                "refused": self.stats["refused"],
+                "hung": sum(self._hung.values()),
+                "workers": self._workers,
+                "running": len(self._running),
+            }
+
+    def report_stuck_calls(self):
+        """
+        Log each stuck call once with its stack.
+
+        inputs:
+            None
+        returns:
+            (int): number of newly reported calls.
+        """
+        reported = 0
+        for call, elapsed_sec in self._get_overdue_calls():
+            if call.reported:
+                continue
+            call.reported = True
+            reported += 1
+            util.log_msg(
+                f"WARNING: {call.name} stuck for {elapsed_sec:.1f} sec "
+                f"(deadline {call.deadline_sec} sec) in thread "
+                f"{call.thread_id}:\n{format_thread_stack(call.thread_id)}",
+                mode=util.BOTH_LOG,
+                func_name=1,
+            )
+        return reported
+
+    def _get_overdue_calls(self):
+        """Return (call, elapsed_sec) of running calls past their deadline."""
+        now = time.monotonic()
+        with self._lock:
+            running = list(self._running.values())
+        overdue = []
+        for call in running:
+            elapsed_sec = now - call.start_time
+            if elapsed_sec > call.deadline_sec:
+                overdue.append((call, elapsed_sec))
+        return overdue
+
+    def _submit(self, call):
+        """Queue a call, starting a worker if none is free."""
+        with self._lock:
+            self._pending += 1
+            self._tasks.put(call)
+            if self._pending > self._idle and self._workers < self.max_workers:
+                self._workers += 1
+                self._idle += 1
+                threading.Thread(
+                    target=self._work,
+                    name=f"vendor_call_{next(self._worker_ids)}",
+                    daemon=True,
+                ).start()
+            if self._watchdog is None:
+                self._watchdog = threading.Thread(
+                    target=self._watch, name="vendor_call_watchdog", daemon=True
+                )
+                self._watchdog.start()
+
+    def _work(self):
+        """Worker thread body."""
+        while True:
+            try:
+                call = self._tasks.get(timeout=self.idle_sec)
+            except queue.Empty:
+                with self._lock:
+                    if self._pending > 0:
+                        continue
+                    self._idle -= 1
+                    self._workers -= 1
+                    return
+            with self._lock:
+                self._pending -= 1
+                if call.abandoned:
+                    # caller gave up while the call was queued, skip it
+                    clock.task_done()
+                    continue
+                self._idle -= 1
+                call.thread_id = threading.get_ident()
+                call.start_time = time.monotonic()
+                self._running[id(call)] = call
+            call.run()
+            with self._lock:
+                del self._running[id(call)]
+                self._idle += 1
+                if call.abandoned:
+                    self.stats["late_returns"] += 1
+                if call.hung:
+                    self._hung[call.group] -= 1
+                    if not self._hung[call.group]:
+                        del self._hung[call.group]
+
+    def _watch(self):
+        """Watchdog thread body."""
+        while True:
+            time.sleep(WATCHDOG_INTERVAL_SEC)
+            self.report_stuck_calls()
+            with self._lock:
+                if self._workers == 0:
+                    # restarted by the next call
+                    self._watchdog = None
+                    return
+
+
+def format_thread_stack(thread_id):
+    """
+    Return the current stack of a thread.
+
+    inputs:
+        thread_id(int): thread identifier, e.g. Thread.ident.
+    returns:
+        (str): formatted stack, empty if the thread is not running.
+    """
+    frame = sys._current_frames().get(thread_id)  # pylint: disable=protected-access
+    if frame is None:
+        return ""
+    return "".join(traceback.format_stack(frame))
+
+
+def get_deadline_sec(thermostat_type):
+    """
+    Return the call deadline of a thermostat type.
+
+    inputs:
+        thermostat_type(str): thermostat type.
+    returns:
+        (float): <vendor>_config.CALL_DEADLINE_SEC, else CALL_DEADLINE_SEC.
+    """
+    # note this import will cause circular import issue if put at top of file.
+    from src import thermostat_api as api  # noqa: E402, C0415
+
+    for config_module in api.config_modules:
+        if config_module.ALIAS == thermostat_type:
+            return getattr(config_module, "CALL_DEADLINE_SEC", CALL_DEADLINE_SEC)
+    return CALL_DEADLINE_SEC
+
+
+# process-wide executor shared by all zones
+_executor = DeadlineExecutor()
+
+
+def get_executor():
+    """
+    Return the process-wide deadline executor.
+
+    inputs:
+        None
+    returns:
+        (DeadlineExecutor): shared executor.
+    """
+    return _executor
+
+
+def reset_executor(
+    max_workers=CALL_MAX_WORKERS,
+    idle_sec=WORKER_IDLE_SEC,
+    max_hung_per_group=CALL_MAX_HUNG_PER_GROUP,
+):
+    """
+    Replace the process-wide executor with a new one.
+
+    Workers of the old executor exit once idle.
+
+    inputs:
+        max_workers(int): see DeadlineExecutor.
+        idle_sec(float): see DeadlineExecutor.
+        max_hung_per_group(int): see DeadlineExecutor.
+    returns:
+        (DeadlineExecutor): new executor.
+    """
+    global _executor  # noqa W603
+    _executor = DeadlineExecutor(max_workers, idle_sec, max_hung_per_group)
+    return _executor
@@ -0,0 +1,542 @@
+"""
+Record/replay cassette for vendor HTTP traffic.
+
+Every driver request that goes through the requests library (kumocloud,
+nest, sht31, weather, and honeywell via its pyhtcc session) ends up in
+requests.adapters.HTTPAdapter.send.  While a Cassette is active that
+method is wrapped:
+
+  * record mode: the real exchange is made and the response status,
+    headers, body and observed latency are appended to the cassette.
+  * replay mode: no network I/O, responses are served from the cassette
+    in recorded order per request, after sleeping the recorded latency on
+    the active clock (see clock.py) scaled by latency_scale.
+
+Cassettes are gzipped JSON files under ./data and hold no secrets:
+
+  * request bodies are stored as a SHA-256 digest only,
+  * Set-Cookie and Authorization values, secret fields of JSON bodies
+    (tokens, passwords) and secret query parameters (e.g. appid) are
+    replaced by REDACTED before writing.
+
+Replay matches requests after the same redaction, so a replayed token or
+cookie sent back by a driver finds its recording.
+"""
+
+# built-in imports
+import base64
+import collections
+import gzip
+import hashlib
+import http.client
+import io
+import json
+import os
+import re
+import threading
+import time
+from urllib import parse
+
+# third party imports
+import requests
+import urllib3
+
+# local imports
+from src import clock
+from src import utilities as util
+
+RECORD = "record"
+REPLAY = "replay"
+MODES = [RECORD, REPLAY]
+
+CASSETTE_FILE_SUFFIX = ".cassette.json.gz"
+CASSETTE_VERSION = 1
+
+# headers describing the wire encoding of the body, the cassette stores the
+# decoded body so these would be wrong on replay
+DROPPED_RESPONSE_HEADERS = ["content-encoding", "content-length", "transfer-encoding"]
+
+REDACTED = "REDACTED"
+# header values that carry credentials, compared lower case
+SECRET_HEADERS = ["authorization", "cookie", "set-cookie"]
+# name=value pairs of Cookie and (possibly folded) Set-Cookie headers, cookie
+# attributes such as Expires=Wed, 21 Oct ... are not matched
+COOKIE_PATTERN = re.compile(r"(^|;\s*)([^=;\s]+)=[^;]*")
+SET_COOKIE_PATTERN = re.compile(r"(^|,\s*)([^=;,\s]+)=[^;,]*")
+# JSON body fields and query parameters that carry credentials, compared
+# lower case
+SECRET_FIELDS = [
+    "access",
+    "access_token",
+    "accesstoken",
+    "api_key",
+    "apikey",
+    "appid",
+    "id_token",
+    "password",
+    "refresh",
+    "refresh_token",
+    "refreshtoken",
+    "sessionid",
+    "token",
+]
+
+# only one cassette can wrap HTTPAdapter.send at a time
+_active_cassette = None
+_active_cassette_lock = threading.Lock()
+
+
+class CassetteMissError(requests.exceptions.ConnectionError):
+    """Replay request that has no recorded response."""
+
+
+def get_cassette_path(name):
+    """
+    Return the cassette file path.
+
+    inputs:
+        name(str): cassette name.
+    returns:
+        (str): full file path under ./data.
+    """
+    return util.get_full_file_path(name + CASSETTE_FILE_SUFFIX)
+
+
+def redact_url(url):
+    """
+    Return a URL with the values of secret query parameters redacted.
+
+    inputs:
+        url(str): full request URL.
+    returns:
+        (str): URL safe to store.
+    """
+    parts = parse.urlsplit(url)
+    query = parse.parse_qsl(parts.query, keep_blank_values=True)
+    if not any(key.lower() in SECRET_FIELDS for key, _ in query):
+        return url
+    query = [
+        (key, REDACTED if key.lower() in SECRET_FIELDS else value)
+        for key, value in query
+    ]
+    return parse.urlunsplit(parts._replace(query=parse.urlencode(query)))
+
+
+def get_url_secrets(url):
+    """
+    Return the values of the secret query parameters of a URL.
+
+    Responses may echo them, e.g. in a redirect Location or its page.
+
+    inputs:
+        url(str): full request URL.
+    returns:
+        (list): non-empty secret values.
+    """
+    query = parse.parse_qsl(parse.urlsplit(url).query, keep_blank_values=True)
+    return [value for key, value in query if key.lower() in SECRET_FIELDS and value]
+
+
+def redact_header(key, value):
+    """
+    Return a header value with its credential redacted.
+
+    Cookie names and attributes, and the Authorization scheme, are kept so
+    the replayed exchange behaves like the recorded one.
+
+    inputs:
+        key(str): header name.
+        value(str): header value.
+    returns:
+        (str): value safe to store.
+    """
+    lower_key = key.lower()
+    if lower_key not in SECRET_HEADERS:
+        return value
+    if lower_key == "authorization":
+        scheme = value.split(" ", 1)[0] if " " in value else ""
+        return f"{scheme} {REDACTED}".strip()
+    pattern = SET_COOKIE_PATTERN if lower_key == "set-cookie" else COOKIE_PATTERN
+    return pattern.sub(rf"\1\2={REDACTED}", value)
+
+
+def redact_json(data):
+    """
+    Return JSON data with the values of secret fields redacted.
+
+    inputs:
+        data(object): decoded JSON.
+    returns:
+        (object): copy safe to store.
+    """
+    if isinstance(data, dict):
+        return {
+            key: (
+                REDACTED
+                if str(key).lower() in SECRET_FIELDS
+                and isinstance(value, (str, int, float))
+                and not isinstance(value, bool)
+                else redact_json(value)
+            )
+            for key, value in data.items()
+        }
+    if isinstance(data, list):
+        return [redact_json(value) for value in data]
+    return data
+
+
+def redact_body(body):
+    """
+    Return a JSON body with its secret fields redacted.
+
+    inputs:
+        body(str): decoded body.
+    returns:
+        (str): body safe to store, unchanged if not JSON or has no secrets.
+    """
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return body
+    redacted = redact_json(data)
+    if redacted == data:
+        return body
+    return json.dumps(redacted, separators=(",", ":"))
+
+
+def scrub(text, secrets):
+    """
+    Return text with every occurrence of secrets redacted.
+
+    inputs:
+        text(str): header value or body.
+        secrets(list): secret strings, see get_url_secrets().
+    returns:
+        (str): text safe to store.
+    """
+    for secret in secrets:
+        text = text.replace(secret, REDACTED).replace(parse.quote(secret), REDACTED)
+    return text
+
+
+def get_body_digest(body):
+    """
+    Return the SHA-256 digest of a redacted request body.
+
+    inputs:
+        body(str, bytes or None): prepared request body.
+    returns:
+        (str): hex digest, "" for no body.
+    """
+    if not body:
+        return ""
+    if isinstance(body, bytes):
+        try:
+            body = body.decode("utf-8")
+        except UnicodeDecodeError:
+            return hashlib.sha256(body).hexdigest()
+    elif not isinstance(body, str):
+        # streamed / file bodies are not read, match on method and url only
+        return ""
+    return hashlib.sha256(redact_body(body).encode("utf-8")).hexdigest()
+
+
+def get_request_key(method, url, body_digest):
+    """
+    Return the replay lookup key of a request.
+
+    inputs:
+        method(str): HTTP method.
+        url(str): full request URL.
+        body_digest(str): see get_body_digest().
+    returns:
+        (str): lookup key.
+    """
+    return f"{method} {url} {body_digest}"
+
+
+class Cassette:
+    """Record or replay the HTTP exchanges of the drivers."""
+
+    def __init__(self, name, mode, latency_scale=1.0):
+        """
+        Constructor.
+
+        inputs:
+            name(str): cassette name, file is ./data/<name>.cassette.json.gz.
+            mode(str): RECORD or REPLAY.
+            latency_scale(float): replay latency multiplier, 0 disables
+                                  replay delays.
+        """
+        if mode not in MODES:
+            raise ValueError(f"cassette mode '{mode}' is not one of {MODES}")
+        self.name = name
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self.path = get_cassette_path(name)
+        self.interactions = []
+        self.stats = collections.Counter()
+        self._replay_queues = {}
+        self._replay_by_url = {}
+        self._last_replayed = {}
+        self._lock = threading.Lock()
+        self._original_send = None
+        if mode == REPLAY:
+            self.load()
+
+    def __enter__(self):
+        """Start the cassette."""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Stop the cassette."""
+        self.stop()
+
+    def start(self):
+        """
+        Wrap HTTPAdapter.send with this cassette.
+
+        inputs:
+            None
+        returns:
+            None
+        """
+        global _active_cassette  # noqa W603
+        with _active_cassette_lock:
+            if _active_cassette is not None:
+                raise RuntimeError(
+                    f"cassette '{_active_cassette.name}' is already active"
+                )
+            _active_cassette = self
+            self._original_send = requests.adapters.HTTPAdapter.send
+            cassette = self
+
+            def send(adapter, request, *args, **kwargs):
+                return cassette.send(adapter, request, *args, **kwargs)
+
+            requests.adapters.HTTPAdapter.send = send
+        util.log_msg(
+            f"cassette '{self.name}' started in {self.mode} mode ({self.path})",
+            mode=util.BOTH_LOG,
+            func_name=1,
+        )
+
+    def stop(self):
+        """
+        Restore HTTPAdapter.send, saving the cassette in record mode.
+
+        inputs:
+            None
+        returns:
+            None
+        """
+        global _active_cassette  # noqa W603
+        with _active_cassette_lock:
+            if _active_cassette is not self:
+                return
+            requests.adapters.HTTPAdapter.send = self._original_send
+            _active_cassette = None
+        if self.mode == RECORD:
+            self.save()
+        util.log_msg(
+            f"cassette '{self.name}' stopped: {self.get_summary()}",
+            mode=util.BOTH_LOG,
+            func_name=1,
+        )
+
+    def send(self, adapter, request, *args, **kwargs):
+        """
+        Record or replay one request, replaces HTTPAdapter.send.
+
+        inputs:
+            adapter(HTTPAdapter): adapter the session selected.
+            request(PreparedRequest): outgoing request.
+            args, kwargs: HTTPAdapter.send arguments.
+        returns:
+            (requests.Response): real or replayed response.
+        """
+        if self.mode == RECORD:
+            return self._record(adapter, request, *args, **kwargs)
+        return self._replay(adapter, request)
+
+    def _record(self, adapter, request, *args, **kwargs):
+        """Make the real request and append it to the cassette."""
+        t_start = time.perf_counter()
+        response = self._original_send(adapter, request, *args, **kwargs)
+        content = response.content  # read the body inside the timed window
+        latency_sec = time.perf_counter() - t_start
+
+        raw_headers = getattr(response.raw, "headers", None) or response.headers
+        url_secrets = get_url_secrets(request.url)
+        headers = [
+            [key, scrub(redact_header(key, value), url_secrets)]
+            for key, value in raw_headers.items()
+            if key.lower() not in DROPPED_RESPONSE_HEADERS
+        ]
+        try:
+            body = scrub(redact_body(content.decode("utf-8")), url_secrets)
+            body_encoding = "utf-8"
+        except UnicodeDecodeError:
+            body = base64.b64encode(content).decode("ascii")
+            body_encoding = "base64"
+        interaction = {
+            "method": request.method,
+            "url": redact_url(request.url),
+            "body_sha256": get_body_digest(request.body),
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": headers,
+            "body": body,
+            "body_encoding": body_encoding,
+            "latency_sec": round(latency_sec, 6),
+        }
+        with self._lock:
+            self.interactions.append(interaction)
+            self.stats["requests"] += 1
+            self.stats["recorded"] += 1
+            self.stats["latency_sec"] += latency_sec
+        return response
+
+    def _replay(self, adapter, request):
+        """Return the next recorded response for the request."""
+        url = redact_url(request.url)
+        key = get_request_key(request.method, url, get_body_digest(request.body))
+        url_key = get_request_key(request.method, url, "")
+        with self._lock:
+            self.stats["requests"] += 1
+            replay_queues = self._replay_queues
+            if key not in replay_queues and url_key in self._replay_by_url:
+                # body differs from the recording, e.g. a new timestamp
+                replay_queues, key = self._replay_by_url, url_key
+                self.stats["body_mismatches"] += 1
+            if key not in replay_queues:
+                self.stats["misses"] += 1
+                raise CassetteMissError(
+                    f"cassette '{self.name}' has no recording for "
+                    f"{request.method} {request.url}",
+                    request=request,
+                )
+            queue = replay_queues[key]
+            if queue:
+                interaction = queue.popleft()
+                self._last_replayed[id(queue)] = interaction
+                self.stats["replayed"] += 1
+            else:
+                # recording exhausted, keep serving the last response
+                interaction = self._last_replayed[id(queue)]
+                self.stats["repeats"] += 1
+            latency_sec = interaction["latency_sec"] * self.latency_scale
+            self.stats["latency_sec"] += latency_sec
+
+        if latency_sec > 0:
+            clock.sleep(latency_sec)
+        return self._build_response(adapter, request, interaction)
+
+    @staticmethod
+    def _build_response(adapter, request, interaction):
+        """Return a requests.Response for a recorded interaction."""
+        if interaction["body_encoding"] == "base64":
+            content = base64.b64decode(interaction["body"])
+        else:
+            content = interaction["body"].encode("utf-8")
+        headers = urllib3.HTTPHeaderDict()
+        # http.client message so requests extracts Set-Cookie into the session
+        message = http.client.HTTPMessage()
+        for key, value in interaction["headers"]:
+            headers.add(key, value)
+            message[key] = value
+        raw = urllib3.HTTPResponse(
+            body=io.BytesIO(content),
+            headers=headers,
+            status=interaction["status"],
+            reason=interaction["reason"],
+            preload_content=False,
+            decode_content=False,
+            request_url=request.url,
+        )
+        raw._original_response = ReplayedHTTPResponse(message)
+        return adapter.build_response(request, raw)
+
+    def load(self):
+        """
+        Load the cassette file and index it for replay.
+
+        inputs:
+            None
+        returns:
+            None
+        """
+        with gzip.open(self.path, "rt", encoding="utf-8") as cassette_file:
+            cassette_data = json.load(cassette_file)
+        if cassette_data.get("version") != CASSETTE_VERSION:
+            raise ValueError(
+                f"cassette {self.path} version {cassette_data.get('version')} "
+                f"is not supported, expected {CASSETTE_VERSION}"
+            )
+        self.interactions = cassette_data["interactions"]
+        self._replay_queues = {}
+        self._replay_by_url = {}
+        for interaction in self.interactions:
+            key = get_request_key(
+                interaction["method"], interaction["url"], interaction["body_sha256"]
+            )
+            url_key = get_request_key(interaction["method"], interaction["url"], "")
+            self._replay_queues.setdefault(key, collections.deque()).append(
+                interaction
+            )
+            self._replay_by_url.setdefault(url_key, collections.deque()).append(
+                interaction
+            )
+
+    def save(self):
+        """
+        Write the recorded interactions to the cassette file.
+
+        inputs:
+            None
+        returns:
+            None
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._lock:
+            cassette_data = {
+                "version": CASSETTE_VERSION,
+                "name": self.name,
+                "interactions": list(self.interactions),
+            }
+        temp_path = self.path + ".tmp"
+        with gzip.open(temp_path, "wt", encoding="utf-8") as cassette_file:
+            json.dump(cassette_data, cassette_file, separators=(",", ":"))
+        os.replace(temp_path, self.path)
+
+    def get_summary(self):
+        """
+        Return request counts and total latency.
+
+        inputs:
+            None
+        returns:
+            (dict): stats counters, latency_sec rounded to ms.
+        """
+        with self._lock:
+            summary = dict(self.stats)
+        summary["latency_sec"] = round(summary.get("latency_sec", 0.0), 3)
+        return summary
+
+
+class ReplayedHTTPResponse:
+    """Minimal http.client response stand-in for cookie extraction."""
+
+    def __init__(self, message):
+        """
+        Constructor.
+
+        inputs:
+            message(http.client.HTTPMessage): response headers.
+        """
+        self.msg = message
+
+    def isclosed(self):
+        """Replayed responses have no connection."""
+        return True
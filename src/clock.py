@@ -0,0 +1,281 @@
+"""
+Injectable clock for polling, retry and timeout delays.
+
+Supervisor code calls clock.time(), clock.monotonic() and clock.sleep()
+instead of the time module so the time source can be swapped:
+
+  * SystemClock (default): real wall clock time.
+  * VirtualClock: simulated time.  Sleeping tasks are queued by wake time
+    and the clock jumps to the earliest wake time as soon as every
+    registered task is asleep, so a week of polling or a long retry
+    backoff sequence finishes as fast as the code between sleeps runs.
+
+Threads that sleep on a VirtualClock must be registered (add_task() before
+start, run_task() as the thread target) and a thread blocked waiting on
+other tasks (e.g. thread.join()) must do so inside idle(), otherwise the
+clock cannot tell that every task is asleep.
+
+wait() is an interruptible sleep: it returns early once a stop event is
+set, which lets supervision threads shut down without sitting out a poll
+period.
+"""
+
+# built-in imports
+import contextlib
+import heapq
+import threading
+import time as real_time
+
+# period a virtual clock wait checks its event, in real seconds
+EVENT_POLL_SEC = 0.05
+
+
+class SystemClock:
+    """Real time clock, thin wrapper over the time module."""
+
+    def time(self):
+        """Return wall clock time in seconds since the epoch."""
+        return real_time.time()
+
+    def monotonic(self):
+        """Return monotonic time in seconds."""
+        return real_time.monotonic()
+
+    def sleep(self, seconds):
+        """Block the calling thread for seconds."""
+        real_time.sleep(seconds)
+
+    def wait(self, event, seconds):
+        """
+        Block the calling thread for seconds or until event is set.
+
+        inputs:
+            event(threading.Event): stop event.
+            seconds(float): longest delay.
+        returns:
+            (bool): True if event is set.
+        """
+        if seconds <= 0:
+            return event.is_set()
+        return event.wait(seconds)
+
+    def add_task(self):
+        """Register a task, no-op for real time."""
+
+    def task_done(self):
+        """Unregister a task, no-op for real time."""
+
+    def idle(self):
+        """Return a context manager for blocking waits, no-op for real time."""
+        return contextlib.nullcontext()
+
+
+class VirtualClock:
+    """Simulated clock that advances instantly when every task is asleep."""
+
+    def __init__(self, start_time=None):
+        """
+        Constructor.
+
+        inputs:
+            start_time(float): initial epoch time, None for the current time.
+        """
+        self._now = real_time.time() if start_time is None else float(start_time)
+        self._start_time = self._now
+        self._cond = threading.Condition()
+        # the thread that creates the clock is the first task
+        self._active_tasks = 1
+        # heap of wake times of sleeping tasks
+        self._wake_times = []
+
+    def time(self):
+        """Return simulated time in seconds since the epoch."""
+        with self._cond:
+            return self._now
+
+    def monotonic(self):
+        """Return simulated seconds elapsed since the clock was created."""
+        with self._cond:
+            return self._now - self._start_time
+
+    def sleep(self, seconds):
+        """
+        Block the calling task until simulated time reaches now + seconds.
+
+        inputs:
+            seconds(float): simulated delay.
+        returns:
+            None
+        """
+        if seconds <= 0:
+            return
+        with self._cond:
+            wake_time = self._now + seconds
+            heapq.heappush(self._wake_times, wake_time)
+            self._advance_if_idle()
+            while self._now < wake_time:
+                self._cond.wait()
+
+    def wait(self, event, seconds):
+        """
+        Block the calling task for seconds of simulated time or until event
+        is set.
+
+        inputs:
+            event(threading.Event): stop event.
+            seconds(float): longest simulated delay.
+        returns:
+            (bool): True if event is set.
+        """
+        if seconds <= 0 or event.is_set():
+            return event.is_set()
+        with self._cond:
+            wake_time = self._now + seconds
+            heapq.heappush(self._wake_times, wake_time)
+            self._advance_if_idle()
+            while self._now < wake_time:
+                if event.is_set():
+                    # awake again, drop the pending wake time
+                    self._wake_times.remove(wake_time)
+                    heapq.heapify(self._wake_times)
+                    return True
+                # setting an event does not notify the clock, poll it
+                self._cond.wait(EVENT_POLL_SEC)
+        return event.is_set()
+
+    def add_task(self):
+        """Register a task, call before starting its thread."""
+        with self._cond:
+            self._active_tasks += 1
+
+    def task_done(self):
+        """Unregister the calling task, call when its thread finishes."""
+        with self._cond:
+            self._active_tasks -= 1
+            self._advance_if_idle()
+
+    @contextlib.contextmanager
+    def idle(self):
+        """Context manager marking the calling task as blocked on others."""
+        self.task_done()
+        try:
+            yield
+        finally:
+            self.add_task()
+
+    def _advance_if_idle(self):
+        """Jump to the earliest wake time if every task is asleep, lock held."""
+        if self._wake_times and len(self._wake_times) >= self._active_tasks:
+            self._now = max(self._now, self._wake_times[0])
+            while self._wake_times and self._wake_times[0] <= self._now:
+                heapq.heappop(self._wake_times)
+            self._cond.notify_all()
+
+
+# clock used by the module level functions
+_clock = SystemClock()
+
+
+def get_clock():
+    """
+    Return the active clock.
+
+    inputs:
+        None
+    returns:
+        (SystemClock or VirtualClock): active clock.
+    """
+    return _clock
+
+
+def set_clock(new_clock):
+    """
+    Replace the active clock.
+
+    inputs:
+        new_clock(SystemClock or VirtualClock): clock to use.
+    returns:
+        (SystemClock or VirtualClock): previous clock.
+    """
+    global _clock  # noqa W603
+    previous_clock = _clock
+    _clock = new_clock
+    return previous_clock
+
+
+@contextlib.contextmanager
+def use_clock(new_clock):
+    """
+    Context manager that activates a clock and restores the previous one.
+
+    inputs:
+        new_clock(SystemClock or VirtualClock): clock to use.
+    returns:
+        (SystemClock or VirtualClock): new_clock.
+    """
+    previous_clock = set_clock(new_clock)
+    try:
+        yield new_clock
+    finally:
+        set_clock(previous_clock)
+
+
+def time():
+    """Return the active clock's time in seconds since the epoch."""
+    return _clock.time()
+
+
+def monotonic():
+    """Return the active clock's monotonic time in seconds."""
+    return _clock.monotonic()
+
+
+def sleep(seconds):
+    """Sleep on the active clock."""
+    _clock.sleep(seconds)
+
+
+def wait(event, seconds):
+    """
+    Sleep on the active clock until event is set.
+
+    inputs:
+        event(threading.Event): stop event.
+        seconds(float): longest delay.
+    returns:
+        (bool): True if event is set, i.e. the sleep was cut short.
+    """
+    return _clock.wait(event, seconds)
+
+
+def add_task():
+    """Register a task on the active clock before starting its thread."""
+    _clock.add_task()
+
+
+def task_done():
+    """Unregister the calling task from the active clock."""
+    _clock.task_done()
+
+
+def idle():
+    """Return a context manager for blocking waits on other tasks."""
+    return _clock.idle()
+
+
+def run_task(func, *args, **kwargs):
+    """
+    Thread target that runs func and unregisters the task when it returns.
+
+    Call add_task() before starting the thread.
+
+    inputs:
+        func(callable): task body.
+        args, kwargs: func arguments.
+    returns:
+        func return value.
+    """
+    try:
+        return func(*args, **kwargs)
+    finally:
+        task_done()
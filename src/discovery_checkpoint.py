@@ -0,0 +1,253 @@
+"""
+Checkpoint of discovered thermostat topology for fast warm restarts.
+
+Connecting a zone starts with vendor discovery: the KumoCloud site and
+zone name mapping, the kumolocal local net probes, the Honeywell zone
+device ids.  Discovery results rarely change, so they are saved to
+./data/discovery_checkpoint.json with a fingerprint of the configuration
+they were discovered with:
+
+  * get_or_discover() returns a checkpoint whose fingerprint matches the
+    current configuration at once, without any vendor request,
+  * a checkpoint not validated for DISCOVERY_REVALIDATE_SEC, e.g. one
+    loaded from ./data at startup, is rediscovered in a background
+    thread, a changed topology is saved and used from the next connection,
+  * a missing checkpoint or one whose fingerprint differs, e.g. after a
+    config edit, is rediscovered before returning.
+
+A caller that finds a checkpoint wrong (e.g. a zone it does not list)
+calls invalidate(), so the next lookup rediscovers.
+"""
+
+# built-in imports
+import collections
+import hashlib
+import json
+import threading
+
+# local imports
+from src import clock
+from src import utilities as util
+
+DISCOVERY_REVALIDATE_SEC = 3600  # rediscover in the background after this long
+DISCOVERY_CHECKPOINT_FILE = "discovery_checkpoint.json"  # under ./data
+CHECKPOINT_VERSION = 1  # bump when a topology format changes
+
+
+def get_fingerprint(config):
+    """
+    Return the fingerprint of a discovery configuration.
+
+    inputs:
+        config(dict): JSON serializable inputs of a discovery, e.g. the
+                      account name and configured zones.
+    returns:
+        (str): hex digest.
+    """
+    config_json = json.dumps(
+        [CHECKPOINT_VERSION, config], sort_keys=True, default=str
+    )
+    return hashlib.sha256(config_json.encode("utf-8")).hexdigest()
+
+
+class DiscoveryCheckpoint:
+    """Discovered topologies keyed by vendor account, persisted to ./data."""
+
+    def __init__(self, revalidate_sec=DISCOVERY_REVALIDATE_SEC, persist=True):
+        """
+        Constructor.
+
+        inputs:
+            revalidate_sec(float): rediscover a checkpoint in the
+                                   background after this long.
+            persist(bool): load and save checkpoints.
+        """
+        self.revalidate_sec = revalidate_sec
+        self.persist = persist
+        self.stats = collections.Counter()
+        # key -> {"fingerprint": str, "topology": any}
+        self._entries = {}
+        # key -> clock.monotonic() of the last discovery in this process
+        self._validated_at = {}
+        # keys being rediscovered in the background
+        self._revalidating = set()
+        self._loaded = not persist
+        self._lock = threading.Lock()
+
+    def get_or_discover(self, key, config, discover_func):
+        """
+        Return the topology of key, discovering it if needed.
+
+        inputs:
+            key(str): checkpoint key, e.g. "<thermostat_type>:<account>".
+            config(dict): discovery inputs, see get_fingerprint().
+            discover_func(callable): returns the JSON serializable
+                                     topology, None if discovery failed.
+        returns:
+            (any): topology, None if discovery failed.
+        """
+        fingerprint = get_fingerprint(config)
+        topology, validated_at = self._get_entry(key, fingerprint)
+        if topology is None:
+            self.stats["misses"] += 1
+            return self._discover(key, fingerprint, discover_func)
+        self.stats["hits"] += 1
+        if validated_at is None or (
+            clock.monotonic() - validated_at >= self.revalidate_sec
+        ):
+            self._start_revalidation(key, fingerprint, discover_func)
+        return topology
+
+    def invalidate(self, key):
+        """
+        Forget the checkpoint of key after it was found wrong.
+
+        inputs:
+            key(str): checkpoint key.
+        returns:
+            None
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+            self._validated_at.pop(key, None)
+            entries = dict(self._entries)
+        self.stats["invalidated"] += 1
+        if self.persist:
+            self._save(entries)
+
+    def _get_entry(self, key, fingerprint):
+        """Return (topology, validated_at) of a matching checkpoint."""
+        self._load()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry["fingerprint"] != fingerprint:
+                return None, None
+            return entry["topology"], self._validated_at.get(key)
+
+    def _discover(self, key, fingerprint, discover_func):
+        """Run discover_func and checkpoint its topology."""
+        self.stats["discoveries"] += 1
+        topology = discover_func()
+        if topology is None:
+            return None
+        # round trip through JSON so a cached topology has the same types,
+        # e.g. str dict keys, as one loaded from ./data
+        topology = json.loads(json.dumps(topology))
+        with self._lock:
+            previous = self._entries.get(key)
+            self._validated_at[key] = clock.monotonic()
+            changed = previous != {"fingerprint": fingerprint, "topology": topology}
+            if changed:
+                self._entries[key] = {"fingerprint": fingerprint, "topology": topology}
+            entries = dict(self._entries)
+        if changed and previous is not None:
+            self.stats["changed"] += 1
+            util.log_msg(
+                f"discovered topology of {key} changed, using it from the "
+                "next connection",
+                mode=util.BOTH_LOG,
+                func_name=1,
+            )
+        if changed and self.persist:
+            self._save(entries)
+        return topology
+
+    def _start_revalidation(self, key, fingerprint, discover_func):
+        """Rediscover key in a background thread unless already running."""
+        with self._lock:
+            if key in self._revalidating:
+                return
+            self._revalidating.add(key)
+        # register with the clock so a virtual clock waits for discovery
+        clock.add_task()
+        threading.Thread(
+            target=clock.run_task,
+            args=(self._revalidate, key, fingerprint, discover_func),
+            name=f"discovery_{key}",
+            daemon=True,
+        ).start()
+
+    def _revalidate(self, key, fingerprint, discover_func):
+        """Background thread body, keeps the checkpoint if discovery fails."""
+        try:
+            self.stats["revalidations"] += 1
+            self._discover(key, fingerprint, discover_func)
+        except Exception as ex:  # keep serving the checkpoint
+            util.log_msg(
+                f"background discovery of {key} failed, keeping the "
+                f"checkpoint: {ex}",
+                mode=util.BOTH_LOG,
+                func_name=1,
+            )
+        finally:
+            with self._lock:
+                self._revalidating.discard(key)
+
+    def _load(self):
+        """Load persisted checkpoints on first use."""
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+        file_path = util.get_full_file_path(DISCOVERY_CHECKPOINT_FILE)
+        try:
+            with open(file_path, "r", encoding="utf-8") as checkpoint_file:
+                entries = json.load(checkpoint_file)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as ex:
+            util.log_msg(
+                f"ignoring unreadable discovery checkpoint {file_path}: {ex}",
+                mode=util.BOTH_LOG,
+                func_name=1,
+            )
+            return
+        with self._lock:
+            for key, entry in entries.items():
+                if isinstance(entry, dict) and {"fingerprint", "topology"} <= set(
+                    entry
+                ):
+                    self._entries.setdefault(key, entry)
+
+    def _save(self, entries):
+        """Write checkpoints to ./data atomically."""
+        file_path = util.get_full_file_path(DISCOVERY_CHECKPOINT_FILE)
+        try:
+            util.write_json_atomic(file_path, entries, file_mode=0o644)
+        except OSError as ex:
+            util.log_msg(
+                f"failed to save discovery checkpoint {file_path}: {ex}",
+                mode=util.BOTH_LOG,
+                func_name=1,
+            )
+
+
+# process-wide checkpoint shared by all zones
+_checkpoint = DiscoveryCheckpoint()
+
+
+def get_checkpoint():
+    """
+    Return the process-wide discovery checkpoint.
+
+    inputs:
+        None
+    returns:
+        (DiscoveryCheckpoint): shared checkpoint.
+    """
+    return _checkpoint
+
+
+def reset_checkpoint(revalidate_sec=DISCOVERY_REVALIDATE_SEC, persist=True):
+    """
+    Replace the process-wide discovery checkpoint with an empty one.
+
+    inputs:
+        revalidate_sec(float): see DiscoveryCheckpoint.
+        persist(bool): see DiscoveryCheckpoint.
+    returns:
+        (DiscoveryCheckpoint): new checkpoint.
+    """
+    global _checkpoint  # noqa W603
+    _checkpoint = DiscoveryCheckpoint(revalidate_sec, persist)
+    return _checkpoint
@@ -0,0 +1,269 @@
+"""
+Host name resolution cache for thermostats on the local net.
+
+Local thermostats (e.g. the 3m50 zones in mmm_config.metadata) are found
+by host name, and .lan lookups through a home router can take seconds.
+Lookups go through a process-wide cache:
+
+  * a resolved address is reused for DNS_POSITIVE_TTL_SEC,
+  * a failed lookup is remembered for DNS_NEGATIVE_TTL_SEC so a missing
+    host does not stall every reconnect,
+  * the last address each host resolved to is saved to
+    ./data/dns_cache.json and, if the caller allows it, returned when DNS
+    is down.
+
+A caller whose connection to a cached address fails calls invalidate(),
+so the next lookup asks DNS again.  resolve_all() looks up several hosts
+concurrently, e.g. every configured zone at startup.
+"""
+
+# built-in imports
+import collections
+import concurrent.futures
+import json
+import socket
+import threading
+
+# local imports
+from src import clock
+from src import utilities as util
+
+DNS_POSITIVE_TTL_SEC = 3600  # reuse a resolved address this long
+DNS_NEGATIVE_TTL_SEC = 60  # remember a failed lookup this long
+DNS_MAX_WORKERS = 8  # concurrent lookups in resolve_all()
+DNS_CACHE_FILE = "dns_cache.json"  # last-known-good addresses under ./data
+
+
+class DnsCache:
+    """Forward and reverse lookups with positive and negative TTLs."""
+
+    def __init__(
+        self,
+        positive_ttl_sec=DNS_POSITIVE_TTL_SEC,
+        negative_ttl_sec=DNS_NEGATIVE_TTL_SEC,
+        persist=True,
+    ):
+        """
+        Constructor.
+
+        inputs:
+            positive_ttl_sec(float): lifetime of a successful lookup.
+            negative_ttl_sec(float): lifetime of a failed lookup.
+            persist(bool): load and save last-known-good addresses.
+        """
+        self.positive_ttl_sec = positive_ttl_sec
+        self.negative_ttl_sec = negative_ttl_sec
+        self.persist = persist
+        self.stats = collections.Counter()
+        # (kind, name) -> (value or None, expires_at on clock.monotonic())
+        self._entries = {}
+        # host name -> last address it resolved to
+        self._last_known_good = {}
+        self._loaded = not persist
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def resolve(self, host_name, use_last_known_good=False):
+        """
+        Return the IP address of a host name.
+
+        inputs:
+            host_name(str): host name.
+            use_last_known_good(bool): if the lookup fails return the last
+                                       address the host resolved to.
+        returns:
+            (str or None): IP address, None if not resolved.
+        """
+        ip_address = self._lookup("name", host_name, socket.gethostbyname)
+        if ip_address is None and use_last_known_good:
+            self._load()
+            with self._lock:
+                ip_address = self._last_known_good.get(host_name)
+            if ip_address is not None:
+                self.stats["last_known_good"] += 1
+                util.log_msg(
+                    f"DNS lookup of '{host_name}' failed, using last known "
+                    f"address {ip_address}",
+                    mode=util.BOTH_LOG,
+                    func_name=1,
+                )
+        return ip_address
+
+    def reverse(self, ip_address):
+        """
+        Return the host entry of an IP address.
+
+        inputs:
+            ip_address(str): IP address.
+        returns:
+            (tuple or None): (host name, aliases, addresses) as returned by
+                             socket.gethostbyaddr(), None if not resolved.
+        """
+        return self._lookup("addr", ip_address, socket.gethostbyaddr)
+
+    def resolve_all(self, host_names, max_workers=DNS_MAX_WORKERS):
+        """
+        Resolve several host names concurrently.
+
+        inputs:
+            host_names(list): host names.
+            max_workers(int): lookups run at once.
+        returns:
+            (dict): host name -> IP address or None.
+        """
+        addresses = {}
+        pending = []
+        for host_name in dict.fromkeys(host_names):
+            found, ip_address = self._get_entry(("name", host_name))
+            if found:
+                addresses[host_name] = ip_address
+            else:
+                pending.append(host_name)
+        if not pending:
+            return addresses
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, min(max_workers, len(pending))),
+            thread_name_prefix="dns_cache",
+        ) as executor:
+            addresses.update(zip(pending, executor.map(self.resolve, pending)))
+        return addresses
+
+    def invalidate(self, host_name):
+        """
+        Forget the cached address of a host after a connection to it failed.
+
+        inputs:
+            host_name(str): host name.
+        returns:
+            None
+        """
+        with self._lock:
+            self._entries.pop(("name", host_name), None)
+        self.stats["invalidated"] += 1
+
+    def _lookup(self, kind, name, lookup_func):
+        """
+        Return a cached lookup, running lookup_func once per expiry.
+
+        inputs:
+            kind(str): "name" for forward, "addr" for reverse lookups.
+            name(str): host name or IP address.
+            lookup_func(callable): lookup_func(name) returns the answer.
+        returns:
+            (str or None): answer, None if the lookup failed.
+        """
+        key = (kind, name)
+        found, value = self._get_entry(key)
+        if found:
+            return value
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            # another thread may have resolved it while we waited
+            found, value = self._get_entry(key)
+            if found:
+                return value
+            self.stats["lookups"] += 1
+            try:
+                value = lookup_func(name)
+            except (OSError, UnicodeError):
+                # socket.gaierror, socket.herror and malformed names
+                value = None
+                self.stats["failures"] += 1
+            ttl_sec = self.negative_ttl_sec if value is None else self.positive_ttl_sec
+            with self._lock:
+                self._entries[key] = (value, clock.monotonic() + ttl_sec)
+        if kind == "name" and value is not None:
+            self._remember(name, value)
+        return value
+
+    def _get_entry(self, key):
+        """Return (found, value) for an unexpired entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or clock.monotonic() >= entry[1]:
+                return False, None
+            self.stats["hits"] += 1
+            return True, entry[0]
+
+    def _remember(self, host_name, ip_address):
+        """Save a new last-known-good address."""
+        self._load()
+        with self._lock:
+            if self._last_known_good.get(host_name) == ip_address:
+                return
+            self._last_known_good[host_name] = ip_address
+            last_known_good = dict(self._last_known_good)
+        if self.persist:
+            self._save(last_known_good)
+
+    def _load(self):
+        """Load persisted last-known-good addresses on first use."""
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+        file_path = util.get_full_file_path(DNS_CACHE_FILE)
+        try:
+            with open(file_path, "r", encoding="utf-8") as cache_file:
+                last_known_good = json.load(cache_file)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as ex:
+            util.log_msg(
+                f"ignoring unreadable DNS cache {file_path}: {ex}",
+                mode=util.BOTH_LOG,
+                func_name=1,
+            )
+            return
+        with self._lock:
+            for host_name, ip_address in last_known_good.items():
+                self._last_known_good.setdefault(host_name, ip_address)
+
+    def _save(self, last_known_good):
+        """Write last-known-good addresses to ./data atomically."""
+        file_path = util.get_full_file_path(DNS_CACHE_FILE)
+        try:
+            util.write_json_atomic(file_path, last_known_good, file_mode=0o644)
+        except OSError as ex:
+            util.log_msg(
+                f"failed to save DNS cache {file_path}: {ex}",
+                mode=util.BOTH_LOG,
+                func_name=1,
+            )
+
+
+# process-wide cache shared by all zones
+_dns_cache = DnsCache()
+
+
+def get_dns_cache():
+    """
+    Return the process-wide DNS cache.
+
+    inputs:
+        None
+    returns:
+        (DnsCache): shared cache.
+    """
+    return _dns_cache
+
+
+def reset_dns_cache(
+    positive_ttl_sec=DNS_POSITIVE_TTL_SEC,
+    negative_ttl_sec=DNS_NEGATIVE_TTL_SEC,
+    persist=True,
+):
+    """
+    Replace the process-wide DNS cache with an empty one.
+
+    inputs:
+        positive_ttl_sec(float): see DnsCache.
+        negative_ttl_sec(float): see DnsCache.
+        persist(bool): see DnsCache.
+    returns:
+        (DnsCache): new cache.
+    """
+    global _dns_cache  # noqa W603
+    _dns_cache = DnsCache(positive_ttl_sec, negative_ttl_sec, persist)
+    return _dns_cache
@@ -1,6 +1,14 @@
 """
 Email notifications from gmail client.
 
+send_email_alert() delivers one message synchronously.  Alerts raised
+from the supervise and retry loops go through queue_email_alert() instead,
+which returns immediately; a background dispatcher thread delivers them
+over one persistent SMTP connection and coalesces alerts of the same type
+arriving within COALESCE_WINDOW_SEC into one digest email, so a retry
+storm across many zones sends one email rather than one per zone and
+trial.
+
 dependencies:
   environment variables must be setup:
   'GMAIL_USERNAME':  from address on gmail service
@@ -8,10 +16,16 @@ dependencies:
 """
 
 # built-in libraries
+import atexit
+import collections
+import datetime
 from email.mime.text import MIMEText
+import queue
 import smtplib
 import socket
 import sys
+import threading
+import time
 import traceback
 
 # local libraries
@@ -26,13 +40,224 @@ email_trace = (
     f"email sent from module '{module_name}' running on {host_name} ({host_ip})"
 )
 
+SMTP_SERVER_URL = "smtp.gmail.com"
+SMTP_SERVER_PORT = 465
+
+# alerts of one type queued within this window are sent as one digest
+COALESCE_WINDOW_SEC = 60.0
+# longest wait for pending digests to be sent on shutdown
+FLUSH_TIMEOUT_SEC = 30.0
+
+return_status_msg_dict = {
+    util.NO_ERROR: "no error",
+    util.CONNECTION_ERROR: ("connection error, verify SMTP address and port"),
+    util.AUTHORIZATION_ERROR: ("authorization error, verify username and password"),
+    util.EMAIL_SEND_ERROR: (
+        "email send error, verify SMTP protocol "
+        "is supported by the sending and "
+        "receiving addresses"
+    ),
+    util.ENVIRONMENT_ERROR: (
+        "failed to retrieve email credentials from environment variable"
+    ),
+}
+
+
+def _get_credentials(to_address, from_address, from_password):
+    """
+    Fill in missing addresses and password from env variables.
+
+    inputs:
+        to_address(str): to address or None.
+        from_address(str): from address or None.
+        from_password(str): from password or None.
+    returns:
+        tuple(status(int), to_address, from_address, from_password)
+    """
+    credentials = [to_address, from_address, from_password]
+    env_keys = ["GMAIL_USERNAME", "GMAIL_USERNAME", "GMAIL_PASSWORD"]
+    for idx, env_key in enumerate(env_keys):
+        if not credentials[idx]:
+            buff = env.get_env_variable(env_key)
+            credentials[idx] = buff["value"]
+            if buff["status"] != util.NO_ERROR:
+                return (buff["status"], *credentials)
+    return (util.NO_ERROR, *credentials)
+
+
+def _build_message(to_address, from_address, subject, body):
+    """
+    Build the email message with the trace footer.
+
+    inputs:
+        to_address(str): to address.
+        from_address(str): from address.
+        subject(str): email subject text.
+        body(str): email body text.
+    returns:
+        (MIMEText): message.
+    """
+    body += f"\n\n{email_trace}"
+    msg = MIMEText(body)
+    msg["Subject"] = ["", "(unittest) "][util.unit_test_mode] + subject
+    msg["From"] = from_address
+    msg["To"] = to_address
+    return msg
+
+
+class SmtpConnection:
+    """Authenticated SMTP connection that reconnects when dropped."""
+
+    def __init__(
+        self,
+        from_address,
+        from_password,
+        server_url=SMTP_SERVER_URL,
+        server_port=SMTP_SERVER_PORT,
+    ):
+        """
+        Constructor.
+
+        inputs:
+            from_address(str): from gmail address, also the login.
+            from_password(str): password for from gmail address.
+            server_url(str): SMTP server URL.
+            server_port(int): SMTP server port number.
+        """
+        self.from_address = from_address
+        self.from_password = from_password
+        self.server_url = server_url
+        self.server_port = server_port
+        self.server = None
+        self.connect_count = 0
+
+    def connect(self):
+        """
+        Open and authenticate the connection.
+
+        inputs:
+            None
+        returns:
+            (int): status code, util.NO_ERROR on success.
+        """
+        try:
+            self.server = smtplib.SMTP_SSL(self.server_url, self.server_port)
+            util.log_msg(
+                "smtp connection successful",
+                mode=util.DEBUG_LOG + util.STDOUT_LOG,
+                func_name=1,
+            )
+        except (
+            ValueError,  # not sure if this exception will be raised here
+            OSError,  # on AzDO with bad port, also catches TimeoutError
+        ) as ex:
+            util.log_msg(
+                f"exception during smtp connection: {str(ex)}",
+                mode=util.BOTH_LOG,
+                func_name=1,
+            )
+            self.server = None
+            return util.CONNECTION_ERROR
+        self.connect_count += 1
+        self.server.ehlo()
+        try:
+            self.server.login(self.from_address, self.from_password)
+            util.log_msg(
+                "email account authorization for account "
+                f"{self.from_address} successful",
+                mode=util.DEBUG_LOG + util.STDOUT_LOG,
+                func_name=1,
+            )
+        except (
+            smtplib.SMTPHeloError,
+            smtplib.SMTPAuthenticationError,
+            smtplib.SMTPNotSupportedError,
+            smtplib.SMTPException,
+        ) as ex:
+            util.log_msg(traceback.format_exc(), mode=util.BOTH_LOG, func_name=1)
+            util.log_msg(
+                "exception during email account authorization for "
+                f"account {self.from_address}: {str(ex)}",
+                mode=util.BOTH_LOG,
+                func_name=1,
+            )
+            self.close()
+            return util.AUTHORIZATION_ERROR
+        return util.NO_ERROR
+
+    def send(self, to_address, msg):
+        """
+        Send a message, connecting or reconnecting once as needed.
+
+        inputs:
+            to_address(str): to address.
+            msg(MIMEText): message.
+        returns:
+            (int): status code, util.NO_ERROR on success.
+        """
+        for attempt in range(2):
+            if self.server is None:
+                status = self.connect()
+                if status != util.NO_ERROR:
+                    return status
+            try:
+                self.server.sendmail(self.from_address, to_address, msg.as_string())
+            except (smtplib.SMTPServerDisconnected, ConnectionError) as ex:
+                # server dropped an idle connection, reconnect and resend
+                util.log_msg(
+                    f"smtp connection lost during mail send: {str(ex)}",
+                    mode=util.DEBUG_LOG + util.STDOUT_LOG,
+                    func_name=1,
+                )
+                self.close()
+                if attempt == 0:
+                    continue
+                return util.CONNECTION_ERROR
+            except (
+                smtplib.SMTPHeloError,
+                smtplib.SMTPRecipientsRefused,
+                smtplib.SMTPSenderRefused,
+                smtplib.SMTPDataError,
+                smtplib.SMTPNotSupportedError,
+            ) as ex:
+                util.log_msg(
+                    f"exception during mail send: {str(ex)}",
+                    mode=util.BOTH_LOG,
+                    func_name=1,
+                )
+                self.close()
+                return util.EMAIL_SEND_ERROR
+            util.log_msg(
+                "mail send was successful",
+                mode=util.DEBUG_LOG + util.STDOUT_LOG,
+                func_name=1,
+            )
+            break
+        return util.NO_ERROR
+
+    def close(self):
+        """
+        Close the connection.
+
+        inputs:
+            None
+        returns:
+            None
+        """
+        if self.server is not None:
+            try:
+                self.server.close()
+            except OSError:
+                pass
+            self.server = None
+
 
 def send_email_alert(
     to_address=None,
     from_address=None,
     from_password=None,
-    server_url="smtp.gmail.com",
-    server_port=465,
+    server_url=SMTP_SERVER_URL,
+    server_port=SMTP_SERVER_PORT,
     subject="",
     body="",
 ):
@@ -54,20 +279,6 @@ def send_email_alert(
         tuple(status(int), msg(str)):  status or error code, 0 for no error
                                        and descriptive explanation.
     """
-    return_status_msg_dict = {
-        util.NO_ERROR: "no error",
-        util.CONNECTION_ERROR: ("connection error, verify SMTP address and port"),
-        util.AUTHORIZATION_ERROR: ("authorization error, verify username and password"),
-        util.EMAIL_SEND_ERROR: (
-            "email send error, verify SMTP protocol "
-            "is supported by the sending and "
-            "receiving addresses"
-        ),
-        util.ENVIRONMENT_ERROR: (
-            "failed to retrieve email credentials from environment variable"
-        ),
-    }
-
     # Skip email sending during unit tests to avoid environment variable errors
     if util.unit_test_mode:
         util.log_msg(
@@ -78,32 +289,14 @@ def send_email_alert(
         return (util.NO_ERROR, return_status_msg_dict[util.NO_ERROR])
 
     # default email addresses from env variables
-    if not to_address:
-        buff = env.get_env_variable("GMAIL_USERNAME")
-        to_address = buff["value"]
-        if buff["status"] != util.NO_ERROR:
-            return (buff["status"], return_status_msg_dict[buff["status"]])
-    if not from_address:
-        buff = env.get_env_variable("GMAIL_USERNAME")
-        from_address = buff["value"]
-        if buff["status"] != util.NO_ERROR:
-            return (buff["status"], return_status_msg_dict[buff["status"]])
-    if not from_password:
-        buff = env.get_env_variable("GMAIL_PASSWORD")
-        from_password = buff["value"]
-        if buff["status"] != util.NO_ERROR:
-            return (buff["status"], return_status_msg_dict[buff["status"]])
-
-    status = util.NO_ERROR  # default
-
-    # add trace
-    body += f"\n\n{email_trace}"
+    status, to_address, from_address, from_password = _get_credentials(
+        to_address, from_address, from_password
+    )
+    if status != util.NO_ERROR:
+        return (status, return_status_msg_dict[status])
 
     # build email message
-    msg = MIMEText(body)
-    msg["Subject"] = ["", "(unittest) "][util.unit_test_mode] + subject
-    msg["From"] = from_address
-    msg["To"] = to_address
+    msg = _build_message(to_address, from_address, subject, body)
 
     util.log_msg(
         f"message text={msg.as_string()}",
@@ -111,78 +304,257 @@ def send_email_alert(
         func_name=1,
     )
 
-    # Skip actual email sending during unit tests after all validation is complete
-    if util.unit_test_mode:
-        util.log_msg(
-            f"Unit test mode: Skipping email send - Subject: {subject}",
-            mode=util.DEBUG_LOG + util.STDOUT_LOG,
-            func_name=1,
-        )
-        return (util.NO_ERROR, return_status_msg_dict[util.NO_ERROR])
+    connection = SmtpConnection(from_address, from_password, server_url, server_port)
+    status = connection.send(to_address, msg)
+    connection.close()
+    if status == util.NO_ERROR:
+        util.log_msg("Email sent!", mode=util.DEBUG_LOG + util.STDOUT_LOG, func_name=1)
 
-    try:
-        server = smtplib.SMTP_SSL(server_url, server_port)
-        util.log_msg(
-            "smtp connection successful",
-            mode=util.DEBUG_LOG + util.STDOUT_LOG,
-            func_name=1,
-        )
-    except (
-        ValueError,  # not sure if this exception will be raised here
-        OSError,  # on AzDO with bad port, also catches TimeoutError
-    ) as ex:
-        util.log_msg(
-            f"exception during smtp connection: {str(ex)}",
-            mode=util.BOTH_LOG,
-            func_name=1,
-        )
-        return (util.CONNECTION_ERROR, return_status_msg_dict[status])
-    server.ehlo()
-    try:
-        server.login(from_address, from_password)
-        util.log_msg(
-            f"email account authorization for account {from_address} successful",
-            mode=util.DEBUG_LOG + util.STDOUT_LOG,
-            func_name=1,
-        )
-    except (
-        smtplib.SMTPHeloError,
-        smtplib.SMTPAuthenticationError,
-        smtplib.SMTPNotSupportedError,
-        smtplib.SMTPException,
-    ) as ex:
-        util.log_msg(traceback.format_exc(), mode=util.BOTH_LOG, func_name=1)
-        util.log_msg(
-            "exception during email account authorization for "
-            f"account {from_address}: {str(ex)}",
-            mode=util.BOTH_LOG,
-            func_name=1,
+    return (status, return_status_msg_dict[status])
+
+
+class EmailDispatcher:
+    """Background email delivery with alert coalescing."""
+
+    def __init__(self, window_sec=COALESCE_WINDOW_SEC, send_func=None):
+        """
+        Constructor.
+
+        inputs:
+            window_sec(float): coalescing window, 0 sends every alert.
+            send_func(callable): send_func(to_address, subject, body) ->
+                                 status, None sends over SMTP.
+        """
+        self.window_sec = window_sec
+        self.send_func = send_func or self._send_smtp
+        self.queue = queue.Queue()
+        self.stats = collections.Counter()
+        self.connection = None
+        # alert_type -> {"deadline": time, "to_address": str, "alerts": list}
+        self._pending = {}
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """
+        Start the dispatcher thread if it is not running.
+
+        inputs:
+            None
+        returns:
+            None
+        """
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="email_dispatcher", daemon=True
+                )
+                self._thread.start()
+
+    def submit(self, subject, body, zone=None, alert_type=None, to_address=None):
+        """
+        Queue an alert and return immediately.
+
+        inputs:
+            subject(str): email subject text.
+            body(str): email body text.
+            zone(str): zone label the alert is about, groups the digest.
+            alert_type(str): coalescing key, None uses the subject.
+            to_address(str): to address, None for the GMAIL_USERNAME default.
+        returns:
+            None
+        """
+        self.start()
+        with self._lock:
+            self.stats["queued"] += 1
+        self.queue.put(
+            {
+                "subject": subject,
+                "body": body,
+                "zone": zone,
+                "alert_type": alert_type or subject,
+                "to_address": to_address,
+                "time": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            }
         )
-        server.close()
-        return (util.AUTHORIZATION_ERROR, return_status_msg_dict[status])
-    try:
-        server.sendmail(from_address, to_address, msg.as_string())
-        util.log_msg(
-            "mail send was successful",
-            mode=util.DEBUG_LOG + util.STDOUT_LOG,
-            func_name=1,
+
+    def stop(self, timeout=FLUSH_TIMEOUT_SEC):
+        """
+        Send pending digests and stop the dispatcher thread.
+
+        inputs:
+            timeout(float): longest wait for the thread to finish.
+        returns:
+            None
+        """
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None and thread.is_alive():
+            self.queue.put(None)
+            thread.join(timeout=timeout)
+
+    def _run(self):
+        """Dispatcher thread body."""
+        while True:
+            try:
+                alert = self.queue.get(timeout=self._get_wait_sec())
+            except queue.Empty:
+                self._flush(force=False)
+                continue
+            if alert is None:
+                self._flush(force=True)
+                if self.connection is not None:
+                    self.connection.close()
+                return
+            self._add(alert)
+            self._flush(force=self.window_sec <= 0)
+
+    def _add(self, alert):
+        """Add an alert to the digest of its type."""
+        digest = self._pending.get(alert["alert_type"])
+        if digest is None:
+            self._pending[alert["alert_type"]] = {
+                "deadline": time.monotonic() + self.window_sec,
+                "to_address": alert["to_address"],
+                "alerts": [alert],
+            }
+        else:
+            digest["alerts"].append(alert)
+            self.stats["coalesced"] += 1
+
+    def _get_wait_sec(self):
+        """Return the time until the next digest is due, None if idle."""
+        if not self._pending:
+            return None
+        deadline = min(digest["deadline"] for digest in self._pending.values())
+        return max(0.0, deadline - time.monotonic())
+
+    def _flush(self, force):
+        """Send the digests whose window has closed, or all if force."""
+        now = time.monotonic()
+        for alert_type in list(self._pending):
+            digest = self._pending[alert_type]
+            if force or digest["deadline"] <= now:
+                del self._pending[alert_type]
+                subject, body = build_digest(digest["alerts"])
+                try:
+                    status = self.send_func(digest["to_address"], subject, body)
+                except Exception:  # pylint: disable=broad-except
+                    # never let a mail failure kill the dispatcher
+                    util.log_msg(traceback.format_exc(), mode=util.BOTH_LOG)
+                    status = util.EMAIL_SEND_ERROR
+                if status == util.NO_ERROR:
+                    self.stats["sent"] += 1
+                else:
+                    self.stats["send_errors"] += 1
+
+    def _send_smtp(self, to_address, subject, body):
+        """Send one email over the persistent SMTP connection."""
+        if util.unit_test_mode:
+            util.log_msg(
+                f"Unit test mode: Skipping email send - Subject: {subject}",
+                mode=util.DEBUG_LOG + util.STDOUT_LOG,
+                func_name=1,
+            )
+            return util.NO_ERROR
+        status, to_address, from_address, from_password = _get_credentials(
+            to_address, None, None
         )
-    except (
-        smtplib.SMTPHeloError,
-        smtplib.SMTPRecipientsRefused,
-        smtplib.SMTPSenderRefused,
-        smtplib.SMTPDataError,
-        smtplib.SMTPNotSupportedError,
-    ) as ex:
-        util.log_msg(
-            f"exception during mail send: {str(ex)}", mode=util.BOTH_LOG, func_name=1
+        if status != util.NO_ERROR:
+            util.log_msg(
+                f"email alert '{subject}' not sent: {return_status_msg_dict[status]}",
+                mode=util.BOTH_LOG,
+                func_name=1,
+            )
+            return status
+        if self.connection is None:
+            self.connection = SmtpConnection(from_address, from_password)
+        msg = _build_message(to_address, from_address, subject, body)
+        return self.connection.send(to_address, msg)
+
+
+def build_digest(alerts):
+    """
+    Return the subject and body of a digest of coalesced alerts.
+
+    inputs:
+        alerts(list): queued alert dicts in arrival order.
+    returns:
+        tuple(subject(str), body(str))
+    """
+    if len(alerts) == 1:
+        return alerts[0]["subject"], alerts[0]["body"]
+
+    # group by zone, keep the latest body of each zone
+    zones = {}
+    for alert in alerts:
+        zone_alerts = zones.setdefault(alert["zone"] or alert["subject"], [])
+        zone_alerts.append(alert)
+    subject = f"{alerts[-1]['subject']} (+{len(alerts) - 1} similar alerts)"
+    sections = [
+        f"{len(alerts)} alerts from {len(zones)} zone(s) between "
+        f"{alerts[0]['time']} and {alerts[-1]['time']}"
+    ]
+    for zone, zone_alerts in zones.items():
+        sections.append(
+            f"--- {zone}: {len(zone_alerts)} alert(s), last at "
+            f"{zone_alerts[-1]['time']}\n{zone_alerts[-1]['subject']}\n"
+            f"{zone_alerts[-1]['body']}"
         )
-        server.close()
-        return (util.EMAIL_SEND_ERROR, return_status_msg_dict[status])
-    server.close()
-    util.log_msg("Email sent!", mode=util.DEBUG_LOG + util.STDOUT_LOG, func_name=1)
+    return subject, "\n\n".join(sections)
 
-    return (status, return_status_msg_dict[status])
+
+# process-wide dispatcher used by queue_email_alert()
+_dispatcher = EmailDispatcher()
+
+
+def get_dispatcher():
+    """
+    Return the process-wide email dispatcher.
+
+    inputs:
+        None
+    returns:
+        (EmailDispatcher): dispatcher.
+    """
+    return _dispatcher
+
+
+def queue_email_alert(subject="", body="", zone=None, alert_type=None):
+    """
+    Queue an email alert for background delivery, returns immediately.
+
+    Alerts with the same alert_type within COALESCE_WINDOW_SEC are sent as
+    one digest grouped by zone.
+
+    inputs:
+        subject(str): email subject text.
+        body(str): email body text.
+        zone(str): zone label the alert is about.
+        alert_type(str): coalescing key, None uses the subject.
+    returns:
+        None
+    """
+    _dispatcher.submit(subject, body, zone=zone, alert_type=alert_type)
+
+
+def flush_email_alerts(timeout=FLUSH_TIMEOUT_SEC):
+    """
+    Send pending digests now and stop the dispatcher thread.
+
+    The dispatcher restarts on the next queued alert.
+
+    inputs:
+        timeout(float): longest wait for delivery.
+    returns:
+        None
+    """
+    _dispatcher.stop(timeout=timeout)
+
+
+# deliver pending digests when the process exits
+atexit.register(flush_email_alerts)
 
 
 if __name__ == "__main__":
@@ -3,10 +3,12 @@
 import os
 import pickle
 import random
-import time
+import tempfile
+import threading
 import traceback
 
 # local imports
+from src import clock
 from src import emulator_config
 from src import environment as env
 from src import thermostat_api as api
@@ -14,6 +16,100 @@ from src import thermostat_common as tc
 from src import utilities as util
 
 
+class FleetZoneModel:
+    """Seeded thermal model for one synthetic fleet zone."""
+
+    def __init__(self, zone, fleet_config):
+        """
+        Constructor, seed the RNG streams and starting temperature.
+
+        inputs:
+            zone(int): zone number.
+            fleet_config(dict): active fleet stanza, see emulator_config.
+        """
+        self.config = fleet_config
+        zone_seed = emulator_config.get_zone_seed(zone)
+        # separate streams so fault settings do not change the temp sequence
+        self.rng = random.Random(zone_seed)
+        self.fault_rng = random.Random(f"{zone_seed}:faults")
+        spread = float(self.config["start_temp_spread"])
+        self.temp = emulator_config.STARTING_TEMP + self.rng.uniform(-spread, spread)
+        self.readings = 0
+        self.next_override = self._schedule_override()
+
+    def _schedule_override(self):
+        """
+        Return the reading count of the next manual override.
+
+        inputs:
+            None
+        returns:
+            (int or None): reading count, None if overrides are disabled.
+        """
+        interval = int(self.config["override_interval"])
+        if interval <= 0:
+            return None
+        return self.readings + self.rng.randint(1, 2 * interval)
+
+    def inject_faults(self):
+        """
+        Apply the configured response latency and error rate.
+
+        inputs:
+            None
+        returns:
+            None
+        raises:
+            ConnectionError: on an injected error.
+        """
+        latency_ms = float(self.config["latency_ms"])
+        jitter_ms = float(self.config["latency_jitter_ms"])
+        if jitter_ms > 0:
+            latency_ms = self.fault_rng.gauss(latency_ms, jitter_ms)
+        if latency_ms > 0:
+            clock.sleep(latency_ms / 1000.0)
+        error_rate = float(self.config["error_rate"])
+        if error_rate > 0 and self.fault_rng.random() < error_rate:
+            raise ConnectionError("emulator fleet: injected response error")
+
+    def override_due(self) -> bool:
+        """
+        Return True if a scheduled manual override is due.
+
+        inputs:
+            None
+        returns:
+            (bool): True once per scheduled override.
+        """
+        if self.next_override is None or self.readings < self.next_override:
+            return False
+        self.next_override = self._schedule_override()
+        return True
+
+    def step(self, heating, cooling, heat_sp, cool_sp) -> float:
+        """
+        Advance the model by one reading.
+
+        inputs:
+            heating(bool): True if the zone is in a heating mode.
+            cooling(bool): True if the zone is in a cooling mode.
+            heat_sp(float): heat setpoint in °F.
+            cool_sp(float): cool setpoint in °F.
+        returns:
+            (float): modeled indoor temp in °F, without sensor noise.
+        """
+        dt_hr = float(self.config["step_minutes"]) / 60.0
+        drift = min(1.0, float(self.config["drift_per_hr"]) * dt_hr)
+        self.temp += (float(self.config["ambient_temp"]) - self.temp) * drift
+        response = float(self.config["hvac_deg_per_hr"]) * dt_hr
+        if heating and self.temp < heat_sp:
+            self.temp = min(heat_sp, self.temp + response)
+        elif cooling and self.temp > cool_sp:
+            self.temp = max(cool_sp, self.temp - response)
+        self.readings += 1
+        return self.temp
+
+
 class ThermostatClass(tc.ThermostatCommon):
     """Emulator thermostat functions."""
 
@@ -42,7 +138,10 @@ class ThermostatClass(tc.ThermostatCommon):
 
     def initialize_meta_data_dict(self):
         """Initialize the meta data dict"""
-        # add zone keys
+        # add zone keys, fleet mode only needs this zone
+        if emulator_config.is_fleet_mode():
+            self.meta_data_dict[self.zone_name] = {}
+            return
         for key in emulator_config.supported_configs["zones"]:
             self.meta_data_dict[key] = {}
 
@@ -151,7 +250,7 @@ class ThermostatZone(tc.ThermostatCommonZone):
 
         # server data cache expiration parameters
         self.fetch_interval_sec = 30  # age of server data before refresh
-        self.last_fetch_time = time.time() - 2 * self.fetch_interval_sec
+        self.last_fetch_time = clock.time() - 2 * self.fetch_interval_sec
 
         # switch config for this thermostat, numbers are unique and arbitrary
         self.system_switch_position[tc.ThermostatCommonZone.OFF_MODE] = 0
@@ -174,6 +273,16 @@ class ThermostatZone(tc.ThermostatCommonZone):
         self.deviation_file_path = util.get_full_file_path(
             f"emulator_deviation_zone_{self.device_id}.pkl"
         )
+        # in-memory copy of the deviation file, reloaded when file changes
+        self._deviation_data = {}
+        self._deviation_file_stamp = None
+        self._deviation_lock = threading.RLock()
+
+        # seeded noise so runs are reproducible, fleet zones add a thermal model
+        self._rng = random.Random(emulator_config.get_zone_seed(self.device_id))
+        self.fleet_model = None
+        if emulator_config.is_fleet_mode():
+            self.fleet_model = FleetZoneModel(self.device_id, emulator_config.fleet)
 
         self.initialize_meta_data_dict()
 
@@ -247,14 +356,60 @@ class ThermostatZone(tc.ThermostatCommonZone):
 
         # Normal behavior if no deviation data
         self.refresh_zone_info()
+        if self.fleet_model is not None:
+            return self._get_fleet_display_temp()
         temp = self.get_parameter("display_temp")
         if temp is None:
             return 0.0
-        return temp + random.uniform(
+        return temp + self._rng.uniform(
             -emulator_config.NORMAL_TEMP_VARIATION,
             emulator_config.NORMAL_TEMP_VARIATION,
         )
 
+    def _get_fleet_display_temp(self) -> float:
+        """
+        Advance the fleet thermal model and return Indoor Temp in °F
+        with gaussian sensor noise.
+
+        inputs:
+            None
+        returns:
+            (float): indoor temp in °F.
+        """
+        self.fleet_model.inject_faults()
+        if self.fleet_model.override_due():
+            self._apply_manual_override()
+        temp = self.fleet_model.step(
+            heating=bool(self.is_heat_mode() or self.is_auto_mode()),
+            cooling=bool(self.is_cool_mode() or self.is_auto_mode()),
+            heat_sp=self.get_heat_setpoint_raw(),
+            cool_sp=self.get_cool_setpoint_raw(),
+        )
+        self.set_parameter("display_temp", temp)
+        return temp + self._rng.gauss(0.0, float(self.fleet_model.config["temp_noise"]))
+
+    def _apply_manual_override(self) -> None:
+        """
+        Simulate an occupant bumping the setpoints past the schedule.
+
+        inputs:
+            None
+        returns:
+            None
+        """
+        override_deg = float(self.fleet_model.config["override_deg"])
+        heat_sp = int(self.get_schedule_heat_sp() + override_deg)
+        cool_sp = int(self.get_schedule_cool_sp() - override_deg)
+        self.set_heat_setpoint(heat_sp)
+        self.set_cool_setpoint(cool_sp)
+        if self.verbose:
+            util.log_msg(
+                f"{self.zone_name}: manual override, heat setpoint={heat_sp}, "
+                f"cool setpoint={cool_sp}",
+                mode=util.BOTH_LOG,
+                func_name=1,
+            )
+
     def get_display_humidity(self) -> float | None:
         """
         Refresh the cached zone information and return IndoorHumidity
@@ -277,7 +432,10 @@ class ThermostatZone(tc.ThermostatCommonZone):
         humidity = self.get_parameter("display_humidity")
         if humidity is None:
             return 0.0
-        return humidity + random.uniform(
+        if self.fleet_model is not None:
+            noise = float(self.fleet_model.config["humidity_noise"])
+            return humidity + self._rng.gauss(0.0, noise)
+        return humidity + self._rng.uniform(
             -emulator_config.NORMAL_HUMIDITY_VARIATION,
             emulator_config.NORMAL_HUMIDITY_VARIATION,
         )
@@ -634,6 +792,78 @@ class ThermostatZone(tc.ThermostatCommonZone):
         """
         self.set_parameter("cool_setpoint", temp)
 
+    def _get_deviation_file_stamp(self):
+        """
+        Return a stamp that changes whenever the deviation file is replaced.
+
+        inputs:
+            None
+        returns:
+            (tuple, None): (mtime_ns, size, inode), None if file is missing.
+        """
+        try:
+            stat_result = os.stat(self.deviation_file_path)
+        except FileNotFoundError:
+            return None
+        return (stat_result.st_mtime_ns, stat_result.st_size, stat_result.st_ino)
+
+    def _load_deviation_data(self) -> dict:
+        """
+        Return the deviation data, reloading the file only if it changed.
+
+        The pickle is only re-read when the file's mtime, size or inode
+        differs from the cached copy, so polling costs one stat() call.
+
+        inputs:
+            None
+        returns:
+            (dict): deviation data, empty if file doesn't exist.
+        """
+        with self._deviation_lock:
+            stamp = self._get_deviation_file_stamp()
+            if stamp is None:
+                self._deviation_data = {}
+            elif stamp != self._deviation_file_stamp:
+                try:
+                    with open(self.deviation_file_path, "rb") as handle:
+                        self._deviation_data = pickle.load(handle)
+                except (pickle.PickleError, EOFError, FileNotFoundError):
+                    self._deviation_data = {}
+            self._deviation_file_stamp = stamp
+            return self._deviation_data
+
+    def _write_deviation_data(self, deviation_data: dict) -> None:
+        """
+        Atomically write deviation data and update the in-memory copy.
+
+        Data is written to a temp file in the same folder and renamed over
+        the deviation file so readers never see a half-written pickle.
+
+        inputs:
+            deviation_data(dict): deviation data to persist.
+        returns:
+            None
+        """
+        with self._deviation_lock:
+            folder = os.path.dirname(self.deviation_file_path) or "."
+            if not os.path.exists(folder):
+                os.makedirs(folder)
+            file_descriptor, temp_path = tempfile.mkstemp(
+                prefix=os.path.basename(self.deviation_file_path) + ".",
+                suffix=".tmp",
+                dir=folder,
+            )
+            try:
+                with os.fdopen(file_descriptor, "wb") as handle:
+                    pickle.dump(deviation_data, handle)
+                os.replace(temp_path, self.deviation_file_path)
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+            self._deviation_data = deviation_data
+            self._deviation_file_stamp = self._get_deviation_file_stamp()
+
     def create_deviation_file(self) -> None:
         """
         Create an empty deviation file for this thermostat zone.
@@ -643,9 +873,7 @@ class ThermostatZone(tc.ThermostatCommonZone):
         returns:
             None
         """
-        deviation_data = {}
-        with open(self.deviation_file_path, "wb") as handle:
-            pickle.dump(deviation_data, handle)
+        self._write_deviation_data({})
         if self.verbose:
             util.log_msg(
                 f"Created deviation file: {self.deviation_file_path}",
@@ -663,21 +891,10 @@ class ThermostatZone(tc.ThermostatCommonZone):
         returns:
             None
         """
-        # Read existing deviation data or create empty dict
-        deviation_data = {}
-        if os.path.exists(self.deviation_file_path):
-            try:
-                with open(self.deviation_file_path, "rb") as handle:
-                    deviation_data = pickle.load(handle)
-            except (pickle.PickleError, EOFError):
-                deviation_data = {}
-
-        # Update the value
+        # copy so the cached dict is never mutated before the write succeeds
+        deviation_data = dict(self._load_deviation_data())
         deviation_data[key] = value
-
-        # Write back to file
-        with open(self.deviation_file_path, "wb") as handle:
-            pickle.dump(deviation_data, handle)
+        self._write_deviation_data(deviation_data)
 
         if self.verbose:
             util.log_msg(
@@ -696,15 +913,7 @@ class ThermostatZone(tc.ThermostatCommonZone):
         returns:
             deviation value or default_val
         """
-        if not os.path.exists(self.deviation_file_path):
-            return default_val
-
-        try:
-            with open(self.deviation_file_path, "rb") as handle:
-                deviation_data = pickle.load(handle)
-                return deviation_data.get(key, default_val)
-        except (pickle.PickleError, EOFError):
-            return default_val
+        return self._load_deviation_data().get(key, default_val)
 
     def has_deviation_data(self, key: str = None) -> bool:  # type: ignore[assignment]
         """
@@ -716,18 +925,10 @@ class ThermostatZone(tc.ThermostatCommonZone):
         returns:
             (bool): True if deviation data exists
         """
-        if not os.path.exists(self.deviation_file_path):
-            return False
-
+        deviation_data = self._load_deviation_data()
         if key is None:
-            return True
-
-        try:
-            with open(self.deviation_file_path, "rb") as handle:
-                deviation_data = pickle.load(handle)
-                return key in deviation_data
-        except (pickle.PickleError, EOFError):
-            return False
+            return self._deviation_file_stamp is not None
+        return key in deviation_data
 
     def clear_deviation_data(self) -> None:
         """
@@ -738,14 +939,18 @@ class ThermostatZone(tc.ThermostatCommonZone):
         returns:
             None
         """
-        if os.path.exists(self.deviation_file_path):
+        with self._deviation_lock:
+            self._deviation_data = {}
+            self._deviation_file_stamp = None
+            if not os.path.exists(self.deviation_file_path):
+                return
             os.remove(self.deviation_file_path)
-            if self.verbose:
-                util.log_msg(
-                    f"Cleared deviation file: {self.deviation_file_path}",
-                    mode=util.BOTH_LOG,
-                    func_name=1,
-                )
+        if self.verbose:
+            util.log_msg(
+                f"Cleared deviation file: {self.deviation_file_path}",
+                mode=util.BOTH_LOG,
+                func_name=1,
+            )
 
     def refresh_zone_info(self, force_refresh=False):
         """
@@ -756,7 +961,7 @@ class ThermostatZone(tc.ThermostatCommonZone):
                                   regardless of the fetch interval. Default is False.
         """
 
-        now_time = time.time()
+        now_time = clock.time()
         # refresh if past expiration date or force_refresh option
         if force_refresh or (
             now_time >= (self.last_fetch_time + self.fetch_interval_sec)
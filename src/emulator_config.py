@@ -2,6 +2,9 @@
 emulator thermostat config file.
 """
 
+# built-in imports
+import contextlib
+
 ALIAS = "emulator"
 
 # constants
@@ -50,6 +53,126 @@ def get_available_zones():
     return supported_configs["zones"]
 
 
+# synthetic fleet mode, generates many zones from one config stanza.
+# keys in a site config "fleet" stanza override these defaults.
+fleet_defaults = {
+    "zones": 1000,  # number of synthetic zones, numbered from 0
+    "seed": 0,  # base seed, each zone derives its own RNG stream
+    "ambient_temp": 60.0,  # temperature zones drift toward with HVAC idle
+    "start_temp_spread": 4.0,  # starting temp is STARTING_TEMP +/- this
+    "drift_per_hr": 0.1,  # fraction of gap to ambient closed per hour
+    "hvac_deg_per_hr": 8.0,  # heat/cool response toward setpoint
+    "step_minutes": 10.0,  # simulated time per temperature reading
+    "temp_noise": 0.2,  # gaussian sensor noise std dev in °F
+    "humidity_noise": 1.0,  # gaussian sensor noise std dev in %RH
+    "latency_ms": 0.0,  # injected response latency per reading
+    "latency_jitter_ms": 0.0,  # gaussian std dev of injected latency
+    "error_rate": 0.0,  # probability a reading raises ConnectionError
+    "override_interval": 0,  # mean readings between manual overrides, 0=off
+    "override_deg": 4.0,  # setpoint bump applied by a manual override
+}
+
+# active fleet stanza, empty when fleet mode is disabled
+fleet = {}
+
+# zones available when fleet mode is disabled
+_default_zones = list(supported_configs["zones"])
+
+
+def get_fleet_config(fleet_stanza=None):
+    """
+    Return a validated fleet config without enabling fleet mode.
+
+    inputs:
+        fleet_stanza(dict): overrides for fleet_defaults, None for defaults.
+    returns:
+        (dict) fleet_defaults updated with fleet_stanza.
+    """
+    fleet_stanza = fleet_stanza or {}
+    unknown_keys = set(fleet_stanza) - set(fleet_defaults)
+    if unknown_keys:
+        raise ValueError(f"unknown fleet config keys: {sorted(unknown_keys)}")
+    fleet_config = dict(fleet_defaults, **fleet_stanza)
+    if int(fleet_config["zones"]) < 1:
+        raise ValueError(f"fleet zones must be >= 1, got {fleet_config['zones']}")
+    return fleet_config
+
+
+def enable_fleet_mode(fleet_stanza=None):
+    """
+    Enable synthetic fleet mode.
+
+    inputs:
+        fleet_stanza(dict): overrides for fleet_defaults, None for defaults.
+    returns:
+        (list) fleet zone numbers.
+    """
+    fleet_config = get_fleet_config(fleet_stanza)
+    fleet.clear()
+    fleet.update(fleet_config)
+    supported_configs["zones"] = list(range(int(fleet["zones"])))
+    return supported_configs["zones"]
+
+
+@contextlib.contextmanager
+def fleet_mode(fleet_stanza=None):
+    """
+    Enable synthetic fleet mode for the duration of a with block.
+
+    The previous fleet mode state is restored on exit.
+
+    inputs:
+        fleet_stanza(dict): overrides for fleet_defaults, None for defaults.
+    returns:
+        (contextmanager): yields the fleet zone numbers.
+    """
+    previous_fleet = dict(fleet)
+    previous_zones = list(supported_configs["zones"])
+    try:
+        yield enable_fleet_mode(fleet_stanza)
+    finally:
+        fleet.clear()
+        fleet.update(previous_fleet)
+        supported_configs["zones"] = previous_zones
+
+
+def disable_fleet_mode():
+    """
+    Disable synthetic fleet mode and restore the default zones.
+
+    inputs:
+        None.
+    returns:
+        None.
+    """
+    fleet.clear()
+    supported_configs["zones"] = list(_default_zones)
+
+
+def is_fleet_mode():
+    """
+    Return True if synthetic fleet mode is enabled.
+
+    inputs:
+        None.
+    returns:
+        (bool) fleet mode state.
+    """
+    return bool(fleet)
+
+
+def get_zone_seed(zone):
+    """
+    Return the deterministic RNG seed for a fleet zone.
+
+    inputs:
+        zone(int): zone number.
+    returns:
+        (int) seed, unique per (fleet seed, zone) pair.
+    """
+    return int(fleet.get("seed", fleet_defaults["seed"])) * 1000003 + int(zone)
+
+
 default_zone = supported_configs["zones"][0]
 default_zone_name = ALIAS + "_" + str(default_zone)
 
@@ -171,6 +171,31 @@ def set_env_variable(key, val):
     os.environ[key] = str(val)
 
 
+def get_base_url(env_key, default_url):
+    """
+    Return a vendor base URL, honoring an env variable override.
+
+    The override points a driver at a local stand-in server, see
+    tests/fake_servers.
+
+    inputs:
+        env_key(str): env variable holding the override URL.
+        default_url(str): vendor base URL used when no override is set.
+    returns:
+        (str): base URL without a trailing slash.
+    """
+    file_env_vars = _read_supervisor_env_file() or {}
+    override_url = os.environ.get(env_key) or file_env_vars.get(env_key)
+    if override_url:
+        util.log_msg(
+            f"using base URL override {env_key}={override_url}",
+            mode=util.DEBUG_LOG,
+            func_name=1,
+        )
+        return override_url.strip().rstrip("/")
+    return default_url
+
+
 def load_all_env_variables():
     """
     Load all environment variables into a dictionary.
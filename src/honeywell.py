@@ -6,23 +6,30 @@ https://pypi.org/project/pyhtcc/
 """
 
 # built-in imports
+import copy
 import http.client
 import logging
 import os
 import pprint
-import time
+import urllib.parse
 
 # third-party imports
+import requests
 import requests.exceptions
 import urllib3.exceptions
 
 # local imports
+from src import clock
+from src import discovery_checkpoint
 from src import email_notification
 from src import environment as env
 from src import honeywell_config
+from src import request_governor
+from src import session_store
 from src import thermostat_api as api
 from src import thermostat_common as tc
 from src import utilities as util
+from src import zone_state as zs
 
 # honeywell import
 HONEYWELL_DEBUG = False  # debug uses local pyhtcc repo instead of pkg
@@ -34,6 +41,8 @@ if HONEYWELL_DEBUG and not env.is_azure_environment():
 else:
     import pyhtcc  # noqa E402, from path / site packages
 
+UI_DATA = ("latestData", "uiData")  # key path of the TCC zone settings
+
 
 class SupervisorLogHandler(logging.Handler):
     """Custom logging handler to redirect pyhtcc logs to supervisor logging."""
@@ -89,6 +98,12 @@ class ThermostatClass(pyhtcc.PyHTCC, tc.ThermostatCommon):  # type: ignore[name-
             self.TCC_PASSWORD_KEY, "<" + self.TCC_PASSWORD_KEY + api.KEY_MISSING_SUFFIX
         )
 
+        # request budget shared by every zone logged into this account,
+        # enforced by the adapter mounted on each pyhtcc session
+        self.request_governor = request_governor.get_governor(
+            honeywell_config.ALIAS, self.tcc_uname, honeywell_config.REQUEST_BUDGET
+        )
+
         # construct the superclass
         # call both parent class __init__
         self.args = [self.tcc_uname, self.tcc_pwd]
@@ -106,8 +121,165 @@ class ThermostatClass(pyhtcc.PyHTCC, tc.ThermostatCommon):  # type: ignore[name-
         self.zone_name = int(zone)
         self.device_id = self.get_target_zone_id(self.zone_name)
 
+    @property
+    def session(self):
+        """Return the requests session created in pyhtcc."""
+        return self._session
+
+    @session.setter
+    def session(self, new_session):
+        """
+        Store the requests session created in pyhtcc.
+
+        pyhtcc creates a new session on each login, mount the request
+        budget adapter (and base URL override) on it before pyhtcc sends
+        its first request.
+
+        inputs:
+            new_session(requests.Session): session or None.
+        returns:
+            None
+        """
+        base_url = env.get_base_url(
+            honeywell_config.BASE_URL_ENV_KEY, honeywell_config.BASE_URL
+        )
+        governor = getattr(self, "request_governor", None)
+        if new_session is not None and base_url != honeywell_config.BASE_URL:
+            new_session.mount(
+                honeywell_config.BASE_URL,
+                BaseUrlHTTPAdapter(
+                    honeywell_config.BASE_URL, base_url, governor=governor
+                ),
+            )
+        elif new_session is not None and governor is not None:
+            # pyhtcc sets no timeouts, keep it that way
+            new_session.mount(
+                honeywell_config.BASE_URL,
+                TimeoutHTTPAdapter(timeout=None, governor=governor),
+            )
+        self._session = new_session
+
+    def _get_session_key(self) -> str:
+        """Return the session store key of this account."""
+        return f"{honeywell_config.ALIAS}:{self.tcc_uname}"
+
+    def authenticate(self) -> None:
+        """
+        Log in to TCC, resuming the saved session of this account if valid.
+
+        Overrides pyhtcc, which logs in again on every connection.
+
+        inputs:
+            None
+        returns:
+            None
+        """
+        if self._resume_session():
+            return
+        pyhtcc.PyHTCC.authenticate(self)  # type: ignore[attr-defined]
+        self._save_session()
+
+    def _resume_session(self) -> bool:
+        """
+        Restore the saved TCC session and probe that it is still logged in.
+
+        inputs:
+            None
+        returns:
+            (bool): True if the saved session is valid.
+        """
+        store = session_store.get_store()
+        state = store.load(self._get_session_key(), self.tcc_pwd)
+        if state is None:
+            return False
+        new_session = self._create_session()
+        for cookie in state.get("cookies", []):
+            new_session.cookies.set(**cookie)
+        self.session = new_session
+        self._locationId = state.get("location_id")
+
+        # cheapest logged in request, page 1 of the zone list
+        try:
+            valid = bool(self._post_zone_list_data(1))
+        except (
+            pyhtcc.UnauthorizedError,  # type: ignore[attr-defined]
+            requests.exceptions.RequestException,
+        ) as ex:
+            util.log_msg(
+                f"saved TCC session probe failed: {ex}",
+                mode=util.DEBUG_LOG + util.DATA_LOG,
+                func_name=1,
+            )
+            valid = False
+        if valid:
+            util.log_msg(
+                f"resumed saved TCC session of {self.tcc_uname}",
+                mode=util.DEBUG_LOG + util.DATA_LOG,
+                func_name=1,
+            )
+            return True
+        util.log_msg(
+            f"saved TCC session of {self.tcc_uname} expired, logging in",
+            mode=util.BOTH_LOG,
+            func_name=1,
+        )
+        store.discard(self._get_session_key())
+        self.close()
+        self._locationId = None
+        return False
+
+    def _create_session(self, cookies=None):
+        """
+        Return a new TCC session with the auth of a pyhtcc login.
+
+        inputs:
+            cookies(RequestsCookieJar): cookies of a logged in session, or None.
+        returns:
+            (requests.Session): new session.
+        """
+        new_session = requests.session()
+        new_session.auth = (
+            self.tcc_uname.encode("utf-8"),
+            self.tcc_pwd.encode("utf-8"),
+        )
+        if cookies is not None:
+            new_session.cookies.update(cookies)
+        return new_session
+
+    def _save_session(self) -> None:
+        """
+        Save the TCC session of a successful login, see session_store.
+
+        inputs:
+            None
+        returns:
+            None
+        """
+        if self.session is None or self._locationId is None:
+            return
+        cookies = [
+            {
+                "name": cookie.name,
+                "value": cookie.value,
+                "domain": cookie.domain,
+                "path": cookie.path,
+                "secure": cookie.secure,
+                "expires": cookie.expires,
+            }
+            for cookie in self.session.cookies
+        ]
+        session_store.get_store().save(
+            self._get_session_key(),
+            self.tcc_pwd,
+            {"cookies": cookies, "location_id": self._locationId},
+        )
+
     def close(self):
-        """Explicitly close the session created in pyhtcc."""
+        """
+        Explicitly close the session created in pyhtcc.
+
+        The saved session is kept for the next connection.
+        """
         session = getattr(self, "session", None)
         if session is not None:
             session.close()
@@ -150,19 +322,66 @@ class ThermostatClass(pyhtcc.PyHTCC, tc.ThermostatCommon):  # type: ignore[name-
         # Prevent propagation to avoid duplicate messages
         pyhtcc_logger.propagate = False
 
+    def _get_discovery_key(self) -> str:
+        """Return the discovery checkpoint key of this account."""
+        return f"{honeywell_config.ALIAS}:{self.tcc_uname}"
+
     def _get_zone_device_ids(self) -> list:
         """
         Return a list of zone Device IDs.
 
+        The list is checkpointed, see discovery_checkpoint.
+
         inputs:
             None
         returns:
             (list): all zone device ids supported.
         """
+        return (
+            discovery_checkpoint.get_checkpoint().get_or_discover(
+                self._get_discovery_key(),
+                {"account": self.tcc_uname},
+                self._discover_zone_device_ids,
+            )
+            or []
+        )
+
+    def _discover_zone_device_ids(self) -> list | None:
+        """
+        Query the zone Device IDs.
+
+        inputs:
+            None
+        returns:
+            (list): all zone device ids supported, None if there are none,
+                    so an empty answer is not checkpointed.
+        """
         zone_id_lst = []
         for _, zone in enumerate(self.get_zones_info()):
             zone_id_lst.append(zone["DeviceID"])
-        return zone_id_lst
+        return zone_id_lst or None
+
+    def clone_for_zone(self, zone):
+        """
+        Return a Thermostat object for another zone on this login.
+
+        The clone gets its own session carrying the login cookies and
+        shares the request budget, so querying every zone of the account
+        takes a single login and closing a clone leaves the login's session
+        open.
+
+        inputs:
+            zone(int): zone number.
+        returns:
+            (ThermostatClass): Thermostat object for zone.
+        """
+        Thermostat = copy.copy(self)
+        Thermostat.session = self._create_session(
+            None if self.session is None else self.session.cookies
+        )
+        Thermostat.zone_name = int(zone)
+        Thermostat.device_id = Thermostat.get_target_zone_id(Thermostat.zone_name)
+        return Thermostat
 
     def get_target_zone_id(self, zone=honeywell_config.default_zone) -> int:
         """
@@ -175,13 +394,18 @@ class ThermostatClass(pyhtcc.PyHTCC, tc.ThermostatCommon):  # type: ignore[name-
         """
         try:
             zone_id = self._get_zone_device_ids()[zone]
-        except IndexError as ex:
-            raise ValueError(
-                f"zone '{zone}' type{type(zone)} is not a valid "
-                "choice for this Honeywell thermostat, valid "
-                "choices are: "
-                f"{self._get_zone_device_ids()}"
-            ) from ex
+        except IndexError:
+            # the checkpoint may predate this zone, discover again
+            discovery_checkpoint.get_checkpoint().invalidate(self._get_discovery_key())
+            try:
+                zone_id = self._get_zone_device_ids()[zone]
+            except IndexError as ex:
+                raise ValueError(
+                    f"zone '{zone}' type{type(zone)} is not a valid "
+                    "choice for this Honeywell thermostat, valid "
+                    "choices are: "
+                    f"{self._get_zone_device_ids()}"
+                ) from ex
         return zone_id
 
     def print_all_thermostat_metadata(self, zone):
@@ -457,7 +681,7 @@ class ThermostatZone(
         # server data cache expiration parameters
         # needs to be defined before pyhtcc.Zone.__init__
         self.fetch_interval_sec = 60  # age of server data before refresh
-        self.last_fetch_time = time.time() - 2 * self.fetch_interval_sec
+        self.last_fetch_time = clock.time() - 2 * self.fetch_interval_sec
 
         # call both parent class __init__
         self.args = [Thermostat_obj.device_id, Thermostat_obj]
@@ -530,13 +754,13 @@ class ThermostatZone(
             (booL): True if is in humidity sensor is available and not faulted.
         """
         self.refresh_zone_info()
-        available = bool(
-            self.zone_info["latestData"]["uiData"]["IndoorHumiditySensorAvailable"]
-        )
-        not_fault = bool(
-            self.zone_info["latestData"]["uiData"]["IndoorHumiditySensorNotFault"]
+        return bool(
+            self._get_zone_field(
+                "humidity_supported",
+                UI_DATA + ("IndoorHumiditySensorAvailable",),
+                UI_DATA + ("IndoorHumiditySensorNotFault",),
+            )
         )
-        return available and not_fault
 
     def is_heat_mode(self) -> int:
         """
@@ -706,7 +930,7 @@ class ThermostatZone(
 
     def get_wifi_status(self) -> bool:  # noqa R0201
         """Return the wifi connection status."""
-        return not self.zone_info["communicationLost"]
+        return bool(self._get_zone_field("wifi_ok", ("communicationLost",)))
 
     def get_battery_voltage(self) -> float:  # noqa R0201
         """Return the battery voltage in volts.
@@ -714,7 +938,7 @@ class ThermostatZone(
         This tstat is on line power so any valid response
         from tstat returns line power value.
         """
-        return 120.0 if self.zone_info["deviceLive"] else 0.0
+        return self._get_zone_field("battery_voltage", ("deviceLive",))
 
     def get_battery_status(self) -> bool:  # noqa R0201
         """Return the battery status.
@@ -734,7 +958,7 @@ class ThermostatZone(
             (float): heating set point in °F.
         """
         self.refresh_zone_info()
-        return float(self.zone_info["latestData"]["uiData"]["ScheduleHeatSp"])
+        return self._get_zone_field("schedule_heat_sp", UI_DATA + ("ScheduleHeatSp",))
 
     def get_schedule_cool_sp(self) -> float:
         """
@@ -747,7 +971,7 @@ class ThermostatZone(
             (float): cooling set point in °F.
         """
         self.refresh_zone_info()
-        return float(self.zone_info["latestData"]["uiData"]["ScheduleCoolSp"])
+        return self._get_zone_field("schedule_cool_sp", UI_DATA + ("ScheduleCoolSp",))
 
     def get_is_invacation_hold_mode(self) -> bool:  # used
         """
@@ -760,7 +984,9 @@ class ThermostatZone(
             (booL): True if is in vacation hold mode.
         """
         self.refresh_zone_info()
-        return bool(int(self.zone_info["latestData"]["uiData"]["IsInVacationHoldMode"]))
+        return bool(
+            self._get_zone_field("hold_mode", UI_DATA + ("IsInVacationHoldMode",))
+        )
 
     def get_vacation_hold(self) -> bool:
         """
@@ -773,7 +999,9 @@ class ThermostatZone(
             (bool): True if vacation hold is set.
         """
         self.refresh_zone_info()
-        return bool(self.zone_info["latestData"]["uiData"]["VacationHold"])
+        return bool(
+            self._get_zone_field("vacation_hold", UI_DATA + ("VacationHold",))
+        )
 
     def get_vacation_hold_until_time(self) -> int:
         """
@@ -785,7 +1013,9 @@ class ThermostatZone(
             (int) vacation hold time until in minutes
         """
         self.refresh_zone_info()
-        return int(self.zone_info["latestData"]["uiData"]["VacationHoldUntilTime"])
+        return self._get_zone_field(
+            "vacation_hold_until", UI_DATA + ("VacationHoldUntilTime",)
+        )
 
     def get_temporary_hold_until_time(self) -> int:  # used
         """
@@ -798,7 +1028,9 @@ class ThermostatZone(
             (int) temporary hold time until in minutes.
         """
         self.refresh_zone_info()
-        return int(self.zone_info["latestData"]["uiData"]["TemporaryHoldUntilTime"])
+        return self._get_zone_field(
+            "temporary_hold_until", UI_DATA + ("TemporaryHoldUntilTime",)
+        )
 
     def get_setpoint_change_allowed(self) -> bool:
         """
@@ -828,7 +1060,135 @@ class ThermostatZone(
                   in self.system_switch_position
         """
         self.refresh_zone_info()
-        return int(self.zone_info["latestData"]["uiData"]["SystemSwitchPosition"])
+        return self._get_zone_field("mode_code", UI_DATA + ("SystemSwitchPosition",))
+
+    def get_indoor_temperature_raw(self) -> int:
+        """
+        Refresh the cached zone information and return DispTemperature.
+
+        inputs:
+            None
+        returns:
+            (int): indoor temperature in °F, None if reported as null.
+        raises:
+            KeyError: field is missing from the zone information.
+        """
+        self.refresh_zone_info()
+        return self._get_zone_field("display_temp", UI_DATA + ("DispTemperature",))
+
+    def get_indoor_humidity_raw(self) -> int:
+        """
+        Refresh the cached zone information and return IndoorHumidity.
+
+        inputs:
+            None
+        returns:
+            (int): indoor humidity in %RH, None if reported as null.
+        raises:
+            KeyError: field is missing from the zone information.
+        """
+        self.refresh_zone_info()
+        return self._get_zone_field("display_humidity", UI_DATA + ("IndoorHumidity",))
+
+    def get_heat_setpoint_raw(self) -> int:
+        """
+        Refresh the cached zone information and return the heat setpoint.
+
+        inputs:
+            None
+        returns:
+            (int): heat setpoint in °F, None if reported as null.
+        raises:
+            KeyError: field is missing from the zone information.
+        """
+        self.refresh_zone_info()
+        return self._get_zone_field("heat_setpoint", UI_DATA + ("HeatSetpoint",))
+
+    def get_cool_setpoint_raw(self) -> int:
+        """
+        Refresh the cached zone information and return the cool setpoint.
+
+        inputs:
+            None
+        returns:
+            (int): cool setpoint in °F, None if reported as null.
+        raises:
+            KeyError: field is missing from the zone information.
+        """
+        self.refresh_zone_info()
+        return self._get_zone_field("cool_setpoint", UI_DATA + ("CoolSetpoint",))
+
+    def _get_zone_field(self, attribute, *paths):
+        """
+        Return a decoded field of the cached zone information.
+
+        zone_state holds None for a field missing from the TCC payload,
+        the payload is only walked then, to raise like the pyhtcc getters.
+
+        inputs:
+            attribute(str): ZoneState attribute.
+            paths(tuple): key paths in zone_info the attribute is decoded from.
+        returns:
+            (any): decoded value, None if the vendor reported null.
+        raises:
+            KeyError: a field is missing from the zone information.
+        """
+        value = getattr(self.zone_state, attribute)
+        if value is None:
+            for path in paths:
+                parent = zs.lookup(self.zone_info, *path[:-1])
+                if not isinstance(parent, dict) or path[-1] not in parent:
+                    raise KeyError(
+                        f"{self.thermostat_type} zone {self.zone_name} "
+                        f"information has no '{'/'.join(path)}' field"
+                    )
+        return value
+
+    def parse_zone_state(self, zone_info) -> zs.ZoneState:
+        """
+        Decode the uiData of a TCC zone payload.
+
+        inputs:
+            zone_info(dict): TCC zone payload.
+        returns:
+            (ZoneState): decoded zone data.
+        """
+        ui_data = zs.lookup(zone_info, "latestData", "uiData") or {}
+        communication_lost = zs.lookup(zone_info, "communicationLost")
+        device_live = zs.lookup(zone_info, "deviceLive")
+        humidity_available = zs.lookup(ui_data, "IndoorHumiditySensorAvailable")
+        humidity_not_fault = zs.lookup(ui_data, "IndoorHumiditySensorNotFault")
+        # line powered, any live response reports line voltage
+        battery_voltage = None
+        if device_live is not None:
+            battery_voltage = 120.0 if device_live else 0.0
+        return zs.ZoneState(
+            display_temp=zs.lookup(ui_data, "DispTemperature"),
+            display_humidity=zs.lookup(ui_data, "IndoorHumidity"),
+            humidity_supported=(
+                bool(humidity_available) and bool(humidity_not_fault)
+                if humidity_available is not None and humidity_not_fault is not None
+                else None
+            ),
+            mode_code=zs.lookup(ui_data, "SystemSwitchPosition", convert=int),
+            heat_setpoint=zs.lookup(ui_data, "HeatSetpoint", convert=int),
+            cool_setpoint=zs.lookup(ui_data, "CoolSetpoint", convert=int),
+            schedule_heat_sp=zs.lookup(ui_data, "ScheduleHeatSp", convert=float),
+            schedule_cool_sp=zs.lookup(ui_data, "ScheduleCoolSp", convert=float),
+            hold_mode=zs.lookup(
+                ui_data, "IsInVacationHoldMode", convert=lambda val: bool(int(val))
+            ),
+            vacation_hold=zs.lookup(ui_data, "VacationHold", convert=bool),
+            vacation_hold_until=zs.lookup(
+                ui_data, "VacationHoldUntilTime", convert=int
+            ),
+            temporary_hold_until=zs.lookup(
+                ui_data, "TemporaryHoldUntilTime", convert=int
+            ),
+            wifi_strength=float(util.BOGUS_INT),
+            wifi_ok=None if communication_lost is None else not communication_lost,
+            battery_voltage=battery_voltage,
+        )
 
     def set_heat_setpoint(self, temp: int) -> None:
         """
@@ -882,7 +1242,7 @@ class ThermostatZone(
             None, populates self.zone_info dict.
         """
         # Check if refresh is needed before capturing timestamp
-        check_time = time.time()
+        check_time = clock.time()
         if force_refresh or (
             check_time >= (self.last_fetch_time + self.fetch_interval_sec)
         ):
@@ -891,7 +1251,7 @@ class ThermostatZone(
             )
             # Capture timestamp AFTER successful API call to ensure cache
             # works correctly even when API call is slow or has retries
-            now_time = time.time()
+            now_time = clock.time()
             for zone_data in all_zones_info:
                 if zone_data["DeviceID"] == self.device_id:
                     pyhtcc.logger.debug(  # type: ignore[attr-defined]
@@ -913,6 +1273,22 @@ from requests.adapters import HTTPAdapter  # noqa E402
 HTTP_TIMEOUT = 2.5  # 6 sigma limit in seconds
 
 
+def get_request_priority(request):
+    """
+    Return the request budget priority of a TCC portal request.
+
+    inputs:
+        request(PreparedRequest): outgoing request.
+    returns:
+        (str): request_governor.WRITE for login and control changes,
+               request_governor.READ otherwise.
+    """
+    path = urllib.parse.urlsplit(request.url).path.rstrip("/")
+    if request.method == "POST" and path in honeywell_config.WRITE_PATHS:
+        return request_governor.WRITE
+    return request_governor.READ
+
+
 class TimeoutHTTPAdapter(HTTPAdapter):
     """Override TimeoutHTTPAdapter to include timeout parameter."""
 
@@ -921,6 +1297,8 @@ class TimeoutHTTPAdapter(HTTPAdapter):
         if "timeout" in kwargs:
             self.timeout = kwargs["timeout"]
             del kwargs["timeout"]
+        # optional request_governor.RequestGovernor of the TCC account
+        self.governor = kwargs.pop("governor", None)
         super().__init__(*args, **kwargs)
 
     def send(
@@ -945,12 +1323,46 @@ class TimeoutHTTPAdapter(HTTPAdapter):
         """
         if timeout is None:
             timeout = self.timeout
+        if self.governor is not None:
+            self.governor.acquire(get_request_priority(request))
         return super().send(
             request, stream=stream, timeout=timeout, verify=verify,
             cert=cert, proxies=proxies
         )
 
 
+class BaseUrlHTTPAdapter(TimeoutHTTPAdapter):
+    """Rewrite requests for the vendor base URL to an override base URL."""
+
+    def __init__(self, vendor_url, base_url, *args, **kwargs):
+        """
+        Constructor.
+
+        inputs:
+            vendor_url(str): URL prefix hard-coded in pyhtcc.
+            base_url(str): replacement URL prefix, e.g. a stand-in server.
+        """
+        self.vendor_url = vendor_url
+        self.base_url = base_url
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, *args, **kwargs):
+        """
+        Send a request after rewriting its URL prefix.
+
+        Args:
+            request: The PreparedRequest being sent.
+            *args: positional arguments for TimeoutHTTPAdapter.send.
+            **kwargs: keyword arguments for TimeoutHTTPAdapter.send.
+
+        Returns:
+            Response object.
+        """
+        if request.url.startswith(self.vendor_url):
+            request.url = self.base_url + request.url[len(self.vendor_url):]
+        return super().send(request, *args, **kwargs)
+
+
 if __name__ == "__main__":
     # verify environment
     env.get_python_version()
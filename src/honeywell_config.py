@@ -6,6 +6,25 @@ ALIAS = "honeywell"
 
 # constants
 
+# TCC portal server, override env var points the driver at a stand-in server
+BASE_URL = "https://mytotalconnectcomfort.com"
+BASE_URL_ENV_KEY = "TCC_BASE_URL"
+
+# request budget per account shared by all zones, see request_governor.py
+REQUEST_BUDGET = {
+    "rate_per_min": 20.0,
+    "burst": 8,
+    "write_reserve": 2,
+    "read_max_wait_sec": 120,
+}
+
+# logins in progress at once in site supervision, TCC flags login bursts
+# as server spamming
+MAX_CONCURRENT_AUTH = 1
+
+# portal POST paths given write priority: login and control changes
+WRITE_PATHS = ["/portal", "/portal/Device/SubmitControlScreenChanges"]
+
 # all environment variables specific to this thermostat type
 env_variables = {
     "TCC_USERNAME": None,
@@ -1,8 +1,10 @@
 """KumoCloud v3 API integration"""
 
 # built-in imports
+import copy
 import os
 import pprint
+import threading
 import time
 import traceback
 from typing import Dict, Any, List
@@ -11,18 +13,125 @@ from typing import Dict, Any, List
 import requests
 
 # local imports
+from src import clock
+from src import discovery_checkpoint
 from src import environment as env
 from src import kumocloud_config
+from src import request_governor
 from src import thermostat_api as api
 from src import thermostat_common as tc
+from src import token_manager
 from src import utilities as util
+from src import zone_state as zs
 
 SEQUENTIAL_ASSIGNMENT_FALLBACK_MSG = "Using sequential assignment as fallback"
 
+ACCESS_TOKEN_LIFETIME_SEC = 1200  # 20 minutes
+REFRESH_TOKEN_LIFETIME_SEC = 2592000  # 30 days
+
+
+class AccountTokens:
+    """Access and refresh tokens shared by every zone of an account."""
+
+    def __init__(self):
+        """Constructor, no tokens until the first login."""
+        # held for a whole login or refresh so one runs per account
+        self.refresh_lock = threading.RLock()
+        # guards the token fields, never held across a request
+        self.lock = threading.Lock()
+        self.auth_token = None
+        self.refresh_token = None
+        self.token_expires_at = 0
+        self.refresh_token_expires_at = 0
+
+    def update(self, auth_token, refresh_token=None):
+        """
+        Replace the tokens after a login or refresh.
+
+        inputs:
+            auth_token(str): new access token.
+            refresh_token(str): new refresh token, None keeps the current one.
+        returns:
+            None
+        """
+        now = clock.time()
+        with self.lock:
+            self.auth_token = auth_token
+            self.token_expires_at = now + ACCESS_TOKEN_LIFETIME_SEC
+            if refresh_token:
+                self.refresh_token = refresh_token
+                self.refresh_token_expires_at = now + REFRESH_TOKEN_LIFETIME_SEC
+
+    def get_auth_headers(self):
+        """
+        Return the Authorization header of the current access token.
+
+        inputs:
+            None
+        returns:
+            (dict): request headers, empty before the first login.
+        """
+        with self.lock:
+            auth_token = self.auth_token
+        return {"Authorization": f"Bearer {auth_token}"} if auth_token else {}
+
+
+# account tokens keyed by (thermostat_type, account)
+_account_tokens = {}
+_account_tokens_lock = threading.Lock()
+
+
+def get_account_tokens(thermostat_type, account):
+    """
+    Return the shared tokens of a vendor account.
+
+    inputs:
+        thermostat_type(str): thermostat type.
+        account(str): vendor account name.
+    returns:
+        (AccountTokens): tokens shared by all zones and threads.
+    """
+    key = (thermostat_type, account)
+    with _account_tokens_lock:
+        if key not in _account_tokens:
+            _account_tokens[key] = AccountTokens()
+        return _account_tokens[key]
+
+
+def reset_account_tokens():
+    """
+    Discard all account tokens.
+
+    inputs:
+        None
+    returns:
+        None
+    """
+    with _account_tokens_lock:
+        _account_tokens.clear()
+
+
+def _account_tokens_field(name):
+    """Return a property reading and writing a field of the account tokens."""
+
+    def get_field(self):
+        return getattr(self.account_tokens, name)
+
+    def set_field(self, value):
+        with self.account_tokens.lock:
+            setattr(self.account_tokens, name, value)
+
+    return property(get_field, set_field, doc=f"account tokens {name}")
+
 
 class ThermostatClass(tc.ThermostatCommon):
     """KumoCloud v3 API thermostat functions."""
 
+    auth_token = _account_tokens_field("auth_token")
+    refresh_token = _account_tokens_field("refresh_token")
+    token_expires_at = _account_tokens_field("token_expires_at")
+    refresh_token_expires_at = _account_tokens_field("refresh_token_expires_at")
+
     def __init__(self, zone, verbose=True):
         """
         Constructor, connect to thermostat using v3 API.
@@ -49,23 +158,23 @@ class ThermostatClass(tc.ThermostatCommon):
         self.verbose = verbose
 
         # v3 API endpoints and session
-        self.base_url = "https://app-prod.kumocloud.com"
-        self.session = requests.Session()
-
-        # Set base headers required by v3 API
-        self.session.headers.update(
-            {
-                "Accept": "application/json, text/plain, */*",
-                "Accept-Encoding": "gzip, deflate, br",
-                "Accept-Language": "en-US, en",
-                "x-app-version": "3.0.9",
-                "Content-Type": "application/json",
-            }
+        self.base_url = env.get_base_url(
+            kumocloud_config.BASE_URL_ENV_KEY, kumocloud_config.BASE_URL
         )
-        self.auth_token = None
-        self.refresh_token = None
-        self.token_expires_at = 0
-        self.refresh_token_expires_at = 0
+        # the Authorization header is added per request from the account
+        # tokens, session headers are never changed after this point
+        self.session = self._create_session()
+        # login and refresh requests, one at a time per account
+        self._auth_session = self._create_session()
+
+        # request budget shared by every zone logged into this account
+        self.request_governor = request_governor.get_governor(
+            self.thermostat_type, self.kc_uname, kumocloud_config.REQUEST_BUDGET
+        )
+        # tokens shared by every zone logged into this account
+        self.account_tokens = get_account_tokens(self.thermostat_type, self.kc_uname)
+        # background token refresh of the account, registered after login
+        self.token_key = f"{self.thermostat_type}:{self.kc_uname}"
 
         # configure zone info
         self.zone_number = int(zone)
@@ -111,6 +220,47 @@ class ThermostatClass(tc.ThermostatCommon):
                 print(f"Warning: Zone assignment update failed: {e}")
                 print("Using static zone assignments as fallback.")
 
+    def clone_for_zone(self, zone):
+        """
+        Return a Thermostat object for another zone on this login.
+
+        The clone shares the account tokens and request budget, so
+        querying every zone of the account takes a single login.  It gets
+        its own session for its requests, login and refresh requests stay
+        on the shared auth session, one at a time per account.
+
+        inputs:
+            zone(int): zone number.
+        returns:
+            (ThermostatClass): Thermostat object for zone.
+        """
+        Thermostat = copy.copy(self)
+        Thermostat.session = self._create_session()
+        Thermostat.session.cookies.update(self.session.cookies)
+        Thermostat.zone_number = int(zone)
+        Thermostat.zone_name = kumocloud_config.metadata.get(
+            Thermostat.zone_number, {"zone_name": f"Zone {Thermostat.zone_number}"}
+        )["zone_name"]
+        Thermostat.device_id = Thermostat.get_target_zone_id(Thermostat.zone_name)
+        Thermostat.serial_number = None
+        Thermostat.zone_info = {}
+        return Thermostat
+
+    @staticmethod
+    def _create_session():
+        """Return a session with the base headers required by the v3 API."""
+        session = requests.Session()
+        session.headers.update(
+            {
+                "Accept": "application/json, text/plain, */*",
+                "Accept-Encoding": "gzip, deflate, br",
+                "Accept-Language": "en-US, en",
+                "x-app-version": "3.0.9",
+                "Content-Type": "application/json",
+            }
+        )
+        return session
+
     def _authenticate(self) -> bool:
         """
         Authenticate with KumoCloud v3 API using JWT tokens.
@@ -118,6 +268,11 @@ class ThermostatClass(tc.ThermostatCommon):
         returns:
             (bool): True if authentication successful
         """
+        with self.account_tokens.refresh_lock:
+            return self._authenticate_locked()
+
+    def _authenticate_locked(self) -> bool:
+        """Log in, account refresh_lock held."""
         self._authentication_attempted = True
 
         login_url = f"{self.base_url}/v3/login"
@@ -128,7 +283,8 @@ class ThermostatClass(tc.ThermostatCommon):
         }
 
         try:
-            response = self.session.post(login_url, json=login_data, timeout=30)
+            self.request_governor.acquire(request_governor.WRITE)
+            response = self._auth_session.post(login_url, json=login_data, timeout=30)
             response.raise_for_status()
 
             auth_response = response.json()
@@ -137,32 +293,30 @@ class ThermostatClass(tc.ThermostatCommon):
             # This handles both possible response formats from the v3 API
             if "token" in auth_response:
                 token_data = auth_response["token"]
-                self.auth_token = token_data.get("access")
-                self.refresh_token = token_data.get("refresh")
             else:
                 # Tokens at top level
-                self.auth_token = auth_response.get("access")
-                self.refresh_token = auth_response.get("refresh")
+                token_data = auth_response
+            auth_token = token_data.get("access")
 
-            if not self.auth_token:
+            if not auth_token:
                 error = tc.AuthenticationError("No auth token received from v3 API")
                 self._authentication_error = error
                 self._authenticated = False
                 raise error
 
-            # Set token expiration (access token expires in 20 minutes)
-            self.token_expires_at = time.time() + 1200  # 20 minutes
-
-            # Set refresh token expiration (refresh token expires in 1 month)
-            self.refresh_token_expires_at = time.time() + 2592000  # 30 days
-
-            # Set authorization header for future requests
-            self.session.headers.update({"Authorization": f"Bearer {self.auth_token}"})
+            # access token expires in 20 minutes, refresh token in 1 month,
+            # both are swapped in together for every zone of the account
+            self.account_tokens.update(auth_token, token_data.get("refresh"))
 
             # Mark as successfully authenticated
             self._authenticated = True
             self._authentication_error = None
 
+            # refresh the access token in the background before it expires
+            token_manager.get_token_manager().register(
+                self.token_key, self._background_token_refresh, self.token_expires_at
+            )
+
             if self.verbose:
                 util.log_msg(
                     "Successfully authenticated with KumoCloud v3 API",
@@ -183,71 +337,73 @@ class ThermostatClass(tc.ThermostatCommon):
             self._authenticated = False
             raise error from exc
 
-    def _refresh_auth_token(self) -> bool:
+    def _refresh_auth_token(self, stale_token=None) -> bool:
         """
         Refresh the authentication token using refresh token.
 
+        The refresh is made on the auth session, the request path keeps
+        using the current token until the new pair is swapped in.
+
+        inputs:
+            stale_token(str): access token found invalid, a refresh is
+                              skipped if another zone already replaced it.
         returns:
             (bool): True if refresh successful
         """
+        with self.account_tokens.refresh_lock:
+            if stale_token is not None and self.auth_token != stale_token:
+                return True  # refreshed by another zone while waiting
+            return self._refresh_auth_token_locked()
+
+    def _refresh_auth_token_locked(self) -> bool:
+        """Refresh the access token, account refresh_lock held."""
         if not self.refresh_token:
-            return self._authenticate()
+            return self._authenticate_locked()
 
         # Check if refresh token has expired
-        if time.time() >= self.refresh_token_expires_at - 300:  # 5 min buffer
-            return self._authenticate()
+        if clock.time() >= self.refresh_token_expires_at - 300:  # 5 min buffer
+            return self._authenticate_locked()
 
         refresh_url = f"{self.base_url}/v3/refresh"
 
         # According to the API docs and working implementation,
-        # refresh does NOT use Authorization header - only sends refresh token in body
+        # refresh does NOT use Authorization header - only sends refresh token
+        # in body, the auth session never carries one
         refresh_data = {"refresh": self.refresh_token}
 
-        # Store the current auth header to restore later
-        current_auth_header = self.session.headers.get("Authorization")
-
-        # Remove Authorization header for refresh request
-        # (refresh token goes only in JSON body)
-        if "Authorization" in self.session.headers:
-            del self.session.headers["Authorization"]
-
         try:
-            response = self.session.post(refresh_url, json=refresh_data, timeout=30)
+            self.request_governor.acquire(request_governor.WRITE)
+            response = self._auth_session.post(
+                refresh_url, json=refresh_data, timeout=30
+            )
             response.raise_for_status()
 
             refresh_response = response.json()
 
             # Extract tokens from refresh response - tokens are at top level
             new_auth_token = refresh_response.get("access")
-            new_refresh_token = refresh_response.get("refresh")
 
             if not new_auth_token:
                 # Refresh failed, try full authentication
-                return self._authenticate()
-
-            # Update instance variables only after successful token extraction
-            self.auth_token = new_auth_token
-            if new_refresh_token:
-                self.refresh_token = new_refresh_token
-                self.refresh_token_expires_at = time.time() + 2592000  # 30 days
-
-            self.token_expires_at = time.time() + 1200  # 20 minutes
-
-            # Update authorization header with new access token
-            self.session.headers.update({"Authorization": f"Bearer {self.auth_token}"})
+                return self._authenticate_locked()
 
+            # Update tokens only after successful token extraction
+            self.account_tokens.update(new_auth_token, refresh_response.get("refresh"))
             return True
 
         except requests.exceptions.RequestException:
-            # Refresh failed, restore original header and try full authentication
-            if current_auth_header:
-                self.session.headers.update({"Authorization": current_auth_header})
-            return self._authenticate()
-        except Exception:
-            # Any other error, restore original header
-            if current_auth_header:
-                self.session.headers.update({"Authorization": current_auth_header})
-            raise
+            # Refresh failed, current token is untouched, try full authentication
+            return self._authenticate_locked()
+
+    def _background_token_refresh(self) -> float:
+        """
+        Refresh the access token from the token manager thread.
+
+        returns:
+            (float): new access token expiry epoch time.
+        """
+        self._refresh_auth_token()
+        return self.token_expires_at
 
     def _ensure_authenticated(self) -> None:
         """Ensure we have a valid authentication token."""
@@ -274,15 +430,33 @@ class ThermostatClass(tc.ThermostatCommon):
 
         # We are authenticated, check if token needs refresh
         # Refresh 5 minutes early
-        if time.time() >= self.token_expires_at - 300:
+        if clock.time() >= self.token_expires_at - 300:
+            # the background refresh normally gets here first, join it if
+            # it is in flight rather than starting a second refresh
+            if token_manager.get_token_manager().refresh(self.token_key):
+                return
             # Check if refresh token is still valid (with 1 hour buffer)
-            if time.time() >= self.refresh_token_expires_at - 3600:
+            if clock.time() >= self.refresh_token_expires_at - 3600:
                 # Refresh token expired, need full re-authentication
                 self._authenticate()
             else:
                 # Refresh token still valid, just refresh access token
                 self._refresh_auth_token()
 
+    def _discover_zone_name_mapping(self):
+        """
+        Query the zone name to index mapping of the account's first site.
+
+        inputs:
+            None
+        returns:
+            (dict): zone name -> zone index, None if no site was found.
+        """
+        sites, zones = self._get_sites_and_zones()
+        if sites is None or zones is None:
+            return None
+        return self._build_zone_name_mapping(zones)
+
     def _get_sites_and_zones(self):
         """Get sites and zones from API with validation."""
         sites = self._get_sites()
@@ -426,16 +600,22 @@ class ThermostatClass(tc.ThermostatCommon):
         config module's zone assignments to match the actual API response.
         Zone assignments are not static in v3 API - sometimes zone 0 is
         LIVING_ROOM and other times zone 1 is LIVING_ROOM.
+
+        The zone name mapping is checkpointed, see discovery_checkpoint, so
+        a warm start or reconnect skips the sites and zones queries.  A
+        stale checkpoint is revalidated in the background while this zone
+        polls, so discovery queries on a clone with its own session.
         """
         try:
-            # Get sites and zones from API
-            sites, zones = self._get_sites_and_zones()
-            if sites is None or zones is None:
+            discoverer = self.clone_for_zone(self.zone_number)
+            zone_name_to_index = discovery_checkpoint.get_checkpoint().get_or_discover(
+                f"{self.thermostat_type}:{self.kc_uname}",
+                {"account": self.kc_uname},
+                discoverer._discover_zone_name_mapping,
+            )
+            if zone_name_to_index is None:
                 return
 
-            # Build mapping of zone names to indices
-            zone_name_to_index = self._build_zone_name_mapping(zones)
-
             # Find zone indices by patterns
             living_room_index, kitchen_index, basement_index = \
                 self._find_zone_indices_by_patterns(zone_name_to_index)
@@ -475,28 +655,32 @@ class ThermostatClass(tc.ThermostatCommon):
         # Ensure we have valid authentication before making request
         self._ensure_authenticated()
 
-        # Ensure the session has the correct auth header
-        if self.auth_token:
-            self.session.headers.update({"Authorization": f"Bearer {self.auth_token}"})
+        # Wait for the account request budget, control writes go first
+        self.request_governor.acquire(
+            request_governor.READ if method == "GET" else request_governor.WRITE
+        )
 
-        # Make the first request attempt
-        response = self.session.request(method, url, timeout=30, **kwargs)
+        # Make the first request attempt, with the token current right now
+        request_token = self.auth_token
+        response = self._send_authenticated(method, url, **kwargs)
 
         # If we get 401, try to refresh token and retry once
         if response.status_code == 401:
             # Token might be expired, try refresh
-            if self._refresh_auth_token():
-                # Ensure session header is updated with new token
-                if self.auth_token:
-                    self.session.headers.update(
-                        {"Authorization": f"Bearer {self.auth_token}"}
-                    )
+            if self._refresh_auth_token(stale_token=request_token):
                 # Retry the request with new token
-                response = self.session.request(method, url, timeout=30, **kwargs)
+                self.request_governor.acquire(request_governor.WRITE)
+                response = self._send_authenticated(method, url, **kwargs)
 
         response.raise_for_status()
         return response
 
+    def _send_authenticated(self, method, url, **kwargs):
+        """Send a request with the account's current Authorization header."""
+        headers = dict(kwargs.pop("headers", None) or {})
+        headers.update(self.account_tokens.get_auth_headers())
+        return self.session.request(method, url, timeout=30, headers=headers, **kwargs)
+
     def _get_sites(self) -> List[Dict[str, Any]]:
         """
         Get sites data from v3 API.
@@ -504,14 +688,14 @@ class ThermostatClass(tc.ThermostatCommon):
         returns:
             (List[Dict]): List of sites
         """
-        if self._cached_sites and time.time() < self._cache_expires_at:
+        if self._cached_sites and clock.time() < self._cache_expires_at:
             return self._cached_sites
 
         sites_url = f"{self.base_url}/v3/sites/"
         response = self._make_authenticated_request("GET", sites_url)
 
         self._cached_sites = response.json()
-        self._cache_expires_at = time.time() + self._cache_duration
+        self._cache_expires_at = clock.time() + self._cache_duration
 
         return self._cached_sites
 
@@ -810,7 +994,7 @@ class ThermostatClass(tc.ThermostatCommon):
             mode=util.BOTH_LOG,
             func_name=1,
         )
-        time.sleep(30)
+        clock.sleep(30)
         try:
             return list(self.get_indoor_units())
         except tc.AuthenticationError:
@@ -1148,7 +1332,7 @@ class ThermostatZone(tc.ThermostatCommonZone):
 
         # server data cache expiration parameters
         self.fetch_interval_sec = 60  # age of server data before refresh
-        self.last_fetch_time = time.time() - 2 * self.fetch_interval_sec
+        self.last_fetch_time = clock.time() - 2 * self.fetch_interval_sec
 
         # switch config for this thermostat
         self.system_switch_position[
@@ -1287,11 +1471,7 @@ class ThermostatZone(tc.ThermostatCommonZone):
             (float): indoor temp in °F.
         """
         self.refresh_zone_info()
-        return util.c_to_f(
-            self.get_parameter(
-                "room_temp", "reportedCondition", default_val=util.BOGUS_INT
-            )
-        )
+        return self.zone_state.display_temp
 
     def get_display_humidity(self) -> float | None:
         """
@@ -1302,16 +1482,8 @@ class ThermostatZone(tc.ThermostatCommonZone):
         returns:
             (float, None): indoor humidity in %RH, None if not supported.
         """
-        if not self.get_is_humidity_supported():
-            return None
-        else:
-            # untested, don't have humidity support
-            # zone refreshed during if clause above
-            return util.c_to_f(
-                self.get_parameter(
-                    "humidity", "reportedCondition", default_val=util.BOGUS_INT
-                )
-            )
+        self.refresh_zone_info()
+        return self.zone_state.display_humidity
 
     def get_is_humidity_supported(self) -> bool:  # used
         """
@@ -1324,7 +1496,7 @@ class ThermostatZone(tc.ThermostatCommonZone):
             (booL): True if is in humidity sensor is available and not faulted.
         """
         self.refresh_zone_info()
-        return bool(self.get_parameter("humidistat", "acoilSettings", "inputs"))
+        return bool(self.zone_state.humidity_supported)
 
     def is_heat_mode(self) -> int:
         """
@@ -1519,10 +1691,7 @@ class ThermostatZone(tc.ThermostatCommonZone):
         rssi dict can be empty if unit is off.
         """
         self.refresh_zone_info()
-        rssi_value = self.get_parameter("rssi", "rssi", None, util.BOGUS_INT)
-        if rssi_value is None or isinstance(rssi_value, dict):
-            return float(util.BOGUS_INT)
-        return float(rssi_value)
+        return self.zone_state.wifi_strength
 
     def get_wifi_status(self) -> bool:  # noqa R0201
         """Return the wifi connection status."""
@@ -1557,10 +1726,7 @@ class ThermostatZone(tc.ThermostatCommonZone):
             (float): heating set point in °F.
         """
         self.refresh_zone_info()
-        # if power is off then sp_heat may be missing
-        return util.c_to_f(
-            self.get_parameter("sp_heat", "reportedCondition", default_val=-1)
-        )
+        return self.zone_state.heat_setpoint
 
     def get_heat_setpoint(self) -> str:
         """Return heat setpoint with units as a string."""
@@ -1598,10 +1764,7 @@ class ThermostatZone(tc.ThermostatCommonZone):
             (float): cooling set point in °F.
         """
         self.refresh_zone_info()
-        # if power is off then sp_heat may be missing
-        return util.c_to_f(
-            self.get_parameter("sp_cool", "reportedCondition", default_val=-1)
-        )
+        return self.zone_state.cool_setpoint
 
     def get_cool_setpoint(self) -> str:
         """Return cool setpoint with units as a string."""
@@ -1642,9 +1805,74 @@ class ThermostatZone(tc.ThermostatCommonZone):
                   in self.system_switch_position
         """
         self.refresh_zone_info()
+        return self.zone_state.mode_code
+
+    def parse_zone_state(self, zone_info) -> zs.ZoneState:
+        """
+        Decode the legacy format zone dict built from the v3 API.
+
+        inputs:
+            zone_info(dict): zone dict from get_all_metadata().
+        returns:
+            (ZoneState): decoded zone data.
+        """
+        del zone_info  # read through get_parameter() for failed auth defaults
+        humidity_supported = bool(
+            self.get_parameter("humidistat", "acoilSettings", "inputs", False)
+        )
+        display_humidity = None
+        if humidity_supported:
+            # untested, don't have humidity support
+            display_humidity = zs.lookup(
+                self.get_parameter(
+                    "humidity", "reportedCondition", default_val=util.BOGUS_INT
+                ),
+                convert=util.c_to_f,
+            )
+        rssi_value = self.get_parameter("rssi", "rssi", None, util.BOGUS_INT)
+        if rssi_value is None or isinstance(rssi_value, dict):
+            rssi_value = util.BOGUS_INT
+        wifi_strength = float(rssi_value)
+        wifi_ok = wifi_strength >= util.MIN_WIFI_DBM
+        return zs.ZoneState(
+            display_temp=zs.lookup(
+                self.get_parameter(
+                    "room_temp", "reportedCondition", default_val=util.BOGUS_INT
+                ),
+                convert=util.c_to_f,
+            ),
+            display_humidity=display_humidity,
+            humidity_supported=humidity_supported,
+            mode_code=self._parse_mode_code(),
+            # if power is off then sp_heat and sp_cool may be missing
+            heat_setpoint=zs.lookup(
+                self.get_parameter("sp_heat", "reportedCondition", default_val=-1),
+                convert=util.c_to_f,
+            ),
+            cool_setpoint=zs.lookup(
+                self.get_parameter("sp_cool", "reportedCondition", default_val=-1),
+                convert=util.c_to_f,
+            ),
+            schedule_heat_sp=float(kumocloud_config.MAX_HEAT_SETPOINT),
+            schedule_cool_sp=kumocloud_config.MIN_COOL_SETPOINT,
+            hold_mode=False,  # no schedule, hold not implemented
+            vacation_hold=False,
+            wifi_strength=wifi_strength,
+            wifi_ok=wifi_ok,
+            # line powered, any valid response reports line voltage
+            battery_voltage=120.0 if wifi_ok else 0.0,
+        )
+
+    def _parse_mode_code(self):
+        """Return the system switch position of zone_info."""
         # first check if power is on
         # if power is off then operation_mode key may be missing.
-        if not self.is_power_on():
+        power_value = self.get_parameter("power", "reportedCondition", default_val=0)
+        if (
+            power_value is None
+            or isinstance(power_value, dict)
+            or not int(power_value)
+        ):
             off_mode_value = self.system_switch_position[
                 tc.ThermostatCommonZone.OFF_MODE
             ]
@@ -1652,12 +1880,13 @@ class ThermostatZone(tc.ThermostatCommonZone):
             if isinstance(off_mode_value, list):
                 return off_mode_value[0]
             return off_mode_value
-        else:
-            op_mode = self.get_parameter("operation_mode", "reportedCondition")
-            # Return valid value or default to 0
-            if op_mode is None or isinstance(op_mode, dict):
-                return 0
-            return op_mode
+        op_mode = self.get_parameter(
+            "operation_mode", "reportedCondition", default_val=0
+        )
+        # Return valid value or default to 0
+        if op_mode is None or isinstance(op_mode, dict):
+            return 0
+        return op_mode
 
     def set_heat_setpoint(self, temp: int) -> None:
         """
@@ -1704,7 +1933,7 @@ class ThermostatZone(tc.ThermostatCommonZone):
         returns:
             None, zone_data is refreshed.
         """
-        now_time = time.time()
+        now_time = clock.time()
         # refresh if past expiration date or force_refresh option
         if force_refresh or (
             now_time >= (self.last_fetch_time + self.fetch_interval_sec)
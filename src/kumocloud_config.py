@@ -19,6 +19,18 @@ BASEMENT = 2  # zone 2 (default, updated dynamically at runtime)
 MAX_HEAT_SETPOINT = 68
 MIN_COOL_SETPOINT = 70
 
+# v3 API server, override env var points the driver at a stand-in server
+BASE_URL = "https://app-prod.kumocloud.com"
+BASE_URL_ENV_KEY = "KUMOCLOUD_BASE_URL"
+
+# request budget per account shared by all zones, see request_governor.py
+REQUEST_BUDGET = {
+    "rate_per_min": 30.0,
+    "burst": 10,
+    "write_reserve": 2,
+    "read_max_wait_sec": 120,
+}
+
 # all environment variables specific to this thermostat type
 env_variables = {
     "KUMO_USERNAME": None,
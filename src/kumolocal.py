@@ -1,14 +1,19 @@
 """KumoCloud integration using local API for data."""
 
 # built-in imports
+import collections
+import concurrent.futures
+import functools
 import logging
 import os
 import pprint
-import time
+import threading
 
 # third party imports
 
 # local imports
+from src import clock
+from src import discovery_checkpoint
 from src import kumolocal_config
 from src import thermostat_api as api
 from src import thermostat_common as tc
@@ -26,6 +31,192 @@ else:
     import pykumo  # noqa E402, from path / site packages
 
 
+class UnitProbeCache:
+    """
+    Local network probe results of the indoor units, shared by all zones.
+
+    Probes run together on a bounded thread pool so one unreachable unit
+    costs one probe timeout instead of one timeout per unit.  Successful
+    results are trusted for PROBE_TTL_SEC and failed results (known-dead
+    addresses) for PROBE_FAILED_TTL_SEC, so a reconnect only re-probes
+    the units whose last probe failed.
+    """
+
+    def __init__(
+        self,
+        ttl_sec=kumolocal_config.PROBE_TTL_SEC,
+        failed_ttl_sec=kumolocal_config.PROBE_FAILED_TTL_SEC,
+    ):
+        """
+        Constructor.
+
+        inputs:
+            ttl_sec(float): lifetime of a successful probe result.
+            failed_ttl_sec(float): lifetime of a failed probe result.
+        """
+        self.ttl_sec = ttl_sec
+        self.failed_ttl_sec = failed_ttl_sec
+        self.stats = collections.Counter()
+        # key -> ((ok, value), expires_at on clock.monotonic())
+        self._results = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Return a cached probe result.
+
+        inputs:
+            key(tuple): probe key.
+        returns:
+            (tuple or None): (ok, value), None if missing or expired.
+        """
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is None or clock.monotonic() >= entry[1]:
+                return None
+            self.stats["hits"] += 1
+            return entry[0]
+
+    def put(self, key, result):
+        """
+        Cache a probe result.
+
+        inputs:
+            key(tuple): probe key.
+            result(tuple): (ok, value).
+        returns:
+            None
+        """
+        ttl_sec = self.ttl_sec if result[0] else self.failed_ttl_sec
+        with self._lock:
+            self._results[key] = (result, clock.monotonic() + ttl_sec)
+
+    def probe_all(
+        self,
+        probes,
+        max_workers=kumolocal_config.PROBE_MAX_WORKERS,
+        deadline_sec=kumolocal_config.PROBE_DEADLINE_SEC,
+    ):
+        """
+        Run the probes without a fresh cached result concurrently.
+
+        A probe that raises or is still running at the deadline counts as
+        failed; it is left to finish in the background.
+
+        inputs:
+            probes(dict): probe key -> callable returning (ok, value).
+            max_workers(int): probes run at once.
+            deadline_sec(float): longest wait for the batch.
+        returns:
+            (dict): probe key -> (ok, value).
+        """
+        results = {}
+        pending = {}
+        for key, probe in probes.items():
+            cached = self.get(key)
+            if cached is None:
+                pending[key] = probe
+            else:
+                results[key] = cached
+        if not pending:
+            return results
+
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, min(max_workers, len(pending))),
+            thread_name_prefix="kumolocal_probe",
+        )
+        try:
+            futures = {executor.submit(probe): key for key, probe in pending.items()}
+            done, _ = concurrent.futures.wait(futures, timeout=deadline_sec)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        for future, key in futures.items():
+            result = (False, None)
+            if future not in done:
+                self.stats["timeouts"] += 1
+                util.log_msg(
+                    f"kumolocal probe {key} did not finish in {deadline_sec} sec",
+                    mode=util.DEBUG_LOG,
+                    func_name=1,
+                )
+            elif future.exception() is not None:
+                self.stats["errors"] += 1
+            else:
+                result = tuple(future.result())
+            self.stats["probes"] += 1
+            self.put(key, result)
+            results[key] = result
+        return results
+
+
+# process-wide probe cache shared by all zones
+_probe_cache = UnitProbeCache()
+# per-thread unit API probes deferred during try_setup()
+_probe_context = threading.local()
+# serializes patching pykumo's probe_ip during try_setup()
+_probe_patch_lock = threading.Lock()
+# pykumo's own sequential unit API probe
+_pykumo_account_module = getattr(pykumo, "py_kumo_cloud_account", None)
+_pykumo_probe_ip = getattr(_pykumo_account_module, "probe_ip", None)
+
+
+def get_probe_cache():
+    """
+    Return the process-wide unit probe cache.
+
+    inputs:
+        None
+    returns:
+        (UnitProbeCache): probe cache.
+    """
+    return _probe_cache
+
+
+def reset_probe_cache():
+    """
+    Discard all cached unit probe results.
+
+    inputs:
+        None
+    returns:
+        (UnitProbeCache): new probe cache.
+    """
+    global _probe_cache  # noqa W603
+    _probe_cache = UnitProbeCache()
+    return _probe_cache
+
+
+def _probe_unit_api(ip_address, creds, timeout):
+    """
+    Cached stand-in for pykumo's unit API probe during try_setup().
+
+    An uncached probe is deferred and reported reachable so pykumo does not
+    log the unit as unreachable before it has been probed; the deferred
+    probes run together once pykumo's setup loop is done and the units that
+    did not answer are marked unreachable then.
+
+    inputs:
+        ip_address(str): unit IP address.
+        creds(dict): unit credentials.
+        timeout(float): probe timeout.
+    returns:
+        (bool): True if the unit answered or its probe was deferred.
+    """
+    key = ("api", ip_address)
+    cached = _probe_cache.get(key)
+    if cached is not None:
+        return cached[0]
+
+    def probe():
+        return _pykumo_probe_ip(ip_address, creds, timeout), None
+
+    deferred = getattr(_probe_context, "deferred", None)
+    if deferred is not None:
+        deferred[key] = probe
+        return True
+    return _probe_cache.probe_all({key: probe})[key][0]
+
+
 class SupervisorLogHandler(logging.Handler):
     """Custom logging handler to redirect pykumo logs to supervisor logging."""
 
@@ -353,6 +544,68 @@ class ThermostatClass(
                 # pylint: disable=access-member-before-definition
                 self._need_fetch = False
 
+    def try_setup(self, candidate_ips=None, prefer_cache=False):
+        """Set up the account, probing the units concurrently.
+
+        pykumo's try_setup() probes the local API of each unit in turn.  The
+        probes only matter for candidate IP discovery, so without
+        candidate_ips pykumo's probe_ip is swapped for _probe_unit_api()
+        for the duration of the call.  The deferred probes then run together
+        and the units that did not answer are marked unreachable, which also
+        primes the probe cache for the next reconnect.
+
+        inputs:
+            candidate_ips(dict): {mac_address: ip_address} for discovery.
+            prefer_cache(bool): skip the cloud fetch if pykumo has a cache.
+        returns:
+            (bool): True if any units were configured.
+        """
+        if candidate_ips or _pykumo_probe_ip is None:
+            return pykumo.KumoCloudAccount.try_setup(  # type: ignore[attr-defined]
+                self, candidate_ips, prefer_cache
+            )
+        with _probe_patch_lock:
+            _probe_context.deferred = {}
+            probe_ip = _pykumo_account_module.probe_ip
+            _pykumo_account_module.probe_ip = _probe_unit_api
+            try:
+                setup = pykumo.KumoCloudAccount.try_setup  # type: ignore[attr-defined]
+                result = setup(self, candidate_ips, prefer_cache)
+            finally:
+                _pykumo_account_module.probe_ip = probe_ip
+                deferred = _probe_context.deferred
+                _probe_context.deferred = None
+        self._mark_unreachable_units(_probe_cache.probe_all(deferred))
+        return result
+
+    def _mark_unreachable_units(self, results):
+        """
+        Record deferred probe failures in pykumo's unit table.
+
+        inputs:
+            results(dict): probe key -> (ok, value) from probe_all().
+        returns:
+            None
+        """
+        failed = {key[1] for key, result in results.items() if not result[0]}
+        if not failed:
+            return
+        try:
+            children = self.get_raw_json()[2]["children"]
+            zone_tables = [child["zoneTable"] for child in children]
+        except (KeyError, IndexError, TypeError):
+            return
+        for zone_table in zone_tables:
+            for serial, unit in zone_table.items():
+                if unit.get("address") in failed:
+                    unit["reachable"] = False
+                    util.log_msg(
+                        f"kumolocal unit {serial} unreachable at "
+                        f"{unit['address']}",
+                        mode=util.DEBUG_LOG + util.STDOUT_LOG,
+                        func_name=1,
+                    )
+
     def get_target_zone_id(self, zone=0):
         """
         Return the target zone ID.
@@ -429,21 +682,60 @@ class ThermostatClass(
         Detect if kumolocal devices are available on the local network.
 
         Updates kumolocal_config.metadata with detected network information.
+        The result is checkpointed, see discovery_checkpoint, so a warm
+        start or reconnect skips the probes.  A stale checkpoint is
+        revalidated in the background, discovery therefore only returns its
+        result, which is applied here.
 
         inputs:
             None
         returns:
             None (updates metadata dict)
         """
+        kc_uname = getattr(self, "kc_uname", None)
+        local_net = discovery_checkpoint.get_checkpoint().get_or_discover(
+            f"{kumolocal_config.ALIAS}:{kc_uname}",
+            {
+                "account": kc_uname,
+                "zones": {
+                    zone_number: {
+                        "zone_name": zone_meta.get("zone_name"),
+                        "ip_address": zone_meta.get("ip_address"),
+                    }
+                    for zone_number, zone_meta in kumolocal_config.metadata.items()
+                },
+            },
+            self._discover_local_network,
+        )
+        if local_net is not None:
+            # a checkpoint or a fresh detection
+            for zone_number, zone_meta in local_net.items():
+                if int(zone_number) in kumolocal_config.metadata:
+                    kumolocal_config.metadata[int(zone_number)].update(zone_meta)
+
+    def _discover_local_network(self):
+        """
+        Probe the kumolocal devices on the local network.
+
+        inputs:
+            None
+        returns:
+            (dict): zone number -> {"host_name", "local_net_available"}
+                    to apply to kumolocal_config.metadata, None if
+                    detection failed.
+        """
+        local_net = {}
         try:
             serial_num_lst = self._get_indoor_units_list()
             if not serial_num_lst:
-                return
+                return None
 
-            self._check_zones_availability(serial_num_lst)
+            self._check_zones_availability(serial_num_lst, local_net)
 
         except Exception as exc:
             self._handle_detection_error(exc)
+            return None
+        return local_net
 
     def _get_indoor_units_list(self):
         """Get list of indoor units."""
@@ -458,12 +750,33 @@ class ThermostatClass(
 
         return serial_num_lst
 
-    def _check_zones_availability(self, serial_num_lst):
-        """Check availability for each discovered device."""
+    def _check_zones_availability(self, serial_num_lst, local_net):
+        """Check availability for each discovered device into local_net."""
+        # probe every unit at once, one dead unit should cost one timeout
+        probes = {}
+        for serial_number in serial_num_lst:
+            local_address = self.get_address(serial_number)
+            if self._has_valid_local_address(local_address):
+                device_name = self.get_name(serial_number)
+                probes[("host", device_name, local_address)] = (
+                    self._get_host_probe(device_name, local_address)
+                )
+        _probe_cache.probe_all(probes)
+
         for serial_number in serial_num_lst:
-            self._process_zone_availability(serial_number)
+            self._process_zone_availability(serial_number, local_net)
+
+    def _get_host_probe(self, device_name, local_address):
+        """Return a local net presence probe of one device."""
+        return functools.partial(
+            util.is_host_on_local_net,
+            host_name=device_name,
+            ip_address=local_address,
+            verbose=self.verbose,
+            use_cache=True,
+        )
 
-    def _process_zone_availability(self, serial_number):
+    def _process_zone_availability(self, serial_number, local_net):
         """Process availability check for a single discovered device."""
         local_address = self.get_address(serial_number)
         device_name = self.get_name(serial_number)
@@ -479,30 +792,37 @@ class ThermostatClass(
             return
 
         if self._has_valid_local_address(local_address):
-            self._check_and_update_available_zone(zone_idx, device_name, local_address)
+            self._check_and_update_available_zone(
+                zone_idx, device_name, local_address, local_net
+            )
         else:
-            self._update_unavailable_zone(zone_idx, device_name)
+            self._update_unavailable_zone(zone_idx, device_name, local_net)
 
     def _has_valid_local_address(self, local_address):
         """Check if local address is valid."""
         return local_address and local_address != "0.0.0.0"
 
-    def _check_and_update_available_zone(self, zone_idx, device_name, local_address):
+    def _check_and_update_available_zone(
+        self, zone_idx, device_name, local_address, local_net
+    ):
         """Check and update zone with valid local address."""
-        is_available, detected_ip = util.is_host_on_local_net(
-            host_name=device_name,
-            ip_address=local_address,
-            verbose=self.verbose,
-        )
+        key = ("host", device_name, local_address)
+        is_available, detected_ip = _probe_cache.probe_all(
+            {key: self._get_host_probe(device_name, local_address)}
+        )[key]
 
         if self.verbose:
             print(f"is_available={is_available}, detected_ip={detected_ip}")
 
-        self._update_zone_metadata(zone_idx, device_name, local_address, is_available)
+        self._update_zone_metadata(
+            zone_idx, device_name, local_address, is_available, local_net
+        )
 
-    def _update_zone_metadata(self, zone_idx, device_name, local_address, is_available):
-        """Update zone metadata with detection results."""
-        zone_meta = kumolocal_config.metadata[zone_idx]
+    def _update_zone_metadata(
+        self, zone_idx, device_name, local_address, is_available, local_net
+    ):
+        """Record zone detection results in local_net."""
+        zone_meta = local_net.setdefault(zone_idx, {})
         zone_meta["host_name"] = device_name
         zone_meta["local_net_available"] = is_available
 
@@ -515,10 +835,9 @@ class ThermostatClass(
                 func_name=1,
             )
 
-    def _update_unavailable_zone(self, zone_idx, device_name):
-        """Update zone metadata for unavailable zone."""
-        zone_meta = kumolocal_config.metadata[zone_idx]
-        zone_meta["local_net_available"] = False
+    def _update_unavailable_zone(self, zone_idx, device_name, local_net):
+        """Record an unavailable zone in local_net."""
+        local_net.setdefault(zone_idx, {})["local_net_available"] = False
 
         if self.verbose:
             util.log_msg(
@@ -547,7 +866,7 @@ class ThermostatClass(
                 mode=util.BOTH_LOG,
                 func_name=1,
             )
-            time.sleep(10)
+            clock.sleep(10)
             return list(self.get_indoor_units())
 
     def _validate_kumocloud_serial_numbers(self, serial_num_lst):
@@ -667,6 +986,9 @@ class ThermostatClass(
                 func=_get_metadata_internal,
                 thermostat_type=getattr(self, "thermostat_type", "KumoLocal"),
                 zone_name=str(getattr(self, "zone_name", zone)),
+                endpoint=util.get_device_endpoint(
+                    _get_metadata_internal, getattr(self, "zone_name", zone)
+                ),
                 number_of_retries=5,
                 initial_retry_delay_sec=60,
                 exception_types=(
@@ -735,6 +1057,9 @@ class ThermostatClass(
                 func=_get_metadata_internal,
                 thermostat_type="KumoLocal",
                 zone_name=str(getattr(self, "zone_name", "unknown")),
+                endpoint=util.get_device_endpoint(
+                    _get_metadata_internal, getattr(self, "zone_name", "unknown")
+                ),
                 number_of_retries=5,
                 initial_retry_delay_sec=60,
                 exception_types=(
@@ -802,7 +1127,7 @@ class ThermostatZone(tc.ThermostatCommonZone):
 
         # server data cache expiration parameters
         self.fetch_interval_sec = 60  # age of server data before refresh
-        self.last_fetch_time = time.time() - 2 * self.fetch_interval_sec
+        self.last_fetch_time = clock.time() - 2 * self.fetch_interval_sec
 
         # switch config for this thermostat
         self.system_switch_position[tc.ThermostatCommonZone.COOL_MODE] = "cool"
@@ -1148,7 +1473,7 @@ class ThermostatZone(tc.ThermostatCommonZone):
         returns:
             None, device_id object is refreshed.
         """
-        now_time = time.time()
+        now_time = clock.time()
         # refresh if past expiration date or force_refresh option
         if force_refresh or (
             now_time >= (self.last_fetch_time + self.fetch_interval_sec)
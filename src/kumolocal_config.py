@@ -43,6 +43,12 @@ supported_configs = {
 # Path to INI file with local IP addresses (relative to project root)
 INI_FILE = "kumolocal.ini"
 
+# local network probes of the indoor units, see kumolocal.UnitProbeCache
+PROBE_MAX_WORKERS = 8  # units probed at once
+PROBE_DEADLINE_SEC = 5.0  # longest wait for one batch of probes
+PROBE_TTL_SEC = 600  # trust a successful probe this long
+PROBE_FAILED_TTL_SEC = 60  # re-probe a unit that failed after this long
+
 
 # metadata dict
 # 'zone_name' is a placeholder, used at Thermostat class level.
@@ -0,0 +1,292 @@
+"""
+Read the supervisor logs in ./data without loading whole files.
+
+A log <name>.txt is rotated by utilities.log_rotate_file() to
+<name>-<date>.txt, so a log's history is its rotated files, oldest
+first, followed by the current file.  This module treats that sequence
+as one byte stream:
+
+  * tail_lines() returns the last lines, searching backwards for line
+    ends through mmap, spanning into rotated files when the current file
+    is short,
+  * read_range() returns a byte range of the stream, offsets stay valid
+    across rotations since rotation renames, never rewrites, a file,
+  * follow() yields bytes appended after an offset, e.g. for a web page
+    that follows the log.
+
+Memory and time scale with the bytes returned, not with the log size.
+"""
+
+# built-in imports
+import datetime
+import glob
+import mmap
+import os
+import re
+
+# local imports
+from src import clock
+from src import utilities as util
+
+MAX_TAIL_LINES = 10000  # largest tail served
+MAX_RANGE_BYTES = 2**20  # largest byte range served
+FOLLOW_POLL_SEC = 1.0  # follow() checks for new bytes this often
+FOLLOW_MAX_SEC = 300  # follow() ends after this long
+
+# log names served, no paths
+LOG_NAME_PATTERN = re.compile(r"^[\w.-]+\.txt$")
+
+
+class LogNotFoundError(FileNotFoundError):
+    """Log name is not valid or the log has no files."""
+
+
+def get_log_path(log_name):
+    """
+    Return the path of the current file of a log.
+
+    inputs:
+        log_name(str): log file name in ./data, e.g. "supervise_log.txt".
+    returns:
+        (str): file path.
+    raises:
+        LogNotFoundError: log_name is not a plain log file name.
+    """
+    if not LOG_NAME_PATTERN.match(log_name) or log_name.startswith("."):
+        raise LogNotFoundError(f"invalid log name '{log_name}'")
+    return util.get_full_file_path(log_name)
+
+
+def parse_rotated_name(file_name):
+    """
+    Split the name of a rotated log file.
+
+    inputs:
+        file_name(str): file name, e.g. "supervise_log-01-Jan-2026-10-00-00.txt".
+    returns:
+        (tuple): (log name, rotation datetime), None if not a rotated file.
+    """
+    parts = file_name[:-4].rsplit("-", 6)
+    if not file_name.endswith(".txt") or len(parts) != 7:
+        return None
+    try:
+        rotated_at = datetime.datetime.strptime(
+            "-".join(parts[1:]), util.LOG_ROTATE_DATE_FORMAT
+        )
+    except ValueError:
+        return None
+    return parts[0] + ".txt", rotated_at
+
+
+def get_log_files(log_name):
+    """
+    Return the files of a log, oldest first.
+
+    inputs:
+        log_name(str): log file name in ./data.
+    returns:
+        (list): file paths, rotated files by date then the current file.
+    """
+    full_path = get_log_path(log_name)
+    rotated = []
+    for path in glob.glob(glob.escape(full_path[:-4]) + "-*.txt"):
+        parsed = parse_rotated_name(os.path.basename(path))
+        # skip other logs sharing the name prefix
+        if parsed is not None and parsed[0] == log_name:
+            rotated.append((parsed[1], path))
+    files = [path for _, path in sorted(rotated)]
+    if os.path.exists(full_path):
+        files.append(full_path)
+    return files
+
+
+def list_logs():
+    """
+    Return the logs in ./data with the number and size of their files.
+
+    inputs:
+        None
+    returns:
+        (dict): log name -> {"files": int, "size": int}.
+    """
+    log_names = set()
+    for path in glob.glob(os.path.join(util.FILE_PATH, "*.txt")):
+        file_name = os.path.basename(path)
+        parsed = parse_rotated_name(file_name)
+        log_name = file_name if parsed is None else parsed[0]
+        if LOG_NAME_PATTERN.match(log_name):
+            log_names.add(log_name)
+    logs = {}
+    for log_name in sorted(log_names):
+        files = get_log_files(log_name)
+        logs[log_name] = {
+            "files": len(files),
+            "size": sum(_get_size(path) for path in files),
+        }
+    return logs
+
+
+def _get_size(path):
+    """Return the size of a file, 0 if it was rotated away meanwhile."""
+    try:
+        return os.path.getsize(path)
+    except FileNotFoundError:
+        return 0
+
+
+def _map_file(log_file):
+    """Return a read-only mmap of an open file, None if it is empty."""
+    if os.fstat(log_file.fileno()).st_size == 0:
+        return None  # an empty file cannot be mapped
+    return mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _find_tail_start(mapped, num_lines):
+    """
+    Return (offset, lines) of the start of the last num_lines lines.
+
+    lines is the number of lines found, fewer than num_lines if the whole
+    file is shorter.
+    """
+    end = len(mapped)
+    # a final line end terminates the last line, it does not start one
+    pos = end - 1 if mapped[end - 1:end] == b"\n" else end
+    found = 0
+    while found < num_lines:
+        line_end = mapped.rfind(b"\n", 0, pos)
+        found += 1
+        if line_end < 0:
+            return 0, found
+        pos = line_end
+    return pos + 1, found
+
+
+def _read_log(log_name, read_func, *args):
+    """
+    Run read_func(files, *args) on the files of a log.
+
+    A file rotated between listing and opening is not found, the read
+    is repeated once on a fresh listing.
+    """
+    for attempt in range(2):
+        files = get_log_files(log_name)
+        if not files:
+            raise LogNotFoundError(f"log '{log_name}' not found")
+        try:
+            return read_func(files, *args)
+        except FileNotFoundError:
+            if attempt:
+                raise
+    return None  # not reached
+
+
+def tail_lines(log_name, num_lines):
+    """
+    Return the last lines of a log, spanning rotated files.
+
+    inputs:
+        log_name(str): log file name in ./data.
+        num_lines(int): number of lines, at most MAX_TAIL_LINES.
+    returns:
+        (bytes): lines, oldest first.
+    raises:
+        LogNotFoundError: log has no files.
+    """
+    num_lines = max(0, min(int(num_lines), MAX_TAIL_LINES))
+    return _read_log(log_name, _tail_files, num_lines)
+
+
+def _tail_files(files, num_lines):
+    """Return the last num_lines lines of files."""
+    chunks = []
+    for path in reversed(files):
+        if num_lines <= 0:
+            break
+        with open(path, "rb") as log_file:
+            mapped = _map_file(log_file)
+            if mapped is None:
+                continue
+            with mapped:
+                start, found = _find_tail_start(mapped, num_lines)
+                chunks.append(mapped[start:])
+        num_lines -= found
+    return b"".join(reversed(chunks))
+
+
+def read_range(log_name, offset, length=MAX_RANGE_BYTES):
+    """
+    Return a byte range of a log, spanning rotated files.
+
+    inputs:
+        log_name(str): log file name in ./data.
+        offset(int): offset in the log's byte stream, negative counts
+                     from the end.
+        length(int): number of bytes, at most MAX_RANGE_BYTES.
+    returns:
+        (tuple): (bytes read, offset of the first byte read, log size).
+    raises:
+        LogNotFoundError: log has no files.
+    """
+    length = max(0, min(int(length), MAX_RANGE_BYTES))
+    return _read_log(log_name, _read_files, int(offset), length)
+
+
+def _read_files(files, offset, length):
+    """Return (bytes, offset, size) of a byte range of files."""
+    sizes = [os.path.getsize(path) for path in files]
+    total_size = sum(sizes)
+    if offset < 0:
+        offset = max(0, total_size + offset)
+    offset = min(offset, total_size)
+    remaining = length
+    chunks = []
+    file_start = 0
+    for path, size in zip(files, sizes):
+        file_end = file_start + size
+        if remaining > 0 and offset < file_end:
+            start = max(offset, file_start) - file_start
+            with open(path, "rb") as log_file:
+                mapped = _map_file(log_file)
+                if mapped is not None:
+                    with mapped:
+                        chunk = mapped[start:min(size, start + remaining)]
+                    chunks.append(chunk)
+                    remaining -= len(chunk)
+        file_start = file_end
+    return b"".join(chunks), offset, total_size
+
+
+def follow(
+    log_name,
+    offset=None,
+    poll_sec=FOLLOW_POLL_SEC,
+    max_sec=FOLLOW_MAX_SEC,
+    stop_event=None,
+):
+    """
+    Yield bytes appended to a log.
+
+    inputs:
+        log_name(str): log file name in ./data.
+        offset(int): stream offset to start at, None starts at the end.
+        poll_sec(float): delay between checks for new bytes.
+        max_sec(float): stop following after this long.
+        stop_event(threading.Event): set to stop following, or None.
+    returns:
+        (generator): bytes, empty on a poll that found none.
+    """
+    if offset is None:
+        _, _, offset = read_range(log_name, 0, 0)
+    deadline = clock.monotonic() + max_sec
+    while True:
+        data, start, _ = read_range(log_name, offset)
+        offset = start + len(data)
+        yield data
+        if len(data) == MAX_RANGE_BYTES:
+            continue  # more is waiting
+        if clock.monotonic() >= deadline:
+            return
+        if stop_event is None:
+            clock.sleep(poll_sec)
+        elif clock.wait(stop_event, poll_sec):
+            return
@@ -6,14 +6,16 @@ connection to 3m50 thermoststat on local net.
 import datetime
 import pprint
 import socket
-import time
 import traceback
 import urllib
+import urllib.parse
 
 # third-party imports
 from dns.exception import DNSException
 
 # local imports
+from src import clock
+from src import dns_cache
 from src import environment as env
 from src import mmm_config
 from src import thermostat_api as api
@@ -60,21 +62,55 @@ class ThermostatClass(tc.ThermostatCommon):
         # use hard-coded IP address if provided, otherwise
         # use host dns lookup
         self.host_name = mmm_config.metadata[self.zone_name]["host_name"]
-        # populate IP address from metadata dict.
-        if "ip_address" in mmm_config.metadata[self.zone_name]:
+        self.ip_from_dns = False
+        # populate IP address from base URL override or metadata dict.
+        # radiotherm builds "http://<ip_address>/<path>" so host:port works.
+        base_url = env.get_base_url(mmm_config.BASE_URL_ENV_KEY, None)
+        if base_url:
+            self.ip_address = urllib.parse.urlsplit(base_url).netloc
+        elif "ip_address" in mmm_config.metadata[self.zone_name]:
             self.ip_address = mmm_config.metadata[self.zone_name]["ip_address"]
         else:
             # get IP address from DNS lookup on local net.
-            ip_status, self.ip_address = util.is_host_on_local_net(
-                self.host_name, verbose=True
-            )
-            if not ip_status:
-                raise DNSException(
-                    f"failed to resolve ip address for 3m thermostat "
-                    f"'{self.host_name}'"
-                )
+            self.ip_address = self.resolve_ip_address()
+            self.ip_from_dns = True
         self.device_id = self.get_target_zone_id()
 
+    def resolve_ip_address(self) -> str:
+        """
+        Return the IP address of this zone's host name.
+
+        Lookups go through the shared DNS cache, so reconnects reuse the
+        cached address, and fall back to the last known address if DNS is
+        down.
+
+        inputs:
+            None
+        returns:
+            (str): IP address.
+        """
+        cache = dns_cache.get_dns_cache()
+        if mmm_config.resolve_all_zones_at_startup:
+            cache.resolve_all(
+                [
+                    meta["host_name"]
+                    for meta in mmm_config.metadata.values()
+                    if "ip_address" not in meta
+                ]
+            )
+        ip_address = cache.resolve(self.host_name, use_last_known_good=True)
+        if ip_address is None:
+            raise DNSException(
+                f"failed to resolve ip address for 3m thermostat "
+                f"'{self.host_name}'"
+            )
+        util.log_msg(
+            f"host {self.host_name} found at {ip_address} on local net",
+            mode=util.DEBUG_LOG + util.STDOUT_LOG,
+            func_name=1,
+        )
+        return ip_address
+
     def get_target_zone_id(self) -> object:
         """
         Return the target zone ID from the
@@ -90,12 +126,46 @@ class ThermostatClass(tc.ThermostatCommon):
             # type: ignore[attr-defined]
             self.device_id = radiotherm.get_thermostat(self.ip_address)
         except urllib.error.URLError as ex:  # type: ignore[attr-defined]
-            raise RuntimeError(
-                f"FATAL ERROR: 3m thermostat not found at ip address: "
-                f"{self.ip_address}"
-            ) from ex
+            # the cached address may be stale, look the host up once more
+            if not self._refresh_ip_address():
+                raise RuntimeError(
+                    f"FATAL ERROR: 3m thermostat not found at ip address: "
+                    f"{self.ip_address}"
+                ) from ex
+            try:
+                # type: ignore[attr-defined]
+                self.device_id = radiotherm.get_thermostat(self.ip_address)
+            except urllib.error.URLError as retry_ex:  # type: ignore[attr-defined]
+                raise RuntimeError(
+                    f"FATAL ERROR: 3m thermostat not found at ip address: "
+                    f"{self.ip_address}"
+                ) from retry_ex
         return self.device_id
 
+    def _refresh_ip_address(self) -> bool:
+        """
+        Drop a failed cached address and resolve the host name again.
+
+        inputs:
+            None
+        returns:
+            (bool): True if the host moved to a new address.
+        """
+        if not self.ip_from_dns:
+            return False
+        cache = dns_cache.get_dns_cache()
+        cache.invalidate(self.host_name)
+        ip_address = cache.resolve(self.host_name)
+        if ip_address is None or ip_address == self.ip_address:
+            return False
+        util.log_msg(
+            f"host {self.host_name} moved from {self.ip_address} to {ip_address}",
+            mode=util.BOTH_LOG,
+            func_name=1,
+        )
+        self.ip_address = ip_address
+        return True
+
     def print_all_thermostat_metadata(self, zone):
         """
         Return initial meta data queried from thermostat.
@@ -181,6 +251,7 @@ class ThermostatClass(tc.ThermostatCommon):
                 func=_get_metadata_internal,
                 thermostat_type=self.thermostat_type,
                 zone_name=str(zone),
+                endpoint=util.get_device_endpoint(_get_metadata_internal, zone),
                 number_of_retries=5,
                 initial_retry_delay_sec=30,
                 exception_types=(
@@ -403,6 +474,9 @@ class ThermostatZone(tc.ThermostatCommonZone):
                 func=_get_tmode_internal,
                 thermostat_type=self.thermostat_type,
                 zone_name=str(self.zone_name),
+                endpoint=util.get_device_endpoint(
+                    _get_tmode_internal, self.zone_name
+                ),
                 number_of_retries=5,
                 initial_retry_delay_sec=60,
                 exception_types=(AttributeError, ConnectionError, TimeoutError),
@@ -419,7 +493,7 @@ class ThermostatZone(tc.ThermostatCommonZone):
                         "WARNING: AttributeError while querying tstat.tmode, "
                         "retrying after brief delay..."
                     )
-                    time.sleep(10)
+                    clock.sleep(10)
                     tmode = self._get_tmode(retries - 1)
                 else:
                     raise ex
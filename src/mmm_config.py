@@ -9,6 +9,10 @@ ALIAS = "mmm50"
 MAIN_3M50 = 0  # zone 0
 BASEMENT_3M50 = 1  # zone 1
 
+# override env var points all zones at a stand-in server, e.g.
+# "http://127.0.0.1:8081", instead of the metadata host/IP address.
+BASE_URL_ENV_KEY = "MMM_BASE_URL"
+
 # all environment variables specific to this thermostat type
 env_variables = {}
 
@@ -24,6 +28,12 @@ supported_configs = {
     "zip_code": "55760",  # Zip code for outdoor weather data
 }
 
+# resolve every zone's host_name concurrently when the first zone connects
+resolve_all_zones_at_startup = True
+
+# radiotherm sockets have no timeout, abandon a local call after this long
+CALL_DEADLINE_SEC = 30
+
 # metadata dict
 # 'zone_name' is returned by self.get_zone_name
 # 'host_name' is used for dns lookup of IP address for each zone
@@ -18,9 +18,12 @@ import oauthlib.oauth2.rfc6749.errors
 import requests
 
 # local imports
+from src import clock
 from src import nest_config
+from src import request_governor
 from src import thermostat_api as api
 from src import thermostat_common as tc
+from src import token_manager
 from src import environment as env
 from src import utilities as util
 
@@ -118,6 +121,35 @@ class ThermostatClass(tc.ThermostatCommon):
         self.device_id = self.get_target_zone_id(self.zone_number)
         self.serial_number = None  # will be populated when unit is queried.
 
+        # refresh the access token in the background before it expires,
+        # once per account, oauthlib checks the expiry against time.time()
+        self.token_key = f"{self.thermostat_type}:{self.client_id}"
+        expires_at = self._get_token_expiry()
+        if expires_at is not None:
+            manager = token_manager.get_token_manager()
+            manager.add_peer(self.token_key, self)
+            manager.register(
+                self.token_key, self.refresh_oauth_token, expires_at, time.time
+            )
+
+    def _get_token_expiry(self):
+        """
+        Return the expiry time of the in-memory access token.
+
+        inputs:
+            None
+        returns:
+            (float or None): expiry epoch time, None if unknown.
+        """
+        client = getattr(self.thermostat_obj, "_client", None)
+        token = getattr(client, "token", None)
+        if not isinstance(token, dict):
+            return None
+        expires_at = token.get("expires_at")
+        if not isinstance(expires_at, (int, float)):
+            return None
+        return float(expires_at)
+
     def _create_token_cache_from_env_if_needed(self):
         """
         Create token cache file from environment variables if it doesn't exist
@@ -189,7 +221,7 @@ class ThermostatClass(tc.ThermostatCommon):
         """
         if cls._shared_devices_cache is None:
             return False
-        return (time.time() - cls._shared_devices_cache_time) < cache_period_sec
+        return (clock.time() - cls._shared_devices_cache_time) < cache_period_sec
 
     @staticmethod
     def _is_rate_limit_error(error: Exception) -> bool:
@@ -222,7 +254,7 @@ class ThermostatClass(tc.ThermostatCommon):
             None
         """
         ThermostatClass._shared_devices_cache = self.devices
-        ThermostatClass._shared_devices_cache_time = time.time()
+        ThermostatClass._shared_devices_cache_time = clock.time()
 
     def get_device_data(self, force_refresh: bool = False):
         """
@@ -240,6 +272,7 @@ class ThermostatClass(tc.ThermostatCommon):
             self.devices = ThermostatClass._shared_devices_cache
             return self.devices
 
+        self._acquire_request_budget(request_governor.READ)
         try:
             self.devices = self.thermostat_obj.get_devices()
         except oauthlib.oauth2.rfc6749.errors.InvalidGrantError as e:
@@ -252,6 +285,7 @@ class ThermostatClass(tc.ThermostatCommon):
             # After successful refresh, reload token and retry
             self._reload_token_from_cache()
             print("Retrying get_devices() with refreshed token...")
+            self._acquire_request_budget(request_governor.READ)
             self.devices = self.thermostat_obj.get_devices()
         except Exception as e:
             if self._is_rate_limit_error(e):
@@ -262,9 +296,10 @@ class ThermostatClass(tc.ThermostatCommon):
                         "Nest ListDevices is rate limited, retrying in "
                         f"{retry_delay_sec} second(s)..."
                     )
-                    time.sleep(retry_delay_sec)
+                    clock.sleep(retry_delay_sec)
                     retry_delay_sec *= 2
                     try:
+                        self._acquire_request_budget(request_governor.READ)
                         self.devices = self.thermostat_obj.get_devices()
                         self._store_shared_device_cache()
                         return self.devices
@@ -278,7 +313,7 @@ class ThermostatClass(tc.ThermostatCommon):
                         "device data."
                     )
                     self.devices = ThermostatClass._shared_devices_cache
-                    ThermostatClass._shared_devices_cache_time = time.time()
+                    ThermostatClass._shared_devices_cache_time = clock.time()
                     return self.devices
                 print(traceback.format_exc())
                 raise
@@ -288,6 +323,21 @@ class ThermostatClass(tc.ThermostatCommon):
         # TODO is there a chance that meta data changes?
         return self.devices
 
+    def _acquire_request_budget(self, priority):
+        """
+        Wait for the request budget shared by zones of this OAuth client.
+
+        inputs:
+            priority(str): request_governor.READ or request_governor.WRITE.
+        returns:
+            None
+        """
+        request_governor.get_governor(
+            nest_config.ALIAS,
+            getattr(self, "client_id", None),
+            nest_config.REQUEST_BUDGET,
+        ).acquire(priority)
+
     def _reload_token_from_cache(self):
         """
         Reload OAuth token from cache file into the thermostat client.
@@ -316,10 +366,14 @@ class ThermostatClass(tc.ThermostatCommon):
         """
         Refreshes the OAuth2 access token using the provided client credentials and
         refresh token.
+
+        The token file is replaced atomically and the in-memory client token
+        is updated, so the next API call does not hit an expired token.
         Args:
             None
         Returns:
-            None, refresh token and token file are updated.
+            (float): new access token expiry epoch time, refresh token,
+                     token file and client token are updated.
         """
 
         # Read refresh tokenfrom from file
@@ -342,6 +396,7 @@ class ThermostatClass(tc.ThermostatCommon):
 
         authorization_url = "https://www.googleapis.com/oauth2/v4/token"
 
+        self._acquire_request_budget(request_governor.WRITE)
         r = requests.post(authorization_url, data=params, timeout=10)
 
         if r.ok:
@@ -364,10 +419,21 @@ class ThermostatClass(tc.ThermostatCommon):
             # Update expiration time if provided
             if "expires_in" in response_data:
                 data["expires_in"] = response_data["expires_in"]
+            data["expires_at"] = time.time() + data.get("expires_in", 3600)
 
             # Write JSON back to file
-            with open(self.access_token_cache_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=4)
+            util.write_json_atomic(self.access_token_cache_file, data)
+
+            # Update the in-memory client token of every zone of the account
+            peers = token_manager.get_token_manager().get_peers(
+                getattr(self, "token_key", None)
+            )
+            for zone in set(peers) | {self}:
+                thermostat_obj = getattr(zone, "thermostat_obj", None)
+                client = getattr(thermostat_obj, "_client", None)
+                if client is not None:
+                    client.token = dict(data)
+            return data["expires_at"]
         else:
             print(f"ERROR: {r.status_code}")
             print(f"ERROR: {r.text}")
@@ -534,7 +600,7 @@ class ThermostatZone(tc.ThermostatCommonZone):
         # server data cache expiration parameters
         # Use cache period from config to avoid spamming nest server
         self.fetch_interval_sec = nest_config.cache_period_sec
-        self.last_fetch_time = time.time() - 2 * self.fetch_interval_sec
+        self.last_fetch_time = clock.time() - 2 * self.fetch_interval_sec
         self.last_printed_refresh_time = None  # track last printed cache message time
 
         # switch config for this thermostat
@@ -591,6 +657,7 @@ class ThermostatZone(tc.ThermostatCommonZone):
         )
 
         # will trigger a request to POST the cmd
+        self.Thermostat._acquire_request_budget(request_governor.WRITE)
         result = devices[self.zone_number].send_cmd(cmd_name, {par_name: par_value})
         return result
 
@@ -993,7 +1060,7 @@ class ThermostatZone(tc.ThermostatCommonZone):
         returns:
             None, device object is refreshed.
         """
-        now_time = time.time()
+        now_time = clock.time()
         # refresh if past expiration date or force_refresh option
         if force_refresh or (
             now_time >= (self.last_fetch_time + self.fetch_interval_sec)
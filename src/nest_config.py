@@ -14,6 +14,15 @@ GARAGE = 3  # zone 3
 MAX_HEAT_SETPOINT = 69.0
 MIN_COOL_SETPOINT = 70.0
 
+# request budget per OAuth client shared by all zones, see request_governor.py
+# Device Access rate limits API calls per user, stay well below the limit
+REQUEST_BUDGET = {
+    "rate_per_min": 5.0,
+    "burst": 4,
+    "write_reserve": 1,
+    "read_max_wait_sec": 120,
+}
+
 # Safety temperature settings
 # These are used when thermostat is OFF and normal setpoints are unavailable
 # Users can adjust these values based on their comfort and safety requirements
@@ -0,0 +1,228 @@
+"""
+Token-bucket request governor per vendor account.
+
+Every zone of a site that logs into the same vendor account shares one
+request budget, so N zones polling together cannot exceed the rate the
+vendor tolerates before it starts returning 429s or locking the account.
+
+Each account gets a bucket holding up to `burst` tokens that refills at
+`rate_per_min` tokens per minute on the active clock (see clock.py).  A
+request takes one token:
+
+  * WRITE requests (control changes and logins) may use every token.
+  * READ requests (polling) must leave `write_reserve` tokens in the
+    bucket and wait while any write is waiting, so a setpoint change is
+    never starved by polling traffic.
+
+A caller that cannot get a token waits for the refill.  If the wait would
+exceed `read_max_wait_sec` (reads only by default) the call is deferred
+with utilities.RequestDeferredError instead, which the extended retry
+loop treats like a short-circuited trial.
+
+Remaining tokens and grant counters per account are reported by
+get_metrics().
+"""
+
+# built-in imports
+import collections
+import threading
+
+# local imports
+from src import clock
+from src import utilities as util
+
+READ = "read"
+WRITE = "write"
+PRIORITIES = [READ, WRITE]
+
+# default budget, override per vendor with <vendor>_config.REQUEST_BUDGET
+DEFAULT_BUDGET = {
+    "rate_per_min": 30.0,  # sustained requests per minute
+    "burst": 10,  # bucket size
+    "write_reserve": 2,  # tokens reads must leave for writes
+    "read_max_wait_sec": None,  # None waits for a token, 0 never waits
+    "write_max_wait_sec": None,
+}
+
+# shortest sleep while waiting for a token
+MIN_WAIT_SEC = 0.05
+
+
+class RequestGovernor:
+    """Token bucket shared by every caller of one vendor account."""
+
+    def __init__(self, thermostat_type, account, budget=None):
+        """
+        Constructor.
+
+        inputs:
+            thermostat_type(str): thermostat type.
+            account(str): vendor account name, e.g. the login username.
+            budget(dict): overrides of DEFAULT_BUDGET keys.
+        """
+        self.thermostat_type = thermostat_type
+        self.account = account
+        self.budget = dict(DEFAULT_BUDGET)
+        self.budget.update(budget or {})
+        if self.budget["rate_per_min"] <= 0 or self.budget["burst"] < 1:
+            raise ValueError(
+                f"invalid request budget for {thermostat_type} account "
+                f"'{account}': {self.budget}"
+            )
+        self.rate_per_sec = self.budget["rate_per_min"] / 60.0
+        self.burst = float(self.budget["burst"])
+        self.write_reserve = min(float(self.budget["write_reserve"]), self.burst - 1.0)
+        self.tokens = self.burst
+        self.refill_time = clock.monotonic()
+        self.waiting_writes = 0
+        self.stats = collections.Counter()
+        self._lock = threading.Lock()
+
+    def acquire(self, priority=READ, max_wait_sec=-1):
+        """
+        Take one token, waiting for the refill if the bucket is empty.
+
+        inputs:
+            priority(str): READ or WRITE.
+            max_wait_sec(float): longest wait before deferring the call,
+                                 None waits indefinitely, -1 uses the
+                                 budget's <priority>_max_wait_sec.
+        returns:
+            (float): seconds waited.
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(
+                f"request priority '{priority}' is not one of {PRIORITIES}"
+            )
+        if max_wait_sec == -1:
+            max_wait_sec = self.budget[f"{priority}_max_wait_sec"]
+        threshold = 1.0 if priority == WRITE else 1.0 + self.write_reserve
+        waited_sec = 0.0
+        with self._lock:
+            if priority == WRITE:
+                self.waiting_writes += 1
+        try:
+            while True:
+                with self._lock:
+                    self._refill()
+                    # reads queue behind every waiting write
+                    needed = threshold
+                    if priority == READ:
+                        needed += self.waiting_writes
+                    if needed == threshold and self.tokens >= threshold:
+                        self.tokens -= 1.0
+                        self.stats[f"granted_{priority}s"] += 1
+                        self.stats["wait_sec"] += waited_sec
+                        break
+                    wait_sec = max(
+                        MIN_WAIT_SEC, (needed - self.tokens) / self.rate_per_sec
+                    )
+                    over_wait = (
+                        max_wait_sec is not None
+                        and waited_sec + wait_sec > max_wait_sec
+                    )
+                    if over_wait:
+                        self.stats["deferred"] += 1
+                        raise util.RequestDeferredError(
+                            f"{self.thermostat_type} account '{self.account}' "
+                            f"request budget exhausted, {priority} deferred "
+                            f"({self.tokens:.1f} tokens left)"
+                        )
+                if waited_sec == 0.0:
+                    util.log_msg(
+                        f"{self.thermostat_type} account '{self.account}' request "
+                        f"budget exhausted, {priority} waiting {wait_sec:.1f} sec",
+                        mode=util.DEBUG_LOG,
+                        func_name=1,
+                    )
+                clock.sleep(wait_sec)
+                waited_sec += wait_sec
+        finally:
+            if priority == WRITE:
+                with self._lock:
+                    self.waiting_writes -= 1
+        return waited_sec
+
+    def get_remaining(self):
+        """
+        Return the tokens currently in the bucket.
+
+        inputs:
+            None
+        returns:
+            (float): remaining tokens rounded to 0.1.
+        """
+        with self._lock:
+            self._refill()
+            return round(self.tokens, 1)
+
+    def _refill(self):
+        """Add the tokens earned since the last refill, lock held."""
+        now = clock.monotonic()
+        elapsed_sec = max(0.0, now - self.refill_time)
+        self.tokens = min(self.burst, self.tokens + elapsed_sec * self.rate_per_sec)
+        self.refill_time = now
+
+
+# governors keyed by (thermostat_type, account)
+_governors = {}
+_governors_lock = threading.Lock()
+
+
+def get_governor(thermostat_type, account, budget=None):
+    """
+    Return the shared request governor of a vendor account.
+
+    inputs:
+        thermostat_type(str): thermostat type.
+        account(str): vendor account name.
+        budget(dict): budget overrides, only used on first access.
+    returns:
+        (RequestGovernor): governor shared by all zones and threads.
+    """
+    key = (thermostat_type, account)
+    with _governors_lock:
+        if key not in _governors:
+            _governors[key] = RequestGovernor(thermostat_type, account, budget)
+        return _governors[key]
+
+
+def reset_governors():
+    """
+    Discard all request governor state.
+
+    inputs:
+        None
+    returns:
+        None
+    """
+    with _governors_lock:
+        _governors.clear()
+
+
+def get_metrics():
+    """
+    Return the request budget metrics of every account.
+
+    inputs:
+        None
+    returns:
+        (dict): {"<thermostat_type>:<account>": {"remaining": tokens,
+                 "granted_reads": n, "granted_writes": n,
+                 "deferred": n, "wait_sec": sec}}.
+    """
+    with _governors_lock:
+        governors = list(_governors.values())
+    metrics = {}
+    for governor in governors:
+        remaining = governor.get_remaining()
+        with governor._lock:
+            stats = dict(governor.stats)
+        metrics[f"{governor.thermostat_type}:{governor.account}"] = {
+            "remaining": remaining,
+            "granted_reads": stats.get("granted_reads", 0),
+            "granted_writes": stats.get("granted_writes", 0),
+            "deferred": stats.get("deferred", 0),
+            "wait_sec": round(stats.get("wait_sec", 0.0), 1),
+        }
+    return metrics
@@ -0,0 +1,230 @@
+"""
+Vendor login sessions saved across reconnects and restarts.
+
+Supervision rebuilds the thermostat object every connection_time_sec and
+a cookie based login (e.g. Honeywell TCC) is slow and counts toward the
+vendor's login spam heuristics.  Drivers save the session state (cookies,
+ids) of a successful login here and try it again, after a cheap validity
+probe, before forcing a new login:
+
+  * states are kept in memory for reconnects within this process,
+  * with the optional cryptography package installed they are also saved
+    to ./data/session_store.json, encrypted with a key derived from the
+    account password, so a restart resumes the session and the file is
+    useless without the password,
+  * a state saved with another password is never returned, e.g. after a
+    password change.
+"""
+
+# built-in imports
+import base64
+import hashlib
+import json
+import os
+import threading
+
+# third party imports
+try:
+    from cryptography.fernet import Fernet, InvalidToken  # type: ignore
+except ImportError:
+    # sessions are still resumed within the process, not after a restart
+    Fernet = None
+    InvalidToken = ValueError
+
+# local imports
+from src import utilities as util
+
+SESSION_STORE_FILE = "session_store.json"  # under ./data
+KEY_DERIVATION_ITERATIONS = 100000  # PBKDF2 rounds of the file key
+SALT_BYTES = 16
+
+
+def get_secret_digest(secret):
+    """
+    Return a digest identifying a secret without storing it.
+
+    inputs:
+        secret(str): account password.
+    returns:
+        (str): hex digest.
+    """
+    return hashlib.sha256(secret.encode("utf-8")).hexdigest()
+
+
+class SessionStore:
+    """Login session states keyed by vendor account."""
+
+    def __init__(self, persist=True):
+        """
+        Constructor.
+
+        inputs:
+            persist(bool): load and save encrypted states in ./data,
+                           ignored if cryptography is not installed.
+        """
+        self.persist = persist and Fernet is not None
+        # key -> (secret digest, state)
+        self._states = {}
+        # key -> {"salt": str, "token": str} as saved in ./data
+        self._entries = {}
+        # (secret digest, salt) -> derived Fernet key
+        self._keys = {}
+        self._loaded = not self.persist
+        self._lock = threading.Lock()
+
+    def load(self, key, secret):
+        """
+        Return the saved session state of key.
+
+        inputs:
+            key(str): store key, e.g. "<thermostat_type>:<account>".
+            secret(str): account password the state was saved with.
+        returns:
+            (dict): session state, None if there is none for this secret.
+        """
+        digest = get_secret_digest(secret)
+        self._load()
+        with self._lock:
+            saved = self._states.get(key)
+            entry = self._entries.get(key)
+        if saved is not None:
+            return saved[1] if saved[0] == digest else None
+        if entry is None:
+            return None
+        try:
+            fernet = Fernet(self._get_file_key(secret, entry["salt"]))
+            state = json.loads(fernet.decrypt(entry["token"].encode("ascii")))
+        except (InvalidToken, KeyError, TypeError, ValueError):
+            # saved with another password or corrupted
+            return None
+        with self._lock:
+            self._states.setdefault(key, (digest, state))
+        return state
+
+    def save(self, key, secret, state):
+        """
+        Save the session state of key.
+
+        inputs:
+            key(str): store key.
+            secret(str): account password, keys the encryption.
+            state(dict): JSON serializable session state.
+        returns:
+            None
+        """
+        self._load()
+        with self._lock:
+            self._states[key] = (get_secret_digest(secret), state)
+            entry = self._entries.get(key)
+        if not self.persist:
+            return
+        salt = (entry or {}).get("salt") or base64.urlsafe_b64encode(
+            os.urandom(SALT_BYTES)
+        ).decode("ascii")
+        fernet = Fernet(self._get_file_key(secret, salt))
+        token = fernet.encrypt(json.dumps(state).encode("utf-8")).decode("ascii")
+        with self._lock:
+            self._entries[key] = {"salt": salt, "token": token}
+            entries = dict(self._entries)
+        self._save(entries)
+
+    def discard(self, key):
+        """
+        Forget the session state of key after it was found invalid.
+
+        inputs:
+            key(str): store key.
+        returns:
+            None
+        """
+        self._load()
+        with self._lock:
+            self._states.pop(key, None)
+            removed = self._entries.pop(key, None)
+            entries = dict(self._entries)
+        if removed is not None and self.persist:
+            self._save(entries)
+
+    def _get_file_key(self, secret, salt):
+        """Return the Fernet key derived from secret and salt."""
+        cache_key = (get_secret_digest(secret), salt)
+        with self._lock:
+            file_key = self._keys.get(cache_key)
+        if file_key is None:
+            file_key = base64.urlsafe_b64encode(
+                hashlib.pbkdf2_hmac(
+                    "sha256",
+                    secret.encode("utf-8"),
+                    base64.urlsafe_b64decode(salt),
+                    KEY_DERIVATION_ITERATIONS,
+                )
+            )
+            with self._lock:
+                self._keys[cache_key] = file_key
+        return file_key
+
+    def _load(self):
+        """Load persisted states on first use."""
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+        file_path = util.get_full_file_path(SESSION_STORE_FILE)
+        try:
+            with open(file_path, "r", encoding="utf-8") as store_file:
+                entries = json.load(store_file)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as ex:
+            util.log_msg(
+                f"ignoring unreadable session store {file_path}: {ex}",
+                mode=util.BOTH_LOG,
+                func_name=1,
+            )
+            return
+        with self._lock:
+            for key, entry in entries.items():
+                if isinstance(entry, dict) and {"salt", "token"} <= set(entry):
+                    self._entries.setdefault(key, entry)
+
+    def _save(self, entries):
+        """Write encrypted states to ./data atomically, owner-only."""
+        file_path = util.get_full_file_path(SESSION_STORE_FILE)
+        try:
+            util.write_json_atomic(file_path, entries)
+        except OSError as ex:
+            util.log_msg(
+                f"failed to save session store {file_path}: {ex}",
+                mode=util.BOTH_LOG,
+                func_name=1,
+            )
+
+
+# process-wide store shared by all zones
+_store = SessionStore()
+
+
+def get_store():
+    """
+    Return the process-wide session store.
+
+    inputs:
+        None
+    returns:
+        (SessionStore): shared store.
+    """
+    return _store
+
+
+def reset_store(persist=True):
+    """
+    Replace the process-wide session store with an empty one.
+
+    inputs:
+        persist(bool): see SessionStore.
+    returns:
+        (SessionStore): new store.
+    """
+    global _store  # noqa W603
+    _store = SessionStore(persist)
+    return _store
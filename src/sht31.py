@@ -15,12 +15,12 @@ data structure expected:
 import json
 import os
 import threading
-import time
 
 # third party imports
 import requests
 
 # local imports
+from src import clock
 from src import environment as env
 from src import sht31_config
 from src import thermostat_api as api
@@ -69,11 +69,12 @@ class ThermostatClass(tc.ThermostatCommon):
         self.measurements = "?measurements=" + str(sht31_config.MEASUREMENTS)
         # Type guard: ensure ip_address is not None before concatenation
         ip_addr = self.ip_address if self.ip_address is not None else "127.0.0.1"
+        base_url = env.get_base_url(
+            sht31_config.BASE_URL_ENV_KEY,
+            sht31_config.FLASK_URL_PREFIX + ip_addr + ":" + self.port,
+        )
         self.url = (
-            sht31_config.FLASK_URL_PREFIX
-            + ip_addr
-            + ":"
-            + self.port
+            base_url
             + self.path
             + self.measurements
             + self.unit_test_seed
@@ -353,6 +354,7 @@ class ThermostatClass(tc.ThermostatCommon):
             func=func,
             thermostat_type=self.thermostat_type,
             zone_name=str(self.zone_name),
+            endpoint=util.get_device_endpoint(func, self.zone_name),
             number_of_retries=5,
             initial_retry_delay_sec=self.retry_delay,
             exception_types=(
@@ -400,7 +402,7 @@ class ThermostatZone(tc.ThermostatCommonZone):
 
         # server data cache expiration parameters
         self.fetch_interval_sec = 5  # age of server data before refresh
-        self.last_fetch_time = time.time() - 2 * self.fetch_interval_sec
+        self.last_fetch_time = clock.time() - 2 * self.fetch_interval_sec
 
         self.tempfield = sht31_config.API_TEMPF_MEAN  # must match flask API
         self.humidityfield = sht31_config.API_HUMIDITY_MEAN  # must match API
@@ -513,6 +515,9 @@ class ThermostatZone(tc.ThermostatCommonZone):
             func=func,
             thermostat_type="SHT31",
             zone_name=str(getattr(self, "zone_name", "unknown")),
+            endpoint=util.get_device_endpoint(
+                func, getattr(self, "zone_name", "unknown")
+            ),
             number_of_retries=5,
             initial_retry_delay_sec=self.retry_delay,
             exception_types=(
@@ -669,7 +674,7 @@ class ThermostatZone(tc.ThermostatCommonZone):
         returns:
             None, cached data is refreshed.
         """
-        now_time = time.time()
+        now_time = clock.time()
         # refresh if past expiration date or force_refresh option
         if force_refresh or (
             now_time >= (self.last_fetch_time + self.fetch_interval_sec)
@@ -21,6 +21,8 @@ UNIT_TEST_ENV_KEY = "SHT31_REMOTE_IP_ADDRESS_" + str(UNIT_TEST_ZONE)
 FLASK_PORT = 5000  # note: ports below 1024 require root access on Linux
 FLASK_USE_HTTPS = False  # HTTPS requires a cert to be installed.
 FLASK_DEBUG_MODE = False  # True to enable flask debugging mode
+# override env var replaces "<prefix><ip>:<port>" with a stand-in server URL
+BASE_URL_ENV_KEY = "SHT31_BASE_URL"
 if FLASK_USE_HTTPS:
     # Import ssl_certificate module for generating certificates
     from src import ssl_certificate
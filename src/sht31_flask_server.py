@@ -332,6 +332,7 @@ class Sensors:
             _perform_i2c_read,
             thermostat_type="sht31",
             zone_name="sensor",
+            endpoint=util.get_device_endpoint(_perform_i2c_read, hex(i2c_addr)),
             number_of_retries=3,
             initial_retry_delay_sec=1,
             exception_types=(OSError,),
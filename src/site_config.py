@@ -13,6 +13,18 @@ env_variables = {}
 # min required env variables on all runs
 required_env_variables = {}
 
+# startup staggering defaults, override with the site config keys of the
+# same name in lower case
+STARTUP_RAMP_SEC = 0  # spread thread starts evenly over this many seconds
+PHASE_OFFSETS = True  # spread polls of one vendor across its poll period
+# logins in progress at once per vendor, override per vendor with
+# <vendor>_config.MAX_CONCURRENT_AUTH or the site config key
+# "max_concurrent_auth": {<thermostat_type>: <limit>}
+MAX_CONCURRENT_AUTH = 2
+# seconds in-flight vendor calls get to finish after a stop request before
+# their sessions are closed, override with "shutdown_grace_sec"
+SHUTDOWN_GRACE_SEC = 5
+
 
 def get_default_site_config():
     """
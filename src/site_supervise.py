@@ -7,10 +7,16 @@ supervision with concurrent monitoring of multiple thermostats.
 
 # built-ins
 import argparse
+import contextlib
+import signal
 import sys
+import threading
 
 # local imports
+from src import call_deadline
+from src import cassette
 from src import environment as env
+from src import request_governor
 from src import site_config
 from src import thermostat_site as ts
 from src import utilities as util
@@ -45,6 +51,10 @@ Examples:
 
   # Set custom measurement count for all thermostats
   python -m src.site_supervise -n 5
+
+  # Record vendor HTTP traffic, then replay it without network access
+  python -m src.site_supervise --cassette baseline --cassette-mode record
+  python -m src.site_supervise --cassette baseline --cassette-mode replay
         """,
     )
 
@@ -81,6 +91,13 @@ Examples:
         help="Disable multi-threading (run thermostats sequentially).",
     )
 
+    parser.add_argument(
+        "--full-supervision",
+        action="store_true",
+        help="Revert mode and setpoint deviations in every zone instead of "
+        "only polling (default: False).",
+    )
+
     parser.add_argument(
         "-v",
         "--verbose",
@@ -109,6 +126,29 @@ Examples:
         help="Display current temperatures and exit (no supervision).",
     )
 
+    parser.add_argument(
+        "--display-deadline",
+        type=float,
+        default=ts.DISPLAY_TEMPS_DEADLINE_SEC,
+        help="Longest wait in seconds for each thermostat with "
+        f"--display-temps (default: {ts.DISPLAY_TEMPS_DEADLINE_SEC}).",
+    )
+
+    parser.add_argument(
+        "--cassette",
+        type=str,
+        default=None,
+        help="Record or replay vendor HTTP traffic using cassette "
+        "./data/<CASSETTE>.cassette.json.gz.",
+    )
+
+    parser.add_argument(
+        "--cassette-mode",
+        choices=cassette.MODES,
+        default=cassette.REPLAY,
+        help="Cassette mode (default: replay).",
+    )
+
     parser.add_argument(
         "--debug",
         action="store_true",
@@ -158,6 +198,36 @@ def load_site_config_from_file(config_path):
         sys.exit(1)
 
 
+@contextlib.contextmanager
+def stop_on_sigterm(site):
+    """
+    Stop site supervision on SIGTERM, e.g. a container stop.
+
+    Signal handlers can only be set in the main thread, elsewhere this is
+    a no-op.
+
+    Args:
+        site (ThermostatSite): Site to stop.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def handle_sigterm(signum, frame):  # pylint: disable=unused-argument
+        util.log_msg(
+            "\nSIGTERM received, stopping site supervision",
+            mode=util.BOTH_LOG,
+            func_name=1,
+        )
+        site.stop()
+
+    previous_handler = signal.signal(signal.SIGTERM, handle_sigterm)
+    try:
+        yield
+    finally:
+        signal.signal(signal.SIGTERM, previous_handler)
+
+
 def site_supervisor(args):
     """
     Execute site supervision.
@@ -198,7 +268,7 @@ def site_supervisor(args):
         return
 
     if args.display_temps:
-        site.display_all_temps()
+        site.display_all_temps(deadline_sec=args.display_deadline)
         return
 
     # Display site configuration
@@ -213,10 +283,12 @@ def site_supervisor(args):
     )
 
     try:
-        result = site.supervise_all_zones(
-            measurement_count=args.measurements if args.measurements else 1,
-            use_threading=args.use_threading
-        )
+        with stop_on_sigterm(site):
+            result = site.supervise_all_zones(
+                measurement_count=args.measurements if args.measurements else 1,
+                use_threading=args.use_threading,
+                full_supervision=args.full_supervision,
+            )
     except KeyboardInterrupt:
         util.log_msg(
             "\n\nSite supervision interrupted by user (CTRL-C)",
@@ -257,6 +329,27 @@ def site_supervisor(args):
                 mode=util.BOTH_LOG,
             )
 
+    # Display remaining vendor request budget per account
+    budget_metrics = request_governor.get_metrics()
+    if budget_metrics:
+        util.log_msg(
+            f"\n{'='*60}\nRequest Budget\n{'='*60}",
+            mode=util.BOTH_LOG,
+        )
+        for account_key, metrics in budget_metrics.items():
+            util.log_msg(
+                f"\n{account_key}: {metrics}",
+                mode=util.BOTH_LOG,
+            )
+
+    # Display vendor calls abandoned at their deadline
+    call_metrics = call_deadline.get_executor().get_metrics()
+    if call_metrics["overruns"]:
+        util.log_msg(
+            f"\n{'='*60}\nVendor Call Deadlines\n{'='*60}\n{call_metrics}",
+            mode=util.BOTH_LOG,
+        )
+
     util.log_msg(
         "\nSite supervision completed successfully",
         mode=util.BOTH_LOG,
@@ -286,8 +379,12 @@ def exec_site_supervise(debug=None, argv_list=None):
     else:
         util.log_msg.debug = args.debug
 
-    # Run site supervisor
-    site_supervisor(args)
+    # Run site supervisor, optionally recording or replaying vendor traffic
+    if args.cassette:
+        with cassette.Cassette(args.cassette, args.cassette_mode):
+            site_supervisor(args)
+    else:
+        site_supervisor(args)
 
     return True
 
@@ -0,0 +1,628 @@
+"""
+Shared memory board of the live status of every supervised zone.
+
+Other processes on the box (flask servers, monitoring agents, scripts)
+read the latest poll of each zone from the board instead of parsing logs
+or opening their own vendor sessions.  The supervisor loop publishes each
+get_current_mode() result and read-only site polling each
+query_thermostat_zone() result, so reading never adds a vendor request.
+
+Each supervisor process writes its own board, a fixed layout file
+status_board_<pid>.bin in /dev/shm (./data where there is no /dev/shm)
+mapped with mmap:
+
+  * a header, HEADER_FORMAT: magic, layout version, slot count, slot size,
+    writer pid, zones left off the board,
+  * slot count zone slots, each a sequence number followed by
+    SLOT_FIELDS.
+
+The board is sized when it is created: set_zone_count() gives it a slot
+for every supervised zone, else it has DEFAULT_SLOTS.  A zone that still
+finds the board full is counted in the header and logged once.
+
+Writes to a slot follow a seqlock: the writer makes the sequence number
+odd, writes the fields, then makes it even again.  A reader unpacks the
+fields straight from the mapping between two reads of the sequence number
+and retries if it was odd or changed, so readers never block the writer
+or each other and read at any rate.  A reader yields its time slice
+between retries so a writer in the same process can finish.
+
+Reader side: read_boards() returns the zone snapshots of all live
+boards, or StatusBoardReader reads one board repeatedly.
+"""
+
+# built-in imports
+import atexit
+import glob
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+
+# third party imports
+import psutil
+
+# local imports
+from src import clock
+from src import utilities as util
+
+DEFAULT_SLOTS = 32  # zone slots if the supervised zone count is not set
+MAX_READ_RETRIES = 1000  # torn reads of a slot before giving up
+BOARD_MAGIC = b"TSTATBRD"
+BOARD_VERSION = 2  # bump when the layout changes
+BOARD_FILE_PREFIX = "status_board_"
+SHARED_MEMORY_DIR = "/dev/shm"  # tmpfs, no storage writes
+
+# magic, version, slot count, slot size, pid, zones left off the board
+HEADER_FORMAT = "<8sIIIII"
+SEQUENCE_FORMAT = "<Q"
+# zone status fields, name -> struct format, in slot order
+SLOT_FIELDS = (
+    ("zone_key", "48s"),  # "<thermostat_type>:<zone_name>", empty if free
+    ("mode", "16s"),  # current mode, e.g. "HEAT_MODE"
+    ("display_temp", "d"),  # NaN if not available
+    ("display_humidity", "d"),  # NaN if not available
+    ("schedule_setpoint", "d"),  # NaN if not in a controlled mode
+    ("current_setpoint", "d"),  # NaN if not in a controlled mode
+    ("poll_time", "d"),  # clock.time() of the last successful poll
+    ("failure_time", "d"),  # clock.time() of the last failed poll, 0 if none
+    ("session_count", "I"),
+    ("poll_count", "I"),
+    ("call_overruns", "I"),  # vendor calls abandoned at their deadline
+    ("flags", "I"),  # FLAGS bits
+)
+SLOT_FORMAT = "<" + "".join(fmt for _, fmt in SLOT_FIELDS)
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+SEQUENCE_SIZE = struct.calcsize(SEQUENCE_FORMAT)
+# 8 byte aligned so the sequence number is written in one piece
+SLOT_SIZE = (SEQUENCE_SIZE + struct.calcsize(SLOT_FORMAT) + 7) // 8 * 8
+
+# flags field bits
+FLAGS = (
+    "heat_mode",
+    "cool_mode",
+    "heat_deviation",
+    "cool_deviation",
+    "hold_mode",
+    "hold_temporary",
+    "humidity_available",
+    "connection_ok",  # the last poll succeeded
+)
+
+
+def get_board_dir():
+    """
+    Return the folder of the board files.
+
+    inputs:
+        None
+    returns:
+        (str): /dev/shm if available, else ./data.
+    """
+    if os.path.isdir(SHARED_MEMORY_DIR):
+        return SHARED_MEMORY_DIR
+    return util.FILE_PATH
+
+
+def get_board_path(pid=None):
+    """
+    Return the board file of a supervisor process.
+
+    inputs:
+        pid(int): writer process id, None for this process.
+    returns:
+        (str): file path.
+    """
+    pid = os.getpid() if pid is None else pid
+    return os.path.join(get_board_dir(), f"{BOARD_FILE_PREFIX}{pid}.bin")
+
+
+def get_zone_key(Zone):
+    """
+    Return the board key of a zone.
+
+    inputs:
+        Zone(obj): zone object.
+    returns:
+        (str): "<thermostat_type>:<zone_name>".
+    """
+    return f"{Zone.thermostat_type}:{Zone.zone_name}"
+
+
+def _get_slot_offset(slot):
+    """Return the offset of a slot in the board."""
+    return (HEADER_SIZE + 7) // 8 * 8 + slot * SLOT_SIZE
+
+
+def _get_board_size(slot_count):
+    """Return the size of a board with slot_count slots."""
+    return _get_slot_offset(slot_count)
+
+
+def _to_float(value):
+    """Return value as a float, NaN if missing or a placeholder."""
+    if value is None or value == util.BOGUS_INT:
+        return math.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+class StatusBoard:
+    """Board written by this supervisor process."""
+
+    def __init__(self, path=None, slot_count=DEFAULT_SLOTS):
+        """
+        Constructor, create the board file.
+
+        inputs:
+            path(str): board file, None for get_board_path().
+            slot_count(int): zones the board can show.
+        """
+        self.path = get_board_path() if path is None else path
+        self.slot_count = slot_count
+        # zone key -> slot index
+        self._slots = {}
+        # zone keys that found the board full
+        self._dropped = set()
+        # zone key -> last published field values
+        self._values = {}
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        board_size = _get_board_size(slot_count)
+        with open(self.path, "w+b") as board_file:
+            board_file.truncate(board_size)
+            self._mapped = mmap.mmap(board_file.fileno(), board_size)
+        self._write_header()
+
+    def _write_header(self):
+        """Write the board header."""
+        struct.pack_into(
+            HEADER_FORMAT,
+            self._mapped,
+            0,
+            BOARD_MAGIC,
+            BOARD_VERSION,
+            self.slot_count,
+            SLOT_SIZE,
+            os.getpid(),
+            len(self._dropped),
+        )
+
+    def publish(self, Zone, current_mode_dict, session_count, poll_count):
+        """
+        Publish a successful poll of a zone.
+
+        inputs:
+            Zone(obj): polled zone.
+            current_mode_dict(dict): get_current_mode() result.
+            session_count(int): session number.
+            poll_count(int): poll number.
+        returns:
+            None
+        """
+        supervision = Zone.supervision
+        flags = {
+            "heat_mode": current_mode_dict.get("heat_mode"),
+            "cool_mode": current_mode_dict.get("cool_mode"),
+            "heat_deviation": current_mode_dict.get("heat_deviation"),
+            "cool_deviation": current_mode_dict.get("cool_deviation"),
+            "hold_mode": current_mode_dict.get("hold_mode"),
+            "hold_temporary": Zone.hold_temporary,
+            "humidity_available": Zone.humidity_is_available,
+            "connection_ok": True,
+        }
+        controlled = bool(flags["heat_mode"] or flags["cool_mode"])
+        self._write(
+            get_zone_key(Zone),
+            {
+                "mode": str(Zone.current_mode or "").upper(),
+                "display_temp": _to_float(Zone.display_temp),
+                "display_humidity": _to_float(
+                    Zone.display_humidity if Zone.humidity_is_available else None
+                ),
+                "schedule_setpoint": _to_float(
+                    Zone.schedule_setpoint if controlled else None
+                ),
+                "current_setpoint": _to_float(
+                    Zone.current_setpoint if controlled else None
+                ),
+                "poll_time": clock.time(),
+                "session_count": session_count,
+                "poll_count": poll_count,
+                "call_overruns": supervision.call_overruns,
+                "flags": sum(
+                    1 << bit for bit, name in enumerate(FLAGS) if flags[name]
+                ),
+            },
+        )
+
+    def publish_failure(self, Zone):
+        """
+        Publish a failed poll of a zone, keeping its last status.
+
+        inputs:
+            Zone(obj): zone whose poll raised.
+        returns:
+            None
+        """
+        zone_key = get_zone_key(Zone)
+        with self._lock:
+            flags = self._values.get(zone_key, {}).get("flags", 0)
+        self._write(
+            zone_key,
+            {
+                "failure_time": clock.time(),
+                "call_overruns": Zone.supervision.call_overruns,
+                "flags": flags & ~(1 << FLAGS.index("connection_ok")),
+            },
+        )
+
+    def _write(self, zone_key, values):
+        """Update the slot of zone_key under the seqlock."""
+        with self._lock:
+            if self._mapped.closed:
+                return  # replaced by a larger board meanwhile
+            slot = self._slots.get(zone_key)
+            if slot is None:
+                if len(self._slots) >= self.slot_count:
+                    self._drop(zone_key)
+                    return
+                slot = self._slots[zone_key] = len(self._slots)
+            merged = self._values.setdefault(
+                zone_key,
+                {
+                    name: (b"" if fmt.endswith("s") else 0)
+                    for name, fmt in SLOT_FIELDS
+                },
+            )
+            merged.update(values, zone_key=zone_key)
+            fields = [
+                (
+                    merged[name].encode("utf-8")
+                    if isinstance(merged[name], str)
+                    else merged[name]
+                )
+                for name, _ in SLOT_FIELDS
+            ]
+            offset = _get_slot_offset(slot)
+            (sequence,) = struct.unpack_from(SEQUENCE_FORMAT, self._mapped, offset)
+            struct.pack_into(SEQUENCE_FORMAT, self._mapped, offset, sequence + 1)
+            struct.pack_into(
+                SLOT_FORMAT, self._mapped, offset + SEQUENCE_SIZE, *fields
+            )
+            struct.pack_into(SEQUENCE_FORMAT, self._mapped, offset, sequence + 2)
+
+    def _drop(self, zone_key):
+        """Count a zone that found the board full, logging the first."""
+        if zone_key in self._dropped:
+            return
+        self._dropped.add(zone_key)
+        self._write_header()
+        if len(self._dropped) == 1:
+            util.log_msg(
+                f"status board {self.path} is full ({self.slot_count} "
+                f"slots), {zone_key} and any further zones are not shown",
+                mode=util.BOTH_LOG,
+                func_name=1,
+            )
+
+    def close(self, remove=True):
+        """
+        Unmap the board.
+
+        inputs:
+            remove(bool): delete the board file.
+        returns:
+            None
+        """
+        with self._lock:
+            if self._mapped.closed:
+                return
+            self._mapped.close()
+        if remove:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+
+class StatusBoardReader:
+    """Lock-free reader of one board file."""
+
+    def __init__(self, path):
+        """
+        Constructor, map a board file read-only.
+
+        inputs:
+            path(str): board file.
+        raises:
+            ValueError: not a board of this layout version.
+        """
+        self.path = path
+        with open(path, "rb") as board_file:
+            self._mapped = mmap.mmap(
+                board_file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        if len(self._mapped) < HEADER_SIZE:
+            self._mapped.close()
+            raise ValueError(f"{path} is not a version {BOARD_VERSION} status board")
+        magic, version, self.slot_count, slot_size, self.pid, _ = (
+            struct.unpack_from(HEADER_FORMAT, self._mapped, 0)
+        )
+        if (magic, version, slot_size) != (
+            BOARD_MAGIC,
+            BOARD_VERSION,
+            SLOT_SIZE,
+        ) or len(self._mapped) < _get_board_size(self.slot_count):
+            self._mapped.close()
+            raise ValueError(f"{path} is not a version {BOARD_VERSION} status board")
+
+    def is_live(self):
+        """
+        Return True if the writer process is running.
+
+        inputs:
+            None
+        returns:
+            (bool): writer is running.
+        """
+        return psutil.pid_exists(self.pid)
+
+    def get_dropped_zones(self):
+        """
+        Return the number of zones that found the board full.
+
+        inputs:
+            None
+        returns:
+            (int): zones not shown on the board.
+        """
+        return struct.unpack_from(HEADER_FORMAT, self._mapped, 0)[-1]
+
+    def read_slot(self, slot):
+        """
+        Return a consistent snapshot of one slot.
+
+        inputs:
+            slot(int): slot index.
+        returns:
+            (dict): field name -> value, flags expanded to bools, None if
+                    the slot is free.
+        raises:
+            RuntimeError: no consistent read after MAX_READ_RETRIES.
+        """
+        offset = _get_slot_offset(slot)
+        for _ in range(MAX_READ_RETRIES):
+            (before,) = struct.unpack_from(SEQUENCE_FORMAT, self._mapped, offset)
+            if not before % 2:
+                values = struct.unpack_from(
+                    SLOT_FORMAT, self._mapped, offset + SEQUENCE_SIZE
+                )
+                (after,) = struct.unpack_from(SEQUENCE_FORMAT, self._mapped, offset)
+                if before == after:
+                    break
+            # write in progress, let the writer run
+            time.sleep(0)
+        else:
+            raise RuntimeError(f"{self.path} slot {slot} kept changing")
+        if before == 0:
+            return None  # never written
+        snapshot = {}
+        for (name, fmt), value in zip(SLOT_FIELDS, values):
+            if fmt.endswith("s"):
+                value = value.rstrip(b"\0").decode("utf-8", errors="replace")
+            snapshot[name] = value
+        for bit, name in enumerate(FLAGS):
+            snapshot[name] = bool(snapshot["flags"] & (1 << bit))
+        snapshot["pid"] = self.pid
+        return snapshot
+
+    def read(self):
+        """
+        Return the snapshots of all zones on the board.
+
+        inputs:
+            None
+        returns:
+            (dict): zone key -> snapshot, see read_slot().
+        """
+        zones = {}
+        for slot in range(self.slot_count):
+            snapshot = self.read_slot(slot)
+            if snapshot is None:
+                break  # slots are claimed in order
+            zones[snapshot["zone_key"]] = snapshot
+        return zones
+
+    def close(self):
+        """Unmap the board."""
+        self._mapped.close()
+
+
+def read_boards(board_dir=None):
+    """
+    Return the zone snapshots of every running supervisor process.
+
+    inputs:
+        board_dir(str): board folder, None for get_board_dir().
+    returns:
+        (dict): zone key -> snapshot, see StatusBoardReader.read_slot().
+    """
+    board_dir = get_board_dir() if board_dir is None else board_dir
+    zones = {}
+    for path in _get_board_files(board_dir):
+        try:
+            reader = StatusBoardReader(path)
+        except (OSError, ValueError):
+            continue  # removed meanwhile or another layout
+        try:
+            if reader.is_live():
+                zones.update(reader.read())
+        except RuntimeError:
+            continue  # writer stuck mid-write, e.g. killed, skip its board
+        finally:
+            reader.close()
+    return zones
+
+
+def _get_board_files(board_dir):
+    """Return the board files in board_dir."""
+    return sorted(glob.glob(os.path.join(board_dir, BOARD_FILE_PREFIX + "*.bin")))
+
+
+def remove_stale_boards(board_dir=None):
+    """
+    Remove the boards of supervisor processes that are not running.
+
+    inputs:
+        board_dir(str): board folder, None for get_board_dir().
+    returns:
+        (int): number of boards removed.
+    """
+    board_dir = get_board_dir() if board_dir is None else board_dir
+    removed = 0
+    for path in _get_board_files(board_dir):
+        pid = os.path.basename(path)[len(BOARD_FILE_PREFIX):-len(".bin")]
+        if pid.isdigit() and not psutil.pid_exists(int(pid)):
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass  # removed meanwhile or not ours to remove
+    return removed
+
+
+# board of this process, created on first publish, False if that failed
+_board = None
+_board_lock = threading.Lock()
+_publish_enabled = True
+_slot_count = DEFAULT_SLOTS
+
+
+def get_board():
+    """
+    Return the board of this process, creating it on first use.
+
+    inputs:
+        None
+    returns:
+        (StatusBoard): board, None if publishing is disabled or the board
+                       could not be created.
+    """
+    global _board  # noqa W603
+    if not _publish_enabled:
+        return None
+    with _board_lock:
+        if _board is None:
+            try:
+                remove_stale_boards()
+                _board = StatusBoard(slot_count=_slot_count)
+            except OSError as ex:
+                util.log_msg(
+                    f"status board disabled, could not create "
+                    f"{get_board_path()}: {ex}",
+                    mode=util.BOTH_LOG,
+                    func_name=1,
+                )
+                _board = False
+                return None
+            atexit.register(_board.close)
+        return _board or None
+
+
+def reset_board(publish=True):
+    """
+    Close the board of this process, the next publish creates a new one
+    with DEFAULT_SLOTS.
+
+    inputs:
+        publish(bool): publish zone status, False disables the board.
+    returns:
+        None
+    """
+    global _board, _publish_enabled, _slot_count  # noqa W603
+    with _board_lock:
+        if _board:
+            _board.close()
+        _board = None
+        _publish_enabled = publish
+        _slot_count = DEFAULT_SLOTS
+
+
+def set_zone_count(zone_count):
+    """
+    Size the board of this process for the supervised zones.
+
+    Call before the zones start publishing; a board already created with
+    fewer slots is replaced on the next publish.
+
+    inputs:
+        zone_count(int): zones supervised by this process.
+    returns:
+        None
+    """
+    global _board, _slot_count  # noqa W603
+    with _board_lock:
+        _slot_count = max(DEFAULT_SLOTS, zone_count)
+        if _board and _board.slot_count < _slot_count:
+            _board.close()
+            _board = None
+
+
+def publish(Zone, current_mode_dict, session_count, poll_count):
+    """
+    Publish a successful poll on the board of this process.
+
+    inputs:
+        see StatusBoard.publish().
+    returns:
+        None
+    """
+    board = get_board()
+    if board is not None:
+        board.publish(Zone, current_mode_dict, session_count, poll_count)
+
+
+def publish_query(Zone, session_count, poll_count):
+    """
+    Publish a read-only poll on the board of this process.
+
+    The mode flags are derived from the zone state set by
+    query_thermostat_zone(), publishing adds no vendor request.
+
+    inputs:
+        Zone(obj): zone polled with query_thermostat_zone().
+        session_count(int): session number.
+        poll_count(int): poll number.
+    returns:
+        None
+    """
+    heat_mode = Zone.current_mode == Zone.HEAT_MODE
+    cool_mode = Zone.current_mode == Zone.COOL_MODE
+    deviated = bool(Zone.temperature_is_deviated)
+    current_mode_dict = {
+        "heat_mode": heat_mode,
+        "cool_mode": cool_mode,
+        "heat_deviation": heat_mode and deviated,
+        "cool_deviation": cool_mode and deviated,
+        "hold_mode": deviated and bool(Zone.is_controlled_mode()),
+    }
+    publish(Zone, current_mode_dict, session_count, poll_count)
+
+
+def publish_failure(Zone):
+    """
+    Publish a failed poll on the board of this process.
+
+    inputs:
+        see StatusBoard.publish_failure().
+    returns:
+        None
+    """
+    board = get_board()
+    if board is not None:
+        board.publish_failure(Zone)
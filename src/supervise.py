@@ -4,9 +4,9 @@ Thermostat Supervisor
 
 # built ins
 import sys
-import time
 
 # local imports
+from src import clock
 from src import environment as env
 from src import thermostat_api as api
 from src import utilities as util
@@ -56,7 +56,7 @@ def supervisor(thermostat_type, zone_str):
         max_total_time_sec = min(
             max_total_time_sec, 7200
         )  # Cap at 2 hours max
-        supervisor_start_time = time.time()
+        supervisor_start_time = clock.time()
         util.log_msg(
             f"supervisor: max_total_time={max_total_time_sec}s "
             f"for {max_measurements} measurements",
@@ -71,7 +71,7 @@ def supervisor(thermostat_type, zone_str):
     while not api.uip.max_measurement_count_exceeded(measurement):
         # Check for overall supervisor timeout
         if max_total_time_sec and supervisor_start_time:
-            elapsed_time = time.time() - supervisor_start_time
+            elapsed_time = clock.time() - supervisor_start_time
             if elapsed_time > max_total_time_sec:
                 util.log_msg(
                     f"supervisor: exceeded max total time "
@@ -103,7 +103,7 @@ def supervisor(thermostat_type, zone_str):
         Zone.display_session_settings()
 
         # set start time for poll
-        Zone.session_start_time_sec = time.time()
+        Zone.session_start_time_sec = clock.time()
 
         # update runtime overrides
         Zone.update_runtime_parameters()
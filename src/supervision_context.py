@@ -0,0 +1,176 @@
+"""
+Per-zone supervision state.
+
+ThermostatCommonZone.supervisor_loop() reads its runtime inputs (target
+mode, measurement limit) from, and writes its reverted target mode back
+to, a SupervisionContext instead of the process-wide api.uip.  The context
+also carries the zone's connection status: execute_with_extended_retries()
+clears connection_ok on the context bound to the calling thread, which
+makes the loop of that zone, and no other, reconnect.  Its stop event
+cuts the loop's poll and retry delays short, e.g. on site shutdown.
+
+A zone without its own context gets one that follows api.uip, which keeps
+the single zone supervise.py behavior.  ThermostatSite gives every zone a
+context built from its site config, so many zones can run the full
+supervisor loop in one process.
+"""
+
+# built-in imports
+import contextlib
+import contextvars
+import threading
+
+# local imports
+from src import clock
+from src import thermostat_api as api
+
+# context of the supervision loop running in the current thread
+_current_context = contextvars.ContextVar("supervision_context", default=None)
+
+
+class SupervisionContext:
+    """Runtime inputs and connection status of one supervised zone."""
+
+    def __init__(
+        self,
+        inputs=None,
+        user_inputs=None,
+        zone_name=None,
+        measurement_callback=None,
+        stop_event=None,
+    ):
+        """
+        Constructor.
+
+        inputs:
+            inputs(dict): api.input_flds name -> value, used when
+                          user_inputs is None and no api.uip is wanted.
+            user_inputs(api.UserInputs): runtime inputs to read and write,
+                                         None follows api.uip unless
+                                         inputs is given.
+            zone_name(str): user_inputs section, None uses its zone_name.
+            measurement_callback(callable): called as
+                                            callback(Zone, measurement)
+                                            after each poll, or None.
+            stop_event(threading.Event): set to stop the loop, None
+                                         creates one, e.g. to share a
+                                         site-wide event.
+        """
+        self.inputs = None if inputs is None else dict(inputs)
+        self.user_inputs = user_inputs
+        self.zone_name = zone_name
+        self.measurement_callback = measurement_callback
+        self.connection_ok = True
+        self.call_overruns = 0  # vendor calls abandoned at their deadline
+        self.stop_event = threading.Event() if stop_event is None else stop_event
+
+    def _get_user_inputs(self):
+        """Return the UserInputs object and section backing this context."""
+        user_inputs = self.user_inputs if self.user_inputs is not None else api.uip
+        return user_inputs, self.zone_name or user_inputs.zone_name
+
+    def get_input(self, field):
+        """
+        Return a runtime input.
+
+        inputs:
+            field(str): api.input_flds name.
+        returns:
+            (any): value, None if not set.
+        """
+        if self.inputs is not None:
+            return self.inputs.get(field)
+        user_inputs, zone_name = self._get_user_inputs()
+        return user_inputs.get_user_inputs(zone_name, field)
+
+    def set_input(self, field, value):
+        """
+        Set a runtime input.
+
+        inputs:
+            field(str): api.input_flds name.
+            value(any): new value.
+        returns:
+            None
+        """
+        if self.inputs is not None:
+            self.inputs[field] = value
+            return
+        user_inputs, zone_name = self._get_user_inputs()
+        user_inputs.set_user_inputs(zone_name, field, value)
+
+    def max_measurement_count_exceeded(self, measurement):
+        """
+        Return True if max measurement reached.
+
+        inputs:
+            measurement(int): current measurement value
+        returns:
+            (bool): True if max measurement reached.
+        """
+        max_measurements = self.get_input(api.input_flds.measurements)
+        return max_measurements is not None and measurement > max_measurements
+
+    def stop_requested(self):
+        """
+        Return True if the loop should stop.
+
+        inputs:
+            None
+        returns:
+            (bool): True if the stop event is set.
+        """
+        return self.stop_event.is_set()
+
+    def wait(self, seconds):
+        """
+        Sleep on the clock, returning early on a stop request.
+
+        inputs:
+            seconds(float): delay.
+        returns:
+            (bool): True if the loop should stop.
+        """
+        return clock.wait(self.stop_event, seconds)
+
+    def record_measurement(self, Zone, measurement):
+        """
+        Report a completed poll to the measurement callback.
+
+        inputs:
+            Zone(obj): zone that was polled.
+            measurement(int): measurement index.
+        returns:
+            None
+        """
+        if self.measurement_callback is not None:
+            self.measurement_callback(Zone, measurement)
+
+
+def get_current_context():
+    """
+    Return the supervision context bound to the calling thread.
+
+    inputs:
+        None
+    returns:
+        (SupervisionContext or None): context, None outside a supervisor loop.
+    """
+    return _current_context.get()
+
+
+@contextlib.contextmanager
+def bind(context):
+    """
+    Bind a supervision context to the calling thread.
+
+    inputs:
+        context(SupervisionContext): context of the running loop.
+    returns:
+        (contextmanager): restores the previous binding on exit.
+    """
+    token = _current_context.set(context)
+    try:
+        yield context
+    finally:
+        _current_context.reset(token)
@@ -11,7 +11,7 @@ import sys
 import webbrowser
 
 # third party imports
-from flask import Flask, Response
+from flask import Flask, Response, abort, jsonify, request
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from flask_wtf.csrf import CSRFProtect
@@ -20,6 +20,7 @@ from flask_wtf.csrf import CSRFProtect
 from src import environment as env
 from src import ssl_certificate
 from src import flask_generic as flg
+from src import log_reader
 from src import supervise as sup
 from src import thermostat_api as api
 from src import utilities as util
@@ -154,6 +155,69 @@ def index():
     return Response(run_supervise(), mimetype="text/html")
 
 
+DEFAULT_TAIL_LINES = 100  # /logs/<name>/tail lines when not specified
+
+
+@app.route("/logs")
+@limiter.limit("30 per minute")
+def logs():
+    """List the logs in ./data with their total size."""
+    return jsonify(log_reader.list_logs())
+
+
+@app.route("/logs/<log_name>/tail")
+@limiter.limit("30 per minute")
+def log_tail(log_name):
+    """
+    Last lines of a log, spanning rotated files.
+
+    query args:
+        lines(int): number of lines.
+        follow(int): 1 keeps streaming lines appended to the log.
+    """
+    num_lines = request.args.get("lines", DEFAULT_TAIL_LINES, type=int)
+    follow = request.args.get("follow", 0, type=int)
+    try:
+        # size first, a line appended meanwhile is repeated, not missed
+        _, _, size = log_reader.read_range(log_name, 0, 0)
+        data = log_reader.tail_lines(log_name, num_lines)
+    except log_reader.LogNotFoundError:
+        abort(404)
+
+    def stream_log():
+        yield data
+        if follow:
+            yield from log_reader.follow(log_name, size)
+
+    return Response(stream_log(), mimetype="text/plain")
+
+
+@app.route("/logs/<log_name>/range")
+@limiter.limit("30 per minute")
+def log_range(log_name):
+    """
+    Byte range of a log, spanning rotated files.
+
+    query args:
+        offset(int): offset in the log, negative counts from the end.
+        length(int): number of bytes.
+
+    The offset and size of the log are returned in the X-Log-Offset and
+    X-Log-Size headers, a client follows the log by asking for
+    X-Log-Offset plus the length read.
+    """
+    offset = request.args.get("offset", 0, type=int)
+    length = request.args.get("length", log_reader.MAX_RANGE_BYTES, type=int)
+    try:
+        data, offset, size = log_reader.read_range(log_name, offset, length)
+    except log_reader.LogNotFoundError:
+        abort(404)
+    response = Response(data, mimetype="text/plain")
+    response.headers["X-Log-Offset"] = str(offset)
+    response.headers["X-Log-Size"] = str(size)
+    return response
+
+
 if __name__ == "__main__":
     # enable logging to STDERR for Flask
     util.log_stdout_to_stderr = True
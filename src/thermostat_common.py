@@ -3,6 +3,7 @@ Common Thermostat Class
 """
 
 # built-ins
+import concurrent.futures
 import datetime
 import operator
 import pprint
@@ -11,15 +12,22 @@ import time
 import traceback
 
 # local imports
+from src import clock
 from src import email_notification as eml
+from src import status_board
+from src import supervision_context as sc
 from src import thermostat_api as api
 from src import utilities as util
 from src import weather
+from src import zone_state as zs
 
 
 DEGREE_SIGN = "\N{DEGREE SIGN}"
 
-connection_ok = True  # global flag for connection OK.
+# print_select_data_from_all_zones() query pool
+ZONE_QUERY_MAX_WORKERS = 8  # zones queried at once
+ZONE_QUERY_TIMEOUT_SEC = 60  # longest wait for one zone
+
 server_spamming_detected = False  # global flag for pyhtcc server spamming
 
 
@@ -38,8 +46,20 @@ class ThermostatCommon:
         self.zone_number = util.BOGUS_INT  # placeholder
         self.device_id = util.BOGUS_INT  # placeholder
         self.ip_address = None  # placeholder
-        global connection_ok  # noqa W603
-        connection_ok = True
+
+    def clone_for_zone(self, zone):
+        """
+        Return a Thermostat object for another zone.
+
+        The default creates a new instance, which logs in again.  Drivers
+        with an account-wide login override this to share their session.
+
+        inputs:
+            zone(int): zone number.
+        returns:
+            (obj): Thermostat object for zone.
+        """
+        return type(self)(zone, verbose=self.verbose)
 
     def get_all_metadata(self, zone, retry=True):
         """
@@ -105,6 +125,106 @@ class ThermostatCommon:
         return return_data
 
 
+class SwitchPositionMap(dict):
+    """
+    system_switch_position dict with a position -> mode reverse index.
+
+    Values follow util.get_key_from_value() matching: a single value, a
+    list of values, or a dict whose keys and values all decode to the mode.
+    The index is rebuilt on the first lookup after any change, and as with
+    get_key_from_value() the first mode listed wins on a shared value.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._index = None  # position -> mode, None until next lookup
+        self._unhashable = False  # some values can only be scanned
+
+    def _invalidate(self):
+        """Drop the reverse index after a change."""
+        self._index = None
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._invalidate()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._invalidate()
+
+    def __ior__(self, other):
+        result = super().__ior__(other)
+        self._invalidate()
+        return result
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._invalidate()
+
+    def setdefault(self, key, default=None):
+        result = super().setdefault(key, default)
+        self._invalidate()
+        return result
+
+    def pop(self, *args):
+        result = super().pop(*args)
+        self._invalidate()
+        return result
+
+    def popitem(self):
+        result = super().popitem()
+        self._invalidate()
+        return result
+
+    def clear(self):
+        super().clear()
+        self._invalidate()
+
+    def _build_index(self):
+        """Return a new position -> mode index."""
+        index = {}
+        self._unhashable = False
+        for mode, value in self.items():
+            if isinstance(value, (str, int, float)):
+                positions = [value]
+            elif isinstance(value, list):
+                positions = value
+            elif isinstance(value, dict):
+                positions = list(value.keys()) + list(value.values())
+            else:
+                raise TypeError(
+                    f"type {type(value)} not yet supported in get_key_from_value"
+                )
+            for position in positions:
+                try:
+                    index.setdefault(position, mode)
+                except TypeError:
+                    self._unhashable = True
+        return index
+
+    def get_mode(self, position):
+        """
+        Return the mode of a system switch position.
+
+        inputs:
+            position(int or str): system switch position.
+        returns:
+            (str or None): mode, None if the position is not mapped.
+        """
+        index = self._index
+        if index is None:
+            index = self._index = self._build_index()
+        if not self._unhashable:
+            try:
+                return index.get(position)
+            except TypeError:
+                pass  # unhashable position, scan below
+        try:
+            return util.get_key_from_value(self, position)
+        except KeyError:
+            return None
+
+
 class ThermostatCommonZone:
     """Class methods common to all thermostat zones."""
 
@@ -142,7 +262,20 @@ class ThermostatCommonZone:
     min_scheduled_cool_allowed = 68  # warn if scheduled cool value exceeds.
     tolerance_degrees_default = 2  # allowed override vs. the scheduled value.
 
+    # decoded mode shared by the is_*_mode() calls of one query, see
+    # _configure_mode_specific_parameters()
+    _mode_decode_cache = None
+
+    # decoded zone_info, see zone_state
+    _zone_state = None
+
+    # runtime inputs and connection status, see supervision
+    _supervision = None
+
     def __init__(self, *_, **__):
+        # per-instance copy so tstat-specific positions do not leak
+        # into the class defaults shared by other thermostat types
+        self.system_switch_position = SwitchPositionMap(self.system_switch_position)
         self.verbose = False
         self.thermostat_type = "unknown"  # placeholder
         self.zone_number = util.BOGUS_INT  # placeholder
@@ -161,11 +294,11 @@ class ThermostatCommonZone:
         self.humidity_is_available = False  # humidity supported flag
         self.hold_mode = False  # True = not following schedule
         self.hold_temporary = False
-        self.zone_info = {}  # dict containing zone data
+        self.zone_info = {}  # dict containing raw zone data
 
         # server data cache expiration parameters
         self.fetch_interval_sec = 10  # age of server data before refresh
-        self.last_fetch_time = time.time() - 2 * self.fetch_interval_sec
+        self.last_fetch_time = clock.time() - 2 * self.fetch_interval_sec
 
         # abstraction vars and funcs, defined in query_thermostat_zone
         self.current_mode = None  # str representing mode
@@ -179,6 +312,59 @@ class ThermostatCommonZone:
         self.revert_setpoint_func = self.function_not_supported
         self.get_setpoint_func = self.function_not_supported
 
+    @property
+    def supervision(self) -> sc.SupervisionContext:
+        """Supervision context of this zone, follows api.uip by default."""
+        if self._supervision is None:
+            self._supervision = sc.SupervisionContext()
+        return self._supervision
+
+    @supervision.setter
+    def supervision(self, context):
+        self._supervision = context
+
+    @property
+    def zone_info(self):
+        """Raw vendor payload of the last fetch."""
+        return self._zone_info
+
+    @zone_info.setter
+    def zone_info(self, zone_info):
+        self._zone_info = zone_info
+        self._zone_state = None  # decoded again on next read
+
+    @property
+    def zone_state(self) -> zs.ZoneState:
+        """
+        Zone data of the last fetch, decoded once per fetch.
+
+        inputs:
+            None
+        returns:
+            (ZoneState): decoded zone data.
+        """
+        state = self._zone_state
+        if state is None:
+            zone_info = getattr(self, "_zone_info", {})
+            state = self.parse_zone_state(zone_info)
+            state.fetch_time = getattr(self, "last_fetch_time", None)
+            if zs.is_debug_enabled():
+                state.raw = zone_info
+            self._zone_state = state
+        return state
+
+    def parse_zone_state(self, zone_info) -> zs.ZoneState:  # noqa R0201
+        """
+        Decode the raw vendor payload, override in the driver.
+
+        inputs:
+            zone_info(dict): raw vendor payload.
+        returns:
+            (ZoneState): decoded zone data.
+        """
+        del zone_info  # unused in the default implementation
+        return zs.ZoneState()
+
     def query_thermostat_zone(self):
         """Return the current mode and set mode-specific parameters."""
         self._set_current_temperature_and_humidity()
@@ -212,13 +398,19 @@ class ThermostatCommonZone:
 
         # Store mode check results to avoid calling twice
         mode_check_results = {}
-        for mode_checker, mode_configurator in mode_handlers.items():
-            result = mode_checker()
-            mode_check_results[mode_checker.__name__] = result
-            if result:
-                # Found matching mode, configure it
-                mode_configurator()
-                return
+        # decode the switch position once for all of the mode checkers
+        self._mode_decode_cache = {}
+        try:
+            for mode_checker, mode_configurator in mode_handlers.items():
+                result = mode_checker()
+                mode_check_results[mode_checker.__name__] = result
+                if result:
+                    # Found matching mode, configure it
+                    self._mode_decode_cache = None
+                    mode_configurator()
+                    return
+        finally:
+            self._mode_decode_cache = None
 
         # If no mode matches, provide detailed diagnostics
         try:
@@ -615,7 +807,12 @@ class ThermostatCommonZone:
                 f"limit ({util.temp_value_with_units(limit_value)})"
             )
             util.log_msg(f"WARNING: {msg}", mode=util.BOTH_LOG)
-            eml.send_email_alert(subject=msg, body=f"{util.get_function_name()}: {msg}")
+            eml.queue_email_alert(
+                subject=msg,
+                body=f"{util.get_function_name()}: {msg}",
+                zone=f"{self.thermostat_type} zone {self.zone_name}",
+                alert_type="setpoint_limit",
+            )
             return True
         else:
             return False
@@ -632,15 +829,48 @@ class ThermostatCommonZone:
         returns:
             (bool): True if current position matches expected mode
         """
+        return self.get_current_mode_name() == expected_mode
+
+    def get_current_mode_name(self) -> str | None:
+        """
+        Return the mode of the current system switch position.
+
+        The position is decoded through the reverse index of
+        system_switch_position.  While the mode-specific parameters are
+        configured the first decode is reused by every is_*_mode() call.
+
+        inputs:
+            None
+        returns:
+            (str or None): mode constant (e.g. self.HEAT_MODE), None if the
+                           position is not in system_switch_position.
+        """
+        cache = self._mode_decode_cache
+        if cache is not None and "mode" in cache:
+            return cache["mode"]
+        mode = self.decode_switch_position(self.get_system_switch_position())
+        if cache is not None:
+            cache["mode"] = mode
+        return mode
+
+    def decode_switch_position(self, position) -> str | None:
+        """
+        Return the mode of a system switch position.
+
+        inputs:
+            position(int or str): system switch position.
+        returns:
+            (str or None): mode constant, None if the position is not in
+                           system_switch_position.
+        """
+        positions = self.system_switch_position
+        if isinstance(positions, SwitchPositionMap):
+            return positions.get_mode(position)
+        # plain dict assigned after construction
         try:
-            current_position = self.get_system_switch_position()
-            detected_mode = util.get_key_from_value(
-                self.system_switch_position, current_position
-            )
-            return detected_mode == expected_mode
+            return util.get_key_from_value(positions, position)
         except KeyError:
-            # Position not found in system_switch_position dict
-            return False
+            return None
 
     def is_heat_mode(self) -> int:
         """Return 1 if in heat mode."""
@@ -870,7 +1100,7 @@ class ThermostatCommonZone:
         returns:
             None, cached data is refreshed.
         """
-        now_time = time.time()
+        now_time = clock.time()
         # refresh if past expiration date or force_refresh option
         if force_refresh or (
             now_time >= (self.last_fetch_time + self.fetch_interval_sec)
@@ -970,7 +1200,7 @@ class ThermostatCommonZone:
                 "supervisor runtime parameters:", mode=util.BOTH_LOG, func_name=1
             )
         for inp, cls_method in user_input_to_class_mapping.items():
-            user_input = api.uip.get_user_inputs(api.uip.zone_name, inp)
+            user_input = self.supervision.get_input(inp)
             if user_input is not None:
                 setattr(self, cls_method, user_input)
                 if self.verbose:
@@ -1083,9 +1313,9 @@ class ThermostatCommonZone:
 
         # measurement loop
         for measurement in range(measurements):
-            t_start = time.time()
+            t_start = clock.time()
             data = func()  # target command
-            t_end = time.time()
+            t_end = clock.time()
 
             # accumulate stats
             tdelta = t_end - t_start
@@ -1109,7 +1339,7 @@ class ThermostatCommonZone:
                 mode=util.BOTH_LOG,
                 func_name=1,
             )
-            time.sleep(poll_interval_sec)
+            clock.sleep(poll_interval_sec)
 
         # calc stats
         stats["measurements"] = measurements
@@ -1240,10 +1470,12 @@ class ThermostatCommonZone:
             setpoint = self.current_setpoint
 
         mode_str = self.current_mode.upper() if self.current_mode else "UNKNOWN"
-        eml.send_email_alert(
+        eml.queue_email_alert(
             subject=f"{self.thermostat_type} {mode_str} "
             f"deviation alert on zone {self.zone_name}",
             body=msg,
+            zone=f"{self.thermostat_type} zone {self.zone_name}",
+            alert_type="deviation",
         )
         util.log_msg(
             f"\n*** {self.thermostat_type} {mode_str} "
@@ -1341,7 +1573,23 @@ class ThermostatCommonZone:
         returns:
             measurement(int): current measurement count
         """
-        global connection_ok  # noqa W603
+        with sc.bind(self.supervision):
+            return self._supervisor_loop(Thermostat, session_count, measurement, debug)
+
+    def _supervisor_loop(self, Thermostat, session_count, measurement, debug):
+        """
+        Loop through supervisor algorithm, see supervisor_loop().
+
+        inputs:
+            Thermostat(obj):  Thermostat instance object
+            session_count(int):  current session
+            measurement(int):  current measurement index
+            debug(bool): debug flag
+        returns:
+            measurement(int): current measurement count
+        """
+        supervision = self.supervision
+        session_overruns = supervision.call_overruns
 
         # initialize poll counter
         poll_count = 1
@@ -1349,16 +1597,14 @@ class ThermostatCommonZone:
 
         # Calculate maximum loop time based on expected measurements
         # Allow enough time for all measurements plus network operations
-        max_measurements = api.uip.get_user_inputs(
-            api.uip.zone_name, api.input_flds.measurements
-        )
+        max_measurements = supervision.get_input(api.input_flds.measurements)
         if max_measurements:
             # Calculate max time: (measurements * poll_time) + generous buffer
             # for network operations and retries
             max_loop_time_sec = (max_measurements * self.poll_time_sec) + (
                 max_measurements * 300
             )  # 5 min buffer per measurement
-            loop_start_time = time.time()
+            loop_start_time = clock.time()
             util.log_msg(
                 f"supervisor_loop: max_loop_time="
                 f"{max_loop_time_sec / 86400.0:.1f} days "
@@ -1371,11 +1617,11 @@ class ThermostatCommonZone:
             loop_start_time = None
 
         # poll thermostat settings
-        while not api.uip.max_measurement_count_exceeded(measurement):
+        while not supervision.max_measurement_count_exceeded(measurement):
             # Check for overall loop timeout to prevent indefinite hanging
             # This check must happen BEFORE potentially blocking operations
             if max_loop_time_sec and loop_start_time:
-                elapsed_time = time.time() - loop_start_time
+                elapsed_time = clock.time() - loop_start_time
                 if elapsed_time > max_loop_time_sec:
                     util.log_msg(
                         f"supervisor_loop: exceeded max loop time "
@@ -1392,7 +1638,7 @@ class ThermostatCommonZone:
 
             # query thermostat for current settings and set points
             # Record start time for this iteration
-            iteration_start_time = time.time()
+            iteration_start_time = clock.time()
             # Wrap in try/except to catch any unexpected hangs/exceptions
             try:
                 current_mode_dict = self.get_current_mode(
@@ -1406,9 +1652,10 @@ class ThermostatCommonZone:
                     mode=util.BOTH_LOG,
                     func_name=1,
                 )
+                status_board.publish_failure(self)
                 # Check if we've exceeded max time due to retries
                 if max_loop_time_sec and loop_start_time:
-                    elapsed_time = time.time() - loop_start_time
+                    elapsed_time = clock.time() - loop_start_time
                     if elapsed_time > max_loop_time_sec:
                         util.log_msg(
                             f"supervisor_loop: exceeded max loop time after "
@@ -1423,8 +1670,11 @@ class ThermostatCommonZone:
                 # Re-raise to maintain existing error handling behavior
                 raise
 
+            # live status for other processes, see status_board
+            status_board.publish(self, current_mode_dict, session_count, poll_count)
+
             # Check if get_current_mode took too long
-            iteration_elapsed = time.time() - iteration_start_time
+            iteration_elapsed = clock.time() - iteration_start_time
             if max_loop_time_sec and iteration_elapsed > (
                 max_loop_time_sec / max_measurements
             ):
@@ -1445,17 +1695,11 @@ class ThermostatCommonZone:
                 previous_mode_dict = current_mode_dict  # latch
 
             # revert thermostat mode if not matching target
-            if not self.verify_current_mode(
-                api.uip.get_user_inputs(api.uip.zone_name, api.input_flds.target_mode)
-            ):
-                api.uip.set_user_inputs(
-                    api.uip.zone_name,
+            target_mode = supervision.get_input(api.input_flds.target_mode)
+            if not self.verify_current_mode(target_mode):
+                supervision.set_input(
                     api.input_flds.target_mode,
-                    self.revert_thermostat_mode(
-                        api.uip.get_user_inputs(
-                            api.uip.zone_name, api.input_flds.target_mode
-                        )
-                    ),
+                    self.revert_thermostat_mode(target_mode),
                 )
 
             # revert thermostat to schedule if heat override is detected
@@ -1468,21 +1712,37 @@ class ThermostatCommonZone:
                     self.schedule_setpoint, current_mode_dict["status_msg"]
                 )
 
+            supervision.record_measurement(self, measurement)
+
             # increment poll count
             poll_count += 1
             measurement += 1
 
-            # polling delay
-            time.sleep(self.poll_time_sec)
+            # polling delay, cut short by a stop request
+            if supervision.wait(self.poll_time_sec):
+                util.log_msg(
+                    f"zone {self.zone_name}: stop requested, ending supervision",
+                    mode=util.BOTH_LOG,
+                    func_name=1,
+                )
+                break
 
-            # refresh zone info
-            connection_ok = True
+            # refresh zone info, a failed retry clears connection_ok
+            supervision.connection_ok = True
             self.refresh_zone_info()
 
             # reconnect
             if (
-                (time.time() - self.session_start_time_sec) > self.connection_time_sec
-            ) or not connection_ok:
+                (clock.time() - self.session_start_time_sec) > self.connection_time_sec
+            ) or not supervision.connection_ok:
+                overruns = supervision.call_overruns - session_overruns
+                if overruns:
+                    util.log_msg(
+                        f"zone {self.zone_name} degraded: {overruns} vendor "
+                        "call(s) abandoned at their deadline this session",
+                        mode=util.BOTH_LOG,
+                        func_name=1,
+                    )
                 util.log_msg(
                     "forcing re-connection to thermostat...", mode=util.BOTH_LOG
                 )
@@ -1528,11 +1788,9 @@ def create_thermostat_instance(
 
     # update runtime overrides
     # thermostat_type
-    api.uip.set_user_inputs(
-        api.uip.zone_name, api.input_flds.thermostat_type, thermostat_type
-    )
+    Zone.supervision.set_input(api.input_flds.thermostat_type, thermostat_type)
     # zone
-    api.uip.set_user_inputs(api.uip.zone_name, api.input_flds.zone, zone)
+    Zone.supervision.set_input(api.input_flds.zone, zone)
     Zone.update_runtime_parameters()
 
     return Thermostat, Zone
@@ -1609,9 +1867,17 @@ def print_select_data_from_all_zones(
     display_wifi=True,
     display_battery=True,
     display_outdoor_weather=True,
+    max_workers=ZONE_QUERY_MAX_WORKERS,
+    zone_timeout_sec=ZONE_QUERY_TIMEOUT_SEC,
 ):
     """
-    Cycle through all zones and print out select data.
+    Query all zones concurrently and print out select data.
+
+    The thermostat logs in once, on the first zone, and the other zones
+    share that login through Thermostat.clone_for_zone().  Zones are then
+    queried on a bounded thread pool and each zone's line is printed as
+    soon as it completes.  A zone that raises or is still running after
+    zone_timeout_sec is reported and skipped.
 
     inputs:
         tstat(int):  thermostat_type
@@ -1621,6 +1887,8 @@ def print_select_data_from_all_zones(
         display_wifi(bool): display wifi status
         display_battery(bool): display battery status
         display_outdoor_weather(bool): display outdoor weather data
+        max_workers(int): zones queried at once.
+        zone_timeout_sec(float): longest wait for one zone.
     returns:
         Thermostat(obj | None): Thermostat object or None if zone_lst is empty
         Zone(obj | None):  Zone object or None if zone_lst is empty
@@ -1634,7 +1902,7 @@ def print_select_data_from_all_zones(
         return None, None
 
     # Get outdoor weather data once if enabled (same for all zones)
-    outdoor_weather_data = None
+    weather_display = None
     if display_outdoor_weather:
         try:
             # Get zip code from thermostat configuration
@@ -1644,6 +1912,10 @@ def print_select_data_from_all_zones(
             if zip_code:
                 api_key = weather.get_weather_api_key()
                 outdoor_weather_data = weather.get_outdoor_weather(zip_code, api_key)
+                if outdoor_weather_data:
+                    weather_display = weather.format_weather_display(
+                        outdoor_weather_data
+                    )
         except Exception as e:
             util.log_msg(
                 f"Failed to get outdoor weather data: {e}",
@@ -1651,43 +1923,114 @@ def print_select_data_from_all_zones(
                 func_name=1,
             )
 
-    for zone in zone_lst:
-        # create class instances
-        Thermostat, Zone = create_thermostat_instance(
-            thermostat_type, zone, ThermostatClass, ThermostatZone, verbose=False
+    # log in once, on the first zone
+    first_zone = zone_lst[0]
+    instances = {
+        first_zone: create_thermostat_instance(
+            thermostat_type, first_zone, ThermostatClass, ThermostatZone, verbose=False
         )
-        # zone temperature
-        display_temp = Zone.get_display_temp()
-        temp_display = (
-            f"{display_temp:.1f} °F" if display_temp is not None else "N/A"
+    }
+    login = instances[first_zone][0]
+    started = {}  # zone -> time.monotonic() when its query started
+
+    def query_zone(zone):
+        started[zone] = time.monotonic()
+        if zone not in instances:
+            Thermostat = login.clone_for_zone(zone)
+            instances[zone] = (Thermostat, ThermostatZone(Thermostat, verbose=False))
+        return format_select_zone_data(
+            zone,
+            instances[zone][1],
+            display_wifi=display_wifi,
+            display_battery=display_battery,
+            weather_display=weather_display,
         )
-        msg = f"zone: {zone}, name: {Zone.zone_name}, temp: {temp_display}"
-
-        # zone wifi strength
-        if display_wifi:
-            wifi_strength = Zone.get_wifi_strength()
-            wifi_status = Zone.get_wifi_status()
-            wifi_status_display = get_wifi_status_display(wifi_status)
-            msg += f", wifi strength: {wifi_strength} dBm ({wifi_status_display})"
-
-        # zone battery stats
-        if display_battery:
-            battery_voltage = Zone.get_battery_voltage()
-            battery_status = Zone.get_battery_status()
-            battery_status_display = get_battery_status_display(battery_status)
-            msg += (
-                f", battery voltage: {battery_voltage:.2f} volts "
-                f"({battery_status_display})"
+
+    executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(zone_lst))),
+        thread_name_prefix="zone_query",
+    )
+    try:
+        futures = {executor.submit(query_zone, zone): zone for zone in zone_lst}
+        pending = set(futures)
+        while pending:
+            # wake up when a zone completes or the oldest running zone times out
+            now = time.monotonic()
+            wait_sec = min(
+                [zone_timeout_sec]
+                + [
+                    started[futures[future]] + zone_timeout_sec - now
+                    for future in pending
+                    if futures[future] in started
+                ]
+            )
+            done, pending = concurrent.futures.wait(
+                pending,
+                timeout=max(0.0, wait_sec),
+                return_when=concurrent.futures.FIRST_COMPLETED,
             )
+            for future in done:
+                try:
+                    print(future.result())
+                except Exception as exc:  # pylint: disable=broad-except
+                    print(f"zone: {futures[future]}, query failed: {exc}")
+            now = time.monotonic()
+            for future in list(pending):
+                zone = futures[future]
+                if zone in started and now - started[zone] >= zone_timeout_sec:
+                    pending.discard(future)
+                    print(
+                        f"zone: {zone}, query timed out after "
+                        f"{zone_timeout_sec} sec"
+                    )
+    finally:
+        # leave timed out zones to finish in the background
+        executor.shutdown(wait=False, cancel_futures=True)
 
-        # outdoor weather data
-        if display_outdoor_weather and outdoor_weather_data:
-            weather_display = weather.format_weather_display(outdoor_weather_data)
-            msg += f", {weather_display}"
+    return instances.get(zone_lst[-1], instances[first_zone])
 
-        print(msg)
 
-    return Thermostat, Zone
+def format_select_zone_data(
+    zone, Zone, display_wifi=True, display_battery=True, weather_display=None
+):
+    """
+    Query a zone and return its line of select data.
+
+    inputs:
+        zone(int): zone number
+        Zone(obj): Zone object
+        display_wifi(bool): display wifi status
+        display_battery(bool): display battery status
+        weather_display(str): formatted outdoor weather, None to omit.
+    returns:
+        (str): select data line.
+    """
+    # zone temperature
+    display_temp = Zone.get_display_temp()
+    temp_display = f"{display_temp:.1f} °F" if display_temp is not None else "N/A"
+    msg = f"zone: {zone}, name: {Zone.zone_name}, temp: {temp_display}"
+
+    # zone wifi strength
+    if display_wifi:
+        wifi_strength = Zone.get_wifi_strength()
+        wifi_status = Zone.get_wifi_status()
+        wifi_status_display = get_wifi_status_display(wifi_status)
+        msg += f", wifi strength: {wifi_strength} dBm ({wifi_status_display})"
+
+    # zone battery stats
+    if display_battery:
+        battery_voltage = Zone.get_battery_voltage()
+        battery_status = Zone.get_battery_status()
+        battery_status_display = get_battery_status_display(battery_status)
+        msg += (
+            f", battery voltage: {battery_voltage:.2f} volts "
+            f"({battery_status_display})"
+        )
+
+    # outdoor weather data
+    if weather_display:
+        msg += f", {weather_display}"
+    return msg
 
 
 class AuthenticationError(ValueError):
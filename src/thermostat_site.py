@@ -8,16 +8,51 @@ support.
 
 # built-ins
 from datetime import datetime
+import functools
 import threading
 import time
 from typing import Dict, Optional
 
 # local imports
+from src import call_deadline
+from src import clock
+from src import emulator_config
 from src import site_config
+from src import status_board
+from src import supervision_context as sc
 from src import thermostat_api as api
 from src import thermostat_common as tc
 from src import utilities as util
 
+# longest wait for one thermostat in display_all_temps()
+DISPLAY_TEMPS_DEADLINE_SEC = 60
+# period supervise_all_zones() checks for a stop request while joining
+JOIN_POLL_SEC = 0.5
+
+
+def _in_fleet_mode(method):
+    """
+    Run a ThermostatSite method with the site's emulator fleet enabled.
+
+    Fleet mode is process-wide emulator_config state, so it is only
+    enabled while the site connects and polls zones.
+
+    Args:
+        method (callable): ThermostatSite method.
+
+    Returns:
+        callable: wrapped method.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.fleet_config is None:
+            return method(self, *args, **kwargs)
+        with emulator_config.fleet_mode(self.fleet_config):
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
 
 class ThermostatSite:
     """
@@ -67,6 +102,17 @@ class ThermostatSite:
         self._lock = threading.Lock()
         # Track thread errors for reporting
         self.thread_errors = {}
+        # staggered startup of supervise_all_zones(), see _plan_startup()
+        self._startup_plan = {}
+        self._startup_time = clock.time()
+        # thermostat_type -> semaphore limiting concurrent logins
+        self._auth_semaphores = {}
+        # set by stop(), cuts every supervision sleep short
+        self.stop_event = threading.Event()
+        # thread id -> Thermostat object of the open session
+        self._sessions = {}
+        # emulator fleet config of a fleet stanza, None without one
+        self.fleet_config = None
 
         # Validate and initialize thermostats
         self._initialize_thermostats()
@@ -101,7 +147,10 @@ class ThermostatSite:
                     f"Thermostat config at index {idx} must be a dictionary"
                 )
 
-            required_fields = ["thermostat_type", "zone"]
+            # a fleet stanza generates its own zones
+            required_fields = ["thermostat_type"]
+            if "fleet" not in tstat:
+                required_fields.append("zone")
             for field in required_fields:
                 if field not in tstat:
                     raise ValueError(
@@ -109,6 +158,24 @@ class ThermostatSite:
                         f"field: '{field}'"
                     )
 
+            if "fleet" in tstat and (
+                tstat["thermostat_type"] != emulator_config.ALIAS
+            ):
+                raise ValueError(
+                    f"Thermostat config at index {idx}: 'fleet' is only "
+                    f"supported for thermostat_type "
+                    f"'{emulator_config.ALIAS}'"
+                )
+
+        fleet_count = sum(
+            "fleet" in tstat for tstat in self.site_config["thermostats"]
+        )
+        if fleet_count > 1:
+            raise ValueError(
+                f"site_config_dict supports one 'fleet' stanza, "
+                f"found {fleet_count}"
+            )
+
     def _initialize_thermostats(self):
         """
         Initialize thermostat configurations.
@@ -126,21 +193,69 @@ class ThermostatSite:
             )
             return
 
-        # Filter to only enabled thermostats
-        self.thermostats = [
-            tstat for tstat in thermostat_configs if tstat.get("enabled", True)
-        ]
+        # Filter to only enabled thermostats, expanding any fleet stanza
+        self.thermostats = []
+        for tstat in thermostat_configs:
+            if not tstat.get("enabled", True):
+                continue
+            if "fleet" in tstat:
+                self.thermostats.extend(self._expand_fleet_stanza(tstat))
+            else:
+                self.thermostats.append(tstat)
 
         if self.verbose:
             util.log_msg(
                 f"Site '{self.site_name}': initialized with "
                 f"{len(self.thermostats)} thermostats "
-                f"({len(thermostat_configs) - len(self.thermostats)} "
+                f"({self._count_disabled(thermostat_configs)} "
                 f"disabled)",
                 mode=util.BOTH_LOG,
                 func_name=1,
             )
 
+    @staticmethod
+    def _count_disabled(thermostat_configs) -> int:
+        """
+        Count disabled thermostat config entries.
+
+        Args:
+            thermostat_configs (list): thermostat config dicts.
+
+        Returns:
+            int: number of entries with enabled set to False.
+        """
+        return sum(
+            not tstat.get("enabled", True) for tstat in thermostat_configs
+        )
+
+    def _expand_fleet_stanza(self, fleet_config: Dict) -> list:
+        """
+        Expand an emulator fleet stanza into per-zone thermostat configs.
+
+        Args:
+            fleet_config (dict): thermostat config with a 'fleet' dict of
+                emulator_config.fleet_defaults overrides.
+
+        Returns:
+            list: thermostat config dicts, one per synthetic zone.
+        """
+        # fleet mode itself is only enabled while zones run, see
+        # _in_fleet_mode()
+        self.fleet_config = emulator_config.get_fleet_config(fleet_config["fleet"])
+        zones = range(int(self.fleet_config["zones"]))
+        base_config = {
+            key: value for key, value in fleet_config.items()
+            if key != "fleet"
+        }
+        if self.verbose:
+            util.log_msg(
+                f"Site '{self.site_name}': emulator fleet of {len(zones)} "
+                f"zones (seed={self.fleet_config['seed']})",
+                mode=util.BOTH_LOG,
+                func_name=1,
+            )
+        return [dict(base_config, zone=zone) for zone in zones]
+
     def display_all_zones(self) -> None:
         """
         Display all zones within the site.
@@ -163,10 +278,16 @@ class ThermostatSite:
 
         for idx, tstat in enumerate(all_thermostats, 1):
             status = "ENABLED" if tstat.get("enabled", True) else "DISABLED"
+            zone = tstat.get("zone", "unknown")
+            if "fleet" in tstat:
+                zone_count = tstat["fleet"].get(
+                    "zones", emulator_config.fleet_defaults["zones"]
+                )
+                zone = f"fleet of {zone_count} zones"
             util.log_msg(
                 f"\n  Thermostat {idx}: [{status}]\n"
                 f"    Type: {tstat.get('thermostat_type', 'unknown')}\n"
-                f"    Zone: {tstat.get('zone', 'unknown')}\n"
+                f"    Zone: {zone}\n"
                 f"    Poll Time: {tstat.get('poll_time', 'N/A')}s\n"
                 f"    Tolerance: {tstat.get('tolerance', 'N/A')}"
                 f"{tc.DEGREE_SIGN}F",
@@ -175,12 +296,27 @@ class ThermostatSite:
 
         util.log_msg(f"{'='*60}\n", mode=util.BOTH_LOG)
 
-    def display_all_temps(self) -> None:
+    @_in_fleet_mode
+    def display_all_temps(
+        self, deadline_sec: float = DISPLAY_TEMPS_DEADLINE_SEC
+    ) -> Dict:
         """
         Display temperatures from all zones within the site.
 
-        Queries each enabled thermostat and displays current temperature
-        and humidity readings.
+        Queries every enabled thermostat concurrently and displays current
+        temperature and humidity readings in configuration order.  A
+        thermostat that has not answered within deadline_sec is reported
+        as timed out, so one slow login cannot hold up the summary.
+
+        Args:
+            deadline_sec (float, optional): Longest wait for any one
+                thermostat, measured from the start of the summary.
+                Defaults to DISPLAY_TEMPS_DEADLINE_SEC.
+
+        Returns:
+            dict: Query result keyed by thermostat index, each a dict with
+                'status' ('ok', 'error' or 'timeout') and either the
+                readings or the error.
         """
         util.log_msg(
             f"\n{'='*60}\nSite Temperature Summary: {self.site_name}\n"
@@ -193,61 +329,135 @@ class ThermostatSite:
                 "No enabled thermostats to query",
                 mode=util.BOTH_LOG,
             )
-            return
+            return {}
 
+        # daemon threads so a hung vendor login cannot block exit
+        results: Dict = {}
+        threads = []
         for idx, tstat_config in enumerate(self.thermostats, 1):
-            thermostat_type = tstat_config.get("thermostat_type")
-            zone_num = tstat_config.get("zone")
-
-            try:
-                # Load the thermostat library
-                mod = api.load_hardware_library(thermostat_type)
+            thread = threading.Thread(
+                target=clock.run_task,
+                args=(self._query_thermostat_temps, tstat_config, idx, results),
+                name=f"display-temps-{idx}",
+                daemon=True,
+            )
+            threads.append(thread)
+            clock.add_task()
+            thread.start()
+
+        # report in configuration order, each line as soon as it is ready
+        start_time = time.monotonic()
+        summary = {}
+        with clock.idle():
+            for idx, (tstat_config, thread) in enumerate(
+                zip(self.thermostats, threads), 1
+            ):
+                thread.join(
+                    timeout=max(0.0, start_time + deadline_sec - time.monotonic())
+                )
+                with self._lock:
+                    result = results.get(idx)
+                if result is None:
+                    result = {"status": "timeout"}
+                summary[idx] = result
+                self._log_thermostat_temps(
+                    idx, tstat_config, result, deadline_sec
+                )
 
-                # Create thermostat and zone objects
-                Thermostat = mod.ThermostatClass(zone_num)  # type: ignore[attr-defined]
-                Zone = mod.ThermostatZone(Thermostat)  # type: ignore[attr-defined]
+        util.log_msg(f"{'='*60}\n", mode=util.BOTH_LOG)
+        return summary
 
-                # Query current conditions
-                Zone.query_thermostat_zone()
+    def _query_thermostat_temps(
+        self, tstat_config: Dict, idx: int, results: Dict
+    ) -> None:
+        """
+        Query one thermostat for display_all_temps().
 
-                # Display results
-                temp = Zone.display_temp
-                humidity = Zone.display_humidity
-                mode = Zone.current_mode
+        Args:
+            tstat_config (dict): Configuration for the thermostat.
+            idx (int): Thermostat index in the site.
+            results (dict): Receives the result keyed by idx.
+        """
+        thermostat_type = tstat_config.get("thermostat_type")
+        zone_num = tstat_config.get("zone")
+        try:
+            # Load the thermostat library
+            mod = api.load_hardware_library(thermostat_type)
 
-                util.log_msg(
-                    f"\n  Thermostat {idx}:\n"
-                    f"    Type: {thermostat_type}\n"
-                    f"    Zone: {Zone.zone_name}\n"
-                    f"    Temperature: {temp}{tc.DEGREE_SIGN}F\n"
-                    f"    Humidity: {humidity}%\n"
-                    f"    Mode: {mode}",
-                    mode=util.BOTH_LOG,
-                )
+            # Create thermostat and zone objects
+            Thermostat = mod.ThermostatClass(zone_num)  # type: ignore[attr-defined]
+            Zone = mod.ThermostatZone(Thermostat)  # type: ignore[attr-defined]
 
-                # Clean up
-                if hasattr(Thermostat, "close"):
-                    Thermostat.close()
-                del Zone
-                del Thermostat
+            # Query current conditions
+            Zone.query_thermostat_zone()
+            result = {
+                "status": "ok",
+                "zone_name": Zone.zone_name,
+                "temperature": Zone.display_temp,
+                "humidity": Zone.display_humidity,
+                "mode": Zone.current_mode,
+            }
+
+            # Clean up
+            if hasattr(Thermostat, "close"):
+                Thermostat.close()
+            del Zone
+            del Thermostat
+        except Exception as ex:
+            result = {"status": "error", "error": str(ex)}
+        with self._lock:
+            results[idx] = result
 
-            except Exception as ex:
-                util.log_msg(
-                    f"\n  Thermostat {idx}: ERROR\n"
-                    f"    Type: {thermostat_type}\n"
-                    f"    Zone: {zone_num}\n"
-                    f"    Error: {str(ex)}",
-                    mode=util.BOTH_LOG,
-                    func_name=1,
-                )
+    @staticmethod
+    def _log_thermostat_temps(
+        idx: int, tstat_config: Dict, result: Dict, deadline_sec: float
+    ) -> None:
+        """
+        Display the display_all_temps() result of one thermostat.
 
-        util.log_msg(f"{'='*60}\n", mode=util.BOTH_LOG)
+        Args:
+            idx (int): Thermostat index in the site.
+            tstat_config (dict): Configuration for the thermostat.
+            result (dict): Result from _query_thermostat_temps().
+            deadline_sec (float): Deadline the query was held to.
+        """
+        thermostat_type = tstat_config.get("thermostat_type")
+        zone_num = tstat_config.get("zone")
+        if result["status"] == "ok":
+            util.log_msg(
+                f"\n  Thermostat {idx}:\n"
+                f"    Type: {thermostat_type}\n"
+                f"    Zone: {result['zone_name']}\n"
+                f"    Temperature: {result['temperature']}{tc.DEGREE_SIGN}F\n"
+                f"    Humidity: {result['humidity']}%\n"
+                f"    Mode: {result['mode']}",
+                mode=util.BOTH_LOG,
+            )
+        elif result["status"] == "timeout":
+            util.log_msg(
+                f"\n  Thermostat {idx}: TIMEOUT\n"
+                f"    Type: {thermostat_type}\n"
+                f"    Zone: {zone_num}\n"
+                f"    Error: timed out after {deadline_sec}s",
+                mode=util.BOTH_LOG,
+                func_name=1,
+            )
+        else:
+            util.log_msg(
+                f"\n  Thermostat {idx}: ERROR\n"
+                f"    Type: {thermostat_type}\n"
+                f"    Zone: {zone_num}\n"
+                f"    Error: {result['error']}",
+                mode=util.BOTH_LOG,
+                func_name=1,
+            )
 
     def _supervise_single_thermostat(
         self,
         tstat_config: Dict,
         thread_id: int,
-        measurement_count: int = 1
+        measurement_count: int = 1,
+        full_supervision: bool = False
     ) -> None:
         """
         Supervise a single thermostat in a separate thread.
@@ -268,6 +478,9 @@ class ThermostatSite:
                 this value may be overridden by configuration values read from
                 ``tstat_config`` (for example, ``max_measurements``).
                 Defaults to 1.
+            full_supervision (bool, optional): Run the zone's
+                supervisor_loop, reverting mode and setpoint deviations,
+                instead of read-only polling. Defaults to False.
         """
         thermostat_type = tstat_config.get("thermostat_type")
         zone_num = tstat_config.get("zone")
@@ -281,6 +494,7 @@ class ThermostatSite:
             func_name=1,
         )
 
+        start_delay_sec, poll_phase = self._startup_plan.get(thread_id, (0.0, 0.0))
         try:
             # Load the thermostat library
             mod = api.load_hardware_library(thermostat_type)
@@ -288,12 +502,38 @@ class ThermostatSite:
             # Verify environment variables
             api.verify_required_env_variables(thermostat_type, str(zone_num))
 
+            # Set measurement limits
+            max_measurements = tstat_config.get("measurements", 1)
+
+            # per-zone inputs and connection status, other zones running
+            # in this process keep their own, the runtime parameters are
+            # added once the Zone object exists
+            supervision = sc.SupervisionContext(
+                inputs={
+                    api.input_flds.thermostat_type: thermostat_type,
+                    api.input_flds.zone: zone_num,
+                    api.input_flds.measurements: max_measurements,
+                },
+                measurement_callback=functools.partial(
+                    self._record_measurement,
+                    tstat_config,
+                    thread_name,
+                    max_measurements=max_measurements,
+                ),
+                stop_event=self.stop_event,
+            )
+
             # Create thermostat and zone objects
-            Thermostat = mod.ThermostatClass(zone_num)  # type: ignore[attr-defined]
-            Zone = mod.ThermostatZone(Thermostat)  # type: ignore[attr-defined]
+            if self._sleep_until(start_delay_sec):
+                return
+            Thermostat, Zone = self._connect(
+                mod, thermostat_type, zone_num, supervision
+            )
+            self._open_session(thread_id, Thermostat)
 
-            # Update runtime parameters from config
-            if tstat_config.get("poll_time"):
+            # Update runtime parameters from config, poll_time 0 polls
+            # back to back
+            if tstat_config.get("poll_time") is not None:
                 Zone.poll_time_sec = tstat_config["poll_time"]
             if tstat_config.get("connection_time"):
                 Zone.connection_time_sec = tstat_config["connection_time"]
@@ -302,9 +542,6 @@ class ThermostatSite:
             if tstat_config.get("target_mode"):
                 Zone.target_mode = tstat_config["target_mode"]
 
-            # Set measurement limits
-            max_measurements = tstat_config.get("measurements", 1)
-
             util.log_msg(
                 f"{thread_name}: Zone={Zone.zone_name}, "
                 f"max_measurements={max_measurements}",
@@ -312,52 +549,64 @@ class ThermostatSite:
                 func_name=1,
             )
 
-            # Supervision loop - using for loop for clarity
-            for measurement in range(1, max_measurements + 1):
-                # Query the thermostat
-                Zone.query_thermostat_zone()
-
-                # Store results
-                with self._lock:
-                    result_key = f"{thermostat_type}_zone{zone_num}"
-                    if result_key not in self.measurement_results:
-                        self.measurement_results[result_key] = []
-
-                    self.measurement_results[result_key].append({
-                        "timestamp": time.time(),
-                        "measurement": measurement,
-                        "temperature": Zone.display_temp,
-                        "humidity": Zone.display_humidity,
-                        "mode": Zone.current_mode,
-                        "thread": thread_name,
-                    })
-
-                timestamp = datetime.now().strftime(
-                    "%Y-%m-%d %H:%M:%S"
+            for field, value in (
+                (api.input_flds.poll_time, Zone.poll_time_sec),
+                (api.input_flds.connection_time, Zone.connection_time_sec),
+                (api.input_flds.tolerance, Zone.tolerance_degrees),
+                (api.input_flds.target_mode, Zone.target_mode),
+            ):
+                supervision.set_input(field, value)
+            Zone.supervision = supervision
+
+            # first poll at this zone's phase of its vendor's poll period
+            if self._sleep_until(poll_phase * Zone.poll_time_sec):
+                return
+
+            if full_supervision:
+                self._run_supervisor_sessions(
+                    mod,
+                    Thermostat,
+                    Zone,
+                    thermostat_type,
+                    zone_num,
+                    supervision,
+                    thread_id,
                 )
+            else:
+                # Supervision loop - using for loop for clarity, bound so a
+                # failed query flags this zone and stop() cuts its retry
+                # delays short
+                with sc.bind(supervision):
+                    for measurement in range(1, max_measurements + 1):
+                        # Query the thermostat, live status for other
+                        # processes, see status_board
+                        try:
+                            Zone.query_thermostat_zone()
+                        except Exception:
+                            status_board.publish_failure(Zone)
+                            raise
+                        status_board.publish_query(Zone, 1, measurement)
+                        supervision.record_measurement(Zone, measurement)
+
+                        # Wait before next measurement (except after last),
+                        # a stop request ends the loop
+                        if measurement < max_measurements and supervision.wait(
+                            Zone.poll_time_sec
+                        ):
+                            break
+
+            if supervision.stop_requested():
                 util.log_msg(
-                    f"[{timestamp}] {thread_name}: Measurement {measurement}/"
-                    f"{max_measurements} - "
-                    f"Temp: {Zone.display_temp}{tc.DEGREE_SIGN}F, "
-                    f"Humidity: {Zone.display_humidity}%",
+                    f"{thread_name}: Stopped on request",
+                    mode=util.BOTH_LOG,
+                    func_name=1,
+                )
+            else:
+                util.log_msg(
+                    f"{thread_name}: Completed {max_measurements} measurements",
                     mode=util.BOTH_LOG,
                     func_name=1,
                 )
-
-                # Wait before next measurement (except after last measurement)
-                if measurement < max_measurements:
-                    time.sleep(Zone.poll_time_sec)
-
-            util.log_msg(
-                f"{thread_name}: Completed {max_measurements} measurements",
-                mode=util.BOTH_LOG,
-                func_name=1,
-            )
-
-            # Clean up external resources; Python will garbage-collect
-            # these objects when they go out of scope
-            if hasattr(Thermostat, "close"):
-                Thermostat.close()
 
         except Exception as ex:
             # Track error for reporting
@@ -366,7 +615,7 @@ class ThermostatSite:
                 self.thread_errors[result_key] = {
                     "error": str(ex),
                     "thread": thread_name,
-                    "timestamp": time.time(),
+                    "timestamp": clock.time(),
                 }
 
             util.log_msg(
@@ -380,11 +629,307 @@ class ThermostatSite:
                 mode=util.DEBUG_LOG,
                 func_name=1,
             )
+        finally:
+            # Clean up external resources; Python will garbage-collect
+            # these objects when they go out of scope
+            self._close_session(thread_id)
+
+    def _plan_startup(self) -> Dict:
+        """
+        Plan staggered thread starts and poll phase offsets.
+
+        Thread starts are spread evenly over the site's startup_ramp_sec.
+        With phase_offsets enabled the first poll of the k-th of n zones
+        of one thermostat type waits k / n of its poll time, so the polls
+        of each vendor stay evenly spread over the poll period and its
+        peak request rate drops to about n / poll_time.  Zones taking a
+        single measurement have no later polls to spread and are not
+        delayed.
+
+        Returns:
+            dict: (start delay in seconds, poll phase as a fraction of the
+                poll time) keyed by thermostat index, measured from the
+                start of supervision.
+        """
+        ramp_sec = self.site_config.get(
+            "startup_ramp_sec", site_config.STARTUP_RAMP_SEC
+        )
+        phase_offsets = self.site_config.get(
+            "phase_offsets", site_config.PHASE_OFFSETS
+        )
+        vendor_zones: Dict = {}
+        for idx, tstat_config in enumerate(self.thermostats, 1):
+            if tstat_config.get("measurements", 1) > 1:
+                vendor_zones.setdefault(
+                    tstat_config.get("thermostat_type"), []
+                ).append(idx)
+
+        plan = {}
+        for idx, tstat_config in enumerate(self.thermostats, 1):
+            start_delay_sec = ramp_sec * (idx - 1) / len(self.thermostats)
+            poll_phase = 0.0
+            zones = vendor_zones.get(tstat_config.get("thermostat_type"), [])
+            if phase_offsets and idx in zones:
+                poll_phase = zones.index(idx) / len(zones)
+            plan[idx] = (start_delay_sec, poll_phase)
+        return plan
+
+    def _sleep_until(self, offset_sec: float) -> bool:
+        """
+        Sleep until offset_sec after the start of supervision.
+
+        Args:
+            offset_sec (float): Seconds after the start of supervision,
+                returns at once if already past.
+
+        Returns:
+            bool: True if stop() was called.
+        """
+        remaining_sec = self._startup_time + offset_sec - clock.time()
+        return clock.wait(self.stop_event, remaining_sec)
+
+    def stop(self) -> None:
+        """
+        Ask supervise_all_zones() to stop.
+
+        Safe to call from any thread or a signal handler.  Every poll,
+        startup and retry delay of the supervision threads ends at once,
+        in-flight vendor calls get the site's shutdown_grace_sec to
+        finish, then the sessions still open are closed.
+        """
+        self.stop_event.set()
+
+    def _get_shutdown_grace_sec(self) -> float:
+        """
+        Return the time in-flight calls get to finish after stop().
+
+        Returns:
+            float: Site config shutdown_grace_sec, else the default.
+        """
+        return self.site_config.get(
+            "shutdown_grace_sec", site_config.SHUTDOWN_GRACE_SEC
+        )
+
+    def _join_threads(self, threads: list, timeout_sec: float) -> list:
+        """
+        Join supervision threads, cutting the wait short after stop().
+
+        Once the stop event is set, threads get the shutdown grace period
+        to finish, then the sessions of threads still running are closed
+        so their blocked vendor calls fail.
+
+        Args:
+            threads (list): Supervision threads.
+            timeout_sec (float): Longest total wait without a stop request.
+
+        Returns:
+            list: Threads still running.
+        """
+        end_time = time.monotonic() + timeout_sec
+        stop_time = None
+        # blocked on other tasks, let virtual time advance meanwhile
+        with clock.idle():
+            for thread in threads:
+                while thread.is_alive():
+                    now = time.monotonic()
+                    if stop_time is None and self.stop_event.is_set():
+                        stop_time = now + self._get_shutdown_grace_sec()
+                        end_time = min(end_time, stop_time)
+                    if now >= end_time:
+                        break
+                    thread.join(timeout=min(end_time - now, JOIN_POLL_SEC))
+
+        if stop_time is not None:
+            with self._lock:
+                thread_ids = list(self._sessions)
+            for thread_id in thread_ids:
+                util.log_msg(
+                    f"closing session of thermostat {thread_id} after the "
+                    "shutdown grace period",
+                    mode=util.BOTH_LOG,
+                    func_name=1,
+                )
+                self._close_session(thread_id)
+        return [thread for thread in threads if thread.is_alive()]
+
+    def _open_session(self, thread_id: int, Thermostat) -> None:
+        """
+        Register the open session of a supervision thread.
+
+        Args:
+            thread_id (int): Thermostat index of the thread.
+            Thermostat (obj): Connected thermostat object.
+        """
+        with self._lock:
+            self._sessions[thread_id] = Thermostat
+
+    def _close_session(self, thread_id: int) -> None:
+        """
+        Close the open session of a supervision thread, if any.
+
+        Called by the thread when it is done and, after the shutdown
+        grace period, by supervise_all_zones() for a thread still stuck
+        in a vendor call.  Only the first call closes the session.
+
+        Args:
+            thread_id (int): Thermostat index of the thread.
+        """
+        with self._lock:
+            Thermostat = self._sessions.pop(thread_id, None)
+        if Thermostat is not None and hasattr(Thermostat, "close"):
+            Thermostat.close()
+
+    def _get_auth_semaphore(self, thermostat_type: str) -> threading.Semaphore:
+        """
+        Return the semaphore limiting concurrent logins of a vendor.
+
+        The limit is the site config "max_concurrent_auth" entry for the
+        thermostat type, else <vendor>_config.MAX_CONCURRENT_AUTH, else
+        site_config.MAX_CONCURRENT_AUTH.
+
+        Args:
+            thermostat_type (str): Thermostat type.
+
+        Returns:
+            threading.Semaphore: Semaphore shared by the vendor's zones.
+        """
+        with self._lock:
+            semaphore = self._auth_semaphores.get(thermostat_type)
+            if semaphore is None:
+                limit = site_config.MAX_CONCURRENT_AUTH
+                for config_module in api.config_modules:
+                    if config_module.ALIAS == thermostat_type:
+                        limit = getattr(
+                            config_module, "MAX_CONCURRENT_AUTH", limit
+                        )
+                limit = self.site_config.get("max_concurrent_auth", {}).get(
+                    thermostat_type, limit
+                )
+                semaphore = threading.Semaphore(max(1, limit))
+                self._auth_semaphores[thermostat_type] = semaphore
+            return semaphore
+
+    def _connect(self, mod, thermostat_type: str, zone_num, supervision):
+        """
+        Create the thermostat and zone objects, bounding concurrent logins.
+
+        The login runs bound to the zone's supervision context, so its
+        retry delays end at once on stop().
+
+        Args:
+            mod (module): Thermostat library.
+            thermostat_type (str): Thermostat type.
+            zone_num (int): Zone number.
+            supervision (SupervisionContext): Context of the zone.
+
+        Returns:
+            tuple: (Thermostat, Zone) objects.
+        """
+        semaphore = self._get_auth_semaphore(thermostat_type)
+        if not semaphore.acquire(blocking=False):
+            # blocked on other zones, let virtual time advance meanwhile
+            with clock.idle():
+                semaphore.acquire()
+        try:
+            with sc.bind(supervision):
+                Thermostat = mod.ThermostatClass(  # type: ignore[attr-defined]
+                    zone_num
+                )
+                Zone = mod.ThermostatZone(Thermostat)  # type: ignore[attr-defined]
+        finally:
+            semaphore.release()
+        return Thermostat, Zone
+
+    def _record_measurement(
+        self,
+        tstat_config: Dict,
+        thread_name: str,
+        Zone,
+        measurement: int,
+        max_measurements: int
+    ) -> None:
+        """
+        Store and log one measurement of a supervised zone.
+
+        Args:
+            tstat_config (dict): Configuration for the thermostat.
+            thread_name (str): Name of the supervision thread.
+            Zone (obj): Zone that was polled.
+            measurement (int): Measurement index.
+            max_measurements (int): Measurements to take.
+        """
+        result_key = (
+            f"{tstat_config.get('thermostat_type')}_zone"
+            f"{tstat_config.get('zone')}"
+        )
+        with self._lock:
+            self.measurement_results.setdefault(result_key, []).append({
+                "timestamp": clock.time(),
+                "measurement": measurement,
+                "temperature": Zone.display_temp,
+                "humidity": Zone.display_humidity,
+                "mode": Zone.current_mode,
+                "thread": thread_name,
+            })
+
+        timestamp = datetime.now().strftime(
+            "%Y-%m-%d %H:%M:%S"
+        )
+        util.log_msg(
+            f"[{timestamp}] {thread_name}: Measurement {measurement}/"
+            f"{max_measurements} - "
+            f"Temp: {Zone.display_temp}{tc.DEGREE_SIGN}F, "
+            f"Humidity: {Zone.display_humidity}%",
+            mode=util.BOTH_LOG,
+            func_name=1,
+        )
+
+    def _run_supervisor_sessions(
+        self, mod, Thermostat, Zone, thermostat_type, zone_num, supervision, thread_id
+    ) -> None:
+        """
+        Run supervisor_loop sessions until the measurements are taken.
+
+        Reconnects whenever the loop ends a session, i.e. after the
+        connection time or a failed connection, and stops on stop().  The
+        zone settings are restored from the context on every new Zone
+        object.
+
+        Args:
+            mod (module): Thermostat library.
+            Thermostat (obj): Connected thermostat object.
+            Zone (obj): Zone object of Thermostat.
+            thermostat_type (str): Thermostat type.
+            zone_num (int): Zone number.
+            supervision (SupervisionContext): Context of the zone.
+            thread_id (int): Thermostat index of the thread.
+        """
+        session_count = 1
+        measurement = 1
+        while not (
+            supervision.max_measurement_count_exceeded(measurement)
+            or supervision.stop_requested()
+        ):
+            if session_count > 1:
+                self._close_session(thread_id)
+                Thermostat, Zone = self._connect(
+                    mod, thermostat_type, zone_num, supervision
+                )
+                self._open_session(thread_id, Thermostat)
+                Zone.supervision = supervision
+                Zone.update_runtime_parameters()
+            Zone.session_start_time_sec = clock.time()
+            measurement = Zone.supervisor_loop(
+                Thermostat, session_count, measurement, False
+            )
+            session_count += 1
 
+    @_in_fleet_mode
     def supervise_all_zones(
         self,
         measurement_count: int = 1,
-        use_threading: bool = True
+        use_threading: bool = True,
+        full_supervision: bool = False
     ) -> Dict:
         """
         Supervise all enabled zones within the site.
@@ -393,12 +938,23 @@ class ThermostatSite:
         per-thermostat 'measurements' configuration takes precedence if
         specified in the thermostat config dictionary.
 
+        With threading, thread starts are staggered and polls are phase
+        offset per vendor (see _plan_startup()), and logins of one vendor
+        are limited to its max concurrent auth setting.
+
+        stop(), e.g. from a signal handler, or CTRL-C ends supervision
+        within about the site's shutdown_grace_sec, however long the poll
+        time.
+
         Args:
             measurement_count (int, optional): Default number of measurements
                 per thermostat. This value is overridden by per-thermostat
                 'measurements' config if present. Defaults to 1.
             use_threading (bool, optional): Use multi-threading for parallel
                 supervision. Defaults to True.
+            full_supervision (bool, optional): Run every zone's
+                supervisor_loop, reverting mode and setpoint deviations,
+                instead of read-only polling. Defaults to False.
 
         Returns:
             dict: Dictionary with two keys:
@@ -427,10 +983,17 @@ class ThermostatSite:
             self.measurement_results = {}
             self.thread_errors = {}
 
+        # stagger threads only, sequential supervision is already serial
+        self._startup_plan = self._plan_startup() if use_threading else {}
+        self._startup_time = clock.time()
+        self.stop_event.clear()
+        # one board slot per zone, see status_board
+        status_board.set_zone_count(len(self.thermostats))
+
+        threads = []
         try:
             if use_threading:
                 # Multi-threaded approach for parallel supervision
-                threads = []
                 thread_configs = []
                 for idx, tstat_config in enumerate(self.thermostats, 1):
                     # Use measurement count from config if available
@@ -438,36 +1001,52 @@ class ThermostatSite:
                         "measurements", measurement_count
                     )
                     thread_configs.append((tstat_config, measurements))
+                    # register with the clock so virtual time can tell when
+                    # every supervision thread is sleeping
                     thread = threading.Thread(
-                        target=self._supervise_single_thermostat,
-                        args=(tstat_config, idx, measurements),
-                        daemon=False,
+                        target=clock.run_task,
+                        args=(
+                            self._supervise_single_thermostat,
+                            tstat_config,
+                            idx,
+                            measurements,
+                            full_supervision,
+                        ),
+                        # a thread stuck in a vendor call past the shutdown
+                        # grace period must not block exit
+                        daemon=True,
                     )
                     threads.append(thread)
+                    clock.add_task()
                     thread.start()
 
                 # Wait for all threads to complete with timeout
-                # Calculate timeout: max(connection_time +
-                # poll_time * measurements)
+                # Calculate timeout: max(start delay + connection_time +
+                # poll_time * (measurements + 1 for the phase offset))
                 max_timeout = 0
-                for tstat_config, measurements in thread_configs:
+                for idx, (tstat_config, measurements) in enumerate(
+                    thread_configs, 1
+                ):
                     conn_time = tstat_config.get("connection_time", 300)
                     poll_time = tstat_config.get("poll_time", 60)
                     safety_margin = 60  # Extra time for processing
                     timeout = (
-                        conn_time + (poll_time * measurements) + safety_margin
+                        self._startup_plan[idx][0]
+                        + conn_time
+                        + (poll_time * (measurements + 1))
+                        + safety_margin
                     )
                     max_timeout = max(max_timeout, timeout)
 
-                for thread in threads:
-                    thread.join(timeout=max_timeout)
-                    if thread.is_alive():
-                        util.log_msg(
-                            f"WARNING: Thread {thread.name} did not complete "
-                            f"within timeout ({max_timeout}s)",
-                            mode=util.BOTH_LOG,
-                            func_name=1,
-                        )
+                for thread in self._join_threads(threads, max_timeout):
+                    util.log_msg(
+                        f"WARNING: Thread {thread.name} did not "
+                        f"complete within timeout ({max_timeout}s), "
+                        f"stack:\n"
+                        f"{call_deadline.format_thread_stack(thread.ident)}",
+                        mode=util.BOTH_LOG,
+                        func_name=1,
+                    )
 
                 util.log_msg(
                     f"All {len(threads)} supervision threads completed",
@@ -481,7 +1060,7 @@ class ThermostatSite:
                         "measurements", measurement_count
                     )
                     self._supervise_single_thermostat(
-                        tstat_config, idx, measurements
+                        tstat_config, idx, measurements, full_supervision
                     )
         except KeyboardInterrupt:
             util.log_msg(
@@ -489,6 +1068,8 @@ class ThermostatSite:
                 mode=util.BOTH_LOG,
                 func_name=1,
             )
+            self.stop()
+            self._join_threads(threads, self._get_shutdown_grace_sec())
             # Re-raise to allow caller to handle
             raise
 
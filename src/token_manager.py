@@ -0,0 +1,309 @@
+"""
+Proactive OAuth token refresh for the cloud thermostat drivers.
+
+Drivers register each logged in client object (token holder) with a
+refresh callback and the expiry time of its access token.  A background
+thread calls the callback TOKEN_REFRESH_LEAD_SEC before the token expires,
+so polls keep using a valid in-memory token and never pay for an auth
+round-trip on the request path.
+
+Refreshes run one at a time.  A request path that finds its token expired
+anyway calls refresh(), which joins a refresh already in flight for the
+same holder instead of starting a second one.  A failed refresh is
+retried every TOKEN_REFRESH_RETRY_SEC until the token expires, after
+which the driver's own reactive refresh takes over.
+
+Token holders are registered per vendor account, so zones logged into
+the same account share one refresh.  Each zone adds itself as a peer of
+the account's holder and the refresh callback hands the new token to
+every live peer.
+
+Bound method callbacks are held by weak reference so a discarded driver
+instance (e.g. after a reconnect) drops out of the manager.
+
+Expiry times are on the holder's time base, clock.time() by default.
+Tokens checked by the vendor library against the wall clock (e.g.
+oauthlib) are registered with time_func=time.time so a virtual clock
+never moves them.
+"""
+
+# built-in imports
+import collections
+import threading
+import traceback
+import weakref
+
+# local imports
+from src import clock
+from src import utilities as util
+
+# refresh this long before the access token expires
+TOKEN_REFRESH_LEAD_SEC = 300
+# retry interval after a failed background refresh
+TOKEN_REFRESH_RETRY_SEC = 60
+# longest real time the refresh thread sleeps before re-checking due times
+MAX_IDLE_WAIT_SEC = 30
+
+
+class TokenManager:
+    """Refresh registered OAuth tokens shortly before they expire."""
+
+    def __init__(
+        self, lead_sec=TOKEN_REFRESH_LEAD_SEC, retry_sec=TOKEN_REFRESH_RETRY_SEC
+    ):
+        """
+        Constructor.
+
+        inputs:
+            lead_sec(float): refresh this long before expiry.
+            retry_sec(float): retry interval after a failed refresh.
+        """
+        self.lead_sec = lead_sec
+        self.retry_sec = retry_sec
+        self.stats = collections.Counter()
+        # key -> holder dict, see register()
+        self._holders = {}
+        # key -> live driver instances sharing the holder's token
+        self._peers = collections.defaultdict(weakref.WeakSet)
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopping = False
+
+    def register(self, key, refresh_func, expires_at, time_func=None):
+        """
+        Register or update a token holder.
+
+        inputs:
+            key(str): token holder name, e.g. "kumocloud:<user>".
+            refresh_func(callable): refreshes the token and returns the new
+                                    expiry epoch time, raises on failure.
+            expires_at(float): current token expiry epoch time.
+            time_func(callable): time base of expires_at, None for
+                                 clock.time.
+        returns:
+            None
+        """
+        if hasattr(refresh_func, "__self__"):
+            func_ref = weakref.WeakMethod(refresh_func)
+        else:
+            func_ref = lambda: refresh_func  # noqa E731
+        with self._cond:
+            holder = self._holders.get(key)
+            if holder is None:
+                holder = {"refreshing": False, "last_ok": True}
+                self._holders[key] = holder
+            holder["func_ref"] = func_ref
+            holder["time_func"] = time_func or clock.time
+            holder["expires_at"] = expires_at
+            holder["due_at"] = expires_at - self.lead_sec
+            self._cond.notify_all()
+        self.start()
+
+    def add_peer(self, key, peer):
+        """
+        Add a driver instance sharing the token of a holder.
+
+        inputs:
+            key(str): token holder name.
+            peer(obj): driver instance, held by weak reference.
+        returns:
+            None
+        """
+        with self._cond:
+            self._peers[key].add(peer)
+
+    def get_peers(self, key):
+        """
+        Return the live driver instances sharing the token of a holder.
+
+        inputs:
+            key(str): token holder name.
+        returns:
+            (list): driver instances.
+        """
+        with self._cond:
+            return list(self._peers.get(key, ()))
+
+    def unregister(self, key):
+        """
+        Stop refreshing a token holder.
+
+        inputs:
+            key(str): token holder name.
+        returns:
+            None
+        """
+        with self._cond:
+            self._holders.pop(key, None)
+
+    def get_expiry(self, key):
+        """
+        Return the tracked expiry of a token holder.
+
+        inputs:
+            key(str): token holder name.
+        returns:
+            (float or None): expiry epoch time, None if not registered.
+        """
+        with self._cond:
+            holder = self._holders.get(key)
+            return None if holder is None else holder["expires_at"]
+
+    def refresh(self, key):
+        """
+        Refresh a token now, joining a refresh already in flight.
+
+        inputs:
+            key(str): token holder name.
+        returns:
+            (bool): True if the token was refreshed.
+        """
+        with self._cond:
+            holder = self._holders.get(key)
+            if holder is None:
+                return False
+            if holder["refreshing"]:
+                while holder["refreshing"]:
+                    self._cond.wait()
+                return holder["last_ok"]
+            holder["refreshing"] = True
+            refresh_func = holder["func_ref"]()
+
+        refreshed = False
+        expires_at = None
+        try:
+            if refresh_func is not None:
+                expires_at = refresh_func()
+                refreshed = True
+        except Exception as ex:  # pylint: disable=broad-except
+            util.log_msg(traceback.format_exc(), mode=util.DEBUG_LOG, func_name=1)
+            util.log_msg(
+                f"WARNING: token refresh for {key} failed: {ex}",
+                mode=util.BOTH_LOG,
+                func_name=1,
+            )
+        finally:
+            with self._cond:
+                holder["refreshing"] = False
+                holder["last_ok"] = refreshed
+                if refresh_func is None:
+                    # driver instance is gone
+                    self._holders.pop(key, None)
+                elif refreshed:
+                    self.stats["refreshed"] += 1
+                    if expires_at is not None:
+                        holder["expires_at"] = expires_at
+                    holder["due_at"] = holder["expires_at"] - self.lead_sec
+                else:
+                    self.stats["failed"] += 1
+                    holder["due_at"] = holder["time_func"]() + self.retry_sec
+                self._cond.notify_all()
+        return refreshed
+
+    def refresh_due(self):
+        """
+        Refresh every token that is due, one at a time.
+
+        inputs:
+            None
+        returns:
+            (int): number of refreshes attempted.
+        """
+        with self._cond:
+            due_keys = [
+                key
+                for key, holder in self._holders.items()
+                if holder["due_at"] <= holder["time_func"]()
+                and not holder["refreshing"]
+            ]
+        for key in due_keys:
+            self.refresh(key)
+        return len(due_keys)
+
+    def start(self):
+        """
+        Start the refresh thread if it is not running.
+
+        inputs:
+            None
+        returns:
+            None
+        """
+        with self._cond:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._thread = threading.Thread(
+                target=self._run, name="token_manager", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout=5.0):
+        """
+        Stop the refresh thread.
+
+        inputs:
+            timeout(float): longest wait for the thread to finish.
+        returns:
+            None
+        """
+        with self._cond:
+            self._stopping = True
+            thread = self._thread
+            self._thread = None
+            self._cond.notify_all()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=timeout)
+
+    def _run(self):
+        """Refresh thread body."""
+        while True:
+            self.refresh_due()
+            with self._cond:
+                if self._stopping:
+                    return
+                self._cond.wait(timeout=self._get_wait_sec())
+                if self._stopping:
+                    return
+
+    def _get_wait_sec(self):
+        """Return the real time to sleep until the next refresh, lock held."""
+        wait_times = [
+            holder["due_at"] - holder["time_func"]()
+            for holder in self._holders.values()
+            if not holder["refreshing"]
+        ]
+        if not wait_times:
+            return MAX_IDLE_WAIT_SEC
+        return min(MAX_IDLE_WAIT_SEC, max(0.0, min(wait_times)))
+
+
+# process-wide token manager shared by all zones
+_token_manager = TokenManager()
+
+
+def get_token_manager():
+    """
+    Return the process-wide token manager.
+
+    inputs:
+        None
+    returns:
+        (TokenManager): token manager.
+    """
+    return _token_manager
+
+
+def reset_token_manager():
+    """
+    Stop the process-wide token manager and replace it with an empty one.
+
+    inputs:
+        None
+    returns:
+        (TokenManager): new token manager.
+    """
+    global _token_manager  # noqa W603
+    _token_manager.stop()
+    _token_manager = TokenManager()
+    return _token_manager
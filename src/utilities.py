@@ -5,9 +5,12 @@ import argparse
 import configparser
 import datetime
 import inspect
+import json
 import os
+import random
 import socket
 import sys
+import threading
 import time
 import traceback
 
@@ -15,6 +18,7 @@ import traceback
 import requests
 
 # local imports
+from src import clock
 
 PACKAGE_NAME = "src"  # should match name in __init__.py
 
@@ -54,6 +58,8 @@ log_modes = {
 
 FILE_PATH = ".//data"
 MAX_LOG_SIZE_BYTES = 2**20  # logs rotate at this max size
+# date suffix of rotated logs, <name>-<date>.txt, see log_reader.py
+LOG_ROTATE_DATE_FORMAT = "%d-%b-%Y-%H-%M-%S"
 STDOUT_CAPTURE_HOURS = 24  # hours of stdout to capture in dual stream mode
 STDOUT_CAPTURE_FILE = "stdout_capture.txt"  # filename for captured stdout
 HTTP_TIMEOUT = 60  # timeout in seconds
@@ -296,7 +302,7 @@ def log_rotate_file(full_path, file_size_bytes, max_size_bytes):
     """
     if file_size_bytes > max_size_bytes:
         # rotate log file
-        current_date = datetime.datetime.today().strftime("%d-%b-%Y-%H-%M-%S")
+        current_date = datetime.datetime.today().strftime(LOG_ROTATE_DATE_FORMAT)
         os.rename(full_path, full_path[:-4] + "-" + str(current_date) + ".txt")
         file_size_bytes = 0
     return file_size_bytes
@@ -321,7 +327,7 @@ def log_rotate_file_by_time(full_path, max_age_hours):
         if age_hours > max_age_hours:
             # Rotate log file with timestamp
             current_date = datetime.datetime.fromtimestamp(file_mod_time).strftime(
-                "%d-%b-%Y-%H-%M-%S"
+                LOG_ROTATE_DATE_FORMAT
             )
             backup_path = full_path[:-4] + "-" + str(current_date) + ".txt"
             os.rename(full_path, backup_path)
@@ -402,6 +408,37 @@ def get_full_file_path(file_name):
     return FILE_PATH + "//" + file_name
 
 
+def write_json_atomic(file_path, data, indent=4, file_mode=0o600):
+    """
+    Write a JSON file atomically.
+
+    The data is written to a temporary file in the same folder and renamed
+    over the target, so readers never see a partially written file.  The
+    temporary file is removed if the write fails.
+
+    inputs:
+        file_path(str): target file path.
+        data(dict): JSON serializable data.
+        indent(int): JSON indent.
+        file_mode(int): permissions of the new file, owner-only by
+                        default for token and session caches.
+    returns:
+        None
+    """
+    folder = os.path.dirname(file_path) or "."
+    os.makedirs(folder, exist_ok=True)
+    temp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, file_mode)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as temp_file:
+            json.dump(data, temp_file, indent=indent)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
 def utf8len(input_string):
     """
     Return length of string in bytes.
@@ -553,7 +590,7 @@ def f_to_c(tempf) -> float | None:
         raise TypeError(f"raw value '{tempf}' is not an int or float")
 
 
-def is_host_on_local_net(host_name, ip_address=None, verbose=False):
+def is_host_on_local_net(host_name, ip_address=None, verbose=False, use_cache=False):
     """
     Return True if specified host is on local network.
     socket.gethostbyaddr() throws exception for some IP address
@@ -563,17 +600,25 @@ def is_host_on_local_net(host_name, ip_address=None, verbose=False):
         host_name(str): expected host name.
         ip_address(str): target IP address on local net.
         verbose(bool): if True, print out status.
+        use_cache(bool): if True, use the shared DNS cache (dns_cache.py),
+                         for discovery sweeps that probe many hosts.
     returns:
         tuple(bool, str): True if confirmed on local net, else False.
                           ip_address if known
     """
-    host_found = None
+    if use_cache:
+        # note this import will cause circular import issue if put at top of file.
+        from src import dns_cache  # noqa: E402, C0415
+
+        resolve = dns_cache.get_dns_cache().resolve
+        reverse = dns_cache.get_dns_cache().reverse
+    else:
+        resolve = _resolve_host_name
+        reverse = _reverse_host_name
+
     # find by hostname alone if IP is None
     if ip_address is None:
-        try:
-            host_found = socket.gethostbyname(host_name)
-        except socket.gaierror:
-            return False, None
+        host_found = resolve(host_name)
         if host_found:
             if verbose:
                 print(f"host {host_name} found at {host_found} on local net")
@@ -583,9 +628,8 @@ def is_host_on_local_net(host_name, ip_address=None, verbose=False):
         return False, None
 
     # match both IP and host if both are provided.
-    try:
-        host_found = socket.gethostbyaddr(ip_address)
-    except socket.herror:  # exception if DNS name is not set
+    host_found = reverse(ip_address)
+    if host_found is None:  # DNS name is not set
         return False, None
     if host_name == host_found[0]:
         return True, ip_address
@@ -593,6 +637,22 @@ def is_host_on_local_net(host_name, ip_address=None, verbose=False):
     return False, None
 
 
+def _resolve_host_name(host_name):
+    """Return the IP address of host_name, None if not found."""
+    try:
+        return socket.gethostbyname(host_name)
+    except socket.gaierror:
+        return None
+
+
+def _reverse_host_name(ip_address):
+    """Return the host entry of ip_address, None if DNS name is not set."""
+    try:
+        return socket.gethostbyaddr(ip_address)
+    except socket.herror:
+        return None
+
+
 # default parent_key if user_inputs are not pulled from file
 default_parent_key = "argv"
 
@@ -1036,6 +1096,254 @@ class UserInputs:
                 self.user_inputs_file[section][key] = config[section][key]
 
 
+# circuit breaker states
+CIRCUIT_CLOSED = "closed"  # calls pass through
+CIRCUIT_OPEN = "open"  # calls short-circuit until the probe time
+CIRCUIT_HALF_OPEN = "half_open"  # one probe call in flight
+
+# circuit breaker settings, shared by all zones and threads of a vendor
+CIRCUIT_FAILURE_THRESHOLD = 3  # consecutive failures that open the circuit
+CIRCUIT_OPEN_MIN_SEC = 30  # first open interval
+CIRCUIT_OPEN_MAX_SEC = 1800  # open interval cap
+RETRY_DELAY_MAX_SEC = 600  # per-call retry delay cap
+
+
+class CircuitOpenError(ConnectionError):
+    """Call short-circuited because the vendor circuit is open."""
+
+
+class RequestDeferredError(CircuitOpenError):
+    """Call deferred because the vendor account request budget is exhausted."""
+
+
+class CallDeadlineError(TimeoutError):
+    """Vendor call abandoned because it overran its deadline."""
+
+
+def get_backoff_delay_sec(base_delay_sec, attempt, max_delay_sec):
+    """
+    Return a jittered exponential backoff delay.
+
+    Uses "equal jitter": half the exponential delay plus a random share of
+    the other half, so zones that failed together do not retry together.
+
+    inputs:
+        base_delay_sec(float): delay of the first attempt.
+        attempt(int): 1-based attempt number.
+        max_delay_sec(float): cap before jitter.
+    returns:
+        (float): delay in seconds, rounded to 0.1 sec.
+    """
+    delay_sec = min(max_delay_sec, base_delay_sec * 2 ** (attempt - 1))
+    return round(delay_sec / 2 + random.uniform(0, delay_sec / 2), 1)
+
+
+class CircuitBreaker:
+    """Consecutive failure circuit breaker for one vendor endpoint."""
+
+    def __init__(self, thermostat_type, endpoint):
+        """
+        Constructor.
+
+        inputs:
+            thermostat_type(str): thermostat type.
+            endpoint(str): endpoint or operation name.
+        """
+        self.thermostat_type = thermostat_type
+        self.endpoint = endpoint
+        self.state = CIRCUIT_CLOSED
+        self.consecutive_failures = 0
+        self.open_count = 0  # consecutive openings, drives the backoff
+        self.probe_time = 0.0  # clock time when a probe is allowed
+        self.last_error = None  # most recent vendor exception
+        self.stats = {"short_circuits": 0, "probes": 0, "opened": 0}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return (
+            f"CircuitBreaker({self.thermostat_type}, {self.endpoint}, "
+            f"{self.state})"
+        )
+
+    def before_call(self):
+        """
+        Admit or short-circuit a call.
+
+        inputs:
+            None
+        returns:
+            None
+        raises:
+            CircuitOpenError: circuit is open or a probe is in flight.
+        """
+        with self._lock:
+            if self.state == CIRCUIT_CLOSED:
+                return
+            if self.state == CIRCUIT_OPEN and clock.time() >= self.probe_time:
+                # let this call through as the half-open probe
+                self.state = CIRCUIT_HALF_OPEN
+                self.stats["probes"] += 1
+                return
+            self.stats["short_circuits"] += 1
+            raise CircuitOpenError(
+                f"{self.thermostat_type} {self.endpoint} circuit is "
+                f"{self.state}, next probe in {self.get_wait_sec(0):.1f} sec"
+            )
+
+    def record_success(self):
+        """
+        Close the circuit after a successful call.
+
+        inputs:
+            None
+        returns:
+            (bool): True if the circuit was open or half-open.
+        """
+        with self._lock:
+            recovered = self.state != CIRCUIT_CLOSED
+            self.state = CIRCUIT_CLOSED
+            self.consecutive_failures = 0
+            self.open_count = 0
+            return recovered
+
+    def record_failure(self, ex=None):
+        """
+        Count a failed call, opening the circuit at the threshold.
+
+        inputs:
+            ex(Exception): vendor exception of the failed call.
+        returns:
+            (bool): True if this failure opened the circuit.
+        """
+        with self._lock:
+            self.last_error = ex if ex is not None else self.last_error
+            self.consecutive_failures += 1
+            if self.state == CIRCUIT_HALF_OPEN or (
+                self.state == CIRCUIT_CLOSED
+                and self.consecutive_failures >= CIRCUIT_FAILURE_THRESHOLD
+            ):
+                opened = self.state == CIRCUIT_CLOSED
+                self._open(CIRCUIT_OPEN_MIN_SEC)
+                return opened
+            return False
+
+    def trip(self):
+        """
+        Open the circuit immediately at the longest interval.
+
+        Used when the vendor reports that it is being spammed.
+
+        inputs:
+            None
+        returns:
+            None
+        """
+        with self._lock:
+            self.consecutive_failures = max(
+                self.consecutive_failures, CIRCUIT_FAILURE_THRESHOLD
+            )
+            self._open(CIRCUIT_OPEN_MAX_SEC)
+
+    def release_probe(self):
+        """
+        Return a half-open circuit to open without counting a failure.
+
+        Called when the probe ended with an exception unrelated to the
+        vendor connection, so another caller can probe right away.
+
+        inputs:
+            None
+        returns:
+            None
+        """
+        with self._lock:
+            if self.state == CIRCUIT_HALF_OPEN:
+                self.state = CIRCUIT_OPEN
+
+    def get_wait_sec(self, default_sec):
+        """
+        Return how long a short-circuited caller should wait.
+
+        inputs:
+            default_sec(float): wait while a probe is in flight.
+        returns:
+            (float): seconds until the next probe is allowed.
+        """
+        if self.state == CIRCUIT_OPEN:
+            return round(max(0.0, self.probe_time - clock.time()), 1)
+        return default_sec
+
+    def _open(self, base_delay_sec):
+        """Open the circuit with jittered exponential backoff, lock held."""
+        self.state = CIRCUIT_OPEN
+        self.open_count += 1
+        self.stats["opened"] += 1
+        self.probe_time = clock.time() + get_backoff_delay_sec(
+            base_delay_sec, self.open_count, CIRCUIT_OPEN_MAX_SEC
+        )
+
+
+# circuit breakers keyed by (thermostat_type, endpoint)
+_circuit_breakers = {}
+_circuit_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(thermostat_type, endpoint):
+    """
+    Return the shared circuit breaker of a vendor endpoint.
+
+    inputs:
+        thermostat_type(str): thermostat type.
+        endpoint(str): endpoint or operation name.
+    returns:
+        (CircuitBreaker): breaker shared by all zones and threads.
+    """
+    key = (thermostat_type, endpoint)
+    with _circuit_breakers_lock:
+        if key not in _circuit_breakers:
+            _circuit_breakers[key] = CircuitBreaker(thermostat_type, endpoint)
+        return _circuit_breakers[key]
+
+
+def reset_circuit_breakers():
+    """
+    Discard all circuit breaker state.
+
+    inputs:
+        None
+    returns:
+        None
+    """
+    with _circuit_breakers_lock:
+        _circuit_breakers.clear()
+
+
+def _get_endpoint_name(func):
+    """Return the default circuit breaker endpoint name of a function."""
+    for attr in ("__qualname__", "__name__"):
+        name = getattr(func, attr, None)
+        if isinstance(name, str):
+            return name
+    return type(func).__name__
+
+
+def get_device_endpoint(func, device):
+    """
+    Return the circuit breaker endpoint of func on one local device.
+
+    Cloud vendors share a backend, so their zones share one breaker per
+    endpoint.  Local devices fail independently, keying the breaker by
+    device keeps one dead device from short-circuiting its siblings.
+
+    inputs:
+        func(callable): function passed to execute_with_extended_retries.
+        device(str or int): zone name, host or bus address of the device.
+    returns:
+        (str): endpoint name.
+    """
+    return f"{_get_endpoint_name(func)}:{device}"
+
+
 def _get_default_exception_types():
     """Get default exception types for retry mechanism."""
     return (
@@ -1051,24 +1359,32 @@ def _initialize_retry_parameters(initial_retry_delay_sec):
     """Initialize retry parameters."""
     initial_trial_number = 1
     trial_number = initial_trial_number
-    retry_delay_sec = initial_retry_delay_sec
+    retry_delay_sec = get_backoff_delay_sec(
+        initial_retry_delay_sec, trial_number, RETRY_DELAY_MAX_SEC
+    )
     return initial_trial_number, trial_number, retry_delay_sec
 
 
-def _handle_server_spamming_detection(tc, ex):
+def _handle_server_spamming_detection(tc, ex, breaker=None):
     """Check for and handle server spamming detection."""
+    # Check for TooManyAttemptsError to detect server spamming
+    if "TooManyAttemptsError" not in str(type(ex)):
+        return
+
+    # stop every zone of this vendor endpoint from calling for a while
+    if breaker is not None:
+        breaker.trip()
+
     if tc is None:
         return
 
-    # Check for TooManyAttemptsError to detect server spamming
-    if "TooManyAttemptsError" in str(type(ex)):
-        tc.server_spamming_detected = True
-        log_msg(
-            "CRITICAL: pyhtcc server spamming detected - "
-            "subsequent Honeywell integration tests will be skipped",
-            mode=BOTH_LOG,
-            func_name=1,
-        )
+    tc.server_spamming_detected = True
+    log_msg(
+        "CRITICAL: pyhtcc server spamming detected - "
+        "subsequent Honeywell integration tests will be skipped",
+        mode=BOTH_LOG,
+        func_name=1,
+    )
 
 
 def _send_retry_email_alert(
@@ -1084,7 +1400,8 @@ def _send_retry_email_alert(
         return
 
     try:
-        email_notification.send_email_alert(
+        # queued, alerts from all zones within the window become one digest
+        email_notification.queue_email_alert(
             subject=(
                 f"{thermostat_type} zone "
                 f"{zone_name}: "
@@ -1097,12 +1414,49 @@ def _send_retry_email_alert(
                 f"{number_of_retries} at "
                 f"{time_now}\n{traceback.format_exc()}"
             ),
+            zone=f"{thermostat_type} zone {zone_name}",
+            alert_type="intermittent_error",
         )
     except Exception:
         # Don't let email failures prevent retry logic
         pass
 
 
+def _send_circuit_email_alert(email_notification, breaker, opened, time_now):
+    """Send one email alert when a vendor circuit opens or recovers."""
+    if email_notification is None:
+        return
+
+    if opened:
+        subject = (
+            f"{breaker.thermostat_type}: {breaker.endpoint} failing for all "
+            "zones, calls suspended"
+        )
+        body = (
+            f"circuit opened at {time_now} after "
+            f"{breaker.consecutive_failures} consecutive failures, "
+            "one probe call will be made per backoff interval\n"
+            f"{traceback.format_exc()}"
+        )
+    else:
+        subject = (
+            f"{breaker.thermostat_type}: (mitigated) {breaker.endpoint} "
+            "recovered for all zones"
+        )
+        body = f"circuit closed at {time_now}, stats={breaker.stats}"
+
+    try:
+        email_notification.queue_email_alert(
+            subject=subject,
+            body=body,
+            zone=f"{breaker.thermostat_type} {breaker.endpoint}",
+            alert_type="circuit",
+        )
+    except Exception:
+        # Don't let email failures affect the retry logic
+        pass
+
+
 def _send_success_email_alert(
     email_notification,
     thermostat_type,
@@ -1116,7 +1470,7 @@ def _send_success_email_alert(
         return
 
     try:
-        email_notification.send_email_alert(
+        email_notification.queue_email_alert(
             subject=(
                 f"{thermostat_type} zone "
                 f"{zone_name}: "
@@ -1128,12 +1482,54 @@ def _send_success_email_alert(
                 f"{trial_number} of {number_of_retries} at "
                 f"{time_now}"
             ),
+            zone=f"{thermostat_type} zone {zone_name}",
+            alert_type="mitigated",
         )
     except Exception:
         # Don't let email failures affect the successful result
         pass
 
 
+def _set_connection_status(connection_ok):
+    """Set connection_ok on the supervision context of the calling thread."""
+    # note this import will cause circular import issue if put at top of file.
+    from src import supervision_context as sc  # noqa: E402, C0415
+
+    context = sc.get_current_context()
+    if context is not None:
+        context.connection_ok = connection_ok
+
+
+def _record_call_overrun():
+    """Count an abandoned call on the calling thread's supervision context."""
+    # note this import will cause circular import issue if put at top of file.
+    from src import supervision_context as sc  # noqa: E402, C0415
+
+    context = sc.get_current_context()
+    if context is not None:
+        context.call_overruns += 1
+
+
+def _handle_call_overrun(ex, time_now, email_notification, zone_name, breaker):
+    """
+    Handle an abandoned call without retrying it.
+
+    The abandoned call may still be running on the thermostat object, a
+    retry on the same object would race it and could repeat a write, so
+    the zone is marked degraded and supervision reconnects with a new
+    thermostat object instead.
+    """
+    _record_call_overrun()
+    _set_connection_status(False)
+    if breaker.record_failure(ex):
+        _send_circuit_email_alert(email_notification, breaker, True, time_now)
+    log_msg(
+        f"ERROR: {ex}, not retrying, zone {zone_name} will reconnect",
+        mode=BOTH_LOG,
+        func_name=1,
+    )
+
+
 def _handle_retry_exception(
     tc,
     ex,
@@ -1144,13 +1540,14 @@ def _handle_retry_exception(
     email_notification,
     thermostat_type,
     zone_name,
+    breaker=None,
 ):
     """Handle exception during retry attempt."""
-    # Set flag to force re-authentication if available
-    if tc is not None:
-        tc.connection_ok = False
+    # Set flag to force re-authentication of the calling zone
+    _set_connection_status(False)
 
-    _handle_server_spamming_detection(tc, ex)
+    circuit_opened = breaker is not None and breaker.record_failure(ex)
+    _handle_server_spamming_detection(tc, ex, breaker)
 
     # Use dual stream logging for verbose retry messages
     log_msg(
@@ -1176,15 +1573,19 @@ def _handle_retry_exception(
         func_name=1,
     )
 
-    # Send warning email if email notification module is available
-    _send_retry_email_alert(
-        email_notification,
-        thermostat_type,
-        zone_name,
-        trial_number,
-        number_of_retries,
-        time_now,
-    )
+    # Send warning email if email notification module is available, once
+    # per outage rather than per zone and trial while the circuit is open
+    if circuit_opened:
+        _send_circuit_email_alert(email_notification, breaker, True, time_now)
+    elif breaker is None or breaker.state == CIRCUIT_CLOSED:
+        _send_retry_email_alert(
+            email_notification,
+            thermostat_type,
+            zone_name,
+            trial_number,
+            number_of_retries,
+            time_now,
+        )
 
     # Exhausted retries, raise exception
     if trial_number >= number_of_retries:
@@ -1198,14 +1599,48 @@ def _handle_retry_exception(
 
 
 def _handle_retry_delay(trial_number, number_of_retries, retry_delay_sec):
-    """Handle delay between retry attempts."""
+    """Handle delay between retry attempts, return True on a stop request."""
+    # note this import will cause circular import issue if put at top of file.
+    from src import supervision_context as sc  # noqa: E402, C0415
+
     if trial_number < number_of_retries:
         log_msg(
             f"Delaying {retry_delay_sec} prior to retry...",
             mode=DUAL_STREAM_LOG,
             func_name=1,
         )
-        time.sleep(retry_delay_sec)
+        context = sc.get_current_context()
+        if context is None:
+            clock.sleep(retry_delay_sec)
+        elif context.wait(retry_delay_sec):
+            log_msg(
+                "stop requested, abandoning retries",
+                mode=DUAL_STREAM_LOG,
+                func_name=1,
+            )
+            return True
+    return False
+
+
+def _handle_circuit_open(ex, trial_number, number_of_retries, breaker):
+    """Handle a short-circuited trial, raise if retries are exhausted."""
+    log_msg(
+        f"WARNING: {ex} (trial {trial_number} of {number_of_retries})",
+        mode=DUAL_STREAM_LOG,
+        func_name=1,
+    )
+    if trial_number >= number_of_retries:
+        log_msg(
+            f"ERROR: exhausted {number_of_retries} "
+            f"retries during {get_function_name()}",
+            mode=DUAL_STREAM_LOG,
+            func_name=1,
+        )
+        # raise the vendor error so callers see the same exception types
+        # whether or not their own trials were short-circuited
+        if breaker.last_error is not None:
+            raise breaker.last_error from ex
+        raise ex
 
 
 def _handle_successful_retry(
@@ -1217,10 +1652,15 @@ def _handle_successful_retry(
     zone_name,
     number_of_retries,
     time_now,
+    breaker=None,
 ):
     """Handle successful function execution after retries."""
-    # Log the mitigated failure if we had to retry
-    if trial_number > initial_trial_number:
+    circuit_recovered = breaker is not None and breaker.record_success()
+    if circuit_recovered:
+        # the probe call closed the circuit for every zone
+        _send_circuit_email_alert(email_notification, breaker, False, time_now)
+    elif trial_number > initial_trial_number:
+        # Log the mitigated failure if we had to retry
         _send_success_email_alert(
             email_notification,
             thermostat_type,
@@ -1230,9 +1670,8 @@ def _handle_successful_retry(
             time_now,
         )
 
-    # Reset connection status if available
-    if tc is not None:
-        tc.connection_ok = True
+    # Reset connection status of the calling zone
+    _set_connection_status(True)
 
 
 def execute_with_extended_retries(
@@ -1243,6 +1682,8 @@ def execute_with_extended_retries(
     initial_retry_delay_sec: int = 30,
     exception_types: tuple = None,  # type: ignore[assignment]
     email_notification=None,
+    endpoint: str = None,  # type: ignore[assignment]
+    deadline_sec: float = -1,
 ):
     """
     Execute a function with extended retry logic and exponential backoff.
@@ -1250,6 +1691,19 @@ def execute_with_extended_retries(
     This function standardizes the retry mechanism across all thermostat types,
     based on the implementation originally in honeywell.py.
 
+    Calls go through a circuit breaker shared by all zones and threads with
+    the same (thermostat_type, endpoint).  After CIRCUIT_FAILURE_THRESHOLD
+    consecutive failures the circuit opens: calls are short-circuited with
+    CircuitOpenError (counted as a failed trial) until a jittered
+    exponential backoff interval passes, then a single probe call is let
+    through and its result closes or re-opens the circuit.
+
+    Each call runs with a hard deadline (see call_deadline.py).  A call
+    that overruns is abandoned and raised without a retry, since it may
+    still be running on the same object, and the zone is marked degraded
+    so it reconnects with a new object instead of hanging in the vendor
+    library.
+
     inputs:
         func(callable): function to execute with retries
         thermostat_type(str): thermostat type for logging/email
@@ -1259,22 +1713,36 @@ def execute_with_extended_retries(
                                       (default: 30)
         exception_types(tuple): tuple of exception types to catch and retry on
         email_notification(module): email notification module for alerts
+        endpoint(str): circuit breaker endpoint name, default is the
+                       qualified name of func, local device drivers pass
+                       get_device_endpoint()
+        deadline_sec(float): longest wait for one call, None waits
+                             indefinitely, -1 uses the vendor's
+                             call_deadline.get_deadline_sec()
     returns:
         result of func() if successful
     raises:
         Exception: if all retries are exhausted
     """
-    # Import thermostat_common to access connection_ok flag
+    # Import thermostat_common to access server_spamming_detected flag
     # note this import will cause circular import issue of put at top of file.
     try:
         from src import thermostat_common as tc  # noqa: E402, C0415
     except ImportError:
         tc = None
+    from src import call_deadline  # noqa: E402, C0415
+
+    if deadline_sec == -1:
+        deadline_sec = call_deadline.get_deadline_sec(thermostat_type)
 
     # Default exception types if not provided
     if exception_types is None:
         exception_types = _get_default_exception_types()
 
+    endpoint = endpoint or _get_endpoint_name(func)
+    breaker = get_circuit_breaker(thermostat_type, endpoint)
+    executor = call_deadline.get_executor()
+
     initial_trial_number, trial_number, retry_delay_sec = _initialize_retry_parameters(
         initial_retry_delay_sec
     )
@@ -1301,7 +1769,32 @@ def execute_with_extended_retries(
         )
 
         try:
-            return_val = func()
+            breaker.before_call()
+            return_val = executor.call(
+                func,
+                deadline_sec,
+                name=f"{thermostat_type} {endpoint} zone {zone_name}",
+                group=f"{thermostat_type} zone {zone_name}",
+            )
+        except CircuitOpenError as ex:
+            if isinstance(ex, RequestDeferredError):
+                # deferred inside func, hand back the probe slot if it held it
+                breaker.release_probe()
+            _handle_circuit_open(ex, trial_number, number_of_retries, breaker)
+
+            # wait for the next probe slot instead of calling the vendor
+            if _handle_retry_delay(
+                trial_number, number_of_retries, breaker.get_wait_sec(retry_delay_sec)
+            ):
+                raise ex
+            trial_number += 1
+
+        except CallDeadlineError as ex:
+            _handle_call_overrun(
+                ex, time_now, email_notification, zone_name, breaker
+            )
+            raise ex
+
         except exception_types as ex:
             _handle_retry_exception(
                 tc,
@@ -1313,16 +1806,21 @@ def execute_with_extended_retries(
                 email_notification,
                 thermostat_type,
                 zone_name,
+                breaker,
             )
 
             # Delay between retries
-            _handle_retry_delay(trial_number, number_of_retries, retry_delay_sec)
+            if _handle_retry_delay(trial_number, number_of_retries, retry_delay_sec):
+                raise ex
 
-            # Increment retry parameters
+            # Increment retry parameters, jittered exponential backoff
             trial_number += 1
-            retry_delay_sec += 30  # Linear backoff: add 30 seconds each time
+            retry_delay_sec = get_backoff_delay_sec(
+                initial_retry_delay_sec, trial_number, RETRY_DELAY_MAX_SEC
+            )
 
         except Exception as ex:
+            breaker.release_probe()
             log_msg(traceback.format_exc(), mode=DUAL_STREAM_LOG, func_name=1)
             log_msg(
                 f"ERROR: unhandled exception {ex} during {get_function_name()}",
@@ -1340,6 +1838,7 @@ def execute_with_extended_retries(
                 zone_name,
                 number_of_retries,
                 time_now,
+                breaker,
             )
             break  # Exit while loop on success
 
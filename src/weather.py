@@ -2,18 +2,34 @@
 Weather API module for outdoor temperature and humidity data.
 
 This module provides functions to fetch outdoor weather data using zip codes.
+
+Lookups go through a process-wide cache keyed by zip code, shared by every
+zone and thermostat type of a site and persisted to ./data so a restart
+does not refetch.  Entries younger than WEATHER_CACHE_TTL_SEC are served
+as is; older entries are served stale for up to WEATHER_CACHE_STALE_SEC
+while one background fetch revalidates them.
 """
 
 # built-in imports
+import collections
+import json
 import os
-from typing import Dict, Optional
+import threading
+from typing import Callable, Dict, Optional
 
 # third-party imports
 import requests
 
 # local imports
+from src import clock
 from src import utilities as util
 
+# weather changes on the scale of minutes, one fetch per zip per TTL
+WEATHER_CACHE_TTL_SEC = 600
+# how long past the TTL an entry is still served while revalidating
+WEATHER_CACHE_STALE_SEC = 3600
+WEATHER_CACHE_FILE = "weather_cache.json"
+
 
 class WeatherError(Exception):
     """Exception raised for weather API errors."""
@@ -22,12 +38,46 @@ class WeatherError(Exception):
 
 
 def get_outdoor_weather(
-    zip_code: str, api_key: Optional[str] = None
+    zip_code: str, api_key: Optional[str] = None, use_cache: bool = True
 ) -> Dict[str, float | str]:
     """
     Get outdoor temperature and humidity data for a given zip code.
 
-    This function uses the OpenWeatherMap API to fetch current weather data.
+    This function uses the OpenWeatherMap API to fetch current weather data,
+    served from the shared weather cache when it is recent enough.
+    If no API key is provided, it returns mock data for testing.
+
+    Args:
+        zip_code (str): The zip code for which to fetch weather data
+        api_key (str, optional): OpenWeatherMap API key
+        use_cache (bool): False always fetches from the API
+
+    Returns:
+        Dict[str, float | str]: see fetch_outdoor_weather()
+
+    Raises:
+        WeatherError: If API call fails or invalid zip code
+    """
+    if not zip_code or not isinstance(zip_code, str):
+        raise WeatherError("Invalid zip code provided")
+
+    # mock data without an API key is never cached
+    if not api_key or not use_cache:
+        return fetch_outdoor_weather(zip_code, api_key)
+
+    return _weather_cache.get(
+        zip_code, lambda zip_code: fetch_outdoor_weather(zip_code, api_key)
+    )
+
+
+def fetch_outdoor_weather(
+    zip_code: str, api_key: Optional[str] = None
+) -> Dict[str, float | str]:
+    """
+    Fetch outdoor temperature and humidity data for a given zip code.
+
+    This function uses the OpenWeatherMap API to fetch current weather data,
+    bypassing the weather cache.
     If no API key is provided, it returns mock data for testing.
 
     Args:
@@ -97,6 +147,200 @@ def get_outdoor_weather(
         raise WeatherError(f"Failed to fetch weather data: {e}")
 
 
+class WeatherCache:
+    """Weather data per zip code with TTL and stale-while-revalidate."""
+
+    def __init__(
+        self,
+        ttl_sec: float = WEATHER_CACHE_TTL_SEC,
+        stale_sec: float = WEATHER_CACHE_STALE_SEC,
+        persist: bool = True,
+    ):
+        """
+        Constructor.
+
+        Args:
+            ttl_sec (float): age below which entries are served as is
+            stale_sec (float): time past ttl_sec an entry is served while
+                it is refetched in the background
+            persist (bool): load and save entries under ./data
+        """
+        self.ttl_sec = ttl_sec
+        self.stale_sec = stale_sec
+        self.persist = persist
+        self.entries: Dict[str, dict] = {}
+        self.stats: collections.Counter = collections.Counter()
+        self._loaded = not persist
+        self._lock = threading.Lock()
+        self._zip_locks: Dict[str, threading.Lock] = {}
+        self._refreshing: set = set()
+
+    def get(
+        self, zip_code: str, fetch_func: Callable[[str], dict]
+    ) -> Dict[str, float | str]:
+        """
+        Return weather data for a zip code, fetching it when needed.
+
+        Args:
+            zip_code (str): zip code
+            fetch_func (callable): fetch_func(zip_code) returns fresh data
+
+        Returns:
+            Dict[str, float | str]: copy of the weather data
+
+        Raises:
+            WeatherError: if the fetch fails and nothing is cached
+        """
+        self._load()
+        entry, age_sec = self._get_entry(zip_code)
+        if entry is not None and age_sec < self.ttl_sec:
+            self.stats["hits"] += 1
+            return dict(entry["data"])
+        if entry is not None and age_sec < self.ttl_sec + self.stale_sec:
+            self.stats["stale_hits"] += 1
+            self._refresh_in_background(zip_code, fetch_func)
+            return dict(entry["data"])
+
+        # one fetch per zip code, concurrent zones wait for its result
+        with self._get_zip_lock(zip_code):
+            entry, age_sec = self._get_entry(zip_code)
+            if entry is not None and age_sec < self.ttl_sec:
+                self.stats["hits"] += 1
+                return dict(entry["data"])
+            self.stats["misses"] += 1
+            try:
+                data = fetch_func(zip_code)
+            except WeatherError:
+                if entry is None:
+                    raise
+                util.log_msg(
+                    f"serving {age_sec:.0f} sec old weather data for zip "
+                    f"{zip_code} after a failed fetch",
+                    mode=util.BOTH_LOG,
+                    func_name=1,
+                )
+                return dict(entry["data"])
+            self._store(zip_code, data)
+            return dict(data)
+
+    def _get_entry(self, zip_code):
+        """Return the entry of a zip code and its age in seconds."""
+        with self._lock:
+            entry = self.entries.get(zip_code)
+        if entry is None:
+            return None, None
+        return entry, clock.time() - entry["fetched_at"]
+
+    def _get_zip_lock(self, zip_code):
+        """Return the fetch lock of a zip code."""
+        with self._lock:
+            return self._zip_locks.setdefault(zip_code, threading.Lock())
+
+    def _refresh_in_background(self, zip_code, fetch_func):
+        """Start one background fetch of a stale zip code."""
+        with self._lock:
+            if zip_code in self._refreshing:
+                return
+            self._refreshing.add(zip_code)
+
+        def refresh():
+            try:
+                with self._get_zip_lock(zip_code):
+                    self._store(zip_code, fetch_func(zip_code))
+                self.stats["refreshes"] += 1
+            except WeatherError as ex:
+                util.log_msg(
+                    f"background weather refresh for zip {zip_code} failed: {ex}",
+                    mode=util.BOTH_LOG,
+                    func_name=1,
+                )
+            finally:
+                with self._lock:
+                    self._refreshing.discard(zip_code)
+
+        threading.Thread(
+            target=refresh, name=f"weather_refresh_{zip_code}", daemon=True
+        ).start()
+
+    def _store(self, zip_code, data):
+        """Store fresh data for a zip code and persist the cache."""
+        with self._lock:
+            self.entries[zip_code] = {"data": dict(data), "fetched_at": clock.time()}
+            entries = dict(self.entries)
+        if self.persist:
+            self._save(entries)
+
+    def _load(self):
+        """Load persisted entries on first use."""
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+        file_path = util.get_full_file_path(WEATHER_CACHE_FILE)
+        try:
+            with open(file_path, "r", encoding="utf-8") as cache_file:
+                entries = json.load(cache_file)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as ex:
+            util.log_msg(
+                f"ignoring unreadable weather cache {file_path}: {ex}",
+                mode=util.BOTH_LOG,
+                func_name=1,
+            )
+            return
+        with self._lock:
+            for zip_code, entry in entries.items():
+                self.entries.setdefault(zip_code, entry)
+
+    def _save(self, entries):
+        """Write entries to ./data atomically."""
+        file_path = util.get_full_file_path(WEATHER_CACHE_FILE)
+        try:
+            util.write_json_atomic(file_path, entries, indent=None, file_mode=0o644)
+        except OSError as ex:
+            util.log_msg(
+                f"failed to save weather cache {file_path}: {ex}",
+                mode=util.BOTH_LOG,
+                func_name=1,
+            )
+
+
+# process-wide cache shared by all zones and thermostat types
+_weather_cache = WeatherCache()
+
+
+def get_weather_cache() -> WeatherCache:
+    """
+    Return the process-wide weather cache.
+
+    Returns:
+        WeatherCache: shared cache
+    """
+    return _weather_cache
+
+
+def reset_weather_cache(
+    ttl_sec: float = WEATHER_CACHE_TTL_SEC,
+    stale_sec: float = WEATHER_CACHE_STALE_SEC,
+    persist: bool = True,
+) -> WeatherCache:
+    """
+    Replace the process-wide weather cache with an empty one.
+
+    Args:
+        ttl_sec (float): see WeatherCache
+        stale_sec (float): see WeatherCache
+        persist (bool): see WeatherCache
+
+    Returns:
+        WeatherCache: new shared cache
+    """
+    global _weather_cache  # noqa W603
+    _weather_cache = WeatherCache(ttl_sec, stale_sec, persist)
+    return _weather_cache
+
+
 def get_weather_api_key() -> Optional[str]:
     """
     Get weather API key from environment variables.
@@ -0,0 +1,108 @@
+"""
+Vendor neutral snapshot of one thermostat zone.
+
+Each driver keeps the vendor payload of its last fetch in zone_info.  The
+payload is decoded once per fetch into a ZoneState record (see
+ThermostatCommonZone.zone_state and parse_zone_state()), so the getters
+are attribute reads instead of nested dict lookups and site-level code can
+read every vendor's zone the same way.
+
+ZoneState uses __slots__, a zone holds one record per fetch and the
+records carry no per-instance dict.  The raw payload is attached to the
+record only while debug logging is enabled.
+"""
+
+# local imports
+from src import utilities as util
+
+
+class ZoneState:
+    """Decoded zone data from one fetch, None where not reported."""
+
+    __slots__ = (
+        "display_temp",  # indoor temp in °F
+        "display_humidity",  # indoor humidity in %RH
+        "humidity_supported",  # humidity sensor available and not faulted
+        "mode_code",  # raw system switch position
+        "heat_setpoint",  # heat setpoint in °F
+        "cool_setpoint",  # cool setpoint in °F
+        "schedule_heat_sp",  # scheduled heat setpoint in °F
+        "schedule_cool_sp",  # scheduled cool setpoint in °F
+        "hold_mode",  # in vacation hold mode
+        "vacation_hold",  # vacation hold is set
+        "vacation_hold_until",  # vacation hold end, minutes
+        "temporary_hold_until",  # temporary hold end, minutes
+        "wifi_strength",  # wifi signal in dBm
+        "wifi_ok",  # wifi connection status
+        "battery_voltage",  # battery or line voltage in volts
+        "fetch_time",  # clock.time() of the fetch
+        "raw",  # vendor payload, debug logging only
+    )
+
+    def __init__(self, **fields):
+        """
+        Constructor.
+
+        inputs:
+            fields(dict): initial value of any slot, others default to None.
+        """
+        for name in self.__slots__:
+            setattr(self, name, fields.pop(name, None))
+        if fields:
+            raise TypeError(f"unknown ZoneState fields: {sorted(fields)}")
+
+    def as_dict(self):
+        """
+        Return the record as a dict.
+
+        inputs:
+            None
+        returns:
+            (dict): slot name -> value, without the raw payload.
+        """
+        return {name: getattr(self, name) for name in self.__slots__[:-1]}
+
+    def __repr__(self):
+        fields = ", ".join(
+            f"{name}={value!r}"
+            for name, value in self.as_dict().items()
+            if value is not None
+        )
+        return f"ZoneState({fields})"
+
+
+def lookup(data, *keys, convert=None):
+    """
+    Return a nested value from a vendor payload.
+
+    inputs:
+        data(dict): vendor payload or value.
+        keys(str): dict keys from outermost to innermost.
+        convert(callable): applied to the value found, e.g. float.
+    returns:
+        (any or None): value, None if a key is missing or the value is None
+                       or cannot be converted.
+    """
+    value = data
+    for key in keys:
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    if value is None or convert is None:
+        return value
+    try:
+        return convert(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def is_debug_enabled():
+    """
+    Return True if the raw vendor payload should be kept on the record.
+
+    inputs:
+        None
+    returns:
+        (bool): debug logging is enabled.
+    """
+    return bool(getattr(util.log_msg, "debug", False))
@@ -0,0 +1 @@
+"""Throughput benchmarks for the supervisor core."""
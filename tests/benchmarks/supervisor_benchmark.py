@@ -0,0 +1,563 @@
+"""
+Emulator-driven throughput benchmark for the supervisor core.
+
+Drives ThermostatSite and ThermostatCommonZone.supervisor_loop against a
+configurable number of emulator fleet zones with injected poll latency and
+failure rates, and reports polls/sec, p50/p99 poll latency, CPU time per
+poll, peak RSS and log bytes per poll.  Results are written as JSON and
+compared against the stored baseline in this folder.
+
+to run this module:
+    python -m tests.benchmarks.supervisor_benchmark --zones 1000
+    python -m tests.benchmarks.supervisor_benchmark --latency-ms 50 \
+        --jitter-ms 20 --failure-rate 0.01
+    python -m tests.benchmarks.supervisor_benchmark --update-baseline
+
+note: this module is not discovered as a unit test, the harness itself is
+covered by tests/test_supervisor_benchmark.py.
+"""
+
+# built-in imports
+import argparse
+import contextlib
+import datetime
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import types
+from unittest.mock import patch
+
+# third party imports
+import psutil
+
+# local imports
+from src import emulator
+from src import emulator_config
+from src import thermostat_api as api
+from src import thermostat_site as ts
+from src import utilities as util
+
+try:
+    import resource  # not available on Windows
+except ImportError:
+    resource = None
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "baseline.json")
+RESULTS_FILE = "supervisor_benchmark.json"  # written to util.FILE_PATH
+DEFAULT_TOLERANCE_PCT = 25.0  # allowed drift vs. baseline before flagging
+
+SITE_SCENARIO = "site"
+SUPERVISOR_LOOP_SCENARIO = "supervisor_loop"
+SCENARIOS = [SITE_SCENARIO, SUPERVISOR_LOOP_SCENARIO]
+
+# metrics compared against the baseline, True if larger is better
+COMPARED_METRICS = {
+    "polls_per_sec": True,
+    "p50_poll_latency_ms": False,
+    "p99_poll_latency_ms": False,
+    "cpu_per_poll_ms": False,
+    "log_bytes_per_poll": False,
+}
+
+# scenario parameters that must match for a baseline comparison
+SCENARIO_PARAMETERS = [
+    "zones",
+    "measurements",
+    "latency_ms",
+    "jitter_ms",
+    "failure_rate",
+]
+
+
+class PollCollector:
+    """Thread-safe accumulator of per-poll latency samples."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies_sec = []
+        self.failures = 0
+
+    def record(self, elapsed_sec, failed=False):
+        """
+        Record one poll.
+
+        inputs:
+            elapsed_sec(float): poll latency in seconds.
+            failed(bool): True if the poll raised an exception.
+        returns:
+            None
+        """
+        with self._lock:
+            self.latencies_sec.append(elapsed_sec)
+            if failed:
+                self.failures += 1
+
+
+class FaultInjector:
+    """Inject latency and connection failures into emulator polls."""
+
+    def __init__(self, latency_ms=0.0, jitter_ms=0.0, failure_rate=0.0, seed=0):
+        """
+        Constructor.
+
+        inputs:
+            latency_ms(float): mean injected latency per poll in ms.
+            jitter_ms(float): standard deviation of injected latency in ms.
+            failure_rate(float): probability (0-1) that a poll fails.
+            seed(int): random seed, same seed gives the same fault sequence.
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def inject(self):
+        """
+        Sleep for the injected latency and raise an injected failure.
+
+        inputs:
+            None
+        returns:
+            None, raises ConnectionError on injected failure.
+        """
+        with self._lock:
+            delay_ms = max(0.0, self._rng.gauss(self.latency_ms, self.jitter_ms))
+            failed = self._rng.random() < self.failure_rate
+        if delay_ms > 0.0:
+            time.sleep(delay_ms / 1000.0)
+        if failed:
+            raise ConnectionError("benchmark injected poll failure")
+
+
+def build_benchmark_module(collector, injector):
+    """
+    Build a hardware module stand-in with an instrumented emulator zone.
+
+    Zones come from emulator fleet mode, which run_scenario() enables.
+
+    inputs:
+        collector(PollCollector): poll sample accumulator.
+        injector(FaultInjector): latency and failure injector.
+    returns:
+        (SimpleNamespace): module-like object with ThermostatClass and
+                           ThermostatZone attributes.
+    """
+
+    class BenchmarkZone(emulator.ThermostatZone):
+        """Emulator zone that times every poll."""
+
+        def __init__(self, Thermostat_obj, verbose=False):
+            super().__init__(Thermostat_obj, verbose=verbose)
+
+        def query_thermostat_zone(self):
+            """Query the zone with injected faults and record latency."""
+            start_time = time.perf_counter()
+            failed = True
+            try:
+                injector.inject()
+                super().query_thermostat_zone()
+                failed = False
+            finally:
+                collector.record(time.perf_counter() - start_time, failed)
+
+    return types.SimpleNamespace(
+        ThermostatClass=emulator.ThermostatClass, ThermostatZone=BenchmarkZone
+    )
+
+
+def percentile(samples, pct):
+    """
+    Return the nearest-rank percentile of samples.
+
+    inputs:
+        samples(list): numeric samples.
+        pct(float): percentile, 0-100.
+    returns:
+        (float): percentile value, 0.0 if samples is empty.
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def get_peak_rss_mb():
+    """
+    Return peak resident set size of this process in MB.
+
+    inputs:
+        None
+    returns:
+        (float): peak RSS in MB.
+    """
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS, KB on linux
+        divisor = 2**20 if sys.platform == "darwin" else 2**10
+        return peak / divisor
+    mem_info = psutil.Process().memory_info()
+    return getattr(mem_info, "peak_wset", mem_info.rss) / 2**20
+
+
+def get_log_bytes(log_dir):
+    """
+    Return total size of the text logs in log_dir.
+
+    inputs:
+        log_dir(str): log folder.
+    returns:
+        (int): bytes.
+    """
+    total_bytes = 0
+    for file_name in os.listdir(log_dir):
+        if file_name.endswith(".txt"):
+            total_bytes += os.path.getsize(os.path.join(log_dir, file_name))
+    return total_bytes
+
+
+def run_site_scenario(module, zones, measurements, poll_time_sec):
+    """
+    Supervise all zones of an emulator fleet stanza through ThermostatSite.
+
+    inputs:
+        module(SimpleNamespace): benchmark hardware module.
+        zones(int): number of zones.
+        measurements(int): measurements per zone.
+        poll_time_sec(float): delay between polls.
+    returns:
+        None
+    """
+    site_config_dict = {
+        "site_name": "benchmark_site",
+        "thermostats": [
+            {
+                "thermostat_type": emulator_config.ALIAS,
+                "fleet": dict(emulator_config.fleet, zones=zones),
+                "enabled": True,
+                "poll_time": poll_time_sec,
+                "connection_time": 24 * 60 * 60,
+                "tolerance": 2,
+                "target_mode": "OFF_MODE",
+                "measurements": measurements,
+            }
+        ],
+    }
+    site = ts.ThermostatSite(site_config_dict=site_config_dict, verbose=False)
+    with patch.object(api, "load_hardware_library", return_value=module):
+        site.supervise_all_zones(use_threading=True)
+
+
+def run_supervisor_loop_scenario(module, zones, measurements, poll_time_sec):
+    """
+    Run the full supervisor_loop for every zone in turn.
+
+    Injected failures are treated like a dropped session: the measurement
+    is counted and the zone reconnects.
+
+    inputs:
+        module(SimpleNamespace): benchmark hardware module.
+        zones(int): number of zones.
+        measurements(int): measurements per zone.
+        poll_time_sec(float): delay between polls.
+    returns:
+        None
+    """
+    api.uip = api.UserInputs(
+        [
+            "supervise.py",
+            emulator_config.ALIAS,
+            "0",  # zone, overridden by the loop below
+            "0",  # poll time, overridden below
+            str(24 * 60 * 60),  # reconnect time
+            "2",  # tolerance
+            emulator_config.STARTING_MODE,  # matches zone, no mode revert
+            str(measurements),
+        ],
+        suppress_warnings=True,
+    )
+    for zone in range(zones):
+        Thermostat = module.ThermostatClass(zone)
+        Zone = module.ThermostatZone(Thermostat)
+        Zone.poll_time_sec = poll_time_sec
+        Zone.connection_time_sec = 24 * 60 * 60
+        Zone.session_start_time_sec = time.time()
+        session_count = 1
+        measurement = 1
+        while not api.uip.max_measurement_count_exceeded(measurement):
+            try:
+                measurement = Zone.supervisor_loop(
+                    Thermostat, session_count, measurement, False
+                )
+            except ConnectionError:
+                measurement += 1
+            session_count += 1
+
+
+def run_scenario(
+    scenario,
+    zones=100,
+    measurements=3,
+    poll_time_sec=0.001,
+    latency_ms=0.0,
+    jitter_ms=0.0,
+    failure_rate=0.0,
+    seed=0,
+):
+    """
+    Run one benchmark scenario and collect its metrics.
+
+    Logs are redirected to a scratch folder so that log volume can be
+    measured, and console output is discarded.
+
+    inputs:
+        scenario(str): one of SCENARIOS.
+        zones(int): number of emulator zones.
+        measurements(int): measurements per zone.
+        poll_time_sec(float): delay between polls.
+        latency_ms(float): mean injected latency per poll.
+        jitter_ms(float): injected latency standard deviation.
+        failure_rate(float): injected failure probability per poll.
+        seed(int): fault injection and emulator fleet random seed.
+    returns:
+        (dict): scenario parameters and metrics.
+    """
+    runners = {
+        SITE_SCENARIO: run_site_scenario,
+        SUPERVISOR_LOOP_SCENARIO: run_supervisor_loop_scenario,
+    }
+    if scenario not in runners:
+        raise ValueError(f"unknown benchmark scenario '{scenario}'")
+
+    collector = PollCollector()
+    injector = FaultInjector(latency_ms, jitter_ms, failure_rate, seed)
+    module = build_benchmark_module(collector, injector)
+
+    log_dir = tempfile.mkdtemp(prefix="tstat_benchmark_")
+    saved_file_path = util.FILE_PATH
+    saved_file_name = util.log_msg.file_name  # type: ignore[attr-defined]
+    saved_unit_test_mode = util.unit_test_mode
+    saved_uip = api.uip
+    util.FILE_PATH = log_dir
+    util.unit_test_mode = True  # suppress email alerts
+    emulator_config.enable_fleet_mode({"zones": zones, "seed": seed})
+    try:
+        with open(os.devnull, "w", encoding="utf8") as devnull:
+            with contextlib.redirect_stdout(devnull):
+                cpu_start = time.process_time()
+                wall_start = time.perf_counter()
+                runners[scenario](module, zones, measurements, poll_time_sec)
+                wall_time_sec = time.perf_counter() - wall_start
+                cpu_time_sec = time.process_time() - cpu_start
+        log_bytes = get_log_bytes(log_dir)
+    finally:
+        util.FILE_PATH = saved_file_path
+        util.log_msg.file_name = saved_file_name  # type: ignore[attr-defined]
+        util.unit_test_mode = saved_unit_test_mode
+        api.uip = saved_uip
+        emulator_config.disable_fleet_mode()
+        shutil.rmtree(log_dir, ignore_errors=True)
+
+    polls = len(collector.latencies_sec)
+    latencies_ms = [sample * 1000.0 for sample in collector.latencies_sec]
+    return {
+        "scenario": scenario,
+        "zones": zones,
+        "measurements": measurements,
+        "latency_ms": latency_ms,
+        "jitter_ms": jitter_ms,
+        "failure_rate": failure_rate,
+        "seed": seed,
+        "polls": polls,
+        "failures": collector.failures,
+        "wall_time_sec": round(wall_time_sec, 3),
+        "polls_per_sec": round(polls / wall_time_sec, 2) if wall_time_sec else 0.0,
+        "p50_poll_latency_ms": round(percentile(latencies_ms, 50), 3),
+        "p99_poll_latency_ms": round(percentile(latencies_ms, 99), 3),
+        "cpu_per_poll_ms": round(cpu_time_sec * 1000.0 / polls, 3) if polls else 0.0,
+        "peak_rss_mb": round(get_peak_rss_mb(), 1),
+        "log_bytes_per_poll": round(log_bytes / polls, 1) if polls else 0.0,
+    }
+
+
+def run_benchmarks(scenarios=None, **kwargs):
+    """
+    Run the requested benchmark scenarios.
+
+    inputs:
+        scenarios(list): scenario names, None runs all.
+        kwargs: scenario parameters, see run_scenario().
+    returns:
+        (dict): run metadata and per-scenario results.
+    """
+    if scenarios is None:
+        scenarios = SCENARIOS
+    return {
+        "timestamp": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scenarios": {
+            scenario: run_scenario(scenario, **kwargs) for scenario in scenarios
+        },
+    }
+
+
+def compare_to_baseline(results, baseline, tolerance_pct=DEFAULT_TOLERANCE_PCT):
+    """
+    Compare benchmark results against a baseline.
+
+    Scenarios whose parameters differ from the baseline are not compared.
+
+    inputs:
+        results(dict): output of run_benchmarks().
+        baseline(dict): previously stored output of run_benchmarks().
+        tolerance_pct(float): allowed change in percent before a metric
+                              is reported as a regression.
+    returns:
+        (dict): {"regressions": [str], "improvements": [str],
+                 "skipped": [str]}
+    """
+    report = {"regressions": [], "improvements": [], "skipped": []}
+    baseline_scenarios = baseline.get("scenarios", {})
+    for scenario, result in results.get("scenarios", {}).items():
+        reference = baseline_scenarios.get(scenario)
+        if reference is None:
+            report["skipped"].append(f"{scenario}: no baseline")
+            continue
+        mismatched = [
+            key for key in SCENARIO_PARAMETERS if result.get(key) != reference.get(key)
+        ]
+        if mismatched:
+            report["skipped"].append(
+                f"{scenario}: parameters differ from baseline ({mismatched})"
+            )
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            ref_val = reference.get(metric)
+            new_val = result.get(metric)
+            if not ref_val or new_val is None:
+                continue
+            change_pct = (new_val - ref_val) / ref_val * 100.0
+            if not higher_is_better:
+                change_pct = -change_pct
+            msg = (
+                f"{scenario}: {metric} {ref_val} -> {new_val} "
+                f"({change_pct:+.1f}%)"
+            )
+            if change_pct < -tolerance_pct:
+                report["regressions"].append(msg)
+            elif change_pct > tolerance_pct:
+                report["improvements"].append(msg)
+    return report
+
+
+def write_json(results, full_path):
+    """
+    Write results to a JSON file.
+
+    inputs:
+        results(dict): benchmark results.
+        full_path(str): output file.
+    returns:
+        None
+    """
+    folder = os.path.dirname(full_path)
+    if folder and not os.path.exists(folder):
+        os.makedirs(folder)
+    with open(full_path, "w", encoding="utf8") as file_handle:
+        json.dump(results, file_handle, indent=2)
+
+
+def parse_arguments(argv_list=None):
+    """
+    Parse command-line arguments.
+
+    inputs:
+        argv_list(list): override sys.argv[1:].
+    returns:
+        (argparse.Namespace): parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Supervisor core throughput benchmark"
+    )
+    parser.add_argument("--scenario", choices=SCENARIOS + ["all"], default="all")
+    parser.add_argument("-z", "--zones", type=int, default=1000)
+    parser.add_argument("-n", "--measurements", type=int, default=3)
+    parser.add_argument("-p", "--poll-time", type=float, default=0.001,
+                        help="delay between polls in seconds")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", default=None,
+                        help="results file, default ./data/" + RESULTS_FILE)
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--tolerance-pct", type=float,
+                        default=DEFAULT_TOLERANCE_PCT)
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="store these results as the new baseline")
+    parser.add_argument("--fail-on-regression", action="store_true",
+                        help="exit with status 1 if any metric regressed")
+    if argv_list is None:
+        argv_list = sys.argv[1:]
+    return parser.parse_args(argv_list)
+
+
+def main(argv_list=None):
+    """
+    Run the benchmark from the command line.
+
+    inputs:
+        argv_list(list): override sys.argv[1:].
+    returns:
+        (int): exit status.
+    """
+    args = parse_arguments(argv_list)
+    scenarios = SCENARIOS if args.scenario == "all" else [args.scenario]
+    results = run_benchmarks(
+        scenarios,
+        zones=args.zones,
+        measurements=args.measurements,
+        poll_time_sec=args.poll_time,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        failure_rate=args.failure_rate,
+        seed=args.seed,
+    )
+    for result in results["scenarios"].values():
+        print(json.dumps(result, indent=2))
+
+    output = args.output or util.get_full_file_path(RESULTS_FILE)
+    write_json(results, output)
+    print(f"results written to {output}")
+
+    if args.update_baseline:
+        write_json(results, args.baseline)
+        print(f"baseline updated: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"no baseline found at {args.baseline}")
+        return 0
+    with open(args.baseline, "r", encoding="utf8") as file_handle:
+        baseline = json.load(file_handle)
+    report = compare_to_baseline(results, baseline, args.tolerance_pct)
+    for label in ["regressions", "improvements", "skipped"]:
+        for line in report[label]:
+            print(f"{label[:-1]}: {line}")
+    if args.fail_on_regression and report["regressions"]:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
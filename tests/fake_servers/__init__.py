@@ -0,0 +1 @@
+"""Local stand-in vendor servers for offline performance and soak testing."""
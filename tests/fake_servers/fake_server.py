@@ -0,0 +1,305 @@
+"""
+Common base for the local stand-in vendor servers.
+
+Each fake server is a flask app served from a background thread on an
+ephemeral localhost port.  A FaultProfile adds response latency, a
+token-bucket rate limit, injected 401/429/5xx responses and paging, all
+driven from a seeded RNG so runs are repeatable.
+
+Point a driver at a running server with its base URL override env var,
+see BASE_URL_ENV_KEY in the thermostat config modules.
+"""
+
+# built-in imports
+import collections
+import random
+import threading
+import time
+
+# third party imports
+import flask
+from werkzeug import serving
+
+# latency distributions supported by FaultProfile
+CONSTANT = "constant"
+NORMAL = "normal"
+EXPONENTIAL = "exponential"
+LATENCY_DISTRIBUTIONS = [CONSTANT, NORMAL, EXPONENTIAL]
+
+SERVER_ERROR_CODES = [500, 502, 503]
+
+
+class FaultProfile:
+    """Latency, rate limit, error injection and paging settings."""
+
+    def __init__(
+        self,
+        latency_ms=0.0,
+        latency_jitter_ms=0.0,
+        latency_distribution=NORMAL,
+        rate_limit_per_sec=0.0,
+        rate_limit_burst=None,
+        unauthorized_rate=0.0,
+        throttle_rate=0.0,
+        server_error_rate=0.0,
+        page_size=None,
+        seed=0,
+    ):
+        """
+        Constructor.
+
+        inputs:
+            latency_ms(float): mean response latency in ms.
+            latency_jitter_ms(float): std dev for the normal distribution.
+            latency_distribution(str): one of LATENCY_DISTRIBUTIONS.
+            rate_limit_per_sec(float): sustained requests/sec, 0 = unlimited.
+            rate_limit_burst(int): bucket size, None = rate_limit_per_sec.
+            unauthorized_rate(float): probability (0-1) of an injected 401.
+            throttle_rate(float): probability (0-1) of an injected 429.
+            server_error_rate(float): probability (0-1) of an injected 5xx.
+            page_size(int): items per page on paged endpoints, None = all.
+            seed(int): random seed, same seed gives the same fault sequence.
+        """
+        if latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(
+                f"latency_distribution '{latency_distribution}' is not one "
+                f"of {LATENCY_DISTRIBUTIONS}"
+            )
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.latency_distribution = latency_distribution
+        self.rate_limit_per_sec = rate_limit_per_sec
+        self.rate_limit_burst = (
+            rate_limit_burst if rate_limit_burst is not None
+            else max(1.0, rate_limit_per_sec)
+        )
+        self.unauthorized_rate = unauthorized_rate
+        self.throttle_rate = throttle_rate
+        self.server_error_rate = server_error_rate
+        self.page_size = page_size
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens = float(self.rate_limit_burst)
+        self._last_refill = time.monotonic()
+
+    def sample_latency_sec(self):
+        """
+        Return the next response latency.
+
+        inputs:
+            None
+        returns:
+            (float): latency in seconds, never negative.
+        """
+        with self._lock:
+            if self.latency_distribution == CONSTANT:
+                latency_ms = self.latency_ms
+            elif self.latency_distribution == EXPONENTIAL:
+                latency_ms = (
+                    self._rng.expovariate(1.0 / self.latency_ms)
+                    if self.latency_ms > 0 else 0.0
+                )
+            else:
+                latency_ms = self._rng.gauss(self.latency_ms, self.latency_jitter_ms)
+        return max(0.0, latency_ms) / 1000.0
+
+    def consume_rate_limit_token(self):
+        """
+        Take one token from the rate limit bucket.
+
+        inputs:
+            None
+        returns:
+            (bool): True if the request is allowed.
+        """
+        if self.rate_limit_per_sec <= 0:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                float(self.rate_limit_burst),
+                self._tokens + (now - self._last_refill) * self.rate_limit_per_sec,
+            )
+            self._last_refill = now
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            return True
+
+    def choose_fault(self):
+        """
+        Return the HTTP status of an injected fault.
+
+        inputs:
+            None
+        returns:
+            (int or None): 401, 429 or 5xx status, None for no fault.
+        """
+        with self._lock:
+            roll = self._rng.random()
+            if roll < self.unauthorized_rate:
+                return 401
+            roll -= self.unauthorized_rate
+            if roll < self.throttle_rate:
+                return 429
+            roll -= self.throttle_rate
+            if roll < self.server_error_rate:
+                return self._rng.choice(SERVER_ERROR_CODES)
+        return None
+
+
+class QuietRequestHandler(serving.WSGIRequestHandler):
+    """Request handler that does not log every request to stderr."""
+
+    def log_request(self, *args, **kwargs):
+        """Skip per-request logging."""
+
+
+class FakeServer:
+    """Threaded localhost server for a fake vendor flask app."""
+
+    name = "fake"
+
+    def __init__(self, profile=None, host="127.0.0.1", port=0):
+        """
+        Constructor, build the flask app.
+
+        inputs:
+            profile(FaultProfile): fault settings, None for no faults.
+            host(str): listen address.
+            port(int): listen port, 0 picks a free port.
+        """
+        self.profile = profile if profile is not None else FaultProfile()
+        self.host = host
+        self.port = port
+        # per-route and per-status request counts
+        self.stats = collections.Counter()
+        self._stats_lock = threading.Lock()
+        self._server = None
+        self._thread = None
+        self.app = flask.Flask(self.name)
+        self.app.before_request(self._before_request)
+        self.app.after_request(self._after_request)
+        self.register_routes()
+
+    def register_routes(self):
+        """Add vendor routes to self.app."""
+        raise NotImplementedError
+
+    def unauthorized_response(self):
+        """
+        Return the vendor-specific 401 response.
+
+        inputs:
+            None
+        returns:
+            (flask.Response): 401 response.
+        """
+        return flask.jsonify({"error": "unauthorized"}), 401
+
+    def _count(self, key):
+        """Increment a request counter."""
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _before_request(self):
+        """Apply latency, rate limit and injected faults."""
+        latency_sec = self.profile.sample_latency_sec()
+        if latency_sec > 0:
+            time.sleep(latency_sec)
+        if not self.profile.consume_rate_limit_token():
+            return self.throttled_response()
+        status = self.profile.choose_fault()
+        if status == 401:
+            return self.unauthorized_response()
+        if status == 429:
+            return self.throttled_response()
+        if status is not None:
+            return flask.jsonify({"error": "injected server error"}), status
+        return None
+
+    def _after_request(self, response):
+        """Record the request in self.stats."""
+        self._count(f"{flask.request.method} {flask.request.path}")
+        self._count(response.status_code)
+        return response
+
+    def throttled_response(self):
+        """
+        Return a 429 response with a Retry-After header.
+
+        inputs:
+            None
+        returns:
+            (flask.Response): 429 response.
+        """
+        response = flask.jsonify({"error": "too many requests"})
+        response.status_code = 429
+        response.headers["Retry-After"] = "1"
+        return response
+
+    def paginate(self, items, default_page_size=None):
+        """
+        Return one page of items.
+
+        The page number comes from the 'page' query arg (1-based), the page
+        size from the 'pageSize' query arg, the profile or default_page_size.
+
+        inputs:
+            items(list): all items.
+            default_page_size(int): page size if neither arg nor profile set.
+        returns:
+            (list): items on the requested page, empty past the last page.
+        """
+        page_size = flask.request.args.get(
+            "pageSize", default=self.profile.page_size or default_page_size,
+            type=int,
+        )
+        page = flask.request.args.get("page", default=None, type=int)
+        if not page_size or page is None:
+            return items
+        start = (page - 1) * page_size
+        return items[start:start + page_size]
+
+    @property
+    def base_url(self):
+        """Return the server base URL."""
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        """
+        Start serving from a daemon thread.
+
+        inputs:
+            None
+        returns:
+            (FakeServer): self.
+        """
+        self._server = serving.make_server(
+            self.host,
+            self.port,
+            self.app,
+            threaded=True,
+            request_handler=QuietRequestHandler,
+        )
+        self.port = self._server.server_port
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name=f"{self.name}_server",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and wait for the thread to exit."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,242 @@
+"""
+Stand-in Honeywell Total Connect Comfort portal for the pyhtcc paths.
+
+Implements login/logoff, GetZoneListData (paged), Device/Control,
+CheckDataSession and SubmitControlScreenChanges.  pyhtcc sends basic auth
+on every request, so a request is authorized when its basic auth user has
+logged in and not logged off.
+
+Point the honeywell driver here with honeywell_config.BASE_URL_ENV_KEY.
+"""
+
+# built-in imports
+import threading
+
+# third party imports
+import flask
+
+# local imports
+from tests.fake_servers import fake_server
+
+FIRST_DEVICE_ID = 1000  # DeviceID of zone 0
+SESSION_COOKIE = ".ASPXAUTH_TRUEHOME"
+UNAUTHORIZED_TEXT = "Unauthorized: Access is denied due to invalid credentials"
+
+
+def make_zone_state(device_id, zone_name):
+    """
+    Return the initial state of one fake TCC zone.
+
+    inputs:
+        device_id(int): TCC DeviceID.
+        zone_name(str): zone name shown on the control page.
+    returns:
+        (dict): zone state, uiData and fanData field names.
+    """
+    return {
+        "DeviceID": device_id,
+        "Name": zone_name,
+        "uiData": {
+            "DispTemperature": 70,
+            "DispUnits": "F",
+            "HeatSetpoint": 68,
+            "CoolSetpoint": 76,
+            "ScheduleHeatSp": 68,
+            "ScheduleCoolSp": 76,
+            "IndoorHumidity": 40,
+            "IndoorHumiditySensorAvailable": True,
+            "IndoorHumiditySensorNotFault": True,
+            "SystemSwitchPosition": 2,  # off
+            "StatusHeat": 0,
+            "StatusCool": 0,
+            "EquipmentOutputStatus": 0,
+            "IsInVacationHoldMode": 0,
+            "VacationHold": 0,
+            "VacationHoldUntilTime": 0,
+            "TemporaryHoldUntilTime": 0,
+            "SetpointChangeAllowed": True,
+        },
+        "fanData": {"fanMode": 0, "fanIsRunning": False},
+    }
+
+
+class HoneywellServer(fake_server.FakeServer):
+    """Fake mytotalconnectcomfort.com portal."""
+
+    name = "honeywell"
+
+    def __init__(
+        self, zones=1, username=None, password=None, location_id=1234567,
+        outdoor_temp=45, outdoor_humidity=60, **kwargs
+    ):
+        """
+        Constructor.
+
+        inputs:
+            zones(int): number of zones on the account.
+            username(str): accepted user name, None accepts any.
+            password(str): accepted password, None accepts any.
+            location_id(int): TCC location id returned on login.
+            outdoor_temp(int): outdoor temp on the control page.
+            outdoor_humidity(int): outdoor humidity on the control page.
+            kwargs: FakeServer arguments.
+        """
+        self.username = username
+        self.password = password
+        self.location_id = location_id
+        self.outdoor_temp = outdoor_temp
+        self.outdoor_humidity = outdoor_humidity
+        self.zones = {
+            FIRST_DEVICE_ID + idx: make_zone_state(
+                FIRST_DEVICE_ID + idx, f"Zone {idx}"
+            )
+            for idx in range(zones)
+        }
+        self.logged_in = set()
+        self._state_lock = threading.Lock()
+        super().__init__(**kwargs)
+
+    def register_routes(self):
+        """Add portal routes."""
+        app = self.app
+        app.add_url_rule("/portal", view_func=self.login, methods=["POST"])
+        app.add_url_rule(
+            "/portal/<int:location_id>/", view_func=self.location_page
+        )
+        app.add_url_rule("/portal/Account/LogOff", view_func=self.logoff)
+        app.add_url_rule(
+            "/portal/Device/GetZoneListData",
+            view_func=self.get_zone_list_data,
+            methods=["POST"],
+        )
+        app.add_url_rule(
+            "/portal/Device/Control/<int:device_id>", view_func=self.control_page
+        )
+        app.add_url_rule(
+            "/portal/Device/CheckDataSession/<int:device_id>",
+            view_func=self.check_data_session,
+        )
+        app.add_url_rule(
+            "/portal/Device/SubmitControlScreenChanges",
+            view_func=self.submit_control_screen_changes,
+            methods=["POST"],
+        )
+
+    def unauthorized_response(self):
+        """Return the portal 401 response pyhtcc looks for."""
+        return UNAUTHORIZED_TEXT, 401
+
+    def _credentials_ok(self, username, password):
+        """Return True if username and password are accepted."""
+        return (self.username is None or username == self.username) and (
+            self.password is None or password == self.password
+        )
+
+    def _is_authorized(self):
+        """Return True if the request basic auth user is logged in."""
+        auth = flask.request.authorization
+        return (
+            auth is not None
+            and auth.username in self.logged_in
+            and self._credentials_ok(auth.username, auth.password)
+        )
+
+    def _get_zone(self, device_id):
+        """Return zone state, aborting with 404 for an unknown device."""
+        if device_id not in self.zones:
+            flask.abort(404)
+        return self.zones[device_id]
+
+    def login(self):
+        """Log in and redirect to the location page."""
+        username = flask.request.form.get("UserName")
+        if not self._credentials_ok(username, flask.request.form.get("Password")):
+            return "<html>The email or password provided is incorrect</html>"
+        self.logged_in.add(username)
+        response = flask.redirect(f"/portal/{self.location_id}/")
+        # portal session cookie, pyhtcc keeps it in its session
+        response.set_cookie(SESSION_COOKIE, f"fake-session-{len(self.logged_in)}")
+        return response
+
+    def location_page(self, location_id):
+        """Return the landing page after login."""
+        return f"<html>locationId={location_id}</html>"
+
+    def logoff(self):
+        """Log the basic auth user off."""
+        auth = flask.request.authorization
+        if auth is not None:
+            self.logged_in.discard(auth.username)
+        return "<html>logged off</html>"
+
+    def get_zone_list_data(self):
+        """Return one page of zone summaries."""
+        if not self._is_authorized():
+            return self.unauthorized_response()
+        if flask.request.args.get("locationId", type=int) != self.location_id:
+            return flask.jsonify([])
+        with self._state_lock:
+            summaries = [
+                {
+                    "DeviceID": zone["DeviceID"],
+                    "DispTemp": zone["uiData"]["DispTemperature"],
+                    "DispTempAvailable": True,
+                }
+                for zone in self.zones.values()
+            ]
+        return flask.jsonify(
+            self.paginate(summaries, default_page_size=len(summaries))
+        )
+
+    def control_page(self, device_id):
+        """Return the control page HTML pyhtcc scrapes."""
+        if not self._is_authorized():
+            return self.unauthorized_response()
+        zone = self._get_zone(device_id)
+        return (
+            f'<html><div id="ZoneName">{zone["Name"]} Control</div>'
+            f"<script>"
+            f"Control.Model.Property.outdoorTemp, {self.outdoor_temp});"
+            f"Control.Model.Property.outdoorHumidity, {self.outdoor_humidity});"
+            f"</script></html>"
+        )
+
+    def check_data_session(self, device_id):
+        """Return the latest data for one zone."""
+        if not self._is_authorized():
+            return self.unauthorized_response()
+        zone = self._get_zone(device_id)
+        with self._state_lock:
+            return flask.jsonify(
+                {
+                    "success": True,
+                    "deviceLive": True,
+                    "communicationLost": False,
+                    "latestData": {
+                        "uiData": dict(zone["uiData"]),
+                        "fanData": dict(zone["fanData"]),
+                        "hasFan": True,
+                    },
+                }
+            )
+
+    def submit_control_screen_changes(self):
+        """Apply setpoint and mode changes to one zone."""
+        if not self._is_authorized():
+            return self.unauthorized_response()
+        changes = flask.request.get_json(silent=True) or {}
+        zone = self._get_zone(changes.get("DeviceID"))
+        ui_field_map = {
+            "HeatSetpoint": "HeatSetpoint",
+            "CoolSetpoint": "CoolSetpoint",
+            "StatusHeat": "StatusHeat",
+            "StatusCool": "StatusCool",
+            "SystemSwitch": "SystemSwitchPosition",
+        }
+        with self._state_lock:
+            for key, ui_field in ui_field_map.items():
+                if changes.get(key) is not None:
+                    zone["uiData"][ui_field] = changes[key]
+            if changes.get("FanMode") is not None:
+                zone["fanData"]["fanMode"] = changes["FanMode"]
+        return flask.jsonify({"success": 1})
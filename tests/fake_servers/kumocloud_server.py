@@ -0,0 +1,179 @@
+"""
+Stand-in KumoCloud v3 API server.
+
+Implements /v3/login, /v3/refresh, /v3/sites/, /v3/sites/<id>/zones/ and
+/v3/devices/<serial>.  Access tokens expire after access_token_ttl_sec so
+the driver's 401 -> refresh -> retry path can be exercised; the site and
+zone lists honor optional 'page'/'pageSize' query args.
+
+Point the kumocloud driver here with kumocloud_config.BASE_URL_ENV_KEY.
+"""
+
+# built-in imports
+import itertools
+import threading
+import time
+
+# third party imports
+import flask
+
+# local imports
+from src import kumo_common_zones
+from tests.fake_servers import fake_server
+
+SITE_ID = "fake-site-0"
+DEFAULT_ZONE_NAMES = [
+    kumo_common_zones.ZONE_NAME_LIVING_ROOM,
+    kumo_common_zones.ZONE_NAME_KITCHEN,
+    kumo_common_zones.ZONE_NAME_BASEMENT,
+]
+
+
+def make_device_state(index):
+    """
+    Return the initial v3 device data of one fake indoor unit.
+
+    inputs:
+        index(int): zone index.
+    returns:
+        (dict): v3 device fields, temperatures in °C.
+    """
+    return {
+        "deviceSerial": f"FAKE{index:04d}",
+        "macAddress": f"00:00:00:00:{index // 256:02x}:{index % 256:02x}",
+        "roomTemp": 21.0,
+        "spHeat": 20.0,
+        "spCool": 24.0,
+        "operationMode": "off",
+        "power": 0,
+        "fanSpeed": "auto",
+        "humidity": 40,
+        "hasHumiditySensor": True,
+        "energySave": False,
+        "rssi": -50,
+        "displayConfig": {"defrost": False, "standby": False},
+    }
+
+
+class KumoCloudServer(fake_server.FakeServer):
+    """Fake app-prod.kumocloud.com v3 API."""
+
+    name = "kumocloud"
+
+    def __init__(
+        self, zone_names=None, username=None, password=None,
+        access_token_ttl_sec=1200, **kwargs
+    ):
+        """
+        Constructor.
+
+        inputs:
+            zone_names(list): zone names, None for the kumo_common_zones names.
+            username(str): accepted user name, None accepts any.
+            password(str): accepted password, None accepts any.
+            access_token_ttl_sec(float): access token lifetime.
+            kwargs: FakeServer arguments.
+        """
+        self.username = username
+        self.password = password
+        self.access_token_ttl_sec = access_token_ttl_sec
+        zone_names = zone_names if zone_names is not None else DEFAULT_ZONE_NAMES
+        self.devices = {}
+        self.zones = []
+        for index, zone_name in enumerate(zone_names):
+            device = make_device_state(index)
+            self.devices[device["deviceSerial"]] = device
+            self.zones.append(
+                {
+                    "id": f"fake-zone-{index}",
+                    "name": zone_name,
+                    "adapter": {"deviceSerial": device["deviceSerial"]},
+                }
+            )
+        # token -> expiry time (time.monotonic)
+        self.access_tokens = {}
+        self.refresh_tokens = set()
+        self._token_ids = itertools.count(1)
+        self._state_lock = threading.Lock()
+        super().__init__(**kwargs)
+
+    def register_routes(self):
+        """Add v3 API routes."""
+        app = self.app
+        app.add_url_rule("/v3/login", view_func=self.login, methods=["POST"])
+        app.add_url_rule("/v3/refresh", view_func=self.refresh, methods=["POST"])
+        app.add_url_rule("/v3/sites/", view_func=self.get_sites)
+        app.add_url_rule("/v3/sites/<site_id>/zones/", view_func=self.get_zones)
+        app.add_url_rule("/v3/devices/<serial>", view_func=self.get_device)
+
+    def _issue_tokens(self):
+        """Return a new (access, refresh) token pair."""
+        token_id = next(self._token_ids)
+        access_token = f"fake-access-{token_id}"
+        refresh_token = f"fake-refresh-{token_id}"
+        with self._state_lock:
+            self.access_tokens[access_token] = (
+                time.monotonic() + self.access_token_ttl_sec
+            )
+            self.refresh_tokens.add(refresh_token)
+        return access_token, refresh_token
+
+    def _is_authorized(self):
+        """Return True if the request has an unexpired bearer token."""
+        header = flask.request.headers.get("Authorization", "")
+        token = header[len("Bearer "):] if header.startswith("Bearer ") else None
+        with self._state_lock:
+            expires_at = self.access_tokens.get(token)
+        return expires_at is not None and time.monotonic() < expires_at
+
+    def login(self):
+        """Return tokens for valid credentials."""
+        body = flask.request.get_json(silent=True) or {}
+        if (self.username is not None and body.get("username") != self.username) or (
+            self.password is not None and body.get("password") != self.password
+        ):
+            return self.unauthorized_response()
+        access_token, refresh_token = self._issue_tokens()
+        return flask.jsonify(
+            {
+                "id": "fake-user",
+                "username": body.get("username"),
+                "token": {"access": access_token, "refresh": refresh_token},
+            }
+        )
+
+    def refresh(self):
+        """Exchange a refresh token for a new token pair."""
+        body = flask.request.get_json(silent=True) or {}
+        with self._state_lock:
+            known = body.get("refresh") in self.refresh_tokens
+            self.refresh_tokens.discard(body.get("refresh"))
+        if not known:
+            return self.unauthorized_response()
+        access_token, refresh_token = self._issue_tokens()
+        return flask.jsonify({"access": access_token, "refresh": refresh_token})
+
+    def get_sites(self):
+        """Return the site list."""
+        if not self._is_authorized():
+            return self.unauthorized_response()
+        return flask.jsonify(
+            self.paginate([{"id": SITE_ID, "name": "Fake Site", "isActive": True}])
+        )
+
+    def get_zones(self, site_id):
+        """Return the zone list of a site."""
+        if not self._is_authorized():
+            return self.unauthorized_response()
+        if site_id != SITE_ID:
+            flask.abort(404)
+        return flask.jsonify(self.paginate(self.zones))
+
+    def get_device(self, serial):
+        """Return one indoor unit."""
+        if not self._is_authorized():
+            return self.unauthorized_response()
+        with self._state_lock:
+            if serial not in self.devices:
+                flask.abort(404)
+            return flask.jsonify(dict(self.devices[serial]))
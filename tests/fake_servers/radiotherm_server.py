@@ -0,0 +1,136 @@
+"""
+Stand-in Radio Thermostat (3M50) local API server.
+
+Serves every endpoint the radiotherm CT50 V1.94 class reads, since the
+mmm driver dumps all thermostat attributes, and accepts POSTs to /tstat
+for mode and setpoint changes.
+
+Point the mmm driver here with mmm_config.BASE_URL_ENV_KEY.
+"""
+
+# built-in imports
+import threading
+
+# third party imports
+import flask
+
+# local imports
+from tests.fake_servers import fake_server
+
+MODEL = "CT50 V1.94"
+
+# /tstat/ttemp returns the setpoint for the active mode
+TMODE_OFF = 0
+TMODE_HEAT = 1
+TMODE_COOL = 2
+
+# POST-only setpoint fields and the /tstat field they change
+HOLD_FIELD_MAP = {"it_heat": "t_heat", "it_cool": "t_cool"}
+
+
+def make_program(day_temp, night_temp):
+    """
+    Return a weekly program, 4 periods per day.
+
+    inputs:
+        day_temp(int): daytime setpoint.
+        night_temp(int): night setpoint.
+    returns:
+        (dict): {"0".."6": [minute, temp, ...]}
+    """
+    day_program = [360, day_temp, 480, night_temp, 1080, day_temp, 1320, night_temp]
+    return {str(day): list(day_program) for day in range(7)}
+
+
+class RadiothermServer(fake_server.FakeServer):
+    """Fake 3M50 thermostat local API."""
+
+    name = "radiotherm"
+
+    def __init__(self, thermostat_name="Fake 3M50", **kwargs):
+        """
+        Constructor.
+
+        inputs:
+            thermostat_name(str): name returned by /sys/name.
+            kwargs: FakeServer arguments.
+        """
+        self.thermostat_name = thermostat_name
+        self.tstat = {
+            "temp": 70.5,
+            "tmode": TMODE_OFF,
+            "fmode": 0,
+            "override": 0,
+            "hold": 0,
+            "t_heat": 68.0,
+            "t_cool": 76.0,
+            "tstate": 0,
+            "fstate": 0,
+            "time": {"day": 0, "hour": 12, "minute": 0},
+        }
+        self.programs = {
+            "heat": make_program(68, 62),
+            "cool": make_program(76, 80),
+        }
+        self._state_lock = threading.Lock()
+        super().__init__(**kwargs)
+
+    def register_routes(self):
+        """Add thermostat API routes."""
+        static_routes = {
+            "/tstat/model": {"model": MODEL},
+            "/tstat/version": {"version": 1.94, "pkg_version": 4.4},
+            "/tstat/led": {"energy_led": 1},
+            "/tstat/hvac_settings": {"pump": 1, "aux_type": 1, "hvac_code": 1},
+            "/tstat/power": {"power": 1000},
+            "/tstat/datalog": {},
+            "/tstat/remote_temp": {"rem_mode": 0},
+            "/sys": {"uuid": "5cdad4000000", "api_version": 113},
+            "/sys/mode": {"mode": 1},
+            "/sys/network": {"ssid": "fake", "security": 4},
+            "/sys/services": {"service_names": ["com.rtcoa.tstat:1.0"]},
+            "/cloud": {"interval": 300, "enabled": 0},
+        }
+        for route, payload in static_routes.items():
+            self.app.add_url_rule(
+                route,
+                endpoint=route,
+                view_func=lambda payload=payload: flask.jsonify(payload),
+                methods=["GET", "POST"],
+            )
+        self.app.add_url_rule("/sys/name", view_func=self.sys_name)
+        self.app.add_url_rule(
+            "/tstat", view_func=self.tstat_route, methods=["GET", "POST"]
+        )
+        self.app.add_url_rule("/tstat/ttemp", view_func=self.ttemp)
+        self.app.add_url_rule(
+            "/tstat/program/<heat_cool>", view_func=self.program
+        )
+
+    def sys_name(self):
+        """Return the thermostat name."""
+        return flask.jsonify({"name": self.thermostat_name})
+
+    def tstat_route(self):
+        """Return thermostat state, or apply a POSTed change."""
+        with self._state_lock:
+            if flask.request.method == "POST":
+                changes = flask.request.get_json(force=True, silent=True) or {}
+                for key, value in changes.items():
+                    # it_heat/it_cool set the same setpoint as t_heat/t_cool
+                    self.tstat[HOLD_FIELD_MAP.get(key, key)] = value
+                return flask.jsonify({"success": 0})
+            return flask.jsonify(dict(self.tstat))
+
+    def ttemp(self):
+        """Return the setpoint of the active mode."""
+        with self._state_lock:
+            if self.tstat["tmode"] == TMODE_COOL:
+                return flask.jsonify({"t_cool": self.tstat["t_cool"]})
+            return flask.jsonify({"t_heat": self.tstat["t_heat"]})
+
+    def program(self, heat_cool):
+        """Return the heat or cool weekly program."""
+        if heat_cool not in self.programs:
+            flask.abort(404)
+        return flask.jsonify(self.programs[heat_cool])
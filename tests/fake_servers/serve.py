@@ -0,0 +1,140 @@
+"""
+Run local stand-in vendor servers until CTRL-C.
+
+Prints the base URL override env vars to point the drivers at them.
+
+to run this module:
+    python -m tests.fake_servers.serve
+    python -m tests.fake_servers.serve kumocloud honeywell --latency-ms 80 \
+        --jitter-ms 30 --throttle-rate 0.02 --server-error-rate 0.01
+"""
+
+# built-in imports
+import argparse
+import sys
+import time
+
+# local imports
+from src import honeywell_config
+from src import kumocloud_config
+from src import mmm_config
+from src import sht31_config
+from tests.fake_servers import fake_server
+from tests.fake_servers import honeywell_server
+from tests.fake_servers import kumocloud_server
+from tests.fake_servers import radiotherm_server
+from tests.fake_servers import sht31_server
+
+# vendor -> (server class, driver base URL override env var)
+VENDORS = {
+    "honeywell": (honeywell_server.HoneywellServer, honeywell_config.BASE_URL_ENV_KEY),
+    "kumocloud": (kumocloud_server.KumoCloudServer, kumocloud_config.BASE_URL_ENV_KEY),
+    "mmm": (radiotherm_server.RadiothermServer, mmm_config.BASE_URL_ENV_KEY),
+    "sht31": (sht31_server.Sht31Server, sht31_config.BASE_URL_ENV_KEY),
+}
+
+
+def start_servers(vendors, profile_kwargs, host="127.0.0.1", port=0):
+    """
+    Start one fake server per vendor.
+
+    inputs:
+        vendors(list): keys of VENDORS.
+        profile_kwargs(dict): FaultProfile arguments, shared by all servers.
+        host(str): listen address.
+        port(int): first listen port, 0 picks free ports.
+    returns:
+        (dict): vendor -> started FakeServer.
+    """
+    servers = {}
+    for idx, vendor in enumerate(vendors):
+        server_class = VENDORS[vendor][0]
+        servers[vendor] = server_class(
+            profile=fake_server.FaultProfile(**profile_kwargs),
+            host=host,
+            port=port + idx if port else 0,
+        ).start()
+    return servers
+
+
+def parse_arguments(argv_list=None):
+    """
+    Parse command line arguments.
+
+    inputs:
+        argv_list(list): arguments, None for sys.argv.
+    returns:
+        (argparse.Namespace): parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "vendors", nargs="*", default=[],
+        help=f"vendors to serve, any of {list(VENDORS)} (default all)",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="listen address")
+    parser.add_argument(
+        "--port", type=int, default=0, help="first port, 0 picks free ports"
+    )
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument(
+        "--distribution", choices=fake_server.LATENCY_DISTRIBUTIONS,
+        default=fake_server.NORMAL,
+    )
+    parser.add_argument("--rate-limit", type=float, default=0.0,
+                        help="requests/sec per server, 0 = unlimited")
+    parser.add_argument("--burst", type=int, default=None)
+    parser.add_argument("--unauthorized-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--server-error-rate", type=float, default=0.0)
+    parser.add_argument("--page-size", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv_list)
+    unknown_vendors = set(args.vendors) - set(VENDORS)
+    if unknown_vendors:
+        parser.error(f"unknown vendors: {sorted(unknown_vendors)}")
+    return args
+
+
+def main(argv_list=None):
+    """
+    Serve until interrupted.
+
+    inputs:
+        argv_list(list): arguments, None for sys.argv.
+    returns:
+        (int): exit code.
+    """
+    args = parse_arguments(argv_list)
+    profile_kwargs = {
+        "latency_ms": args.latency_ms,
+        "latency_jitter_ms": args.jitter_ms,
+        "latency_distribution": args.distribution,
+        "rate_limit_per_sec": args.rate_limit,
+        "rate_limit_burst": args.burst,
+        "unauthorized_rate": args.unauthorized_rate,
+        "throttle_rate": args.throttle_rate,
+        "server_error_rate": args.server_error_rate,
+        "page_size": args.page_size,
+        "seed": args.seed,
+    }
+    servers = start_servers(
+        args.vendors or list(VENDORS), profile_kwargs, args.host, args.port
+    )
+    for vendor, server in servers.items():
+        print(f"export {VENDORS[vendor][1]}={server.base_url}")
+    print("serving, press CTRL-C to stop")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for server in servers.values():
+            server.stop()
+            print(f"{server.name}: {dict(server.stats)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
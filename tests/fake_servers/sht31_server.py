@@ -0,0 +1,82 @@
+"""
+Stand-in SHT31 flask API server.
+
+Serves the production (/data) and unit test (/unit) measurement routes
+with the sht31_config API field names.  Readings come from a seeded RNG,
+the 'seed' query arg reseeds a request like the real unit test route.
+
+Point the sht31 driver here with sht31_config.BASE_URL_ENV_KEY.
+"""
+
+# built-in imports
+import random
+import statistics
+import threading
+
+# third party imports
+import flask
+
+# local imports
+from src import sht31_config
+from src import utilities as util
+from tests.fake_servers import fake_server
+
+
+class Sht31Server(fake_server.FakeServer):
+    """Fake SHT31 flask server."""
+
+    name = "sht31"
+
+    def __init__(self, temp_f=70.0, humidity=40.0, rssi=-50.0, seed=0, **kwargs):
+        """
+        Constructor.
+
+        inputs:
+            temp_f(float): mean temperature in °F.
+            humidity(float): mean humidity in %RH.
+            rssi(float): mean wifi signal strength in dBm.
+            seed(int): reading RNG seed.
+            kwargs: FakeServer arguments.
+        """
+        self.temp_f = temp_f
+        self.humidity = humidity
+        self.rssi = rssi
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        super().__init__(**kwargs)
+
+    def register_routes(self):
+        """Add measurement routes."""
+        for route in (
+            sht31_config.flask_folder.production,
+            sht31_config.flask_folder.unit_test,
+        ):
+            self.app.add_url_rule(route, endpoint=route, view_func=self.measure)
+
+    def measure(self):
+        """Return averaged readings in the sht31 API format."""
+        measurements = flask.request.args.get(
+            "measurements", sht31_config.MEASUREMENTS, type=int
+        )
+        seed = flask.request.args.get("seed", None, type=int)
+        with self._rng_lock:
+            rng = random.Random(seed) if seed is not None else self._rng
+            temp_f_lst = [self.temp_f + rng.gauss(0, 0.2) for _ in range(measurements)]
+            humidity_lst = [
+                self.humidity + rng.gauss(0, 0.5) for _ in range(measurements)
+            ]
+            rssi_lst = [self.rssi + rng.gauss(0, 1.0) for _ in range(measurements)]
+        temp_c_lst = [util.f_to_c(temp_f) for temp_f in temp_f_lst]
+        return flask.jsonify(
+            {
+                sht31_config.API_MEASUREMENT_CNT: measurements,
+                sht31_config.API_TEMPC_MEAN: statistics.mean(temp_c_lst),
+                sht31_config.API_TEMPC_STD: statistics.pstdev(temp_c_lst),
+                sht31_config.API_TEMPF_MEAN: statistics.mean(temp_f_lst),
+                sht31_config.API_TEMPF_STD: statistics.pstdev(temp_f_lst),
+                sht31_config.API_HUMIDITY_MEAN: statistics.mean(humidity_lst),
+                sht31_config.API_HUMIDITY_STD: statistics.pstdev(humidity_lst),
+                sht31_config.API_RSSI_MEAN: statistics.mean(rssi_lst),
+                sht31_config.API_RSSI_STD: statistics.pstdev(rssi_lst),
+            }
+        )
@@ -132,7 +132,7 @@ class BlinkSpamMitigationTest(unittest.TestCase):
 
         # Create zone instance
         with patch(
-            "src.thermostat_common.time.time",
+            "src.clock.real_time.time",
             return_value=start_time - 120,
         ):
             zone = blink.ThermostatZone(self.mock_thermostat, verbose=False)
@@ -164,7 +164,7 @@ class BlinkSpamMitigationTest(unittest.TestCase):
 
         # Create zone instance
         with patch(
-            "src.thermostat_common.time.time",
+            "src.clock.real_time.time",
             return_value=start_time - 120,
         ):
             zone = blink.ThermostatZone(self.mock_thermostat, verbose=False)
@@ -211,7 +211,7 @@ class BlinkSpamMitigationTest(unittest.TestCase):
 
         # Create zone instance with verbose=True
         with patch(
-            "src.thermostat_common.time.time",
+            "src.clock.real_time.time",
             return_value=start_time - 120,
         ):
             zone = blink.ThermostatZone(self.mock_thermostat, verbose=True)
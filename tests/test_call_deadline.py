@@ -0,0 +1,174 @@
+"""
+Unit test module for call_deadline.py.
+"""
+
+# built-in imports
+import threading
+import unittest
+from unittest import mock
+
+# local imports
+from src import call_deadline
+from src import clock
+from src import emulator_config
+from src import supervision_context as sc
+from src import utilities as util
+from tests import unit_test_common as utc
+
+
+class TestCallDeadline(utc.UnitTest):
+    """Test per-call deadlines of vendor calls."""
+
+    def setUp(self):
+        super().setUp()
+        self.executor = call_deadline.reset_executor(max_workers=4, idle_sec=0.2)
+        self.release = threading.Event()
+
+    def tearDown(self):
+        # let abandoned calls return so their workers exit
+        self.release.set()
+        super().tearDown()
+
+    def hang(self):
+        """Block like a vendor call on a dead socket."""
+        self.release.wait(10)
+        return "late"
+
+    def test_result_and_exception(self):
+        """Verify results and exceptions reach the caller."""
+        self.assertEqual(self.executor.call(lambda: 42, 1), 42)
+        with self.assertRaises(ValueError):
+            self.executor.call(mock.Mock(side_effect=ValueError("bad")), 1)
+        # no deadline runs inline
+        self.assertEqual(
+            self.executor.call(threading.get_ident, None), threading.get_ident()
+        )
+        self.assertEqual(self.executor.get_metrics()["calls"], 2)
+
+    def test_caller_context(self):
+        """Verify the call sees the caller's supervision context."""
+        context = sc.SupervisionContext(inputs={})
+        with sc.bind(context):
+            self.assertIs(self.executor.call(sc.get_current_context, 1), context)
+
+    def test_overrun(self):
+        """Verify a hung call is abandoned and counted."""
+        with mock.patch.object(util, "log_msg"):
+            with self.assertRaises(util.CallDeadlineError):
+                self.executor.call(self.hang, 0.1, name="hung call")
+            # a new call gets a fresh worker while the hung one is held
+            self.assertEqual(self.executor.call(lambda: "ok", 1), "ok")
+        metrics = self.executor.get_metrics()
+        self.assertEqual(metrics["overruns"], 1)
+        self.assertEqual(metrics["running"], 1)
+        self.assertEqual(metrics["workers"], 2)
+        self.assertIsInstance(util.CallDeadlineError(), TimeoutError)
+
+    def test_hung_group_spares_siblings(self):
+        """Verify hung calls of one zone cannot drain the shared pool."""
+        with mock.patch.object(util, "log_msg"):
+            for _ in range(self.executor.max_workers):
+                with self.assertRaises(util.CallDeadlineError):
+                    self.executor.call(self.hang, 0.1, group="dead zone")
+            # a healthy sibling still gets a worker
+            self.assertEqual(self.executor.call(lambda: "ok", 1), "ok")
+            self.assertEqual(
+                self.executor.call(lambda: "ok", 1, group="healthy zone"), "ok"
+            )
+        metrics = self.executor.get_metrics()
+        self.assertEqual(metrics["overruns"], call_deadline.CALL_MAX_HUNG_PER_GROUP)
+        self.assertEqual(metrics["hung"], call_deadline.CALL_MAX_HUNG_PER_GROUP)
+        self.assertEqual(
+            metrics["refused"],
+            self.executor.max_workers - call_deadline.CALL_MAX_HUNG_PER_GROUP,
+        )
+        # the group recovers once its hung calls return
+        self.release.set()
+        with mock.patch.object(util, "log_msg"):
+            for _ in range(50):
+                if not self.executor.get_metrics()["hung"]:
+                    break
+                clock.sleep(0.01)
+            self.assertEqual(
+                self.executor.call(lambda: "ok", 1, group="dead zone"), "ok"
+            )
+
+    def test_abandoned_queued_call_is_skipped(self):
+        """Verify a call abandoned while queued never runs."""
+        executor = call_deadline.reset_executor(max_workers=1, idle_sec=0.2)
+        queued = mock.Mock()
+        with mock.patch.object(util, "log_msg"):
+            for func in (self.hang, queued):
+                with self.assertRaises(util.CallDeadlineError):
+                    executor.call(func, 0.1)
+            self.release.set()
+            self.assertEqual(executor.call(lambda: "ok", 1), "ok")
+        queued.assert_not_called()
+        self.assertEqual(executor.get_metrics()["late_returns"], 1)
+
+    def test_report_stuck_calls(self):
+        """Verify a stuck call is reported once with its stack."""
+        with mock.patch.object(util, "log_msg") as log_msg:
+            with self.assertRaises(util.CallDeadlineError):
+                self.executor.call(self.hang, 0.05, name="hung call")
+            self.assertEqual(self.executor.report_stuck_calls(), 1)
+            self.assertEqual(self.executor.report_stuck_calls(), 0)
+        stuck = self.executor.get_stuck_calls()
+        self.assertEqual(stuck[0]["name"], "hung call")
+        self.assertIn("in hang", stuck[0]["stack"])
+        self.assertIn("in hang", log_msg.call_args.args[0])
+
+    def test_virtual_clock(self):
+        """Verify clock.sleep() inside a call advances a virtual clock."""
+        with clock.use_clock(clock.VirtualClock(start_time=0)):
+            self.executor.call(lambda: clock.sleep(3600), 1)
+            self.assertEqual(clock.time(), 3600)
+
+    def test_get_deadline_sec(self):
+        """Verify the vendor override of the call deadline."""
+        self.assertEqual(
+            call_deadline.get_deadline_sec("unknown"), call_deadline.CALL_DEADLINE_SEC
+        )
+        with mock.patch.object(emulator_config, "CALL_DEADLINE_SEC", 5, create=True):
+            self.assertEqual(call_deadline.get_deadline_sec(emulator_config.ALIAS), 5)
+
+    def test_hung_call_flags_zone(self):
+        """Verify a hung call makes only its zone reconnect."""
+        context = sc.SupervisionContext(inputs={})
+        with mock.patch.object(util, "log_msg"), sc.bind(context):
+            with self.assertRaises(util.CallDeadlineError):
+                util.execute_with_extended_retries(
+                    self.hang,
+                    emulator_config.ALIAS,
+                    "zone_a",
+                    number_of_retries=1,
+                    initial_retry_delay_sec=0,
+                    endpoint="hang",
+                    deadline_sec=0.1,
+                )
+        self.assertFalse(context.connection_ok)
+        self.assertEqual(context.call_overruns, 1)
+
+    def test_abandoned_call_not_retried(self):
+        """Verify an abandoned write is not repeated on the same object."""
+        write = mock.Mock(side_effect=self.hang)
+        context = sc.SupervisionContext(inputs={})
+        with mock.patch.object(util, "log_msg"), sc.bind(context):
+            with self.assertRaises(util.CallDeadlineError):
+                util.execute_with_extended_retries(
+                    write,
+                    emulator_config.ALIAS,
+                    "zone_a",
+                    number_of_retries=3,
+                    initial_retry_delay_sec=0,
+                    endpoint="write",
+                    deadline_sec=0.1,
+                )
+        write.assert_called_once()
+        self.assertFalse(context.connection_ok)
+        self.assertEqual(context.call_overruns, 1)
+
+
+if __name__ == "__main__":
+    util.log_msg.debug = True  # type: ignore[attr-defined]
+    unittest.main(verbosity=2)
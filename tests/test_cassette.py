@@ -0,0 +1,184 @@
+"""
+Unit test module for cassette.py.
+"""
+
+# built-in imports
+import gzip
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# third party imports
+import requests
+
+# local imports
+from src import cassette
+from src import clock
+from src import honeywell
+from src import honeywell_config
+from src import kumocloud
+from src import kumocloud_config
+from src import site_supervise as ss
+from src import utilities as util
+from tests import unit_test_common as utc
+from tests.fake_servers import fake_server
+from tests.fake_servers import honeywell_server
+from tests.fake_servers import kumocloud_server
+from tests.fake_servers import sht31_server
+
+
+class TestCassette(utc.UnitTest):
+    """Test record and replay of HTTP exchanges."""
+
+    def setUp(self):
+        """Write cassettes to a temporary data folder."""
+        super().setUp()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path_patch = patch.object(util, "FILE_PATH", self.temp_dir.name)
+        self.file_path_patch.start()
+
+    def tearDown(self):
+        """Remove the temporary data folder."""
+        self.file_path_patch.stop()
+        self.temp_dir.cleanup()
+        super().tearDown()
+
+    def test_record_then_replay_offline(self):
+        """Verify replay serves recorded responses with the server down."""
+        profile = fake_server.FaultProfile(latency_ms=20)
+        with sht31_server.Sht31Server(profile=profile) as server:
+            url = server.base_url + "/unit?measurements=3&seed=1"
+            with cassette.Cassette("sht31", cassette.RECORD) as recorder:
+                recorded = [requests.get(url, timeout=5).json() for _ in range(2)]
+        self.assertEqual(recorder.get_summary()["recorded"], 2)
+        self.assertTrue(os.path.exists(cassette.get_cassette_path("sht31")))
+
+        with cassette.Cassette("sht31", cassette.REPLAY) as player:
+            replayed = [requests.get(url, timeout=5).json() for _ in range(3)]
+        self.assertEqual(replayed[:2], recorded)
+        # recording exhausted, last response is served again
+        self.assertEqual(replayed[2], recorded[1])
+        summary = player.get_summary()
+        self.assertEqual(summary["replayed"], 2)
+        self.assertEqual(summary["repeats"], 1)
+        self.assertGreaterEqual(summary["latency_sec"], 0.05)
+
+    def test_replay_latency_on_virtual_clock(self):
+        """Verify replay sleeps the recorded latency on the active clock."""
+        profile = fake_server.FaultProfile(latency_ms=30)
+        with sht31_server.Sht31Server(profile=profile) as server:
+            url = server.base_url + "/data"
+            with cassette.Cassette("latency", cassette.RECORD):
+                requests.get(url, timeout=5)
+
+        virtual_clock = clock.VirtualClock(start_time=0)
+        with clock.use_clock(virtual_clock), cassette.Cassette(
+            "latency", cassette.REPLAY, latency_scale=10.0
+        ):
+            response = requests.get(url, timeout=5)
+        self.assertEqual(response.status_code, 200)
+        self.assertGreaterEqual(virtual_clock.time(), 0.3)
+
+    def test_replay_miss(self):
+        """Verify an unrecorded request raises a ConnectionError."""
+        with sht31_server.Sht31Server() as server:
+            with cassette.Cassette("miss", cassette.RECORD):
+                requests.get(server.base_url + "/data", timeout=5)
+        with cassette.Cassette("miss", cassette.REPLAY) as player:
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                requests.get("http://127.0.0.1:1/not-recorded", timeout=5)
+        self.assertEqual(player.get_summary()["misses"], 1)
+
+    def test_kumocloud_driver_replay(self):
+        """Verify driver login and discovery replay without credentials on disk."""
+        with kumocloud_server.KumoCloudServer() as server, patch.dict(
+            os.environ,
+            {
+                kumocloud_config.BASE_URL_ENV_KEY: server.base_url,
+                "KUMO_PASSWORD": "cassette-secret",
+            },
+        ):
+            with cassette.Cassette("kumocloud", cassette.RECORD):
+                recorded_units = kumocloud.ThermostatClass(
+                    0, verbose=False
+                ).get_indoor_units()
+            server.stop()
+            with cassette.Cassette("kumocloud", cassette.REPLAY) as player:
+                replayed_units = kumocloud.ThermostatClass(
+                    0, verbose=False
+                ).get_indoor_units()
+        self.assertEqual(replayed_units, recorded_units)
+        self.assertEqual(player.get_summary().get("misses", 0), 0)
+        with gzip.open(cassette.get_cassette_path("kumocloud"), "rt") as file:
+            self.assertNotIn("cassette-secret", file.read())
+
+    def test_recorded_login_has_no_secrets(self):
+        """Verify recorded logins hold no token, cookie or secret parameter."""
+        with honeywell_server.HoneywellServer() as server, patch.dict(
+            os.environ, {honeywell_config.BASE_URL_ENV_KEY: server.base_url}
+        ):
+            with cassette.Cassette("honeywell", cassette.RECORD):
+                Thermostat = honeywell.ThermostatClass(0, verbose=False)
+                cookie = Thermostat.session.cookies.get(
+                    honeywell_server.SESSION_COOKIE
+                )
+                Thermostat.close()
+        self.assertTrue(cookie)
+        with kumocloud_server.KumoCloudServer() as server, patch.dict(
+            os.environ, {kumocloud_config.BASE_URL_ENV_KEY: server.base_url}
+        ):
+            with cassette.Cassette("kumocloud", cassette.RECORD):
+                Thermostat = kumocloud.ThermostatClass(0, verbose=False)
+                tokens = [Thermostat.auth_token, Thermostat.refresh_token]
+                requests.get(server.base_url + "/v3/sites?appid=weather-key", timeout=5)
+            server.stop()
+            with cassette.Cassette("kumocloud", cassette.REPLAY) as player:
+                kumocloud.ThermostatClass(0, verbose=False).get_indoor_units()
+                requests.get(server.base_url + "/v3/sites?appid=weather-key", timeout=5)
+        self.assertEqual(player.get_summary().get("misses", 0), 0)
+
+        for name, secrets in [("honeywell", [cookie]), ("kumocloud", tokens)]:
+            with gzip.open(cassette.get_cassette_path(name), "rt") as file:
+                recorded = file.read()
+            self.assertIn(cassette.REDACTED, recorded)
+            for secret in secrets + ["weather-key"]:
+                self.assertNotIn(secret, recorded)
+        # cookie name is kept so replay fills the session cookie jar
+        cookie_names = recorded_cookie_names(cassette.get_cassette_path("honeywell"))
+        self.assertIn(honeywell_server.SESSION_COOKIE, cookie_names)
+
+    def test_single_active_cassette(self):
+        """Verify only one cassette can be active and send is restored."""
+        original_send = requests.adapters.HTTPAdapter.send
+        with cassette.Cassette("one", cassette.RECORD):
+            with self.assertRaises(RuntimeError):
+                cassette.Cassette("two", cassette.RECORD).start()
+        self.assertIs(requests.adapters.HTTPAdapter.send, original_send)
+        with self.assertRaises(ValueError):
+            cassette.Cassette("bad", "bogus")
+
+    def test_site_supervise_arguments(self):
+        """Verify site_supervise cassette arguments."""
+        args = ss.parse_arguments(["--cassette", "soak", "--cassette-mode", "record"])
+        self.assertEqual(args.cassette, "soak")
+        self.assertEqual(args.cassette_mode, cassette.RECORD)
+        self.assertEqual(ss.parse_arguments([]).cassette, None)
+
+
+def recorded_cookie_names(path):
+    """Return the cookie names of the Set-Cookie headers in a cassette."""
+    with gzip.open(path, "rt") as file:
+        interactions = json.load(file)["interactions"]
+    return [
+        value.split("=", 1)[0]
+        for interaction in interactions
+        for key, value in interaction["headers"]
+        if key.lower() == "set-cookie"
+    ]
+
+
+if __name__ == "__main__":
+    util.log_msg.debug = True  # type: ignore[attr-defined]
+    unittest.main(verbosity=2)
@@ -0,0 +1,155 @@
+"""
+Unit test module for clock.py.
+"""
+
+# built-in imports
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+# local imports
+from src import clock
+from src import thermostat_site as ts
+from src import utilities as util
+from tests import unit_test_common as utc
+
+
+class TestSystemClock(utc.UnitTest):
+    """Test the default real time clock."""
+
+    def test_default_clock(self):
+        """Verify the module functions use real time by default."""
+        self.assertIsInstance(clock.get_clock(), clock.SystemClock)
+        self.assertAlmostEqual(clock.time(), time.time(), delta=1.0)
+        with patch("time.sleep") as mock_sleep:
+            clock.sleep(5)
+        mock_sleep.assert_called_once_with(5)
+
+    def test_wait(self):
+        """Verify wait returns early once its event is set."""
+        event = threading.Event()
+        self.assertFalse(clock.wait(event, 0.01))
+        threading.Timer(0.05, event.set).start()
+        t_start = time.monotonic()
+        self.assertTrue(clock.wait(event, 60))
+        self.assertLess(time.monotonic() - t_start, 5)
+        self.assertTrue(clock.wait(event, 0))
+
+    def test_use_clock_restores(self):
+        """Verify use_clock restores the previous clock."""
+        previous_clock = clock.get_clock()
+        with clock.use_clock(clock.VirtualClock(start_time=0)) as virtual_clock:
+            self.assertIs(clock.get_clock(), virtual_clock)
+        self.assertIs(clock.get_clock(), previous_clock)
+
+
+class TestVirtualClock(utc.UnitTest):
+    """Test simulated time."""
+
+    def test_single_task_sleep(self):
+        """Verify sleep advances simulated time without waiting."""
+        virtual_clock = clock.VirtualClock(start_time=1000.0)
+        t_start = time.monotonic()
+        virtual_clock.sleep(86400 * 7)
+        virtual_clock.sleep(0)
+        self.assertEqual(virtual_clock.time(), 1000.0 + 86400 * 7)
+        self.assertEqual(virtual_clock.monotonic(), 86400 * 7)
+        self.assertLess(time.monotonic() - t_start, 1.0)
+
+    def test_wait(self):
+        """Verify wait sleeps in simulated time until its event is set."""
+        virtual_clock = clock.VirtualClock(start_time=0)
+        event = threading.Event()
+        self.assertFalse(virtual_clock.wait(event, 600))
+        self.assertEqual(virtual_clock.time(), 600)
+
+        # a waiter stopped while another task is busy keeps the clock still
+        virtual_clock.add_task()
+        waiter = threading.Thread(
+            target=clock.run_task,
+            args=(lambda: virtual_clock.wait(event, 600),),
+        )
+        with clock.use_clock(virtual_clock):
+            waiter.start()
+            event.set()
+            waiter.join(timeout=5)
+        self.assertFalse(waiter.is_alive())
+        self.assertEqual(virtual_clock.time(), 600)
+        # the stopped waiter left no wake time behind
+        virtual_clock.sleep(10)
+        self.assertEqual(virtual_clock.time(), 610)
+
+    def test_threads_wake_in_order(self):
+        """Verify concurrent sleepers wake in wake time order."""
+        virtual_clock = clock.VirtualClock(start_time=0)
+        wake_log = []
+        lock = threading.Lock()
+
+        def worker(name, delay_sec, repeats):
+            for _ in range(repeats):
+                virtual_clock.sleep(delay_sec)
+                with lock:
+                    wake_log.append((virtual_clock.time(), name))
+            virtual_clock.task_done()
+
+        threads = [
+            threading.Thread(target=worker, args=("fast", 10, 3)),
+            threading.Thread(target=worker, args=("slow", 25, 1)),
+        ]
+        for thread in threads:
+            virtual_clock.add_task()
+            thread.start()
+        with virtual_clock.idle():
+            for thread in threads:
+                thread.join(timeout=5)
+        self.assertEqual(
+            wake_log,
+            [(10, "fast"), (20, "fast"), (25, "slow"), (30, "fast")],
+        )
+        self.assertEqual(virtual_clock.time(), 30)
+
+    def test_retry_delay_uses_clock(self):
+        """Verify retry delays run in simulated time."""
+        with clock.use_clock(clock.VirtualClock(start_time=0)) as virtual_clock:
+            for trial_number in range(1, 5):
+                util._handle_retry_delay(trial_number, 5, 60 * trial_number)
+        self.assertEqual(virtual_clock.time(), 60 + 120 + 180 + 240)
+
+    def test_week_of_site_supervision(self):
+        """Verify a week of emulator polling finishes in simulated time."""
+        measurements = 7 * 24 * 6  # 10 minute polls for one week
+        site_config = {
+            "site_name": "virtual_week",
+            "thermostats": [
+                {
+                    "thermostat_type": "emulator",
+                    "zone": zone,
+                    "enabled": True,
+                    "poll_time": 600,
+                    "connection_time": 86400,
+                    "tolerance": 2,
+                    "target_mode": "OFF_MODE",
+                    "measurements": measurements,
+                }
+                for zone in (0, 1)
+            ],
+        }
+        with clock.use_clock(clock.VirtualClock(start_time=0)) as virtual_clock:
+            site = ts.ThermostatSite(site_config_dict=site_config, verbose=False)
+            results = site.supervise_all_zones()
+        self.assertEqual(results["errors"], {})
+        # the second zone polls half a poll period after the first
+        for zone, phase_sec in ((0, 0), (1, 300)):
+            zone_results = results["results"][f"emulator_zone{zone}"]
+            self.assertEqual(len(zone_results), measurements)
+            self.assertEqual(zone_results[0]["timestamp"], phase_sec)
+            self.assertEqual(
+                zone_results[-1]["timestamp"], phase_sec + 600 * (measurements - 1)
+            )
+        self.assertEqual(virtual_clock.time(), 300 + 600 * (measurements - 1))
+
+
+if __name__ == "__main__":
+    util.log_msg.debug = True  # type: ignore[attr-defined]
+    unittest.main(verbosity=2)
@@ -0,0 +1,158 @@
+"""
+Unit test module for discovery_checkpoint.py.
+"""
+
+# built-in imports
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+# local imports
+from src import clock
+from src import discovery_checkpoint
+from src import honeywell
+from src import utilities as util
+from tests import unit_test_common as utc
+
+
+class TestDiscoveryCheckpoint(utc.UnitTest):
+    """Test the discovered topology checkpoint."""
+
+    def setUp(self):
+        """Persist checkpoints to a temporary data folder on a virtual clock."""
+        super().setUp()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path_patch = patch.object(util, "FILE_PATH", self.temp_dir.name)
+        self.file_path_patch.start()
+        self.clock_context = clock.use_clock(clock.VirtualClock(start_time=1000))
+        self.virtual_clock = self.clock_context.__enter__()
+
+    def tearDown(self):
+        """Restore the clock and remove the temporary data folder."""
+        self.clock_context.__exit__(None, None, None)
+        self.file_path_patch.stop()
+        self.temp_dir.cleanup()
+        super().tearDown()
+
+    def wait_for_revalidation(self, checkpoint):
+        """Wait for background discovery to finish."""
+        deadline = time.monotonic() + 5
+        while checkpoint._revalidating and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertFalse(checkpoint._revalidating)
+
+    def test_warm_lookup_skips_discovery(self):
+        """Verify a checkpoint is served without rediscovery until it ages."""
+        checkpoint = discovery_checkpoint.DiscoveryCheckpoint(
+            revalidate_sec=600, persist=False
+        )
+        discover = MagicMock(return_value={"Kitchen": 1})
+        for _ in range(3):
+            self.assertEqual(
+                checkpoint.get_or_discover("kumocloud:user", {}, discover),
+                {"Kitchen": 1},
+            )
+        discover.assert_called_once_with()
+        self.assertEqual(checkpoint.stats["hits"], 2)
+
+        # an aged checkpoint is still served, then rediscovered
+        self.virtual_clock.sleep(600)
+        discover.return_value = {"Kitchen": 2}
+        self.assertEqual(
+            checkpoint.get_or_discover("kumocloud:user", {}, discover),
+            {"Kitchen": 1},
+        )
+        self.wait_for_revalidation(checkpoint)
+        self.assertEqual(
+            checkpoint.get_or_discover("kumocloud:user", {}, discover),
+            {"Kitchen": 2},
+        )
+        self.assertEqual(checkpoint.stats["changed"], 1)
+
+    def test_config_change_rediscovers(self):
+        """Verify a checkpoint of another configuration is not used."""
+        checkpoint = discovery_checkpoint.DiscoveryCheckpoint(persist=False)
+        discover = MagicMock(side_effect=[[111], [222]])
+        checkpoint.get_or_discover("honeywell:user", {"zones": [0]}, discover)
+        self.assertEqual(
+            checkpoint.get_or_discover("honeywell:user", {"zones": [0, 1]}, discover),
+            [222],
+        )
+        self.assertEqual(discover.call_count, 2)
+
+    def test_failed_discovery_not_checkpointed(self):
+        """Verify a failed discovery is retried on the next lookup."""
+        checkpoint = discovery_checkpoint.DiscoveryCheckpoint(persist=False)
+        discover = MagicMock(side_effect=[None, [111]])
+        self.assertIsNone(checkpoint.get_or_discover("honeywell:user", {}, discover))
+        self.assertEqual(
+            checkpoint.get_or_discover("honeywell:user", {}, discover), [111]
+        )
+
+    def test_invalidate(self):
+        """Verify invalidate() forces the next lookup to rediscover."""
+        checkpoint = discovery_checkpoint.DiscoveryCheckpoint(persist=False)
+        discover = MagicMock(side_effect=[[111], [111, 222]])
+        checkpoint.get_or_discover("honeywell:user", {}, discover)
+        checkpoint.invalidate("honeywell:user")
+        self.assertEqual(
+            checkpoint.get_or_discover("honeywell:user", {}, discover), [111, 222]
+        )
+
+    def test_warm_restart(self):
+        """Verify a restart uses the saved checkpoint and revalidates it."""
+        discovery_checkpoint.DiscoveryCheckpoint().get_or_discover(
+            "kumolocal:user", {"account": "user"}, lambda: {0: {"host_name": "a"}}
+        )
+        self.assertTrue(
+            os.path.exists(
+                util.get_full_file_path(discovery_checkpoint.DISCOVERY_CHECKPOINT_FILE)
+            )
+        )
+
+        checkpoint = discovery_checkpoint.DiscoveryCheckpoint()
+        discover = MagicMock(side_effect=ConnectionError("offline"))
+        with patch.object(util, "log_msg"):
+            self.assertEqual(
+                checkpoint.get_or_discover(
+                    "kumolocal:user", {"account": "user"}, discover
+                ),
+                {"0": {"host_name": "a"}},
+            )
+            self.wait_for_revalidation(checkpoint)
+        # background discovery failed, the checkpoint is kept
+        discover.assert_called_once_with()
+        self.assertEqual(
+            checkpoint.get_or_discover("kumolocal:user", {"account": "user"}, discover),
+            {"0": {"host_name": "a"}},
+        )
+
+    def test_honeywell_zone_ids_checkpointed(self):
+        """Verify Honeywell zone device ids are discovered once per account."""
+        discovery_checkpoint.reset_checkpoint(persist=False)
+        with patch.dict(
+            "os.environ", {"TCC_USERNAME": "test_user", "TCC_PASSWORD": "test_pass"}
+        ), patch("pyhtcc.PyHTCC.__init__", return_value=None), patch.object(
+            honeywell.ThermostatClass,
+            "get_zones_info",
+            return_value=[{"DeviceID": 111}, {"DeviceID": 222}],
+        ) as get_zones_info:
+            honeywell.ThermostatClass(zone=0, verbose=False)
+            Thermostat = honeywell.ThermostatClass(zone=1, verbose=False)
+            self.assertEqual(Thermostat.device_id, 222)
+            self.assertEqual(get_zones_info.call_count, 1)
+
+            # a zone added since the checkpoint is found by rediscovery
+            get_zones_info.return_value = [
+                {"DeviceID": 111},
+                {"DeviceID": 222},
+                {"DeviceID": 333},
+            ]
+            self.assertEqual(Thermostat.get_target_zone_id(2), 333)
+
+
+if __name__ == "__main__":
+    util.log_msg.debug = True  # type: ignore[attr-defined]
+    unittest.main(verbosity=2)
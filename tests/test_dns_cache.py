@@ -0,0 +1,167 @@
+"""
+Unit test module for dns_cache.py.
+"""
+
+# built-in imports
+import os
+import socket
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+# local imports
+from src import clock
+from src import dns_cache
+from src import mmm
+from src import mmm_config
+from src import utilities as util
+from tests import unit_test_common as utc
+from tests.fake_servers import radiotherm_server
+
+
+class TestDnsCache(utc.UnitTest):
+    """Test the resolver cache."""
+
+    def setUp(self):
+        """Persist the cache to a temporary data folder on a virtual clock."""
+        super().setUp()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path_patch = patch.object(util, "FILE_PATH", self.temp_dir.name)
+        self.file_path_patch.start()
+        self.clock_context = clock.use_clock(clock.VirtualClock(start_time=1000))
+        self.virtual_clock = self.clock_context.__enter__()
+
+    def tearDown(self):
+        """Restore the clock and remove the temporary data folder."""
+        self.clock_context.__exit__(None, None, None)
+        self.file_path_patch.stop()
+        self.temp_dir.cleanup()
+        super().tearDown()
+
+    def test_positive_ttl(self):
+        """Verify a resolved address is reused until the TTL expires."""
+        cache = dns_cache.DnsCache(positive_ttl_sec=600, persist=False)
+        with patch("socket.gethostbyname", return_value="10.0.0.5") as lookup:
+            self.assertEqual(cache.resolve("tstat.lan"), "10.0.0.5")
+            self.assertEqual(cache.resolve("tstat.lan"), "10.0.0.5")
+            self.assertEqual(lookup.call_count, 1)
+            self.virtual_clock.sleep(600)
+            cache.resolve("tstat.lan")
+            self.assertEqual(lookup.call_count, 2)
+
+    def test_negative_ttl(self):
+        """Verify a failed lookup is remembered for the negative TTL."""
+        cache = dns_cache.DnsCache(negative_ttl_sec=60, persist=False)
+        with patch(
+            "socket.gethostbyname", side_effect=socket.gaierror("not found")
+        ) as lookup:
+            self.assertIsNone(cache.resolve("missing.lan"))
+            self.virtual_clock.sleep(59)
+            self.assertIsNone(cache.resolve("missing.lan"))
+            self.assertEqual(lookup.call_count, 1)
+            self.virtual_clock.sleep(1)
+            cache.resolve("missing.lan")
+            self.assertEqual(lookup.call_count, 2)
+        self.assertEqual(cache.stats["failures"], 2)
+
+    def test_invalidate(self):
+        """Verify invalidate() forces the next lookup to DNS."""
+        cache = dns_cache.DnsCache(persist=False)
+        with patch(
+            "socket.gethostbyname", side_effect=["10.0.0.5", "10.0.0.6"]
+        ) as lookup:
+            cache.resolve("tstat.lan")
+            cache.invalidate("tstat.lan")
+            self.assertEqual(cache.resolve("tstat.lan"), "10.0.0.6")
+        self.assertEqual(lookup.call_count, 2)
+
+    def test_last_known_good_persisted(self):
+        """Verify the last address is saved and used when DNS is down."""
+        with patch("socket.gethostbyname", return_value="10.0.0.5"):
+            dns_cache.DnsCache().resolve("tstat.lan")
+        self.assertTrue(
+            os.path.exists(util.get_full_file_path(dns_cache.DNS_CACHE_FILE))
+        )
+
+        cache = dns_cache.DnsCache()
+        with patch("socket.gethostbyname", side_effect=socket.gaierror("down")):
+            self.assertIsNone(cache.resolve("tstat.lan"))
+            self.assertEqual(
+                cache.resolve("tstat.lan", use_last_known_good=True), "10.0.0.5"
+            )
+        self.assertEqual(cache.stats["last_known_good"], 1)
+
+    def test_reverse_lookup(self):
+        """Verify reverse lookups are cached, including failures."""
+        cache = dns_cache.DnsCache(persist=False)
+        with patch(
+            "socket.gethostbyaddr", side_effect=socket.herror("not set")
+        ) as lookup:
+            self.assertIsNone(cache.reverse("10.0.0.9"))
+            self.assertIsNone(cache.reverse("10.0.0.9"))
+        self.assertEqual(lookup.call_count, 1)
+
+    def test_resolve_all_concurrently(self):
+        """Verify slow lookups of several hosts overlap."""
+        cache = dns_cache.DnsCache(persist=False)
+
+        def slow_lookup(host_name):
+            time.sleep(0.3)
+            return f"10.0.0.{host_name[-5]}"
+
+        host_names = [f"tstat{idx}.lan" for idx in range(4)]
+        with patch("socket.gethostbyname", side_effect=slow_lookup):
+            start_time = time.monotonic()
+            addresses = cache.resolve_all(host_names)
+            elapsed_sec = time.monotonic() - start_time
+        self.assertLess(elapsed_sec, 1.0)
+        self.assertEqual(addresses["tstat3.lan"], "10.0.0.3")
+
+    def test_single_lookup_in_flight(self):
+        """Verify concurrent callers of one host share a single lookup."""
+        cache = dns_cache.DnsCache(persist=False)
+        lookup = MagicMock(side_effect=lambda _: time.sleep(0.2) or "10.0.0.5")
+        with patch("socket.gethostbyname", lookup):
+            threads = [
+                threading.Thread(target=cache.resolve, args=("tstat.lan",))
+                for _ in range(3)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(timeout=5)
+        self.assertEqual(lookup.call_count, 1)
+
+
+class TestMmmHostResolution(utc.UnitTest):
+    """Test host name resolution in the 3m50 driver."""
+
+    def test_stale_cached_address_is_refreshed(self):
+        """Verify a failed cached address is dropped and resolved again."""
+        metadata = {
+            zone: {"zone_name": meta["zone_name"], "host_name": f"tstat{zone}.lan"}
+            for zone, meta in mmm_config.metadata.items()
+        }
+        with radiotherm_server.RadiothermServer() as server, patch.dict(
+            mmm_config.metadata, metadata
+        ), patch.dict(os.environ, {mmm_config.BASE_URL_ENV_KEY: ""}):
+            # every zone resolves to a dead port, then tstat0 moves
+            addresses = {"tstat0.lan": ["127.0.0.1:9", f"127.0.0.1:{server.port}"]}
+            lookup = MagicMock(
+                side_effect=lambda host: (
+                    addresses[host].pop(0) if host in addresses else "127.0.0.1:9"
+                )
+            )
+            with patch("socket.gethostbyname", lookup):
+                Thermostat = mmm.ThermostatClass(0, verbose=False)
+        self.assertEqual(Thermostat.ip_address, f"127.0.0.1:{server.port}")
+        # both zones at startup plus the re-resolve after the failure
+        self.assertEqual(lookup.call_count, 3)
+        self.assertEqual(dns_cache.get_dns_cache().stats["invalidated"], 1)
+
+
+if __name__ == "__main__":
+    util.log_msg.debug = True  # type: ignore[attr-defined]
+    unittest.main(verbosity=2)
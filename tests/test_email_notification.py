@@ -5,6 +5,7 @@ Unit tes module for email_notification.py.
 # built-in libraries
 import os
 import smtplib
+import time
 import unittest
 from unittest import mock
 
@@ -223,6 +224,95 @@ class Test(utc.UnitTest):
                 self.assertEqual(return_status, util.EMAIL_SEND_ERROR, fail_msg)
 
 
+class TestEmailDispatcher(utc.UnitTest):
+    """Test queued email delivery and alert coalescing."""
+
+    def test_retry_storm_is_one_digest(self):
+        """Verify alerts of one type across zones are sent as one digest."""
+        send_func = mock.Mock(return_value=util.NO_ERROR)
+        dispatcher = eml.EmailDispatcher(window_sec=5.0, send_func=send_func)
+        for trial in range(5):
+            for zone in range(20):
+                dispatcher.submit(
+                    f"zone {zone}: intermittent error",
+                    f"trial {trial}",
+                    zone=f"zone {zone}",
+                    alert_type="intermittent_error",
+                )
+        dispatcher.submit("zone 0: deviation", "too hot", alert_type="deviation")
+        dispatcher.stop()
+
+        self.assertEqual(send_func.call_count, 2)
+        subjects = [call.args[1] for call in send_func.call_args_list]
+        bodies = [call.args[2] for call in send_func.call_args_list]
+        self.assertIn("(+99 similar alerts)", subjects[0])
+        self.assertIn("100 alerts from 20 zone(s)", bodies[0])
+        self.assertIn("trial 4", bodies[0])
+        # a lone alert is sent as is
+        self.assertEqual((subjects[1], bodies[1]), ("zone 0: deviation", "too hot"))
+        self.assertEqual(dispatcher.stats["queued"], 101)
+        self.assertEqual(dispatcher.stats["coalesced"], 99)
+        self.assertEqual(dispatcher.stats["sent"], 2)
+
+    def test_window_closes_digest(self):
+        """Verify a digest is sent when its window closes."""
+        send_func = mock.Mock(return_value=util.NO_ERROR)
+        dispatcher = eml.EmailDispatcher(window_sec=0.1, send_func=send_func)
+        dispatcher.submit("first", "body", alert_type="mitigated")
+        dispatcher.submit("second", "body", alert_type="mitigated")
+        deadline = time.monotonic() + 5
+        while not send_func.called and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(send_func.call_count, 1)
+        dispatcher.submit("third", "body", alert_type="mitigated")
+        dispatcher.stop()
+        self.assertEqual(send_func.call_count, 2)
+
+    def test_submit_does_not_wait_for_smtp(self):
+        """Verify callers return before a slow send completes."""
+
+        def slow_send(*_):
+            time.sleep(0.5)
+            return util.NO_ERROR
+
+        dispatcher = eml.EmailDispatcher(window_sec=0, send_func=slow_send)
+        t_start = time.monotonic()
+        for idx in range(5):
+            dispatcher.submit(f"alert {idx}", "body")
+        self.assertLess(time.monotonic() - t_start, 0.25)
+        dispatcher.stop(timeout=0)
+
+    def test_send_failure_does_not_stop_dispatcher(self):
+        """Verify the dispatcher survives a raising send function."""
+        send_func = mock.Mock(side_effect=[OSError("smtp down"), util.NO_ERROR])
+        dispatcher = eml.EmailDispatcher(window_sec=0, send_func=send_func)
+        with mock.patch.object(util, "log_msg"):
+            dispatcher.submit("first", "body")
+            dispatcher.submit("second", "body")
+            dispatcher.stop()
+        self.assertEqual(dispatcher.stats["send_errors"], 1)
+        self.assertEqual(dispatcher.stats["sent"], 1)
+
+    def test_smtp_connection_is_reused(self):
+        """Verify one login for many messages and a reconnect when dropped."""
+        mock_server = mock.Mock()
+        mock_server.sendmail.side_effect = [
+            None,
+            None,
+            smtplib.SMTPServerDisconnected("idle timeout"),
+            None,
+        ]
+        msg = eml._build_message("to@gmail.com", "from@gmail.com", "subject", "")
+        connection = eml.SmtpConnection("from@gmail.com", "password")
+        with mock.patch("smtplib.SMTP_SSL", return_value=mock_server):
+            statuses = [connection.send("to@gmail.com", msg) for _ in range(3)]
+        connection.close()
+        self.assertEqual(statuses, [util.NO_ERROR] * 3)
+        self.assertEqual(connection.connect_count, 2)
+        self.assertEqual(mock_server.login.call_count, 2)
+        self.assertEqual(mock_server.sendmail.call_count, 4)
+
+
 if __name__ == "__main__":
     util.log_msg.debug = True  # type: ignore[attr-defined]
     unittest.main(verbosity=2)
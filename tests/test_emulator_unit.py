@@ -0,0 +1,181 @@
+"""
+Unit test module for emulator.py.
+"""
+
+# built-in imports
+import os
+import pickle
+import unittest
+from unittest.mock import patch
+
+# local imports
+from src import emulator
+from src import emulator_config
+from tests import unit_test_common as utc
+
+
+class TestEmulatorDeviationCache(utc.UnitTest):
+    """Test in-memory deviation state in emulator.py."""
+
+    def setUp(self):
+        super().setUp()
+        self.Thermostat = emulator.ThermostatClass(zone=1, verbose=False)
+        self.Zone = emulator.ThermostatZone(self.Thermostat, verbose=False)
+        self.Zone.clear_deviation_data()
+
+    def tearDown(self):
+        self.Zone.clear_deviation_data()
+        super().tearDown()
+
+    def test_unchanged_file_is_not_reloaded(self):
+        """Verify repeated reads are served from memory."""
+        self.Zone.set_deviation_value("display_temp", 80.0)
+        with patch("src.emulator.pickle.load", wraps=pickle.load) as mock_load:
+            for _ in range(10):
+                self.assertEqual(self.Zone.get_display_temp(), 80.0)
+            mock_load.assert_not_called()
+
+    def test_external_change_is_detected(self):
+        """Verify a file written by another zone instance is picked up."""
+        self.Zone.set_deviation_value("display_temp", 80.0)
+        self.assertEqual(self.Zone.get_deviation_value("display_temp"), 80.0)
+
+        other_zone = emulator.ThermostatZone(self.Thermostat, verbose=False)
+        other_zone.set_deviation_value("display_temp", 55.0)
+        self.assertEqual(self.Zone.get_deviation_value("display_temp"), 55.0)
+
+        other_zone.clear_deviation_data()
+        self.assertIsNone(self.Zone.get_deviation_value("display_temp"))
+        self.assertFalse(self.Zone.has_deviation_data())
+
+    def test_atomic_write_leaves_no_temp_files(self):
+        """Verify writes replace the file without leaving temp files."""
+        self.Zone.set_deviation_value("heat_setpoint", 70)
+        self.Zone.set_deviation_value("cool_setpoint", 75)
+        folder = os.path.dirname(self.Zone.deviation_file_path)
+        base_name = os.path.basename(self.Zone.deviation_file_path)
+        leftovers = [
+            name
+            for name in os.listdir(folder)
+            if name.startswith(base_name) and name.endswith(".tmp")
+        ]
+        self.assertEqual(leftovers, [])
+        with open(self.Zone.deviation_file_path, "rb") as handle:
+            self.assertEqual(
+                pickle.load(handle), {"heat_setpoint": 70, "cool_setpoint": 75}
+            )
+
+    def test_failed_write_keeps_previous_state(self):
+        """Verify a failed write leaves the file and cache untouched."""
+        self.Zone.set_deviation_value("display_humidity", 40.0)
+        with patch("src.emulator.pickle.dump", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                self.Zone.set_deviation_value("display_humidity", 99.0)
+        self.assertEqual(self.Zone.get_deviation_value("display_humidity"), 40.0)
+
+    def test_corrupt_file_returns_default(self):
+        """Verify a corrupt deviation file is treated as empty."""
+        with open(self.Zone.deviation_file_path, "wb") as handle:
+            handle.write(b"")
+        self.assertTrue(self.Zone.has_deviation_data())
+        self.assertEqual(self.Zone.get_deviation_value("display_temp", 1.0), 1.0)
+
+
+class TestEmulatorFleetMode(utc.UnitTest):
+    """Test synthetic fleet mode in emulator.py."""
+
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(emulator_config.disable_fleet_mode)
+        emulator_config.enable_fleet_mode({"zones": 50, "seed": 11})
+
+    def make_zone(self, zone):
+        """Return a fleet zone object with no deviation data."""
+        Thermostat = emulator.ThermostatClass(zone=zone, verbose=False)
+        Zone = emulator.ThermostatZone(Thermostat, verbose=False)
+        Zone.clear_deviation_data()
+        return Zone
+
+    def readings(self, zone, count=10):
+        """Return a list of display temps for a fresh zone object."""
+        Zone = self.make_zone(zone)
+        return [Zone.get_display_temp() for _ in range(count)]
+
+    def test_enable_and_disable(self):
+        """Verify fleet mode replaces and restores the zone list."""
+        self.assertTrue(emulator_config.is_fleet_mode())
+        self.assertEqual(len(emulator_config.get_available_zones()), 50)
+        Thermostat = emulator.ThermostatClass(zone=49, verbose=False)
+        self.assertEqual(list(Thermostat.meta_data_dict), [49])
+        emulator_config.disable_fleet_mode()
+        self.assertFalse(emulator_config.is_fleet_mode())
+        self.assertEqual(emulator_config.get_available_zones(), [0, 1])
+        with self.assertRaises(ValueError):
+            emulator_config.enable_fleet_mode({"bogus": 1})
+        with self.assertRaises(ValueError):
+            emulator_config.enable_fleet_mode({"zones": 0})
+
+    def test_fleet_mode_scope(self):
+        """Verify fleet_mode() restores the previous fleet on exit."""
+        emulator_config.disable_fleet_mode()
+        with self.assertRaises(RuntimeError):
+            with emulator_config.fleet_mode({"zones": 3}) as zones:
+                self.assertEqual(zones, [0, 1, 2])
+                self.assertTrue(emulator_config.is_fleet_mode())
+                raise RuntimeError("zone failed")
+        self.assertFalse(emulator_config.is_fleet_mode())
+        self.assertEqual(emulator_config.get_available_zones(), [0, 1])
+        self.assertEqual(
+            emulator_config.get_fleet_config({"zones": 3})["seed"],
+            emulator_config.fleet_defaults["seed"],
+        )
+        self.assertFalse(emulator_config.is_fleet_mode())
+
+    def test_readings_are_reproducible(self):
+        """Verify each zone has its own deterministic stream."""
+        self.assertEqual(self.readings(3), self.readings(3))
+        self.assertNotEqual(self.readings(3), self.readings(4))
+
+    def test_thermal_model_tracks_setpoint(self):
+        """Verify heat mode drives temp toward the heat setpoint."""
+        emulator_config.enable_fleet_mode(
+            {"zones": 2, "temp_noise": 0.0, "ambient_temp": 40.0}
+        )
+        Zone = self.make_zone(0)
+        Zone.set_mode(Zone.HEAT_MODE)
+        Zone.set_heat_setpoint(75)
+        for _ in range(200):
+            temp = Zone.get_display_temp()
+        self.assertLessEqual(temp, 75.0)
+        self.assertGreater(temp, 70.0)
+
+        Zone.set_mode(Zone.OFF_MODE)
+        for _ in range(200):
+            temp = Zone.get_display_temp()
+        self.assertLess(temp, 45.0)
+
+    def test_injected_errors(self):
+        """Verify error_rate raises ConnectionError."""
+        emulator_config.enable_fleet_mode({"zones": 2, "error_rate": 1.0})
+        Zone = self.make_zone(1)
+        with self.assertRaises(ConnectionError):
+            Zone.get_display_temp()
+
+    def test_manual_override_events(self):
+        """Verify scheduled overrides bump setpoints past the schedule."""
+        emulator_config.enable_fleet_mode(
+            {"zones": 2, "override_interval": 2, "override_deg": 3.0}
+        )
+        Zone = self.make_zone(0)
+        for _ in range(10):
+            Zone.get_display_temp()
+        self.assertEqual(
+            Zone.get_heat_setpoint_raw(), Zone.get_schedule_heat_sp() + 3.0
+        )
+        self.assertEqual(
+            Zone.get_cool_setpoint_raw(), Zone.get_schedule_cool_sp() - 3.0
+        )
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,267 @@
+"""
+Unit test module for the stand-in vendor servers in tests/fake_servers.
+"""
+
+# built-in imports
+import os
+import unittest
+from unittest.mock import patch
+
+# third party imports
+import requests
+
+# local imports
+from src import honeywell
+from src import honeywell_config
+from src import kumocloud
+from src import kumocloud_config
+from src import mmm
+from src import mmm_config
+from src import sht31
+from src import sht31_config
+from src import thermostat_api as api
+from src import thermostat_common as tc
+from src import utilities as util
+from tests import unit_test_common as utc
+from tests.fake_servers import fake_server
+from tests.fake_servers import honeywell_server
+from tests.fake_servers import kumocloud_server
+from tests.fake_servers import radiotherm_server
+from tests.fake_servers import serve
+from tests.fake_servers import sht31_server
+
+
+class TestFaultProfile(utc.UnitTest):
+    """Test latency, rate limit and fault injection settings."""
+
+    def test_faults_are_seeded(self):
+        """Verify the same seed gives the same fault sequence."""
+
+        def fault_sequence(seed):
+            profile = fake_server.FaultProfile(
+                unauthorized_rate=0.1,
+                throttle_rate=0.1,
+                server_error_rate=0.1,
+                seed=seed,
+            )
+            return [profile.choose_fault() for _ in range(200)]
+
+        sequence = fault_sequence(5)
+        self.assertEqual(sequence, fault_sequence(5))
+        self.assertTrue({401, 429}.issubset(sequence))
+        self.assertTrue(set(fake_server.SERVER_ERROR_CODES) & set(sequence))
+        self.assertIn(None, sequence)
+
+    def test_latency_distributions(self):
+        """Verify latency samples for each distribution."""
+        for distribution in fake_server.LATENCY_DISTRIBUTIONS:
+            with self.subTest(distribution=distribution):
+                profile = fake_server.FaultProfile(
+                    latency_ms=10.0,
+                    latency_jitter_ms=50.0,
+                    latency_distribution=distribution,
+                )
+                samples = [profile.sample_latency_sec() for _ in range(100)]
+                self.assertTrue(all(sample >= 0.0 for sample in samples))
+        constant = fake_server.FaultProfile(
+            latency_ms=10.0, latency_distribution=fake_server.CONSTANT
+        )
+        self.assertEqual(constant.sample_latency_sec(), 0.01)
+        with self.assertRaises(ValueError):
+            fake_server.FaultProfile(latency_distribution="bogus")
+
+    def test_rate_limit(self):
+        """Verify the token bucket allows a burst then throttles."""
+        profile = fake_server.FaultProfile(
+            rate_limit_per_sec=0.001, rate_limit_burst=3
+        )
+        allowed = [profile.consume_rate_limit_token() for _ in range(5)]
+        self.assertEqual(allowed, [True, True, True, False, False])
+
+
+class TestFakeServerFaults(utc.UnitTest):
+    """Test injected responses from a running fake server."""
+
+    def test_injected_server_errors(self):
+        """Verify a 100% server error rate returns 5xx responses."""
+        profile = fake_server.FaultProfile(server_error_rate=1.0)
+        with sht31_server.Sht31Server(profile=profile) as server:
+            response = requests.get(server.base_url + "/data", timeout=5)
+        self.assertIn(response.status_code, fake_server.SERVER_ERROR_CODES)
+
+    def test_rate_limit_returns_429(self):
+        """Verify requests past the burst get 429 with Retry-After."""
+        profile = fake_server.FaultProfile(
+            rate_limit_per_sec=0.001, rate_limit_burst=2
+        )
+        with sht31_server.Sht31Server(profile=profile) as server:
+            codes = [
+                requests.get(server.base_url + "/data", timeout=5)
+                for _ in range(3)
+            ]
+        self.assertEqual([r.status_code for r in codes], [200, 200, 429])
+        self.assertEqual(codes[-1].headers["Retry-After"], "1")
+        self.assertEqual(server.stats[429], 1)
+
+    def test_serve_arguments(self):
+        """Verify serve.py argument parsing."""
+        args = serve.parse_arguments(["kumocloud", "--latency-ms", "50"])
+        self.assertEqual(args.vendors, ["kumocloud"])
+        self.assertEqual(args.latency_ms, 50.0)
+        with patch("sys.stderr"), self.assertRaises(SystemExit):
+            serve.parse_arguments(["bogus"])
+
+
+class TestFakeServerDrivers(utc.UnitTest):
+    """Test the thermostat drivers against the fake servers."""
+
+    def test_kumocloud(self):
+        """Verify login, discovery and token refresh on a 401."""
+        with kumocloud_server.KumoCloudServer() as server, patch.dict(
+            os.environ, {kumocloud_config.BASE_URL_ENV_KEY: server.base_url}
+        ):
+            Thermostat = kumocloud.ThermostatClass(0, verbose=False)
+            self.assertEqual(Thermostat.base_url, server.base_url)
+            self.assertEqual(
+                Thermostat.get_indoor_units(), ["FAKE0000", "FAKE0001", "FAKE0002"]
+            )
+
+            # server forgets the access token, driver refreshes and retries
+            server.access_tokens.clear()
+            Thermostat._cached_sites = None
+            self.assertEqual(len(Thermostat.get_indoor_units()), 3)
+            self.assertEqual(server.stats["POST /v3/refresh"], 1)
+            self.assertEqual(server.stats[401], 1)
+
+            # a zone clone has its own session and sees the refreshed token
+            clone = Thermostat.clone_for_zone(1)
+            self.assertIsNot(clone.session, Thermostat.session)
+            self.assertEqual(clone.token_key, Thermostat.token_key)
+            clone._cached_sites = None
+            self.assertEqual(len(clone.get_indoor_units()), 3)
+            self.assertEqual(server.stats["POST /v3/login"], 1)
+            self.assertEqual(server.stats[401], 1)
+
+    def test_kumocloud_all_zones_one_login(self):
+        """Verify the all zones checkout logs in once for every zone."""
+        with kumocloud_server.KumoCloudServer() as server, patch.dict(
+            os.environ, {kumocloud_config.BASE_URL_ENV_KEY: server.base_url}
+        ), patch.dict(
+            kumocloud_config.REQUEST_BUDGET, {"rate_per_min": 6000.0, "burst": 100}
+        ), patch.object(
+            api, "verify_required_env_variables", return_value=True
+        ), patch.object(
+            api, "uip", api.UserInputs(utc.unit_test_argv)
+        ), patch(
+            "builtins.print"
+        ) as mock_print:
+            tc.print_select_data_from_all_zones(
+                kumocloud_config.ALIAS,
+                [0, 1, 2],
+                kumocloud.ThermostatClass,
+                kumocloud.ThermostatZone,
+                display_outdoor_weather=False,
+            )
+        self.assertEqual(server.stats["POST /v3/login"], 1)
+        lines = [str(call.args[0]) for call in mock_print.call_args_list]
+        for zone in range(3):
+            self.assertTrue(
+                any(line.startswith(f"zone: {zone}, name: ") for line in lines)
+            )
+
+    def test_honeywell_paging(self):
+        """Verify pyhtcc login and paged zone list through the override."""
+        profile = fake_server.FaultProfile(page_size=1)
+        with honeywell_server.HoneywellServer(
+            zones=3, profile=profile
+        ) as server, patch.dict(
+            os.environ, {honeywell_config.BASE_URL_ENV_KEY: server.base_url}
+        ):
+            Thermostat = honeywell.ThermostatClass(0, verbose=False)
+            list_route = "POST /portal/Device/GetZoneListData"
+            list_requests = server.stats[list_route]
+            zones_info = Thermostat.get_zones_info()
+            self.assertEqual(
+                [zone["Name"] for zone in zones_info], ["Zone 0", "Zone 1", "Zone 2"]
+            )
+            self.assertEqual(zones_info[0]["OutdoorTemperature"], 45)
+            # 3 pages of 1 zone plus the empty page that ends paging
+            self.assertEqual(server.stats[list_route] - list_requests, 4)
+
+            Thermostat.submit_raw_control_changes(
+                honeywell_server.FIRST_DEVICE_ID, {"HeatSetpoint": 65}
+            )
+            zone = server.zones[honeywell_server.FIRST_DEVICE_ID]
+            self.assertEqual(zone["uiData"]["HeatSetpoint"], 65)
+
+            Thermostat.logout()
+            Thermostat.session = requests.session()
+            with self.assertRaises(honeywell.pyhtcc.pyhtcc.UnauthorizedError):
+                Thermostat._get_check_data_session(honeywell_server.FIRST_DEVICE_ID)
+            Thermostat.close()
+
+    def test_honeywell_session_resume(self):
+        """Verify a reconnect resumes the saved TCC session."""
+        with honeywell_server.HoneywellServer(zones=2) as server, patch.dict(
+            os.environ, {honeywell_config.BASE_URL_ENV_KEY: server.base_url}
+        ):
+            honeywell.ThermostatClass(0, verbose=False).close()
+            Thermostat = honeywell.ThermostatClass(1, verbose=False)
+            self.assertEqual(server.stats["POST /portal"], 1)
+            self.assertEqual(Thermostat._locationId, server.location_id)
+
+            # an expired session is probed once, then replaced by a login
+            Thermostat.logout()
+            with patch.object(util, "log_msg"):
+                honeywell.ThermostatClass(0, verbose=False)
+            self.assertEqual(server.stats["POST /portal"], 2)
+
+    def test_honeywell_clone_own_session(self):
+        """Verify a zone clone reuses the login without owning its session."""
+        with honeywell_server.HoneywellServer(zones=2) as server, patch.dict(
+            os.environ, {honeywell_config.BASE_URL_ENV_KEY: server.base_url}
+        ):
+            Thermostat = honeywell.ThermostatClass(0, verbose=False)
+            clone = Thermostat.clone_for_zone(1)
+            self.assertIsNot(clone.session, Thermostat.session)
+            self.assertEqual(
+                clone.session.cookies.get(honeywell_server.SESSION_COOKIE),
+                Thermostat.session.cookies.get(honeywell_server.SESSION_COOKIE),
+            )
+            self.assertEqual(clone.device_id, honeywell_server.FIRST_DEVICE_ID + 1)
+            self.assertTrue(clone._get_check_data_session(clone.device_id))
+            # closing the clone leaves the login usable
+            clone.close()
+            del clone
+            self.assertIsNotNone(Thermostat.session)
+            self.assertTrue(Thermostat._get_check_data_session(Thermostat.device_id))
+        self.assertEqual(server.stats["POST /portal"], 1)
+
+    def test_mmm(self):
+        """Verify the radiotherm client reads and writes the fake 3M50."""
+        with radiotherm_server.RadiothermServer() as server, patch.dict(
+            os.environ, {mmm_config.BASE_URL_ENV_KEY: server.base_url}
+        ):
+            Thermostat = mmm.ThermostatClass(0, verbose=False)
+            self.assertEqual(Thermostat.ip_address, f"127.0.0.1:{server.port}")
+            Zone = mmm.ThermostatZone(Thermostat, verbose=False)
+            self.assertEqual(Zone.get_display_temp(), 70.5)
+            metadata = Thermostat.get_meta_data_dict(0)
+            self.assertEqual(metadata["model"]["raw"], radiotherm_server.MODEL)
+
+            Thermostat.device_id.t_heat = 64
+            self.assertEqual(server.tstat["t_heat"], 64)
+
+    def test_sht31(self):
+        """Verify the sht31 driver reads the fake measurement route."""
+        with sht31_server.Sht31Server(temp_f=68.0) as server, patch.dict(
+            os.environ, {sht31_config.BASE_URL_ENV_KEY: server.base_url}
+        ):
+            Thermostat = sht31.ThermostatClass(0, verbose=False)
+            self.assertTrue(Thermostat.url.startswith(server.base_url + "/"))
+            Zone = sht31.ThermostatZone(Thermostat, verbose=False)
+            self.assertAlmostEqual(Zone.get_display_temp(), 68.0, delta=1.0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
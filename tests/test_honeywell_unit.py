@@ -51,7 +51,7 @@ class Test(utc.UnitTest):
 
                 # Mock time.sleep and email notifications to speed up the test
                 with mock.patch("time.sleep"), mock.patch(
-                    "src.email_notification.send_email_alert"
+                    "src.email_notification.queue_email_alert"
                 ):
                     # Create a mock function that raises the exception on first calls,
                     # then succeeds on the final call
@@ -86,7 +86,7 @@ class Test(utc.UnitTest):
         """
         # Mock time.sleep and email notifications to speed up the test
         with mock.patch("time.sleep"), mock.patch(
-            "src.email_notification.send_email_alert"
+            "src.email_notification.queue_email_alert"
         ):
             # Mock a function that raises ConnectionError then succeeds
             call_count = 0
@@ -124,7 +124,7 @@ class Test(utc.UnitTest):
 
         # Mock time.sleep and email notifications to speed up the test
         with mock.patch("time.sleep"), mock.patch(
-            "src.email_notification.send_email_alert"
+            "src.email_notification.queue_email_alert"
         ):
             # Mock a function that always raises TooManyAttemptsError
             def mock_func():
@@ -893,10 +893,15 @@ class Test(utc.UnitTest):
                     # Test both available and not faulted
                     self.assertTrue(zone.get_is_humidity_supported())
 
-                # Test when sensor is faulted
-                zone.zone_info["latestData"]["uiData"][
-                    "IndoorHumiditySensorNotFault"
-                ] = 0
+                # Test when sensor is faulted, zone_state decodes each fetch
+                zone.zone_info = {
+                    "latestData": {
+                        "uiData": {
+                            "IndoorHumiditySensorAvailable": 1,
+                            "IndoorHumiditySensorNotFault": 0,
+                        }
+                    }
+                }
                 with mock.patch.object(zone, "refresh_zone_info"):
                     self.assertFalse(zone.get_is_humidity_supported())
 
@@ -1404,6 +1409,43 @@ class Test(utc.UnitTest):
                     until_time = zone.get_temporary_hold_until_time()
                     self.assertEqual(until_time, 720)
 
+    def test_zone_getters_missing_field(self):
+        """Test getters raise KeyError naming a field missing from uiData."""
+        mock_tstat = mock.Mock()
+        mock_tstat.device_id = 12345
+        mock_tstat.zone_name = 0
+
+        with mock.patch("pyhtcc.Zone.__init__", return_value=None):
+            with mock.patch.object(
+                honeywell.ThermostatZone, "get_zone_name", return_value="TestZone"
+            ):
+                zone = honeywell.ThermostatZone(mock_tstat)
+                zone.zone_info = {"latestData": {"uiData": {"HeatSetpoint": 68}}}
+
+                with mock.patch.object(zone, "refresh_zone_info"):
+                    self.assertEqual(zone.get_heat_setpoint_raw(), 68)
+                    for getter, field in [
+                        (zone.get_schedule_heat_sp, "ScheduleHeatSp"),
+                        (zone.get_vacation_hold_until_time, "VacationHoldUntilTime"),
+                        (zone.get_system_switch_position, "SystemSwitchPosition"),
+                        (zone.get_is_invacation_hold_mode, "IsInVacationHoldMode"),
+                        (zone.get_display_temp, "DispTemperature"),
+                        (
+                            zone.get_is_humidity_supported,
+                            "IndoorHumiditySensorAvailable",
+                        ),
+                        (zone.get_wifi_status, "communicationLost"),
+                        (zone.get_battery_voltage, "deviceLive"),
+                    ]:
+                        with self.subTest(field=field):
+                            with self.assertRaisesRegex(KeyError, field):
+                                getter()
+
+                # a field reported as null is returned, not an error
+                zone.zone_info = {"latestData": {"uiData": {"IndoorHumidity": None}}}
+                with mock.patch.object(zone, "refresh_zone_info"):
+                    self.assertIsNone(zone.get_indoor_humidity_raw())
+
     def test_zone_get_setpoint_change_allowed(self):
         """Test get_setpoint_change_allowed method."""
         mock_tstat = mock.Mock()
@@ -15,6 +15,7 @@ import requests
 
 # local imports
 try:
+    from src import discovery_checkpoint
     from src import kumocloud
     from src import kumocloud_config
     from src import thermostat_common as tc
@@ -23,6 +24,7 @@ try:
     kumocloud_import_error = None
 except ImportError as ex:
     from typing import Any
+    discovery_checkpoint: Any = None
     kumocloud: Any = None
     kumocloud_config: Any = None
     tc: Any = None
@@ -996,6 +998,18 @@ class ZoneAssignmentUnitTest(utc.UnitTest):
         self.assertEqual(kumocloud_config.KITCHEN, 1)
         self.assertEqual(kumocloud_config.BASEMENT, 2)
 
+    def test_update_zone_assignments_own_session(self):
+        """Test zone discovery, also run in the background, has its own session."""
+        checkpoint = discovery_checkpoint.get_checkpoint()
+        with patch.object(kumocloud.ThermostatClass, "_authenticate"), patch.object(
+            checkpoint, "get_or_discover", return_value=None
+        ) as get_or_discover:
+            thermostat = kumocloud.ThermostatClass(zone=0, verbose=False)
+
+        discoverer = get_or_discover.call_args.args[2].__self__
+        self.assertIsNot(discoverer.session, thermostat.session)
+        self.assertIs(discoverer.account_tokens, thermostat.account_tokens)
+
     @patch("src.kumocloud.requests.Session")
     def test_update_zone_assignments_api_error(self, mock_session_class):
         """Test zone assignment handles API errors gracefully."""
@@ -8,9 +8,13 @@ without requiring actual kumolocal devices.
 # built-in imports
 import copy
 import logging
+import threading
+import time
 import unittest
+from unittest.mock import MagicMock, patch
 
 # local imports
+from src import clock
 from src import kumolocal
 from src import kumo_common_zones
 from src import kumolocal_config
@@ -29,6 +33,7 @@ class LocalNetworkDetectionUnitTest(utc.UnitTest):
 
         # Reset metadata to initial state
         self.original_metadata = copy.deepcopy(kumolocal_config.metadata)
+        kumolocal.reset_probe_cache()
 
     def tearDown(self):
         """Cleanup after unit tests."""
@@ -272,6 +277,27 @@ class LocalNetworkDetectionUnitTest(utc.UnitTest):
             basement_ip,
         )
 
+    def test_discover_local_network_leaves_metadata(self):
+        """Discovery returns its results, detection applies them."""
+        thermostat = kumolocal.ThermostatClass.__new__(kumolocal.ThermostatClass)
+        thermostat.verbose = False
+        thermostat.get_indoor_units = (  # type: ignore[method-assign]
+            lambda: ["serial-kitchen"]
+        )
+        thermostat.get_name = lambda serial: "Kitchen"  # type: ignore[method-assign]
+        thermostat.get_address = lambda serial: None  # type: ignore[method-assign]
+        kitchen_meta = kumolocal_config.metadata[kumolocal_config.KITCHEN]
+        kitchen_meta["local_net_available"] = None
+
+        local_net = thermostat._discover_local_network()
+
+        self.assertEqual(
+            local_net, {kumolocal_config.KITCHEN: {"local_net_available": False}}
+        )
+        self.assertIsNone(kitchen_meta["local_net_available"])
+        thermostat.detect_local_network_availability()
+        self.assertFalse(kitchen_meta["local_net_available"])
+
     def test_process_zone_availability_matches_zone_by_name_when_ip_missing(self):
         """Availability detection should still update the right zone by device name."""
         thermostat = kumolocal.ThermostatClass.__new__(kumolocal.ThermostatClass)
@@ -288,16 +314,18 @@ class LocalNetworkDetectionUnitTest(utc.UnitTest):
             "local_net_available"
         ] = None
 
-        thermostat._process_zone_availability("serial-living")
+        local_net = {}
+        thermostat._process_zone_availability("serial-living", local_net)
 
-        self.assertFalse(
+        self.assertEqual(
+            local_net, {kumolocal_config.LIVING_ROOM: {"local_net_available": False}}
+        )
+        # discovery only returns results, detection applies them
+        self.assertIsNone(
             kumolocal_config.metadata[kumolocal_config.LIVING_ROOM][
                 "local_net_available"
             ]
         )
-        self.assertIsNone(
-            kumolocal_config.metadata[kumolocal_config.KITCHEN]["local_net_available"]
-        )
 
 
 class KumolocalConfigUnitTest(utc.UnitTest):
@@ -1014,5 +1042,95 @@ class LocalAddressUnitTest(utc.UnitTest):
         zone.refresh_zone_info()
 
 
+class UnitProbeCacheUnitTest(utc.UnitTest):
+    """Unit tests for concurrent, cached indoor unit probes."""
+
+    def setUp(self):
+        """Setup for tests."""
+        super().setUp()
+        self.print_test_name()
+        kumolocal.reset_probe_cache()
+
+    def test_probes_run_concurrently(self):
+        """Six slow probes should take about one probe time, not six."""
+        probe_cache = kumolocal.UnitProbeCache()
+        probe = MagicMock(side_effect=lambda: time.sleep(0.3) or (True, None))
+        probes = {("host", f"unit {idx}", f"10.0.0.{idx}"): probe for idx in range(6)}
+        start_time = time.monotonic()
+        results = probe_cache.probe_all(probes, max_workers=6, deadline_sec=5)
+        self.assertLess(time.monotonic() - start_time, 1.2)
+        self.assertEqual(set(results.values()), {(True, None)})
+
+        # second pass is served from the cache
+        probe_cache.probe_all(probes)
+        self.assertEqual(probe.call_count, 6)
+        self.assertEqual(probe_cache.stats["hits"], 6)
+
+    def test_hung_probe_fails_at_deadline(self):
+        """A probe still running at the deadline should count as failed."""
+        probe_cache = kumolocal.UnitProbeCache()
+        release = threading.Event()
+        probes = {
+            ("api", "10.0.0.1"): lambda: (True, None),
+            ("api", "10.0.0.2"): lambda: release.wait(5) and (True, None),
+        }
+        try:
+            results = probe_cache.probe_all(probes, deadline_sec=0.2)
+        finally:
+            release.set()
+        self.assertEqual(results[("api", "10.0.0.1")], (True, None))
+        self.assertEqual(results[("api", "10.0.0.2")], (False, None))
+        self.assertEqual(probe_cache.stats["timeouts"], 1)
+
+    def test_only_failed_units_are_reprobed(self):
+        """Failed results should expire before successful ones."""
+        probe_ok = MagicMock(return_value=(True, None))
+        probe_dead = MagicMock(return_value=(False, None))
+        probes = {("api", "10.0.0.1"): probe_ok, ("api", "10.0.0.2"): probe_dead}
+        with clock.use_clock(clock.VirtualClock(start_time=0)) as virtual_clock:
+            probe_cache = kumolocal.UnitProbeCache(ttl_sec=600, failed_ttl_sec=60)
+            probe_cache.probe_all(probes)
+            virtual_clock.sleep(30)
+            probe_cache.probe_all(probes)
+            self.assertEqual((probe_ok.call_count, probe_dead.call_count), (1, 1))
+            virtual_clock.sleep(30)
+            probe_cache.probe_all(probes)
+        self.assertEqual((probe_ok.call_count, probe_dead.call_count), (1, 2))
+
+    def test_try_setup_defers_unit_api_probes(self):
+        """pykumo's per-unit probes should run after its setup loop."""
+        account_module = kumolocal.pykumo.py_kumo_cloud_account
+        original_probe_ip = account_module.probe_ip
+        setup_results = []
+
+        def fake_try_setup(_self, _candidate_ips=None, _prefer_cache=False):
+            zone_table = {}
+            for serial, ip_address in (("s1", "10.0.0.1"), ("s2", "10.0.0.2")):
+                reachable = account_module.probe_ip(ip_address, {}, 2.0)
+                setup_results.append(reachable)
+                zone_table[serial] = {"address": ip_address, "reachable": reachable}
+            _self._kumo_dict = [{}, {}, {"children": [{"zoneTable": zone_table}]}]
+            return True
+
+        obj = kumolocal.ThermostatClass.__new__(kumolocal.ThermostatClass)
+        with patch.object(
+            kumolocal.pykumo.KumoCloudAccount, "try_setup", fake_try_setup
+        ), patch.object(
+            kumolocal, "_pykumo_probe_ip", MagicMock(side_effect=[True, False])
+        ) as mock_probe:
+            self.assertTrue(obj.try_setup())
+        # no unit is reported unreachable before it has been probed
+        self.assertEqual(setup_results, [True, True])
+        self.assertEqual(mock_probe.call_count, 2)
+        zone_table = obj.get_raw_json()[2]["children"][0]["zoneTable"]
+        self.assertTrue(zone_table["s1"]["reachable"])
+        self.assertFalse(zone_table["s2"]["reachable"])
+        self.assertEqual(
+            kumolocal.get_probe_cache().get(("api", "10.0.0.2")), (False, None)
+        )
+        # pykumo's probe_ip is only replaced for the duration of try_setup()
+        self.assertIs(account_module.probe_ip, original_probe_ip)
+
+
 if __name__ == "__main__":
     unittest.main(verbosity=2)
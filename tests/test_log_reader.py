@@ -0,0 +1,124 @@
+"""
+Unit test module for log_reader.py.
+"""
+
+# built-in imports
+import datetime
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+# local imports
+from src import log_reader
+from src import utilities as util
+from tests import unit_test_common as utc
+
+
+class TestLogReader(utc.UnitTest):
+    """Test tail and range reads of rotated logs."""
+
+    def setUp(self):
+        """Write a log and two rotated files to a temporary data folder."""
+        super().setUp()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path_patch = patch.object(util, "FILE_PATH", self.temp_dir.name)
+        self.file_path_patch.start()
+        # oldest first: lines 0-9, 10-19 and the current file 20-24
+        for day, first in ((1, 0), (2, 10)):
+            date_str = datetime.datetime(2026, 1, day).strftime(
+                util.LOG_ROTATE_DATE_FORMAT
+            )
+            self.write_lines(f"test_log-{date_str}.txt", first, 10)
+        self.write_lines("test_log.txt", 20, 5)
+        # shares the name prefix, not a rotated file
+        self.write_lines("test_log-other.txt", 100, 1)
+
+    def tearDown(self):
+        """Remove the temporary data folder."""
+        self.file_path_patch.stop()
+        self.temp_dir.cleanup()
+        super().tearDown()
+
+    def write_lines(self, file_name, first, count):
+        """Append numbered lines to a file in the data folder."""
+        with open(util.get_full_file_path(file_name), "a", encoding="utf-8") as f:
+            for line in range(first, first + count):
+                f.write(f"line {line}\n")
+
+    def test_get_log_files(self):
+        """Verify rotated files are listed oldest first."""
+        files = [os.path.basename(p) for p in log_reader.get_log_files("test_log.txt")]
+        self.assertEqual(
+            files,
+            [
+                "test_log-01-Jan-2026-00-00-00.txt",
+                "test_log-02-Jan-2026-00-00-00.txt",
+                "test_log.txt",
+            ],
+        )
+        logs = log_reader.list_logs()
+        self.assertEqual(logs["test_log.txt"]["files"], 3)
+        self.assertIn("test_log-other.txt", logs)
+        for bad_name in ("../secret.txt", ".hidden.txt", "test_log"):
+            with self.assertRaises(log_reader.LogNotFoundError):
+                log_reader.get_log_files(bad_name)
+
+    def test_tail_lines(self):
+        """Verify tails within and across rotated files."""
+        self.assertEqual(
+            log_reader.tail_lines("test_log.txt", 2), b"line 23\nline 24\n"
+        )
+        tail = log_reader.tail_lines("test_log.txt", 8).decode().splitlines()
+        self.assertEqual(tail, [f"line {line}" for line in range(17, 25)])
+        whole = log_reader.tail_lines("test_log.txt", 1000).decode().splitlines()
+        self.assertEqual(len(whole), 25)
+        self.assertEqual(log_reader.tail_lines("test_log.txt", 0), b"")
+
+        # a last line without line end, an empty current file
+        with open(util.get_full_file_path("test_log.txt"), "a", encoding="utf-8") as f:
+            f.write("partial")
+        self.assertEqual(log_reader.tail_lines("test_log.txt", 2), b"line 24\npartial")
+        open(util.get_full_file_path("test_log.txt"), "w", encoding="utf-8").close()
+        self.assertEqual(log_reader.tail_lines("test_log.txt", 1), b"line 19\n")
+        with self.assertRaises(log_reader.LogNotFoundError):
+            log_reader.tail_lines("missing_log.txt", 1)
+
+    def test_read_range(self):
+        """Verify byte ranges span files and survive a rotation."""
+        # spans the first two files, "line 0\n" to "line 9\n" are 7 bytes
+        line_len = len(b"line 10\n")
+        expected = b"line 8\nline 9\nline 10\nline 11\n"
+        data, offset, size = log_reader.read_range("test_log.txt", 56, len(expected))
+        self.assertEqual(data, expected)
+        self.assertEqual(offset, 56)
+        self.assertEqual(size, 70 + 15 * line_len)
+
+        data, offset, _ = log_reader.read_range("test_log.txt", -line_len)
+        self.assertEqual(data, b"line 24\n")
+        self.assertEqual(offset, size - line_len)
+
+        # rotation keeps the offsets of the bytes read so far
+        util.log_rotate_file(util.get_full_file_path("test_log.txt"), 2, 1)
+        self.write_lines("test_log.txt", 25, 1)
+        data, _, new_size = log_reader.read_range("test_log.txt", size)
+        self.assertEqual(data, b"line 25\n")
+        self.assertEqual(new_size, size + line_len)
+
+    def test_follow(self):
+        """Verify follow yields appended bytes until stopped."""
+        stop_event = threading.Event()
+        follower = log_reader.follow(
+            "test_log.txt", poll_sec=0.01, stop_event=stop_event
+        )
+        self.assertEqual(next(follower), b"")
+        self.write_lines("test_log.txt", 25, 2)
+        self.assertEqual(next(follower), b"line 25\nline 26\n")
+        stop_event.set()
+        self.assertEqual(list(follower), [])
+
+
+if __name__ == "__main__":
+    util.log_msg.debug = True  # type: ignore[attr-defined]
+    unittest.main(verbosity=2)
@@ -8,6 +8,7 @@ actual nest hardware connection or valid OAuth credentials.
 import json
 import os
 import tempfile
+import time
 import unittest
 from unittest.mock import Mock, patch
 
@@ -15,7 +16,9 @@ from unittest.mock import Mock, patch
 import oauthlib.oauth2.rfc6749.errors
 
 # local imports
+from src import clock
 from src import nest
+from src import token_manager
 from tests import unit_test_common as utc
 
 
@@ -140,6 +143,39 @@ class TestNestOAuthRefresh(utc.UnitTest):
         # access token
         self.assertNotEqual(updated_data["refresh_token"], updated_data["access_token"])
 
+    @patch("src.nest.requests.post")
+    def test_refresh_oauth_token_account_peers(self, mock_post):
+        """Test a refresh updates every zone of the account on real time."""
+        mock_response = Mock()
+        mock_response.ok = True
+        mock_response.json.return_value = {
+            "access_token": "ya29.a0AfB_byNEW_ACCESS_TOKEN",
+            "expires_in": 3600,
+        }
+        mock_post.return_value = mock_response
+
+        zones = []
+        for _ in range(2):
+            thermostat = nest.ThermostatClass.__new__(nest.ThermostatClass)
+            thermostat.access_token_cache_file = self.cache_file_path
+            thermostat.client_id = "test_client_id"
+            thermostat.client_secret = "test_client_secret"
+            thermostat.token_key = "nest:test_client_id"
+            thermostat.thermostat_obj = Mock()
+            token_manager.get_token_manager().add_peer(thermostat.token_key, thermostat)
+            zones.append(thermostat)
+
+        # oauthlib compares the expiry against time.time(), not the clock
+        with clock.use_clock(clock.VirtualClock(start_time=0)):
+            expires_at = zones[0].refresh_oauth_token()
+        self.assertAlmostEqual(expires_at, time.time() + 3600, delta=60)
+        for thermostat in zones:
+            client_token = thermostat.thermostat_obj._client.token
+            self.assertEqual(
+                client_token["access_token"], "ya29.a0AfB_byNEW_ACCESS_TOKEN"
+            )
+            self.assertEqual(client_token["expires_at"], expires_at)
+
     @patch("src.nest.requests.post")
     def test_refresh_oauth_token_failure(self, mock_post):
         """Test OAuth refresh failure handling."""
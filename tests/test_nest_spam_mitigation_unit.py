@@ -197,7 +197,7 @@ class NestSpamMitigationTest(unittest.TestCase):
             "src.nest.nest.Device.filter_for_trait",
             return_value=self.mock_thermostat.devices,
         ), patch(
-            "src.thermostat_common.time.time",
+            "src.clock.real_time.time",
             return_value=start_time - 120,
         ):
             zone = nest.ThermostatZone(self.mock_thermostat, verbose=True)
@@ -0,0 +1,160 @@
+"""
+Unit test module for request_governor.py.
+"""
+
+# built-in imports
+import os
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+# third party imports
+import requests
+
+# local imports
+from src import clock
+from src import honeywell
+from src import honeywell_config
+from src import kumocloud
+from src import kumocloud_config
+from src import request_governor as rg
+from src import utilities as util
+from tests import unit_test_common as utc
+from tests.fake_servers import honeywell_server
+from tests.fake_servers import kumocloud_server
+
+
+class TestRequestGovernor(utc.UnitTest):
+    """Test the token bucket."""
+
+    def test_burst_then_refill(self):
+        """Verify the burst is granted at once and later calls wait."""
+        budget = {"rate_per_min": 60, "burst": 3, "write_reserve": 0}
+        with clock.use_clock(clock.VirtualClock(start_time=0)) as virtual_clock:
+            governor = rg.RequestGovernor("emulator", "account", budget)
+            waits = [governor.acquire(rg.READ) for _ in range(5)]
+        self.assertEqual(waits[:3], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(waits[3], 1.0)
+        self.assertAlmostEqual(virtual_clock.time(), 2.0)
+        self.assertEqual(governor.stats["granted_reads"], 5)
+
+    def test_reads_leave_write_reserve(self):
+        """Verify reads are deferred before they use the write reserve."""
+        budget = {"rate_per_min": 1, "burst": 3, "write_reserve": 2}
+        with clock.use_clock(clock.VirtualClock(start_time=0)):
+            governor = rg.RequestGovernor("emulator", "account", budget)
+            governor.acquire(rg.READ)
+            with self.assertRaises(util.RequestDeferredError):
+                governor.acquire(rg.READ, max_wait_sec=30)
+            self.assertEqual(governor.acquire(rg.WRITE), 0.0)
+            self.assertEqual(governor.acquire(rg.WRITE), 0.0)
+            self.assertEqual(governor.get_remaining(), 0.0)
+        self.assertEqual(governor.stats["deferred"], 1)
+
+    def test_write_served_before_waiting_read(self):
+        """Verify a write waiting on an empty bucket goes before a read."""
+        budget = {"rate_per_min": 60, "burst": 2, "write_reserve": 0}
+        grant_log = []
+        with clock.use_clock(clock.VirtualClock(start_time=0)) as virtual_clock:
+            governor = rg.RequestGovernor("emulator", "account", budget)
+            governor.acquire(rg.WRITE)
+            governor.acquire(rg.WRITE)
+
+            def caller(priority, start_sec):
+                clock.sleep(start_sec)
+                governor.acquire(priority)
+                grant_log.append((priority, clock.time()))
+
+            threads = [
+                threading.Thread(target=clock.run_task, args=(caller, rg.READ, 0.1)),
+                threading.Thread(target=clock.run_task, args=(caller, rg.WRITE, 0.2)),
+            ]
+            for thread in threads:
+                clock.add_task()
+                thread.start()
+            with clock.idle():
+                for thread in threads:
+                    thread.join(timeout=5)
+        self.assertEqual([priority for priority, _ in grant_log], [rg.WRITE, rg.READ])
+        self.assertLessEqual(grant_log[0][1], 1.0)
+        self.assertLessEqual(virtual_clock.time(), 2.1)
+
+    def test_invalid_budget(self):
+        """Verify invalid budgets and priorities are rejected."""
+        with self.assertRaises(ValueError):
+            rg.RequestGovernor("emulator", "account", {"rate_per_min": 0})
+        with self.assertRaises(ValueError):
+            rg.RequestGovernor("emulator", "account").acquire("bogus")
+
+    def test_shared_registry_and_metrics(self):
+        """Verify zones of one account share a governor reported in metrics."""
+        governor = rg.get_governor("emulator", "account", {"burst": 5})
+        self.assertIs(rg.get_governor("emulator", "account"), governor)
+        self.assertIsNot(rg.get_governor("emulator", "other"), governor)
+        governor.acquire(rg.WRITE)
+        metrics = rg.get_metrics()["emulator:account"]
+        self.assertEqual(metrics["granted_writes"], 1)
+        self.assertEqual(metrics["granted_reads"], 0)
+        self.assertLessEqual(metrics["remaining"], 5.0)
+        rg.reset_governors()
+        self.assertEqual(rg.get_metrics(), {})
+
+    def test_deferred_trial_is_not_a_failure(self):
+        """Verify a deferred call is retried without counting a failure."""
+        func = MagicMock(side_effect=[util.RequestDeferredError("deferred"), "ok"])
+        with clock.use_clock(clock.VirtualClock(start_time=0)):
+            result = util.execute_with_extended_retries(
+                func, "emulator", "zone 0", number_of_retries=3, endpoint="poll"
+            )
+        self.assertEqual(result, "ok")
+        breaker = util.get_circuit_breaker("emulator", "poll")
+        self.assertEqual(breaker.state, util.CIRCUIT_CLOSED)
+        self.assertEqual(breaker.consecutive_failures, 0)
+
+
+class TestDriverRequestBudget(utc.UnitTest):
+    """Test the request budget in the vendor HTTP paths."""
+
+    def test_kumocloud_zones_share_budget(self):
+        """Verify every kumocloud zone draws from one account budget."""
+        with kumocloud_server.KumoCloudServer() as server, patch.dict(
+            os.environ, {kumocloud_config.BASE_URL_ENV_KEY: server.base_url}
+        ):
+            for zone in (0, 1):
+                Thermostat = kumocloud.ThermostatClass(zone, verbose=False)
+                Thermostat.get_indoor_units()
+            metrics = rg.get_metrics()[f"kumocloud:{Thermostat.kc_uname}"]
+        self.assertEqual(metrics["granted_writes"], server.stats["POST /v3/login"])
+        self.assertGreater(metrics["granted_reads"], 0)
+
+    def test_honeywell_request_priority(self):
+        """Verify login and control changes get write priority."""
+        base_url = honeywell_config.BASE_URL
+        cases = [
+            ("POST", "/portal/", rg.WRITE),
+            ("POST", "/portal/Device/SubmitControlScreenChanges", rg.WRITE),
+            ("POST", "/portal/Device/GetZoneListData?page=1", rg.READ),
+            ("GET", "/portal/Device/CheckDataSession/1", rg.READ),
+        ]
+        for method, path, priority in cases:
+            request = requests.Request(method, base_url + path).prepare()
+            self.assertEqual(honeywell.get_request_priority(request), priority)
+
+    def test_honeywell_adapter_acquires(self):
+        """Verify the pyhtcc session adapter takes budget for each request."""
+        with honeywell_server.HoneywellServer() as server, patch.dict(
+            os.environ, {honeywell_config.BASE_URL_ENV_KEY: server.base_url}
+        ):
+            Thermostat = honeywell.ThermostatClass(0, verbose=False)
+            Thermostat.submit_raw_control_changes(
+                honeywell_server.FIRST_DEVICE_ID, {"HeatSetpoint": 65}
+            )
+            Thermostat.close()
+        stats = Thermostat.request_governor.stats
+        self.assertEqual(stats["granted_writes"], 2)  # login and setpoint
+        self.assertGreater(stats["granted_reads"], 0)
+
+
+if __name__ == "__main__":
+    util.log_msg.debug = True  # type: ignore[attr-defined]
+    unittest.main(verbosity=2)
@@ -0,0 +1,87 @@
+"""
+Unit test module for session_store.py.
+"""
+
+# built-in imports
+import json
+import os
+import stat
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# local imports
+from src import session_store
+from src import utilities as util
+from tests import unit_test_common as utc
+
+STATE = {"cookies": [{"name": "auth", "value": "abc"}], "location_id": 1234567}
+
+
+class TestSessionStore(utc.UnitTest):
+    """Test the saved vendor login sessions."""
+
+    def setUp(self):
+        """Save sessions to a temporary data folder."""
+        super().setUp()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path_patch = patch.object(util, "FILE_PATH", self.temp_dir.name)
+        self.file_path_patch.start()
+        self.kdf_patch = patch.object(session_store, "KEY_DERIVATION_ITERATIONS", 10)
+        self.kdf_patch.start()
+
+    def tearDown(self):
+        """Remove the temporary data folder."""
+        self.kdf_patch.stop()
+        self.file_path_patch.stop()
+        self.temp_dir.cleanup()
+        super().tearDown()
+
+    def test_in_memory(self):
+        """Verify a state is returned only for the password it was saved with."""
+        store = session_store.SessionStore(persist=False)
+        self.assertIsNone(store.load("honeywell:user", "pwd"))
+        store.save("honeywell:user", "pwd", STATE)
+        self.assertEqual(store.load("honeywell:user", "pwd"), STATE)
+        self.assertIsNone(store.load("honeywell:user", "new_pwd"))
+        store.discard("honeywell:user")
+        self.assertIsNone(store.load("honeywell:user", "pwd"))
+        self.assertFalse(
+            os.path.exists(util.get_full_file_path(session_store.SESSION_STORE_FILE))
+        )
+
+    @unittest.skipIf(session_store.Fernet is None, "cryptography not installed")
+    def test_restart(self):
+        """Verify a restart resumes the encrypted state."""
+        session_store.SessionStore().save("honeywell:user", "pwd", STATE)
+        file_path = util.get_full_file_path(session_store.SESSION_STORE_FILE)
+        with open(file_path, "r", encoding="utf-8") as store_file:
+            saved = store_file.read()
+        # encrypted at rest and owner-only
+        self.assertNotIn("abc", saved)
+        self.assertIn("honeywell:user", json.loads(saved))
+        if os.name == "posix":
+            self.assertEqual(stat.S_IMODE(os.stat(file_path).st_mode), 0o600)
+
+        self.assertEqual(
+            session_store.SessionStore().load("honeywell:user", "pwd"), STATE
+        )
+        self.assertIsNone(session_store.SessionStore().load("honeywell:user", "bad"))
+
+        session_store.SessionStore().discard("honeywell:user")
+        self.assertIsNone(session_store.SessionStore().load("honeywell:user", "pwd"))
+
+    @unittest.skipIf(session_store.Fernet is None, "cryptography not installed")
+    def test_unreadable_file(self):
+        """Verify a corrupted store is ignored."""
+        file_path = util.get_full_file_path(session_store.SESSION_STORE_FILE)
+        with open(file_path, "w", encoding="utf-8") as store_file:
+            store_file.write("{not json")
+        with patch.object(util, "log_msg") as log_msg:
+            self.assertIsNone(session_store.SessionStore().load("honeywell:user", "p"))
+        log_msg.assert_called_once()
+
+
+if __name__ == "__main__":
+    util.log_msg.debug = True  # type: ignore[attr-defined]
+    unittest.main(verbosity=2)
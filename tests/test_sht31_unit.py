@@ -10,6 +10,7 @@ import unittest
 from unittest.mock import Mock, patch
 import requests
 
+from src import clock
 from src import sht31
 from src import utilities as util
 
@@ -198,6 +199,41 @@ class TestSht31EdgeCases(unittest.TestCase):
         self.assertIn(json.decoder.JSONDecodeError, exception_types)
         self.assertIn(RuntimeError, exception_types)
 
+    @patch('src.environment.get_env_variable')
+    def test_zones_trip_circuit_breakers_independently(self, mock_env):
+        """Test a dead sensor does not short-circuit a healthy one."""
+        mock_env.return_value = {"value": "192.168.1.1"}
+        util.reset_circuit_breakers()
+        self.addCleanup(util.reset_circuit_breakers)
+        dead = sht31.ThermostatClass(zone=0, verbose=False)
+        healthy = sht31.ThermostatClass(zone=1, verbose=False)
+        sensor_down = [True]
+        calls = []
+
+        def read_sensor():
+            calls.append(1)
+            if sensor_down[0]:
+                raise requests.exceptions.ConnectionError("sensor down")
+            return "ok"
+
+        with clock.use_clock(clock.VirtualClock(start_time=0)), patch.object(
+            util, "log_msg"
+        ):
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                dead._execute_with_retry(read_sensor)
+            dead_breaker = util.get_circuit_breaker(
+                dead.thermostat_type,
+                util.get_device_endpoint(read_sensor, dead.zone_name),
+            )
+            self.assertEqual(dead_breaker.state, util.CIRCUIT_OPEN)
+
+            sensor_down[0] = False
+            calls.clear()
+            self.assertEqual(healthy._execute_with_retry(read_sensor), "ok")
+        # first trial went to the sensor, not short-circuited
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(dead_breaker.state, util.CIRCUIT_OPEN)
+
     @patch('src.environment.get_env_variable')
     def test_get_wifi_status_with_valid_rssi(self, mock_env):
         """Test get_wifi_status with valid RSSI value."""
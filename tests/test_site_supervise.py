@@ -5,13 +5,15 @@ Unit test module for site_supervise.py.
 # built-in imports
 import json
 import os
+import signal
 import sys
 import tempfile
 import unittest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 # local imports
 from src import site_supervise as ss
+from src import thermostat_site as ts
 from src import utilities as util
 from tests import unit_test_common as utc
 
@@ -37,6 +39,7 @@ class TestParseArguments(utc.UnitTest):
         self.assertIsNone(args.config)
         self.assertIsNone(args.measurements)
         self.assertTrue(args.use_threading)
+        self.assertFalse(args.full_supervision)
         self.assertTrue(args.verbose)
         self.assertFalse(args.display_zones)
         self.assertFalse(args.display_temps)
@@ -96,6 +99,9 @@ class TestParseArguments(utc.UnitTest):
         """Verify display temps argument parsing."""
         args = ss.parse_arguments(["--display-temps"])
         self.assertTrue(args.display_temps)
+        self.assertEqual(args.display_deadline, ts.DISPLAY_TEMPS_DEADLINE_SEC)
+        args = ss.parse_arguments(["--display-temps", "--display-deadline", "5"])
+        self.assertEqual(args.display_deadline, 5.0)
 
     def test_parse_arguments_debug(self):
         """Verify parse_arguments with debug option."""
@@ -223,6 +229,8 @@ class TestSiteSupervisor(utc.UnitTest):
             'use_threading': False,
             'display_zones': False,
             'display_temps': False,
+            'display_deadline': ts.DISPLAY_TEMPS_DEADLINE_SEC,
+            'full_supervision': False,
         })()
 
     def tearDown(self):
@@ -348,6 +356,15 @@ class TestSiteSupervisor(utc.UnitTest):
         args.measurements = 1  # type: ignore[attr-defined]
         ss.site_supervisor(args)
 
+    def test_stop_on_sigterm(self):
+        """Verify SIGTERM stops the site and the handler is restored."""
+        site = MagicMock()
+        previous_handler = signal.getsignal(signal.SIGTERM)
+        with ss.stop_on_sigterm(site):
+            os.kill(os.getpid(), signal.SIGTERM)
+        site.stop.assert_called_once_with()
+        self.assertIs(signal.getsignal(signal.SIGTERM), previous_handler)
+
 
 class TestExecSiteSupervise(utc.UnitTest):
     """Test exec_site_supervise function."""
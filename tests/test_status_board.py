@@ -0,0 +1,233 @@
+"""
+Unit test module for status_board.py.
+"""
+
+# built-in imports
+import math
+import os
+import struct
+import tempfile
+import threading
+import types
+import unittest
+from unittest.mock import patch
+
+# local imports
+from src import clock
+from src import status_board
+from src import supervision_context as sc
+from src import utilities as util
+from tests import unit_test_common as utc
+
+CURRENT_MODE = {
+    "heat_mode": True,
+    "cool_mode": False,
+    "heat_deviation": True,
+    "cool_deviation": False,
+    "hold_mode": True,
+}
+
+
+def make_zone(zone_name=0, display_temp=70.5):
+    """Return a polled zone stand-in."""
+    return types.SimpleNamespace(
+        thermostat_type="emulator",
+        zone_name=zone_name,
+        current_mode="heat_mode",
+        display_temp=display_temp,
+        display_humidity=45.0,
+        humidity_is_available=True,
+        schedule_setpoint=68,
+        current_setpoint=72.0,
+        hold_temporary=False,
+        supervision=sc.SupervisionContext(inputs={}),
+    )
+
+
+class TestStatusBoard(utc.UnitTest):
+    """Test the shared memory zone status board."""
+
+    def setUp(self):
+        """Write boards to a temporary folder."""
+        super().setUp()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.board_dir_patch = patch.object(
+            status_board, "SHARED_MEMORY_DIR", self.temp_dir.name
+        )
+        self.board_dir_patch.start()
+        self.board = status_board.StatusBoard()
+
+    def tearDown(self):
+        """Remove the boards."""
+        self.board.close()
+        self.board_dir_patch.stop()
+        self.temp_dir.cleanup()
+        super().tearDown()
+
+    def test_publish_and_read(self):
+        """Verify a poll is read back by another mapping of the board."""
+        with clock.use_clock(clock.VirtualClock(start_time=1000)):
+            self.board.publish(make_zone(), CURRENT_MODE, 2, 5)
+        zones = status_board.read_boards()
+        zone = zones["emulator:0"]
+        self.assertEqual(zone["mode"], "HEAT_MODE")
+        self.assertEqual(zone["display_temp"], 70.5)
+        self.assertEqual(zone["display_humidity"], 45.0)
+        self.assertEqual(zone["schedule_setpoint"], 68.0)
+        self.assertEqual(zone["poll_time"], 1000)
+        self.assertEqual((zone["session_count"], zone["poll_count"]), (2, 5))
+        self.assertTrue(zone["heat_deviation"] and zone["hold_mode"])
+        self.assertFalse(zone["cool_mode"] or zone["hold_temporary"])
+        self.assertTrue(zone["connection_ok"])
+        self.assertEqual(zone["pid"], os.getpid())
+
+        # a failed poll keeps the last status
+        with clock.use_clock(clock.VirtualClock(start_time=2000)):
+            self.board.publish_failure(make_zone())
+        zone = status_board.read_boards()["emulator:0"]
+        self.assertFalse(zone["connection_ok"])
+        self.assertTrue(zone["heat_mode"])
+        self.assertEqual(zone["display_temp"], 70.5)
+        self.assertEqual((zone["poll_time"], zone["failure_time"]), (1000, 2000))
+
+    def test_missing_values(self):
+        """Verify unavailable readings are NaN."""
+        zone = make_zone(display_temp=None)
+        zone.humidity_is_available = False
+        self.board.publish(zone, {"heat_mode": False, "cool_mode": False}, 1, 1)
+        snapshot = status_board.read_boards()["emulator:0"]
+        for field in ("display_temp", "display_humidity", "current_setpoint"):
+            self.assertTrue(math.isnan(snapshot[field]), field)
+
+    def test_consistent_snapshots(self):
+        """Verify readers never see a half written slot."""
+        done = threading.Event()
+
+        def write():
+            for poll in range(1, 3000):
+                self.board.publish(make_zone(display_temp=poll), CURRENT_MODE, 1, poll)
+            done.set()
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        reader = status_board.StatusBoardReader(self.board.path)
+        try:
+            while not done.is_set():
+                snapshot = reader.read_slot(0)
+                if snapshot is not None:
+                    self.assertEqual(snapshot["display_temp"], snapshot["poll_count"])
+        finally:
+            writer.join()
+            reader.close()
+
+    def test_torn_read(self):
+        """Verify a slot stuck mid-write is reported."""
+        self.board.publish(make_zone(), CURRENT_MODE, 1, 1)
+        offset = status_board._get_slot_offset(0)
+        struct.pack_into(status_board.SEQUENCE_FORMAT, self.board._mapped, offset, 3)
+        reader = status_board.StatusBoardReader(self.board.path)
+        with patch.object(status_board, "MAX_READ_RETRIES", 5), patch.object(
+            status_board.time, "sleep"
+        ) as sleep:
+            with self.assertRaises(RuntimeError):
+                reader.read_slot(0)
+        reader.close()
+        # the reader yields to the writer between retries
+        self.assertEqual(sleep.call_count, 5)
+
+        # read_boards() skips the stuck board, not the others
+        with patch("os.getpid", return_value=os.getpid() + 1):
+            other = status_board.StatusBoard()
+        try:
+            other.publish(make_zone(zone_name=1), CURRENT_MODE, 1, 1)
+            with patch.object(status_board, "MAX_READ_RETRIES", 5), patch(
+                "psutil.pid_exists", return_value=True
+            ):
+                zones = status_board.read_boards()
+        finally:
+            other.close()
+        self.assertEqual(list(zones), ["emulator:1"])
+
+    def test_full_board(self):
+        """Verify a zone that finds the board full is counted and logged once."""
+        board = status_board.StatusBoard(
+            path=os.path.join(self.temp_dir.name, "small.bin"), slot_count=2
+        )
+        reader = status_board.StatusBoardReader(board.path)
+        try:
+            with patch.object(util, "log_msg") as log_msg:
+                for zone_name in range(4):
+                    board.publish(make_zone(zone_name=zone_name), CURRENT_MODE, 1, 1)
+                board.publish(make_zone(zone_name=3), CURRENT_MODE, 1, 2)
+            self.assertEqual(log_msg.call_count, 1)
+            self.assertEqual(reader.slot_count, 2)
+            self.assertEqual(list(reader.read()), ["emulator:0", "emulator:1"])
+            self.assertEqual(reader.get_dropped_zones(), 2)
+        finally:
+            reader.close()
+            board.close()
+
+    def test_zone_count(self):
+        """Verify the process board has a slot for every supervised zone."""
+        status_board.reset_board()
+        try:
+            status_board.publish(make_zone(), CURRENT_MODE, 1, 1)
+            self.assertEqual(
+                status_board.get_board().slot_count, status_board.DEFAULT_SLOTS
+            )
+            status_board.set_zone_count(1000)
+            for zone_name in range(1000):
+                status_board.publish(make_zone(zone_name=zone_name), CURRENT_MODE, 1, 1)
+            reader = status_board.StatusBoardReader(status_board.get_board_path())
+            try:
+                self.assertEqual(len(reader.read()), 1000)
+                self.assertEqual(reader.get_dropped_zones(), 0)
+            finally:
+                reader.close()
+        finally:
+            status_board.reset_board(publish=False)
+
+    def test_publish_query(self):
+        """Verify a read-only poll is published from the zone state."""
+        zone = make_zone()
+        zone.current_mode = zone.HEAT_MODE = "HEAT_MODE"
+        zone.COOL_MODE = "COOL_MODE"
+        zone.temperature_is_deviated = True
+        zone.is_controlled_mode = lambda: True
+        status_board.reset_board()
+        try:
+            status_board.publish_query(zone, 1, 3)
+            snapshot = status_board.read_boards()["emulator:0"]
+        finally:
+            status_board.reset_board(publish=False)
+        self.assertEqual(snapshot["mode"], "HEAT_MODE")
+        self.assertEqual(snapshot["poll_count"], 3)
+        self.assertTrue(snapshot["heat_deviation"] and snapshot["hold_mode"])
+        self.assertFalse(snapshot["cool_mode"] or snapshot["cool_deviation"])
+
+    def test_stale_boards(self):
+        """Verify boards of stopped processes are skipped and removed."""
+        with patch("os.getpid", return_value=999999):
+            stale = status_board.StatusBoard()
+        stale.publish(make_zone(zone_name=1), CURRENT_MODE, 1, 1)
+        stale.close(remove=False)
+        with patch("psutil.pid_exists", side_effect=lambda pid: pid == os.getpid()):
+            self.assertNotIn("emulator:1", status_board.read_boards())
+            self.assertEqual(status_board.remove_stale_boards(), 1)
+        self.assertFalse(os.path.exists(status_board.get_board_path(pid=999999)))
+
+    def test_process_board(self):
+        """Verify the process board is created on first publish."""
+        self.assertIsNone(status_board.get_board())
+        status_board.reset_board()
+        try:
+            status_board.publish(make_zone(), CURRENT_MODE, 1, 1)
+            self.assertIn("emulator:0", status_board.read_boards())
+        finally:
+            status_board.reset_board(publish=False)
+        self.assertEqual(status_board.read_boards(), {})
+
+
+if __name__ == "__main__":
+    util.log_msg.debug = True  # type: ignore[attr-defined]
+    unittest.main(verbosity=2)
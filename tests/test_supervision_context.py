@@ -0,0 +1,138 @@
+"""
+Unit test module for supervision_context.py.
+"""
+
+# built-in imports
+import threading
+import unittest
+from unittest import mock
+
+# local imports
+from src import supervision_context as sc
+from src import thermostat_api as api
+from src import utilities as util
+from tests import unit_test_common as utc
+
+
+class TestSupervisionContext(utc.UnitTest):
+    """Test the per-zone supervision context."""
+
+    def test_inputs(self):
+        """Verify a context with its own inputs leaves api.uip alone."""
+        context = sc.SupervisionContext(
+            inputs={api.input_flds.target_mode: "HEAT_MODE"}
+        )
+        context.set_input(api.input_flds.measurements, 2)
+        self.assertEqual(context.get_input(api.input_flds.target_mode), "HEAT_MODE")
+        self.assertIsNone(context.get_input(api.input_flds.poll_time))
+        self.assertFalse(context.max_measurement_count_exceeded(2))
+        self.assertTrue(context.max_measurement_count_exceeded(3))
+        unlimited = sc.SupervisionContext(inputs={})
+        self.assertFalse(unlimited.max_measurement_count_exceeded(9))
+
+    def test_follows_api_uip(self):
+        """Verify the default context reads and writes api.uip."""
+        uip = mock.Mock()
+        uip.zone_name = "zone_a"
+        uip.get_user_inputs.return_value = "COOL_MODE"
+        with mock.patch.object(api, "uip", uip, create=True):
+            context = sc.SupervisionContext()
+            self.assertEqual(
+                context.get_input(api.input_flds.target_mode), "COOL_MODE"
+            )
+            context.set_input(api.input_flds.target_mode, "OFF_MODE")
+        uip.get_user_inputs.assert_called_once_with(
+            "zone_a", api.input_flds.target_mode
+        )
+        uip.set_user_inputs.assert_called_once_with(
+            "zone_a", api.input_flds.target_mode, "OFF_MODE"
+        )
+
+    def test_measurement_callback(self):
+        """Verify polls are reported to the callback."""
+        callback = mock.Mock()
+        zone = object()
+        sc.SupervisionContext(measurement_callback=callback).record_measurement(
+            zone, 3
+        )
+        callback.assert_called_once_with(zone, 3)
+        # no callback is a no-op
+        sc.SupervisionContext().record_measurement(zone, 3)
+
+    def test_stop_event(self):
+        """Verify a shared stop event cuts waits short."""
+        stop_event = threading.Event()
+        context = sc.SupervisionContext(inputs={}, stop_event=stop_event)
+        self.assertFalse(context.stop_requested())
+        self.assertFalse(context.wait(0.01))
+        stop_event.set()
+        self.assertTrue(context.stop_requested())
+        self.assertTrue(context.wait(600))
+        self.assertIsNot(sc.SupervisionContext().stop_event, stop_event)
+
+    def test_stop_ends_retries(self):
+        """Verify a stop request ends the retry delays of its zone."""
+        context = sc.SupervisionContext(inputs={})
+        context.stop_event.set()
+        failing_call = mock.Mock(side_effect=ConnectionError("dropped"))
+        with mock.patch.object(util, "log_msg"), sc.bind(context):
+            with self.assertRaises(ConnectionError):
+                util.execute_with_extended_retries(
+                    failing_call,
+                    "emulator",
+                    "zone_a",
+                    number_of_retries=5,
+                    initial_retry_delay_sec=600,
+                    endpoint="stop",
+                )
+        failing_call.assert_called_once_with()
+
+    def test_bind(self):
+        """Verify bind() scopes the current context to the thread."""
+        outer = sc.SupervisionContext(inputs={})
+        inner = sc.SupervisionContext(inputs={})
+        self.assertIsNone(sc.get_current_context())
+        with sc.bind(outer):
+            with sc.bind(inner):
+                self.assertIs(sc.get_current_context(), inner)
+            self.assertIs(sc.get_current_context(), outer)
+        self.assertIsNone(sc.get_current_context())
+
+    def test_failed_retry_flags_only_its_zone(self):
+        """Verify a failed call clears connection_ok of the calling zone."""
+        contexts = {
+            "bad": sc.SupervisionContext(inputs={}),
+            "good": sc.SupervisionContext(inputs={}),
+        }
+
+        def failing_call():
+            """Fail like a dropped connection."""
+            raise ConnectionError("dropped")
+
+        def supervise(name):
+            """Make one vendor call from a zone's supervision thread."""
+            with sc.bind(contexts[name]):
+                util.execute_with_extended_retries(
+                    failing_call if name == "bad" else lambda: True,
+                    "emulator",
+                    name,
+                    number_of_retries=1,
+                    initial_retry_delay_sec=0,
+                    endpoint=name,
+                )
+
+        with mock.patch.object(util, "log_msg"):
+            threads = [
+                threading.Thread(target=supervise, args=(name,)) for name in contexts
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertFalse(contexts["bad"].connection_ok)
+        self.assertTrue(contexts["good"].connection_ok)
+
+
+if __name__ == "__main__":
+    util.log_msg.debug = True  # type: ignore[attr-defined]
+    unittest.main(verbosity=2)
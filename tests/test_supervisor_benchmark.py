@@ -0,0 +1,102 @@
+"""
+Unit test module for tests/benchmarks/supervisor_benchmark.py.
+"""
+
+# built-in imports
+import copy
+import unittest
+
+# local imports
+from tests import unit_test_common as utc
+from tests.benchmarks import supervisor_benchmark as bench
+
+
+class TestSupervisorBenchmark(utc.UnitTest):
+    """Test the supervisor benchmark harness."""
+
+    def test_percentile(self):
+        """Verify nearest-rank percentile."""
+        samples = list(range(1, 101))
+        self.assertEqual(bench.percentile(samples, 50), 50)
+        self.assertEqual(bench.percentile(samples, 99), 99)
+        self.assertEqual(bench.percentile(samples, 100), 100)
+        self.assertEqual(bench.percentile([], 50), 0.0)
+
+    def test_fault_injector_is_seeded(self):
+        """Verify the same seed gives the same failure sequence."""
+
+        def failure_sequence(seed):
+            injector = bench.FaultInjector(failure_rate=0.5, seed=seed)
+            sequence = []
+            for _ in range(20):
+                try:
+                    injector.inject()
+                    sequence.append(False)
+                except ConnectionError:
+                    sequence.append(True)
+            return sequence
+
+        self.assertEqual(failure_sequence(3), failure_sequence(3))
+        self.assertIn(True, failure_sequence(3))
+
+    def test_run_scenarios(self):
+        """Verify each scenario polls every zone and reports metrics."""
+        for scenario in bench.SCENARIOS:
+            with self.subTest(scenario=scenario):
+                result = bench.run_scenario(scenario, zones=3, measurements=2)
+                self.assertEqual(result["polls"], 6)
+                self.assertEqual(result["failures"], 0)
+                for metric in bench.COMPARED_METRICS:
+                    self.assertIn(metric, result)
+                self.assertGreater(result["polls_per_sec"], 0)
+                self.assertGreater(result["log_bytes_per_poll"], 0)
+
+    def test_run_scenario_with_failures(self):
+        """Verify injected failures are counted."""
+        result = bench.run_scenario(
+            bench.SUPERVISOR_LOOP_SCENARIO,
+            zones=2,
+            measurements=5,
+            failure_rate=1.0,
+        )
+        self.assertEqual(result["failures"], result["polls"])
+
+    def test_run_scenario_unknown(self):
+        """Verify unknown scenario raises."""
+        with self.assertRaises(ValueError):
+            bench.run_scenario("bogus")
+
+    def test_compare_to_baseline(self):
+        """Verify regressions, improvements and skipped scenarios."""
+        scenario = {
+            "zones": 10,
+            "measurements": 2,
+            "latency_ms": 0.0,
+            "jitter_ms": 0.0,
+            "failure_rate": 0.0,
+            "polls_per_sec": 100.0,
+            "p50_poll_latency_ms": 1.0,
+            "p99_poll_latency_ms": 2.0,
+            "cpu_per_poll_ms": 1.0,
+            "log_bytes_per_poll": 100.0,
+        }
+        baseline = {"scenarios": {"site": scenario}}
+
+        results = copy.deepcopy(baseline)
+        results["scenarios"]["site"]["polls_per_sec"] = 50.0
+        results["scenarios"]["site"]["log_bytes_per_poll"] = 10.0
+        report = bench.compare_to_baseline(results, baseline, tolerance_pct=25)
+        self.assertEqual(len(report["regressions"]), 1)
+        self.assertIn("polls_per_sec", report["regressions"][0])
+        self.assertEqual(len(report["improvements"]), 1)
+        self.assertIn("log_bytes_per_poll", report["improvements"][0])
+
+        results["scenarios"]["site"]["zones"] = 20
+        results["scenarios"]["supervisor_loop"] = scenario
+        report = bench.compare_to_baseline(results, baseline)
+        self.assertEqual(report["regressions"], [])
+        self.assertEqual(len(report["skipped"]), 2)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
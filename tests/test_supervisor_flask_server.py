@@ -6,9 +6,11 @@ because ports cannot be opened on shared pool.
 """
 
 # built-in imports
+import tempfile
 import threading
 import time
 import unittest
+from unittest.mock import patch
 
 # third party imports
 from flask_wtf.csrf import CSRFProtect
@@ -165,6 +167,64 @@ class TestRunSupervise(utc.UnitTest):
             # subprocess may not run properly
 
 
+class TestLogEndpoints(utc.UnitTest):
+    """Unit tests for the log tail and range routes."""
+
+    def setUp(self):
+        super().setUp()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path_patch = patch.object(util, "FILE_PATH", self.temp_dir.name)
+        self.file_path_patch.start()
+        with open(
+            util.get_full_file_path("test_log.txt"), "w", encoding="utf-8"
+        ) as log_file:
+            log_file.write("".join(f"line {line}\n" for line in range(10)))
+        sfs.limiter.enabled = False
+        self.client = sfs.app.test_client()
+
+    def tearDown(self):
+        sfs.limiter.enabled = True
+        self.file_path_patch.stop()
+        self.temp_dir.cleanup()
+        super().tearDown()
+
+    def test_list_and_tail(self):
+        """Verify the log list and tail routes."""
+        response = self.client.get("/logs")
+        self.assertEqual(response.json["test_log.txt"]["size"], 70)
+
+        response = self.client.get("/logs/test_log.txt/tail?lines=2")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, b"line 8\nline 9\n")
+        self.assertEqual(self.client.get("/logs/missing.txt/tail").status_code, 404)
+
+    def test_tail_follow(self):
+        """Verify follow mode streams lines appended after the tail."""
+        response = self.client.get(
+            "/logs/test_log.txt/tail?lines=1&follow=1", buffered=False
+        )
+        chunks = iter(response.response)
+        self.assertEqual(next(chunks), b"line 9\n")
+        with open(
+            util.get_full_file_path("test_log.txt"), "a", encoding="utf-8"
+        ) as log_file:
+            log_file.write("line 10\n")
+        data = b""
+        while not data:
+            data = next(chunks)
+        self.assertEqual(data, b"line 10\n")
+        response.close()
+
+    def test_range(self):
+        """Verify the byte range route and its offset headers."""
+        response = self.client.get("/logs/test_log.txt/range?offset=-7")
+        self.assertEqual(response.data, b"line 9\n")
+        self.assertEqual(response.headers["X-Log-Offset"], "63")
+        self.assertEqual(response.headers["X-Log-Size"], "70")
+        response = self.client.get("/logs/test_log.txt/range?offset=7&length=7")
+        self.assertEqual(response.data, b"line 1\n")
+
+
 if __name__ == "__main__":
     util.log_msg.debug = True  # type: ignore[attr-defined]
     unittest.main(verbosity=2)
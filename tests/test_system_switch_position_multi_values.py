@@ -310,6 +310,67 @@ class TestSystemSwitchPositionMultiValues(utc.UnitTest):
                 f"for position {position}",
             )
 
+    def test_reverse_index_matches_get_key_from_value(self):
+        """Verify the reverse index decodes like get_key_from_value()."""
+        positions = tc.SwitchPositionMap(
+            {
+                "HEAT": 1,
+                "COOL": "cool",
+                "AUTO": [5, "auto", "autoHeat"],
+                "FAN": {"fan": 7},
+                "DRY": 1,  # shared value, first mode wins
+            }
+        )
+        for position in [1, "cool", 5, "autoHeat", "fan", 7]:
+            self.assertEqual(
+                util.get_key_from_value(positions, position),
+                positions.get_mode(position),
+            )
+        self.assertIsNone(positions.get_mode(999))
+
+        # index follows changes made after construction
+        positions["COOL"] = 3
+        positions.update({"OFF": 0})
+        self.assertEqual("COOL", positions.get_mode(3))
+        self.assertEqual("OFF", positions.get_mode(0))
+        self.assertIsNone(positions.get_mode("cool"))
+
+    def test_per_instance_positions(self):
+        """Verify zone positions do not change the class defaults."""
+        other_zone = tc.ThermostatCommonZone()
+        self.Zone.system_switch_position[tc.ThermostatCommonZone.HEAT_MODE] = "zone"
+        for positions in [
+            tc.ThermostatCommonZone.system_switch_position,
+            other_zone.system_switch_position,
+        ]:
+            self.assertNotEqual(
+                "zone", positions[tc.ThermostatCommonZone.HEAT_MODE]
+            )
+        self.assertIsInstance(self.Zone.system_switch_position, tc.SwitchPositionMap)
+
+    def test_get_current_mode_name(self):
+        """Verify the current position is decoded to a mode name."""
+        self.Zone.system_switch_position[tc.ThermostatCommonZone.COOL_MODE] = 2
+        self.Zone.get_system_switch_position = MagicMock(return_value=2)
+        self.assertEqual(
+            tc.ThermostatCommonZone.COOL_MODE, self.Zone.get_current_mode_name()
+        )
+        self.Zone.get_system_switch_position = MagicMock(return_value=999)
+        self.assertIsNone(self.Zone.get_current_mode_name())
+
+    def test_mode_decoded_once_per_query(self):
+        """Verify configuring the mode reads the switch position once."""
+        self.Zone.is_off_mode = self.is_off_mode_bckup
+        self.Zone.system_switch_position[tc.ThermostatCommonZone.OFF_MODE] = 0
+        self.Zone.get_system_switch_position = MagicMock(return_value=0)
+        getattr(self.Zone, "_configure_mode_specific_parameters")()
+        self.assertEqual(tc.ThermostatCommonZone.OFF_MODE, self.Zone.current_mode)
+        self.assertEqual(1, self.Zone.get_system_switch_position.call_count)
+
+        # outside of a query every call decodes the current position
+        self.Zone.is_off_mode()
+        self.assertEqual(2, self.Zone.get_system_switch_position.call_count)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -6,6 +6,8 @@ Tests for thermostat_common.py
 import operator
 import pprint
 import random
+import threading
+import time
 import unittest
 import unittest.mock
 
@@ -1034,6 +1036,60 @@ class Test(utc.UnitTest):
         self.assertIs(zone, fake_zone)
         mock_print.assert_any_call("zone: 0, name: Living Room, temp: N/A")
 
+    def test_print_select_data_from_all_zones_concurrent(self):
+        """Verify zones share one login and are queried concurrently."""
+        from unittest.mock import MagicMock
+        from unittest.mock import patch
+
+        class FakeZone:
+            """Zone whose temperature query takes 0.3 sec."""
+
+            def __init__(self, Thermostat, verbose=False):
+                del verbose
+                self.zone_name = f"zone{Thermostat.zone}"
+                self.zone = Thermostat.zone
+
+            def get_display_temp(self):
+                if self.zone == 3:
+                    raise ValueError("zone offline")
+                threading.Event().wait(5.0 if self.zone == 4 else 0.3)
+                return 70.0
+
+        def make_thermostat(zone):
+            Thermostat = MagicMock()
+            Thermostat.zone = zone
+            Thermostat.clone_for_zone.side_effect = make_thermostat
+            return Thermostat
+
+        login = make_thermostat(0)
+        with patch.object(
+            tc,
+            "create_thermostat_instance",
+            return_value=(login, FakeZone(login)),
+        ) as create_instance, patch("builtins.print") as mock_print:
+            start_time = time.monotonic()
+            thermostat, zone = tc.print_select_data_from_all_zones(
+                thermostat_type="kumocloud",
+                zone_lst=[0, 1, 2, 3, 4],
+                ThermostatClass=object,
+                ThermostatZone=FakeZone,
+                display_wifi=False,
+                display_battery=False,
+                display_outdoor_weather=False,
+                zone_timeout_sec=1.0,
+            )
+            elapsed_sec = time.monotonic() - start_time
+
+        # one login, the other zones cloned from it
+        create_instance.assert_called_once()
+        self.assertEqual(login.clone_for_zone.call_count, 4)
+        self.assertLess(elapsed_sec, 2.0)
+        mock_print.assert_any_call("zone: 2, name: zone2, temp: 70.0 °F")
+        mock_print.assert_any_call("zone: 3, query failed: zone offline")
+        mock_print.assert_any_call("zone: 4, query timed out after 1.0 sec")
+        self.assertEqual(zone.zone, 4)
+        self.assertEqual(thermostat.zone, 4)
+
     def test_revert_temperature_deviation(self):
         """Verify revert_temperature_deviation()."""
 
@@ -5,11 +5,16 @@ Unit test module for thermostat_site.py.
 # built-in imports
 import re
 import threading
+import time
 import unittest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 # local imports
+from src import emulator_config
 from src import site_config
+from src import status_board
+from src import thermostat_api as api
+from src import thermostat_common as tc
 from src import thermostat_site as ts
 from src import utilities as util
 from tests import unit_test_common as utc
@@ -127,6 +132,55 @@ class TestThermostatSite(utc.UnitTest):
         # This should not raise an exception
         site.display_all_temps()
 
+    def test_display_all_temps_deadline(self):
+        """Verify a slow thermostat times out without delaying the others."""
+        site = ts.ThermostatSite(
+            site_config_dict=self.test_site_config,
+            verbose=False
+        )
+        release = threading.Event()
+        original_query = site._query_thermostat_temps
+
+        def query(tstat_config, idx, results):
+            """Hang the first thermostat until the test releases it."""
+            if idx == 1:
+                release.wait(10)
+            original_query(tstat_config, idx, results)
+
+        try:
+            with patch.object(site, "_query_thermostat_temps", query), patch(
+                "src.utilities.log_msg"
+            ) as mock_log:
+                summary = site.display_all_temps(deadline_sec=0.5)
+        finally:
+            release.set()
+        self.assertEqual(list(summary), [1, 2])
+        self.assertEqual(summary[1]["status"], "timeout")
+        self.assertEqual(summary[2]["status"], "ok")
+        messages = [call.args[0] for call in mock_log.call_args_list]
+        timeout_msg = [msg for msg in messages if "Thermostat 1:" in msg][0]
+        self.assertIn("timed out after 0.5s", timeout_msg)
+        # output stays in configuration order
+        self.assertLess(
+            messages.index(timeout_msg),
+            [i for i, msg in enumerate(messages) if "Thermostat 2:" in msg][0],
+        )
+
+    def test_display_all_temps_error(self):
+        """Verify a failing thermostat is reported as an error."""
+        site = ts.ThermostatSite(
+            site_config_dict=self.test_site_config,
+            verbose=False
+        )
+        with patch(
+            "src.thermostat_api.load_hardware_library",
+            side_effect=ImportError("no library"),
+        ):
+            summary = site.display_all_temps()
+        self.assertEqual(
+            summary[1], {"status": "error", "error": "no library"}
+        )
+
     def test_display_all_temps_empty_site(self):
         """Verify display_all_temps handles empty site gracefully."""
         empty_config = {
@@ -161,15 +215,20 @@ class TestThermostatSite(utc.UnitTest):
             site_config_dict=small_config,
             verbose=False
         )
-        result = site.supervise_all_zones(
-            measurement_count=1,
-            use_threading=False
-        )
+        with patch.object(
+            status_board, "publish_query", wraps=status_board.publish_query
+        ) as publish_query:
+            result = site.supervise_all_zones(
+                measurement_count=1,
+                use_threading=False
+            )
         # Verify we got results dict with results and errors keys
         self.assertIsInstance(result, dict)
         self.assertIn("results", result)
         self.assertIn("errors", result)
         self.assertGreater(len(result["results"]), 0)
+        # read-only polls are published for other processes too
+        publish_query.assert_called_once()
 
     def test_supervise_all_zones_threaded(self):
         """Verify supervise_all_zones works with multi-threading."""
@@ -191,6 +250,253 @@ class TestThermostatSite(utc.UnitTest):
         total_measurements = sum(len(v) for v in results.values())
         self.assertGreater(total_measurements, 0)
 
+    def test_supervise_all_zones_full_supervision(self):
+        """Verify every zone runs its own supervisor_loop at once."""
+        site = ts.ThermostatSite(
+            site_config_dict=self.test_site_config,
+            verbose=False
+        )
+        contexts = []
+        original_loop = tc.ThermostatCommonZone.supervisor_loop
+
+        def supervisor_loop(zone, *args):
+            """Record the context each zone supervises with."""
+            contexts.append(zone.supervision)
+            return original_loop(zone, *args)
+
+        with patch.object(
+            tc.ThermostatCommonZone, "supervisor_loop", supervisor_loop
+        ), patch.object(api, "uip", None):
+            result = site.supervise_all_zones(
+                use_threading=True, full_supervision=True
+            )
+        self.assertEqual(result["errors"], {})
+        self.assertEqual(
+            sorted(result["results"]), ["emulator_zone0", "emulator_zone1"]
+        )
+        for measurements in result["results"].values():
+            self.assertEqual(len(measurements), 1)
+        # one context per zone, none shared through api.uip
+        self.assertEqual(len(contexts), 2)
+        self.assertIsNot(contexts[0], contexts[1])
+        for context in contexts:
+            self.assertEqual(context.get_input("target_mode"), "OFF_MODE")
+
+    def test_plan_startup(self):
+        """Verify thread starts ramp up and polls spread per vendor."""
+        site = ts.ThermostatSite(
+            site_config_dict={
+                "site_name": "test_site",
+                "startup_ramp_sec": 8,
+                "thermostats": [
+                    {
+                        "thermostat_type": "honeywell",
+                        "zone": zone,
+                        "measurements": 2,
+                    }
+                    for zone in range(3)
+                ] + [
+                    # single poll, not phase offset
+                    {"thermostat_type": "emulator", "zone": 0},
+                ],
+            },
+            verbose=False
+        )
+        plan = site._plan_startup()
+        self.assertEqual([plan[idx][0] for idx in range(1, 5)], [0, 2, 4, 6])
+        self.assertEqual(
+            [plan[idx][1] for idx in range(1, 5)], [0.0, 1 / 3, 2 / 3, 0.0]
+        )
+        site.site_config["phase_offsets"] = False
+        site.site_config["startup_ramp_sec"] = 0
+        self.assertEqual(set(site._plan_startup().values()), {(0.0, 0.0)})
+
+    def test_auth_concurrency_limit(self):
+        """Verify per-vendor login limits and their overrides."""
+        site = ts.ThermostatSite(
+            site_config_dict=dict(
+                self.test_site_config, max_concurrent_auth={"emulator": 3}
+            ),
+            verbose=False
+        )
+        self.assertEqual(site._get_auth_semaphore("honeywell")._value, 1)
+        self.assertEqual(site._get_auth_semaphore("blink")._value, 1)
+        self.assertEqual(
+            site._get_auth_semaphore("kumocloud")._value,
+            site_config.MAX_CONCURRENT_AUTH,
+        )
+        self.assertEqual(site._get_auth_semaphore("emulator")._value, 3)
+        self.assertIs(
+            site._get_auth_semaphore("emulator"),
+            site._get_auth_semaphore("emulator"),
+        )
+
+    def test_supervise_all_zones_staggered(self):
+        """Verify logins are bounded and first polls follow the plan."""
+        zone_count = 4
+        site = ts.ThermostatSite(
+            site_config_dict={
+                "site_name": "test_site",
+                "max_concurrent_auth": {"emulator": 1},
+                "thermostats": [
+                    {
+                        "thermostat_type": "emulator",
+                        "zone": zone,
+                        "poll_time": 0.4,
+                        "measurements": 2,
+                    }
+                    for zone in range(zone_count)
+                ],
+            },
+            verbose=False
+        )
+        lock = threading.Lock()
+        logins = {"active": 0, "peak": 0}
+        first_polls = {}
+
+        def login(zone_num):
+            """Track concurrent logins."""
+            with lock:
+                logins["active"] += 1
+                logins["peak"] = max(logins["peak"], logins["active"])
+            time.sleep(0.02)
+            with lock:
+                logins["active"] -= 1
+            return zone_num
+
+        def make_zone(zone_num):
+            """Return a zone recording the time of its first poll."""
+            zone = MagicMock()
+            zone.query_thermostat_zone.side_effect = (
+                lambda: first_polls.setdefault(zone_num, time.monotonic())
+            )
+            return zone
+
+        module = MagicMock()
+        module.ThermostatClass.side_effect = login
+        module.ThermostatZone.side_effect = make_zone
+        start_time = time.monotonic()
+        with patch.object(
+            api, "load_hardware_library", return_value=module
+        ), patch.object(api, "verify_required_env_variables", return_value=True):
+            result = site.supervise_all_zones(use_threading=True)
+        self.assertEqual(result["errors"], {})
+        self.assertEqual(logins["peak"], 1)
+        # zone k polls first at k / 4 of the 0.4 sec poll time
+        for zone in range(zone_count):
+            self.assertGreaterEqual(
+                first_polls[zone] - start_time, 0.1 * zone - 0.01
+            )
+
+    def test_stop_ends_long_polls(self):
+        """Verify stop() ends supervision without sitting out a poll."""
+        site = ts.ThermostatSite(
+            site_config_dict={
+                "site_name": "test_site",
+                "thermostats": [
+                    {
+                        "thermostat_type": "emulator",
+                        "zone": zone,
+                        "poll_time": 600,
+                        "measurements": 10,
+                    }
+                    for zone in range(2)
+                ],
+            },
+            verbose=False
+        )
+        for full_supervision in (False, True):
+            with self.subTest(full_supervision=full_supervision):
+                timer = threading.Timer(0.5, site.stop)
+                timer.start()
+                start_time = time.monotonic()
+                result = site.supervise_all_zones(
+                    use_threading=True, full_supervision=full_supervision
+                )
+                timer.join()
+                self.assertLess(time.monotonic() - start_time, 10)
+                self.assertEqual(result["errors"], {})
+                for measurements in result["results"].values():
+                    self.assertEqual(len(measurements), 1)
+
+    def test_stop_ends_retry_delay(self):
+        """Verify stop() cuts a read-only poll's retry delay short."""
+        site = ts.ThermostatSite(
+            site_config_dict={
+                "site_name": "test_site",
+                "thermostats": [
+                    {
+                        "thermostat_type": "emulator",
+                        "zone": 0,
+                        "poll_time": 600,
+                        "measurements": 10,
+                    }
+                ],
+            },
+            verbose=False
+        )
+        vendor_call = MagicMock(side_effect=ConnectionError("dropped"))
+
+        def query():
+            """Poll a vendor that drops every connection."""
+            util.execute_with_extended_retries(
+                vendor_call,
+                "emulator",
+                "0",
+                initial_retry_delay_sec=600,
+                endpoint="query",
+                deadline_sec=None,
+            )
+
+        module = MagicMock()
+        module.ThermostatZone.return_value.query_thermostat_zone.side_effect = query
+        threading.Timer(0.2, site.stop).start()
+        start_time = time.monotonic()
+        with patch.object(
+            api, "load_hardware_library", return_value=module
+        ), patch.object(
+            api, "verify_required_env_variables", return_value=True
+        ), patch.object(util, "log_msg"):
+            result = site.supervise_all_zones(use_threading=True)
+        self.assertLess(time.monotonic() - start_time, 5)
+        vendor_call.assert_called_once_with()
+        self.assertIn("emulator_zone0", result["errors"])
+
+    def test_stop_closes_stuck_sessions(self):
+        """Verify a session stuck in a call is closed after the grace."""
+        site = ts.ThermostatSite(
+            site_config_dict={
+                "site_name": "test_site",
+                "shutdown_grace_sec": 0.2,
+                "thermostats": [
+                    {
+                        "thermostat_type": "emulator",
+                        "zone": 0,
+                        "poll_time": 600,
+                        "measurements": 10,
+                    }
+                ],
+            },
+            verbose=False
+        )
+        closed = threading.Event()
+        Thermostat = MagicMock()
+        Thermostat.close.side_effect = closed.set
+        module = MagicMock()
+        module.ThermostatClass.return_value = Thermostat
+        # the poll blocks until its session is closed
+        module.ThermostatZone.return_value.query_thermostat_zone.side_effect = (
+            lambda: closed.wait(10)
+        )
+        threading.Timer(0.2, site.stop).start()
+        start_time = time.monotonic()
+        with patch.object(
+            api, "load_hardware_library", return_value=module
+        ), patch.object(api, "verify_required_env_variables", return_value=True):
+            site.supervise_all_zones(use_threading=True)
+        self.assertLess(time.monotonic() - start_time, 5)
+        Thermostat.close.assert_called_once_with()
+
     def test_supervise_disabled_thermostats_excluded(self):
         """Verify disabled thermostats are excluded from supervision."""
         config_with_disabled = {
@@ -275,6 +581,48 @@ class TestThermostatSite(utc.UnitTest):
             ts.ThermostatSite(site_config_dict=invalid_config, verbose=False)
         self.assertIn("thermostat_type", str(context.exception))
 
+    def test_fleet_stanza_expansion(self):
+        """Verify a fleet stanza expands into one config per zone."""
+        default_zones = emulator_config.get_available_zones()
+        fleet_config = {
+            "site_name": "fleet_site",
+            "thermostats": [
+                {
+                    "thermostat_type": "emulator",
+                    "poll_time": 0,
+                    "measurements": 1,
+                    "fleet": {"zones": 5, "seed": 7},
+                },
+                {"thermostat_type": "emulator", "zone": 0, "enabled": False},
+            ],
+        }
+        site = ts.ThermostatSite(site_config_dict=fleet_config, verbose=False)
+        self.assertEqual([t["zone"] for t in site.thermostats], list(range(5)))
+        self.assertNotIn("fleet", site.thermostats[0])
+        self.assertEqual(site.thermostats[0]["poll_time"], 0)
+        result = site.supervise_all_zones(measurement_count=1, use_threading=True)
+        self.assertEqual(len(result["results"]), 5)
+        # fleet mode is process-wide, it is only enabled while zones run
+        self.assertFalse(emulator_config.is_fleet_mode())
+        self.assertEqual(emulator_config.get_available_zones(), default_zones)
+
+    def test_fleet_stanza_validation(self):
+        """Verify fleet stanzas are limited to one emulator entry."""
+        bad_configs = [
+            [{"thermostat_type": "honeywell", "fleet": {"zones": 2}}],
+            [
+                {"thermostat_type": "emulator", "fleet": {"zones": 2}},
+                {"thermostat_type": "emulator", "fleet": {"zones": 3}},
+            ],
+        ]
+        for thermostats in bad_configs:
+            with self.subTest(thermostats=thermostats):
+                with self.assertRaises(ValueError):
+                    ts.ThermostatSite(
+                        site_config_dict={"thermostats": thermostats},
+                        verbose=False,
+                    )
+
     def test_default_site_config(self):
         """Verify default site config is valid."""
         config = site_config.get_default_site_config()
@@ -0,0 +1,221 @@
+"""
+Unit test module for token_manager.py.
+"""
+
+# built-in imports
+import os
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+# local imports
+from src import clock
+from src import kumocloud
+from src import kumocloud_config
+from src import request_governor
+from src import token_manager
+from src import utilities as util
+from tests import unit_test_common as utc
+from tests.fake_servers import kumocloud_server
+
+
+class TokenHolder:
+    """Minimal driver stand-in with a bound refresh method."""
+
+    def __init__(self, ttl_sec=1200):
+        self.ttl_sec = ttl_sec
+        self.refresh_count = 0
+
+    def refresh(self):
+        """Return a new expiry one ttl from now."""
+        self.refresh_count += 1
+        return clock.time() + self.ttl_sec
+
+
+class TestTokenManager(utc.UnitTest):
+    """Test the token refresh schedule."""
+
+    def setUp(self):
+        """Use a token manager without the background thread."""
+        super().setUp()
+        self.manager = token_manager.TokenManager(lead_sec=300, retry_sec=60)
+        self.manager.start = MagicMock()
+
+    def test_refresh_before_expiry(self):
+        """Verify a token is refreshed lead_sec before it expires."""
+        holder = TokenHolder()
+        with clock.use_clock(clock.VirtualClock(start_time=0)) as virtual_clock:
+            self.manager.register("emulator:user:0", holder.refresh, 1200)
+            virtual_clock.sleep(899)
+            self.assertEqual(self.manager.refresh_due(), 0)
+            virtual_clock.sleep(1)
+            self.assertEqual(self.manager.refresh_due(), 1)
+        self.assertEqual(holder.refresh_count, 1)
+        self.assertEqual(self.manager.get_expiry("emulator:user:0"), 2100)
+        self.assertEqual(self.manager.stats["refreshed"], 1)
+
+    def test_failed_refresh_is_retried(self):
+        """Verify a failed refresh is retried after retry_sec."""
+        refresh_func = MagicMock(side_effect=[ValueError("auth down"), 3000])
+        with clock.use_clock(clock.VirtualClock(start_time=0)) as virtual_clock:
+            self.manager.register("emulator:user:0", refresh_func, 300)
+            self.assertEqual(self.manager.refresh_due(), 1)
+            self.assertEqual(self.manager.get_expiry("emulator:user:0"), 300)
+            virtual_clock.sleep(59)
+            self.assertEqual(self.manager.refresh_due(), 0)
+            virtual_clock.sleep(1)
+            self.assertEqual(self.manager.refresh_due(), 1)
+        self.assertEqual(self.manager.get_expiry("emulator:user:0"), 3000)
+        self.assertEqual(self.manager.stats["failed"], 1)
+        self.assertEqual(self.manager.stats["refreshed"], 1)
+
+    def test_single_refresh_in_flight(self):
+        """Verify concurrent callers join the refresh already in flight."""
+        started = threading.Event()
+        release = threading.Event()
+        refresh_count = []
+
+        def slow_refresh():
+            refresh_count.append(1)
+            started.set()
+            release.wait(timeout=5)
+            return clock.time() + 1200
+
+        self.manager.register("emulator:user:0", slow_refresh, 0)
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(self.manager.refresh("emulator:user:0"))
+            )
+            for _ in range(3)
+        ]
+        threads[0].start()
+        started.wait(timeout=5)
+        for thread in threads[1:]:
+            thread.start()
+        # release the refresh once both callers are waiting on it
+        for _ in range(500):
+            if len(self.manager._cond._waiters) == 2:
+                break
+            threading.Event().wait(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(timeout=5)
+        self.assertEqual(len(refresh_count), 1)
+        self.assertEqual(results, [True, True, True])
+
+    def test_discarded_holder_is_dropped(self):
+        """Verify a garbage collected driver instance is unregistered."""
+        holder = TokenHolder()
+        self.manager.register("emulator:user:0", holder.refresh, 0)
+        del holder
+        self.assertFalse(self.manager.refresh("emulator:user:0"))
+        self.assertIsNone(self.manager.get_expiry("emulator:user:0"))
+
+    def test_wall_clock_holder(self):
+        """Verify a wall clock expiry is not moved by a virtual clock."""
+        refresh_func = MagicMock(return_value=time.time() + 3600)
+        with clock.use_clock(clock.VirtualClock(start_time=0)):
+            self.manager.register(
+                "emulator:user", refresh_func, time.time() + 3600, time.time
+            )
+            self.assertEqual(self.manager.refresh_due(), 0)
+            self.manager.register(
+                "emulator:user", refresh_func, time.time() + 100, time.time
+            )
+            self.assertEqual(self.manager.refresh_due(), 1)
+        refresh_func.assert_called_once_with()
+
+    def test_account_peers(self):
+        """Verify the zones sharing an account token are tracked weakly."""
+        zones = [TokenHolder(), TokenHolder()]
+        for zone in zones:
+            self.manager.add_peer("emulator:user", zone)
+        self.assertCountEqual(self.manager.get_peers("emulator:user"), zones)
+        self.assertEqual(self.manager.get_peers("emulator:other"), [])
+        del zones[0]
+        self.assertEqual(len(self.manager.get_peers("emulator:user")), 1)
+
+    def test_refresh_thread_start_stop(self):
+        """Verify the background thread refreshes due tokens and stops."""
+        manager = token_manager.TokenManager(lead_sec=300)
+        refreshed = threading.Event()
+
+        def refresh():
+            refreshed.set()
+            return clock.time() + 1200
+
+        manager.register("emulator:user:0", refresh, clock.time())
+        self.assertTrue(refreshed.wait(timeout=5))
+        manager.stop()
+        self.assertIsNone(manager._thread)
+
+
+class TestDriverTokenRefresh(utc.UnitTest):
+    """Test the token manager in the vendor drivers."""
+
+    def test_kumocloud_background_refresh(self):
+        """Verify kumocloud refreshes its token off the request path."""
+        with kumocloud_server.KumoCloudServer() as server, patch.dict(
+            os.environ, {kumocloud_config.BASE_URL_ENV_KEY: server.base_url}
+        ):
+            Thermostat = kumocloud.ThermostatClass(0, verbose=False)
+            manager = token_manager.get_token_manager()
+            old_token = Thermostat.auth_token
+            self.assertEqual(
+                manager.get_expiry(Thermostat.token_key), Thermostat.token_expires_at
+            )
+            self.assertTrue(manager.refresh(Thermostat.token_key))
+            self.assertNotEqual(Thermostat.auth_token, old_token)
+            self.assertEqual(server.stats["POST /v3/refresh"], 1)
+            # the request path finds a fresh token and does not refresh again
+            Thermostat.get_indoor_units()
+        self.assertEqual(server.stats["POST /v3/refresh"], 1)
+
+    def test_kumocloud_refresh_per_account(self):
+        """Verify one refresh serves every zone while they keep polling."""
+        refreshes = 20
+        with kumocloud_server.KumoCloudServer() as server, patch.dict(
+            os.environ, {kumocloud_config.BASE_URL_ENV_KEY: server.base_url}
+        ):
+            zone_0 = kumocloud.ThermostatClass(0, verbose=False)
+            # unthrottled account so the poll loop keeps running
+            request_governor.reset_governors()
+            request_governor.get_governor(
+                zone_0.thermostat_type,
+                zone_0.kc_uname,
+                {"rate_per_min": 60000.0, "burst": 1000},
+            )
+            zone_1 = kumocloud.ThermostatClass(1, verbose=False)
+            zone_0.request_governor = zone_1.request_governor
+            self.assertEqual(zone_0.token_key, zone_1.token_key)
+            manager = token_manager.get_token_manager()
+            errors = []
+            stop_event = threading.Event()
+
+            def poll():
+                while not stop_event.is_set():
+                    try:
+                        zone_1.get_indoor_units()
+                    except Exception as ex:  # noqa: W0718
+                        errors.append(ex)
+
+            poll_thread = threading.Thread(target=poll)
+            poll_thread.start()
+            try:
+                for _ in range(refreshes):
+                    self.assertTrue(manager.refresh(zone_0.token_key))
+            finally:
+                stop_event.set()
+                poll_thread.join(timeout=10)
+        self.assertEqual(errors, [])
+        # no poll went out without a token and forced a refresh of its own
+        self.assertEqual(server.stats["POST /v3/refresh"], refreshes)
+        self.assertEqual(zone_1.auth_token, zone_0.auth_token)
+        self.assertNotIn("Authorization", zone_1.session.headers)
+
+
+if __name__ == "__main__":
+    util.log_msg.debug = True  # type: ignore[attr-defined]
+    unittest.main(verbosity=2)
@@ -3,11 +3,17 @@ Unit test module for utilities.py.
 """
 
 # built-in imports
+import json
 import os
 import shutil
+import stat
+import tempfile
+import threading
 import unittest
+from unittest.mock import MagicMock, patch
 
 # local imports
+from src import clock
 from src import environment as env
 from src import utilities as util
 from tests import unit_test_common as utc
@@ -226,6 +232,23 @@ class FileAndLoggingTests(utc.UnitTest):
             print(f"unit test file '{full_path}' did not exist.")
             return False
 
+    def test_write_json_atomic(self):
+        """Verify the file is replaced whole with owner-only permissions."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "tokens", "cache.json")
+            util.write_json_atomic(file_path, {"access_token": "a"})
+            util.write_json_atomic(file_path, {"access_token": "b"})
+            with open(file_path, "r", encoding="utf-8") as cache_file:
+                self.assertEqual(json.load(cache_file), {"access_token": "b"})
+            if os.name == "posix":
+                self.assertEqual(stat.S_IMODE(os.stat(file_path).st_mode), 0o600)
+            # a failed write keeps the old file and leaves no temp file
+            with self.assertRaises(TypeError):
+                util.write_json_atomic(file_path, {"access_token": object()})
+            with open(file_path, "r", encoding="utf-8") as cache_file:
+                self.assertEqual(json.load(cache_file), {"access_token": "b"})
+            self.assertEqual(os.listdir(os.path.dirname(file_path)), ["cache.json"])
+
 
 class MetricsTests(utc.UnitTest):
     """Test functions related temperature/humidity metrics."""
@@ -584,7 +607,9 @@ class MiscTests(utc.UnitTest):
         with patch("socket.gethostbyaddr") as mock_gethostbyaddr:
             mock_gethostbyaddr.side_effect = socket.herror("DNS name not set")
 
-            result, ip = util.is_host_on_local_net("test_host", "192.168.1.1")
+            result, ip = util.is_host_on_local_net(
+                "test_host", "192.168.1.1", use_cache=False
+            )
             self.assertFalse(result)
             self.assertIsNone(ip)
 
@@ -593,7 +618,9 @@ class MiscTests(utc.UnitTest):
             with patch("builtins.print") as mock_print:
                 mock_gethostbyname.return_value = "192.168.1.1"
 
-                result, ip = util.is_host_on_local_net("test_host", verbose=True)
+                result, ip = util.is_host_on_local_net(
+                    "test_host", verbose=True, use_cache=False
+                )
 
                 self.assertTrue(result)
                 self.assertEqual(ip, "192.168.1.1")
@@ -608,7 +635,9 @@ class MiscTests(utc.UnitTest):
                     "Name resolution failed"
                 )
 
-                result, ip = util.is_host_on_local_net("bogus_host", verbose=True)
+                result, ip = util.is_host_on_local_net(
+                    "bogus_host", verbose=True, use_cache=False
+                )
 
                 self.assertFalse(result)
                 self.assertIsNone(ip)
@@ -617,7 +646,9 @@ class MiscTests(utc.UnitTest):
         with patch("socket.gethostbyaddr") as mock_gethostbyaddr:
             mock_gethostbyaddr.return_value = ("test_host", [], ["192.168.1.1"])
 
-            result, ip = util.is_host_on_local_net("test_host", "192.168.1.1")
+            result, ip = util.is_host_on_local_net(
+                "test_host", "192.168.1.1", use_cache=False
+            )
 
             self.assertTrue(result)
             self.assertEqual(ip, "192.168.1.1")
@@ -631,7 +662,9 @@ class MiscTests(utc.UnitTest):
                     ["192.168.1.1"],
                 )
 
-                result, ip = util.is_host_on_local_net("expected_host", "192.168.1.1")
+                result, ip = util.is_host_on_local_net(
+                    "expected_host", "192.168.1.1", use_cache=False
+                )
 
                 self.assertFalse(result)
                 self.assertIsNone(ip)
@@ -740,6 +773,154 @@ class SummaryMessageHelperTests(utc.UnitTest):
         self.assertIn("[Response]", result)
 
 
+class CircuitBreakerTests(utc.UnitTest):
+    """Test the vendor circuit breaker and retry backoff."""
+
+    def test_backoff_delay_is_jittered_exponential(self):
+        """Verify backoff delays double, stay in the jitter band and cap."""
+        for attempt in range(1, 8):
+            delay_sec = min(600, 30 * 2 ** (attempt - 1))
+            for _ in range(20):
+                backoff_sec = util.get_backoff_delay_sec(30, attempt, 600)
+                self.assertGreaterEqual(backoff_sec, delay_sec / 2 - 0.1)
+                self.assertLessEqual(backoff_sec, delay_sec + 0.1)
+
+    def test_breaker_state_machine(self):
+        """Verify open, short-circuit, single half-open probe and close."""
+        with clock.use_clock(clock.VirtualClock(start_time=0)) as virtual_clock:
+            breaker = util.get_circuit_breaker("emulator", "test_endpoint")
+            self.assertIs(
+                breaker, util.get_circuit_breaker("emulator", "test_endpoint")
+            )
+            for _ in range(util.CIRCUIT_FAILURE_THRESHOLD - 1):
+                self.assertFalse(breaker.record_failure())
+            self.assertTrue(breaker.record_failure())
+            self.assertEqual(breaker.state, util.CIRCUIT_OPEN)
+            with self.assertRaises(util.CircuitOpenError):
+                breaker.before_call()
+
+            virtual_clock.sleep(breaker.get_wait_sec(0))
+            breaker.before_call()  # probe admitted
+            self.assertEqual(breaker.state, util.CIRCUIT_HALF_OPEN)
+            with self.assertRaises(util.CircuitOpenError):
+                breaker.before_call()  # only one probe at a time
+
+            # failed probe re-opens with a longer interval
+            self.assertFalse(breaker.record_failure())
+            self.assertEqual(breaker.state, util.CIRCUIT_OPEN)
+            self.assertGreaterEqual(
+                breaker.get_wait_sec(0), util.CIRCUIT_OPEN_MIN_SEC - 0.1
+            )
+            virtual_clock.sleep(breaker.get_wait_sec(0))
+            breaker.before_call()
+            self.assertTrue(breaker.record_success())
+            self.assertEqual(breaker.state, util.CIRCUIT_CLOSED)
+            self.assertEqual(breaker.stats["probes"], 2)
+
+    def test_spamming_detection_trips_breaker(self):
+        """Verify TooManyAttemptsError opens the circuit at once."""
+
+        class TooManyAttemptsError(Exception):
+            """Stand-in for pyhtcc.TooManyAttemptsError."""
+
+        breaker = util.get_circuit_breaker("honeywell", "get_zones_info")
+        util._handle_server_spamming_detection(None, TooManyAttemptsError(), breaker)
+        self.assertEqual(breaker.state, util.CIRCUIT_OPEN)
+        self.assertGreaterEqual(
+            breaker.get_wait_sec(0), util.CIRCUIT_OPEN_MAX_SEC / 2 - 0.1
+        )
+
+    def test_outage_shared_across_zones(self):
+        """Verify an outage costs one probe per interval, not zones x retries."""
+        zones = 10
+        number_of_retries = 5
+        calls = []
+        calls_lock = threading.Lock()
+        email_notification = MagicMock()
+        results = {}
+
+        def vendor_call():
+            with calls_lock:
+                calls.append(clock.time())
+            raise ConnectionError("backend down")
+
+        def supervise_zone(zone):
+            try:
+                results[zone] = util.execute_with_extended_retries(
+                    vendor_call,
+                    thermostat_type="emulator",
+                    zone_name=str(zone),
+                    number_of_retries=number_of_retries,
+                    initial_retry_delay_sec=30,
+                    email_notification=email_notification,
+                    endpoint="vendor_call",
+                )
+            except ConnectionError as ex:
+                results[zone] = ex
+
+        with clock.use_clock(clock.VirtualClock(start_time=0)), patch.object(
+            util, "log_msg"
+        ):
+            threads = [
+                threading.Thread(target=clock.run_task, args=(supervise_zone, zone))
+                for zone in range(zones)
+            ]
+            for thread in threads:
+                clock.add_task()
+                thread.start()
+            with clock.idle():
+                for thread in threads:
+                    thread.join(timeout=10)
+
+        self.assertEqual(len(results), zones)
+        self.assertTrue(
+            all(isinstance(result, ConnectionError) for result in results.values())
+        )
+        # threshold failures to open, then one probe per open interval
+        self.assertLess(len(calls), zones * number_of_retries / 2)
+        breaker = util.get_circuit_breaker("emulator", "vendor_call")
+        self.assertGreater(breaker.stats["short_circuits"], 0)
+        self.assertLessEqual(breaker.stats["probes"], breaker.stats["opened"])
+        # one opened alert instead of a retry email per zone and trial
+        subjects = [
+            call.kwargs["subject"]
+            for call in email_notification.queue_email_alert.call_args_list
+        ]
+        self.assertEqual(
+            len([subject for subject in subjects if "calls suspended" in subject]), 1
+        )
+
+    def test_probe_closes_circuit(self):
+        """Verify a successful probe closes the circuit and alerts once."""
+        email_notification = MagicMock()
+
+        def vendor_call():
+            if clock.time() < 100:
+                raise ConnectionError("backend down")
+            return "ok"
+
+        with clock.use_clock(clock.VirtualClock(start_time=0)), patch.object(
+            util, "log_msg"
+        ):
+            result = util.execute_with_extended_retries(
+                vendor_call,
+                thermostat_type="emulator",
+                zone_name="0",
+                number_of_retries=10,
+                initial_retry_delay_sec=30,
+                email_notification=email_notification,
+                endpoint="vendor_call",
+            )
+        self.assertEqual(result, "ok")
+        breaker = util.get_circuit_breaker("emulator", "vendor_call")
+        self.assertEqual(breaker.state, util.CIRCUIT_CLOSED)
+        subjects = [
+            call.kwargs["subject"]
+            for call in email_notification.queue_email_alert.call_args_list
+        ]
+        self.assertEqual(len([s for s in subjects if "recovered" in s]), 1)
+
+
 if __name__ == "__main__":
     util.log_msg.debug = True  # type: ignore[attr-defined]
     unittest.main(verbosity=2)
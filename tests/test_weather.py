@@ -2,14 +2,24 @@
 Unit tests for weather module.
 """
 
+import os
+import tempfile
+import threading
+import time
 import unittest
 from unittest.mock import patch, MagicMock
+from src import clock
+from src import utilities as util
 from src import weather
 
 
 class TestWeather(unittest.TestCase):
     """Test functions in weather.py."""
 
+    def setUp(self):
+        """Start each test with an empty, memory-only weather cache."""
+        weather.reset_weather_cache(persist=False)
+
     def test_get_weather_api_key(self):
         """Test get_weather_api_key function."""
         with patch.dict("os.environ", {"WEATHER_API_KEY": "test_key"}):
@@ -89,5 +99,104 @@ class TestWeather(unittest.TestCase):
         self.assertEqual(result, "outdoor: N/A")
 
 
+class TestWeatherCache(unittest.TestCase):
+    """Test the shared weather cache."""
+
+    weather_data = {
+        "outdoor_temp": 40.0,
+        "outdoor_humidity": 50.0,
+        "outdoor_conditions": "Clear Sky",
+        "data_source": "OpenWeatherMap",
+    }
+
+    def setUp(self):
+        """Persist the cache to a temporary data folder on a virtual clock."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path_patch = patch.object(util, "FILE_PATH", self.temp_dir.name)
+        self.file_path_patch.start()
+        self.clock_context = clock.use_clock(clock.VirtualClock(start_time=1000))
+        self.virtual_clock = self.clock_context.__enter__()
+        self.fetch = MagicMock(return_value=dict(self.weather_data))
+
+    def tearDown(self):
+        """Restore the clock and remove the temporary data folder."""
+        self.clock_context.__exit__(None, None, None)
+        self.file_path_patch.stop()
+        self.temp_dir.cleanup()
+        weather.reset_weather_cache(persist=False)
+
+    def test_one_fetch_per_ttl(self):
+        """Verify repeated lookups within the TTL fetch once."""
+        cache = weather.WeatherCache(ttl_sec=600, persist=False)
+        results = [cache.get("55378", self.fetch) for _ in range(20)]
+        self.assertEqual(self.fetch.call_count, 1)
+        self.assertEqual(results[-1], self.weather_data)
+        self.assertEqual(cache.stats["hits"], 19)
+
+        # returned data is a copy
+        results[0]["outdoor_temp"] = 0.0
+        self.assertEqual(cache.get("55378", self.fetch)["outdoor_temp"], 40.0)
+
+        # zip codes are cached separately
+        cache.get("55760", self.fetch)
+        self.assertEqual(self.fetch.call_count, 2)
+
+    def test_stale_while_revalidate(self):
+        """Verify stale data is served while one background fetch refreshes."""
+        cache = weather.WeatherCache(ttl_sec=600, stale_sec=600, persist=False)
+        cache.get("55378", self.fetch)
+        self.virtual_clock.sleep(700)
+
+        release = threading.Event()
+        self.fetch.side_effect = lambda _: release.wait(5) and dict(
+            self.weather_data, outdoor_temp=45.0
+        )
+        stale = [cache.get("55378", self.fetch)["outdoor_temp"] for _ in range(3)]
+        self.assertEqual(stale, [40.0, 40.0, 40.0])
+        release.set()
+        deadline = time.monotonic() + 5
+        while cache.stats["refreshes"] < 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.fetch.call_count, 2)
+        self.assertEqual(cache.get("55378", self.fetch)["outdoor_temp"], 45.0)
+
+    def test_expired_entry_served_on_fetch_error(self):
+        """Verify an expired entry is served when the refetch fails."""
+        cache = weather.WeatherCache(ttl_sec=600, stale_sec=0, persist=False)
+        cache.get("55378", self.fetch)
+        self.virtual_clock.sleep(3600)
+        self.fetch.side_effect = weather.WeatherError("api down")
+        with patch.object(util, "log_msg"):
+            self.assertEqual(cache.get("55378", self.fetch), self.weather_data)
+            with self.assertRaises(weather.WeatherError):
+                cache.get("55760", self.fetch)
+
+    def test_persisted_across_restarts(self):
+        """Verify a new cache loads entries saved to ./data."""
+        weather.WeatherCache().get("55378", self.fetch)
+        self.assertTrue(
+            os.path.exists(util.get_full_file_path(weather.WEATHER_CACHE_FILE))
+        )
+        restarted_cache = weather.WeatherCache()
+        self.assertEqual(restarted_cache.get("55378", self.fetch), self.weather_data)
+        self.assertEqual(self.fetch.call_count, 1)
+
+    @patch("requests.get")
+    def test_get_outdoor_weather_uses_shared_cache(self, mock_get):
+        """Verify get_outdoor_weather fetches once for many zones."""
+        weather.reset_weather_cache(persist=False)
+        mock_response = MagicMock()
+        mock_response.json.return_value = {
+            "main": {"temp": 75.5, "humidity": 60},
+            "weather": [{"description": "partly cloudy"}],
+        }
+        mock_get.return_value = mock_response
+        for _ in range(10):
+            weather.get_outdoor_weather("12345", "test_api_key")
+        self.assertEqual(mock_get.call_count, 1)
+        weather.get_outdoor_weather("12345", "test_api_key", use_cache=False)
+        self.assertEqual(mock_get.call_count, 2)
+
+
 if __name__ == "__main__":
     unittest.main()
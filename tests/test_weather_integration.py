@@ -33,6 +33,8 @@ class TestWeatherIntegration(unittest.TestCase):
             "display_wifi",
             "display_battery",
             "display_outdoor_weather",
+            "max_workers",
+            "zone_timeout_sec",
         ]
 
         actual_params = list(sig.parameters.keys())
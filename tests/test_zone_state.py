@@ -0,0 +1,169 @@
+"""
+Unit test module for zone_state.py.
+"""
+
+# built-in imports
+import unittest
+from unittest import mock
+
+# local imports
+from src import honeywell
+from src import kumocloud
+from src import thermostat_common as tc
+from src import utilities as util
+from src import zone_state as zs
+from tests import unit_test_common as utc
+
+HONEYWELL_ZONE_INFO = {
+    "DeviceID": 12345,
+    "Name": "Living Room",
+    "communicationLost": False,
+    "deviceLive": True,
+    "latestData": {
+        "uiData": {
+            "DispTemperature": 71,
+            "IndoorHumidity": 45,
+            "IndoorHumiditySensorAvailable": 1,
+            "IndoorHumiditySensorNotFault": 1,
+            "SystemSwitchPosition": 1,
+            "HeatSetpoint": 68,
+            "CoolSetpoint": 76,
+            "ScheduleHeatSp": 68,
+            "ScheduleCoolSp": 76,
+            "IsInVacationHoldMode": 0,
+            "VacationHold": False,
+            "VacationHoldUntilTime": 0,
+            "TemporaryHoldUntilTime": 120,
+        },
+    },
+}
+
+
+class TestZoneState(utc.UnitTest):
+    """Test the ZoneState record."""
+
+    def test_slots(self):
+        """Verify the record has no per-instance dict."""
+        state = zs.ZoneState(display_temp=70.0)
+        self.assertFalse(hasattr(state, "__dict__"))
+        self.assertIsNone(state.mode_code)
+        with self.assertRaises(AttributeError):
+            state.unknown_field = 1  # pylint: disable=assigning-non-slot
+        with self.assertRaises(TypeError):
+            zs.ZoneState(unknown_field=1)
+        self.assertEqual(state.as_dict()["display_temp"], 70.0)
+        self.assertNotIn("raw", state.as_dict())
+
+    def test_lookup(self):
+        """Verify nested lookups return None for missing or bad values."""
+        data = {"a": {"b": "12", "c": "bad", "d": None}}
+        self.assertEqual(zs.lookup(data, "a", "b", convert=int), 12)
+        self.assertIsNone(zs.lookup(data, "a", "c", convert=int))
+        self.assertIsNone(zs.lookup(data, "a", "d", convert=int))
+        self.assertIsNone(zs.lookup(data, "a", "missing"))
+        self.assertIsNone(zs.lookup(data, "a", "b", "too_deep"))
+        self.assertEqual(zs.lookup(20.0, convert=util.c_to_f), 68.0)
+
+    def test_default_zone_state(self):
+        """Verify a driver without a parser gets an empty record."""
+        zone = tc.ThermostatCommonZone()
+        zone.zone_info = {"anything": 1}
+        self.assertIsInstance(zone.zone_state, zs.ZoneState)
+        self.assertIsNone(zone.zone_state.display_temp)
+        self.assertEqual(zone.zone_state.fetch_time, zone.last_fetch_time)
+
+
+class TestHoneywellZoneState(utc.UnitTest):
+    """Test decoding of the Honeywell TCC payload."""
+
+    def setUp(self):
+        """Create a zone without contacting TCC."""
+        super().setUp()
+        mock_tstat = mock.Mock()
+        mock_tstat.device_id = 12345
+        mock_tstat.zone_name = 0
+        with mock.patch("pyhtcc.Zone.__init__", return_value=None), mock.patch.object(
+            honeywell.ThermostatZone, "get_zone_name", return_value="Living Room"
+        ):
+            self.zone = honeywell.ThermostatZone(mock_tstat, verbose=False)
+        self.zone.refresh_zone_info = mock.Mock()
+
+    def test_getters_read_zone_state(self):
+        """Verify the getters return the decoded payload."""
+        self.zone.zone_info = HONEYWELL_ZONE_INFO
+        self.assertEqual(self.zone.get_display_temp(), 71.0)
+        self.assertEqual(self.zone.get_display_humidity(), 45.0)
+        self.assertTrue(self.zone.get_is_humidity_supported())
+        self.assertEqual(self.zone.get_system_switch_position(), 1)
+        self.assertEqual(self.zone.get_heat_setpoint_raw(), 68)
+        self.assertEqual(self.zone.get_schedule_cool_sp(), 76.0)
+        self.assertFalse(self.zone.get_is_invacation_hold_mode())
+        self.assertEqual(self.zone.get_temporary_hold_until_time(), 120)
+        self.assertTrue(self.zone.get_wifi_status())
+        self.assertEqual(self.zone.get_battery_voltage(), 120.0)
+        self.assertTrue(self.zone.is_heat_mode())
+
+    def test_decoded_once_per_fetch(self):
+        """Verify the payload is decoded once until the next fetch."""
+        self.zone.zone_info = HONEYWELL_ZONE_INFO
+        with mock.patch.object(
+            self.zone, "parse_zone_state", wraps=self.zone.parse_zone_state
+        ) as parse:
+            self.zone.get_display_temp()
+            self.zone.get_schedule_heat_sp()
+            self.zone.get_system_switch_position()
+            self.assertEqual(parse.call_count, 1)
+            self.zone.zone_info = HONEYWELL_ZONE_INFO
+            self.zone.get_display_temp()
+            self.assertEqual(parse.call_count, 2)
+
+    def test_raw_payload_only_when_debugging(self):
+        """Verify the raw payload is attached only in debug mode."""
+        self.zone.zone_info = HONEYWELL_ZONE_INFO
+        with mock.patch.object(util.log_msg, "debug", False, create=True):
+            self.assertIsNone(self.zone.zone_state.raw)
+        self.zone.zone_info = HONEYWELL_ZONE_INFO
+        with mock.patch.object(util.log_msg, "debug", True, create=True):
+            self.assertIs(self.zone.zone_state.raw, HONEYWELL_ZONE_INFO)
+
+
+class TestKumocloudZoneState(utc.UnitTest):
+    """Test decoding of the kumocloud legacy format zone dict."""
+
+    def test_parse_zone_state(self):
+        """Verify the zone dict is decoded into a ZoneState."""
+        zone_info = {
+            "label": "Kitchen",
+            "reportedCondition": {
+                "room_temp": 20.0,
+                "sp_heat": 20.0,
+                "sp_cool": 25.0,
+                "power": 1,
+                "operation_mode": 3,
+            },
+            "inputs": {"acoilSettings": {"humidistat": 0}},
+            "rssi": {"rssi": -50.0},
+        }
+        mock_thermostat = mock.Mock()
+        mock_thermostat.device_id = 0
+        mock_thermostat.zone_number = 0
+        mock_thermostat.get_all_metadata.return_value = zone_info
+        zone = kumocloud.ThermostatZone(mock_thermostat, verbose=False)
+
+        state = zone.zone_state
+        self.assertAlmostEqual(state.display_temp, 68.0)
+        self.assertIsNone(state.display_humidity)
+        self.assertEqual(state.mode_code, 3)
+        self.assertAlmostEqual(state.cool_setpoint, 77.0)
+        self.assertEqual(state.wifi_strength, -50.0)
+        self.assertTrue(state.wifi_ok)
+        self.assertEqual(zone.get_current_mode_name(), zone.COOL_MODE)
+
+        # unit powered off reports the off position
+        zone.zone_info = dict(zone_info, reportedCondition={"power": 0})
+        self.assertEqual(zone.get_system_switch_position(), 16)
+
+
+if __name__ == "__main__":
+    util.log_msg.debug = True  # type: ignore[attr-defined]
+    unittest.main(verbosity=2)
@@ -19,13 +19,21 @@ from zoneinfo import ZoneInfo
 from str2bool import str2bool
 
 # local imports
+from src import call_deadline
+from src import discovery_checkpoint
+from src import dns_cache
 from src import emulator_config
 from src import honeywell_config
+from src import request_governor
+from src import session_store
+from src import status_board
 from src import supervise as sup
 from src import thermostat_api as api
 from src import thermostat_common as tc
+from src import token_manager
 from src import environment as env
 from src import utilities as util
+from src import weather
 
 # enable modes
 ENABLE_FUNCTIONAL_INTEGRATION_TESTS = True  # enable func int tests
@@ -198,6 +206,17 @@ class UnitTest(unittest.TestCase, metaclass=PatchMeta):
         self.thermostat_type = self.unit_test_argv[1]
         self.zone_number = self.unit_test_argv[2]
         util.unit_test_mode = True
+        # vendor circuit breakers are process-wide, start each test closed
+        util.reset_circuit_breakers()
+        request_governor.reset_governors()
+        token_manager.reset_token_manager()
+        call_deadline.reset_executor()
+        # keep unit tests off the caches and checkpoints persisted in ./data
+        weather.reset_weather_cache(persist=False)
+        dns_cache.reset_dns_cache(persist=False)
+        discovery_checkpoint.reset_checkpoint(persist=False)
+        session_store.reset_store(persist=False)
+        status_board.reset_board(publish=False)
 
     def tearDown(self):
         """Default teardown method."""